@@ -13,9 +13,6 @@ from typing import (
 from cfx_utils.post_import_hook import (
     when_imported
 )
-from cfx_address import (
-    Base32Address
-)
 from cfx_utils.exceptions import (
     InvalidEpochNumebrParam
 )
@@ -75,11 +72,11 @@ def cfx_web3_condition(*args, **kwargs) -> bool:
     """
 
     Returns:
-        bool: returns if conflux_web3.Web3 type variable in arguments
+        bool: returns if conflux_web3.Web3 or conflux_web3.AsyncWeb3 type variable in arguments
     """
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
     for arg in list(args)+list(kwargs.values()):
-        if isinstance(arg, Web3):
+        if isinstance(arg, (Web3, AsyncWeb3)):
             return True
     return False
 
@@ -133,9 +130,11 @@ def hook_parse_block_identifier(mod):
 
 # hooked to is_none_or_zero_address in _web3_hook
 def is_none_or_base_32_zero_address(addr) -> bool:
+    # imported here because this module is executed before any module of conflux_web3
+    from conflux_web3._utils.addresses import to_hex_address
     EMPTY_ADDR_HEX = "0x" + "00" * 20
     try:
-        return (not addr) or (addr == EMPTY_ADDR_HEX) or (Base32Address.decode(addr)["hex_address"] == EMPTY_ADDR_HEX)
+        return (not addr) or (addr == EMPTY_ADDR_HEX) or (to_hex_address(addr) == EMPTY_ADDR_HEX)
     except:
         return False
 
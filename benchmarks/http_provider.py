@@ -0,0 +1,131 @@
+"""
+Compare the HTTPProvider of web3.py with ConfluxHTTPProvider and its JSON backends,
+decoding only and end to end (HTTP request, decoding and result formatting) against a local server.
+
+    python benchmarks/http_provider.py [RECORDED_DIR]
+
+RECORDED_DIR may contain JSON-RPC response bodies recorded from a node, named after the RPC,
+e.g. ``cfx_getEpochReceipts.json``. They replace the generated payloads of the same RPC.
+
+End to end, most of the difference from the web3.py provider comes from not formatting the response
+into a debug log message unless debug logging is enabled. The JSON backend only shows in decoding,
+which is a small part of a request once the result is formatted.
+"""
+import json
+import os
+import sys
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web3.providers.rpc import HTTPProvider  # noqa: E402
+
+from conflux_web3 import Web3  # noqa: E402
+from conflux_web3.providers import ConfluxHTTPProvider, orjson  # noqa: E402
+from conflux_web3._utils.rpc_abi import RPC  # noqa: E402
+
+from payloads import make_block, make_epoch_receipts, make_logs  # noqa: E402
+
+BLOCK = make_block(tx_count=200)
+RESULTS = {
+    RPC.cfx_getEpochReceipts: make_epoch_receipts(block_count=4, tx_count=50, log_count=3),
+    RPC.cfx_getLogs: make_logs(1000),
+    RPC.cfx_getBlockByHash: BLOCK,
+}
+CALLS: List[Tuple[str, Callable[[Web3], Any]]] = [
+    (RPC.cfx_getEpochReceipts, lambda w3: w3.cfx.get_epoch_receipts(100000000)),
+    (RPC.cfx_getLogs, lambda w3: w3.cfx.get_logs(fromEpoch=100000000, toEpoch=100000000)),
+    (RPC.cfx_getBlockByHash, lambda w3: w3.cfx.get_block_by_hash(BLOCK["hash"], True)),
+]
+
+
+def load_bodies(recorded_dir: str = "") -> Dict[str, bytes]:
+    bodies = {
+        method: json.dumps({"jsonrpc": "2.0", "id": 0, "result": result}).encode()
+        for method, result in RESULTS.items()
+    }
+    if recorded_dir:
+        for method in bodies:
+            path = os.path.join(recorded_dir, f"{method}.json")
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    bodies[method] = f.read()
+    return bodies
+
+
+def serve(bodies: Dict[str, bytes]) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            body = bodies[request["method"]]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_providers(url: str) -> Dict[str, Any]:
+    providers: Dict[str, Any] = {
+        "web3.py": HTTPProvider(url),
+        "json": ConfluxHTTPProvider(url, json_backend="json"),
+    }
+    if orjson is not None:
+        providers["orjson"] = ConfluxHTTPProvider(url, json_backend="orjson")
+    return providers
+
+
+def best_time(fn: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main(recorded_dir: str = "", repeat: int = 30) -> None:
+    bodies = load_bodies(recorded_dir)
+    server = serve(bodies)
+    url = f"http://127.0.0.1:{server.server_port}"
+    providers = make_providers(url)
+    if orjson is None:
+        print("orjson is not installed, pip install conflux-web3[orjson] to compare it\n")
+
+    print("decoding (ms)")
+    print(f"{'method':<24}{'size (KiB)':>12}" + "".join(f"{name:>10}" for name in providers))
+    for method, body in bodies.items():
+        times = [best_time(lambda: provider.decode_rpc_response(body), repeat) for provider in providers.values()]
+        print(f"{method:<24}{len(body) / 1024:>12.0f}" + "".join(f"{t * 1000:>10.2f}" for t in times))
+
+    print()
+    print("end to end (ms)")
+    names = list(providers)
+    print(
+        f"{'method':<24}" + "".join(f"{name:>10}" for name in names)
+        + "".join(f"{name + ' / web3':>16}" for name in names[1:])
+    )
+    # no middlewares, so results are not cached
+    web3s = [Web3(provider, middlewares=[], cns=None) for provider in providers.values()]
+    for method, call in CALLS:
+        times = [float("inf")] * len(web3s)
+        # the providers take turns so that noise of the machine affects them alike
+        for _ in range(repeat):
+            for i, w3 in enumerate(web3s):
+                times[i] = min(times[i], best_time(lambda: call(w3), 1))
+        print(
+            f"{method:<24}" + "".join(f"{t * 1000:>10.2f}" for t in times)
+            + "".join(f"{times[0] / t:>15.2f}x" for t in times[1:])
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,123 @@
+"""
+JSON-RPC results shaped as the responses of a Conflux node, used by the benchmarks
+"""
+import random
+from typing import Any, Dict, List
+
+from cfx_address import Base32Address
+
+_random = random.Random(0)
+ADDRESSES = [str(Base32Address("0x1" + f"{i:039x}", 1029)) for i in range(64)]
+CONTRACTS = [str(Base32Address("0x8" + f"{i:039x}", 1029)) for i in range(16)]
+
+
+def _hash() -> str:
+    return "0x" + _random.getrandbits(256).to_bytes(32, "big").hex()
+
+def _quantity(bits: int = 32) -> str:
+    return hex(_random.getrandbits(bits))
+
+
+def make_log(tx_hash: str, log_index: int) -> Dict[str, Any]:
+    return {
+        "address": _random.choice(CONTRACTS),
+        "topics": [_hash() for _ in range(3)],
+        "data": "0x" + "00" * 32,
+        "blockHash": _hash(),
+        "epochNumber": "0x5f5e100",
+        "transactionHash": tx_hash,
+        "transactionIndex": "0x0",
+        "logIndex": hex(log_index),
+        "transactionLogIndex": hex(log_index),
+        "space": "native",
+    }
+
+
+def make_receipt(index: int, log_count: int) -> Dict[str, Any]:
+    tx_hash = _hash()
+    return {
+        "transactionHash": tx_hash,
+        "index": hex(index),
+        "blockHash": _hash(),
+        "epochNumber": "0x5f5e100",
+        "from": _random.choice(ADDRESSES),
+        "to": _random.choice(CONTRACTS),
+        "gasUsed": _quantity(20),
+        "accumulatedGasUsed": _quantity(24),
+        "gasFee": _quantity(48),
+        "contractCreated": None,
+        "logs": [make_log(tx_hash, i) for i in range(log_count)],
+        "logsBloom": "0x" + "00" * 256,
+        "stateRoot": _hash(),
+        "outcomeStatus": "0x0",
+        "txExecErrorMsg": None,
+        "gasCoveredBySponsor": False,
+        "storageCoveredBySponsor": False,
+        "storageCollateralized": "0x0",
+        "storageReleased": [],
+        "space": "native",
+        "burntGasFee": _quantity(40),
+        "effectiveGasPrice": _quantity(40),
+        "type": "0x0",
+    }
+
+
+def make_epoch_receipts(block_count: int, tx_count: int, log_count: int) -> List[List[Dict[str, Any]]]:
+    return [[make_receipt(i, log_count) for i in range(tx_count)] for _ in range(block_count)]
+
+
+def make_logs(count: int) -> List[Dict[str, Any]]:
+    return [make_log(_hash(), i) for i in range(count)]
+
+
+def make_transaction(index: int) -> Dict[str, Any]:
+    return {
+        "hash": _hash(),
+        "nonce": _quantity(16),
+        "blockHash": _hash(),
+        "transactionIndex": hex(index),
+        "from": _random.choice(ADDRESSES),
+        "to": _random.choice(CONTRACTS),
+        "value": _quantity(64),
+        "gasPrice": _quantity(40),
+        "gas": _quantity(20),
+        "contractCreated": None,
+        "data": "0xa9059cbb" + "00" * 64,
+        "storageLimit": _quantity(16),
+        "epochHeight": "0x5f5e100",
+        "chainId": "0x405",
+        "status": "0x0",
+        "v": "0x1",
+        "r": _hash(),
+        "s": _hash(),
+        "type": "0x0",
+    }
+
+
+def make_block(tx_count: int) -> Dict[str, Any]:
+    return {
+        "hash": _hash(),
+        "parentHash": _hash(),
+        "height": "0x5f5e100",
+        "miner": _random.choice(ADDRESSES),
+        "deferredStateRoot": _hash(),
+        "deferredReceiptsRoot": _hash(),
+        "deferredLogsBloomHash": _hash(),
+        "blame": "0x0",
+        "transactionsRoot": _hash(),
+        "epochNumber": "0x5f5e100",
+        "blockNumber": "0x7735940",
+        "gasLimit": "0x1c9c380",
+        "gasUsed": _quantity(24),
+        "timestamp": _quantity(32),
+        "difficulty": _quantity(48),
+        "powQuality": _quantity(48),
+        "refereeHashes": [_hash() for _ in range(2)],
+        "adaptive": False,
+        "nonce": _quantity(64),
+        "size": _quantity(16),
+        "custom": ["0x01"],
+        "posReference": _hash(),
+        "baseFeePerGas": _quantity(32),
+        "transactions": [make_transaction(i) for i in range(tx_count)],
+    }
@@ -0,0 +1,86 @@
+"""
+Compare the compiled result formatters with the composed toolz formatters,
+and the result modes of the compiled formatters.
+
+    python benchmarks/result_formatters.py
+"""
+import copy
+import os
+import sys
+import timeit
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web3.datastructures import AttributeDict  # noqa: E402
+from eth_utils.toolz import compose  # noqa: E402
+from eth_utils.curried import apply_formatter_if  # noqa: E402
+
+import conflux_web3  # noqa: E402,F401
+from conflux_web3._utils.method_formatters import (  # noqa: E402
+    PYTHONIC_RESULT_FORMATTERS,
+    cfx_result_formatters,
+    not_attrdict,
+)
+from conflux_web3._utils.rpc_abi import RPC  # noqa: E402
+
+from payloads import make_block, make_epoch_receipts, make_logs  # noqa: E402
+
+CASES = [
+    (RPC.cfx_getEpochReceipts, make_epoch_receipts(block_count=4, tx_count=50, log_count=3)),
+    (RPC.cfx_getLogs, make_logs(1000)),
+    (RPC.cfx_getBlockByHash, make_block(tx_count=200)),
+]
+RESULT_MODES = ("default", "records", "light", "raw")
+
+
+def composed_formatter(method: str) -> Callable[[Any], Any]:
+    return compose(apply_formatter_if(not_attrdict, AttributeDict.recursive), PYTHONIC_RESULT_FORMATTERS[method])
+
+
+def compiled_formatter(method: str, result_mode: str = "default") -> Callable[[Any], Any]:
+    return cfx_result_formatters(method, SimpleNamespace(result_mode=result_mode))  # type: ignore
+
+
+def best_time(formatter: Callable[[Any], Any], payload: Any, repeat: int) -> float:
+    return min(timeit.repeat(lambda: formatter(payload), number=1, repeat=repeat))
+
+
+def allocated_bytes(formatter: Callable[[Any], Any], payload: Any) -> int:
+    # the payload is copied before tracing so only the formatted result is measured
+    payload = copy.deepcopy(payload)
+    tracemalloc.start()
+    result = formatter(payload)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'method':<24}{'composed (ms)':>16}{'compiled (ms)':>16}{'speedup':>10}")
+    for method, payload in CASES:
+        composed = composed_formatter(method)
+        compiled = compiled_formatter(method)
+        assert compiled(copy.deepcopy(payload)) == composed(copy.deepcopy(payload))
+        composed_time = best_time(composed, payload, repeat)
+        compiled_time = best_time(compiled, payload, repeat)
+        print(
+            f"{method:<24}{composed_time * 1000:>16.2f}{compiled_time * 1000:>16.2f}"
+            f"{composed_time / compiled_time:>9.1f}x"
+        )
+    print()
+    print(f"{'method':<24}{'mode':>8}{'time (ms)':>12}{'memory (KiB)':>14}")
+    for method, payload in CASES:
+        for result_mode in RESULT_MODES:
+            formatter = compiled_formatter(method, result_mode)
+            print(
+                f"{method:<24}{result_mode:>8}{best_time(formatter, payload, repeat) * 1000:>12.2f}"
+                f"{allocated_bytes(formatter, payload) / 1024:>14.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,26 @@ import _web3_hook
 
 import pkg_resources
 
-from conflux_web3.main import Web3
+from conflux_web3.main import Web3, AsyncWeb3
 from conflux_web3.dev import (
     get_local_web3,
     get_mainnet_web3,
     get_testnet_web3
 )
+from conflux_web3.providers import (
+    ConfluxHTTPProvider,
+)
 HTTPProvider = Web3.HTTPProvider
+AsyncHTTPProvider = AsyncWeb3.AsyncHTTPProvider
 
 __version__ = pkg_resources.get_distribution("conflux_web3").version
 
 __all__ = [
     "Web3",
+    "AsyncWeb3",
     "HTTPProvider",
+    "ConfluxHTTPProvider",
+    "AsyncHTTPProvider",
     "get_local_web3",
     "get_mainnet_web3",
     "get_testnet_web3",
@@ -0,0 +1,110 @@
+"""
+Memoized address conversions.
+
+The same few thousand addresses are converted again and again when blocks, receipts, logs
+and contract return values are formatted. ``Base32Address`` is immutable, so the converted
+addresses are cached in bounded LRU caches and shared by the callers.
+"""
+from functools import (
+    lru_cache,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Optional,
+    Union,
+)
+
+from cfx_address import (
+    Base32Address,
+)
+from cfx_address.utils import (
+    normalize_to as _normalize_to,
+)
+from cfx_utils.types import (
+    ChecksumAddress,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3.middleware.cache import CacheInfo
+
+ADDRESS_CACHE_SIZE = 16384
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _to_base32(address: str, network_id: int, verbose: bool, ignore_invalid_type: bool) -> Base32Address:
+    return Base32Address(address, network_id, verbose, _ignore_invalid_type=ignore_invalid_type)
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _from_trust(address: str) -> Base32Address:
+    return Base32Address(address, _from_trust=True)
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _normalize(address: str, network_id: Optional[int], verbose: bool) -> Union[Base32Address, ChecksumAddress]:
+    return _normalize_to(address, network_id, verbose)
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _to_hex_address(address: str) -> str:
+    return Base32Address.decode(address)["hex_address"]
+
+_CACHES = (_to_base32, _from_trust, _normalize, _to_hex_address)
+
+
+def _as_key(address: Any) -> Any:
+    # Base32Address.__eq__ decodes both operands, so cache keys are plain strings
+    if isinstance(address, str) and type(address) is not str:
+        return str(address)
+    return address
+
+
+def to_base32_address(
+    address: str, network_id: int, verbose: bool = False, ignore_invalid_type: bool = False
+) -> Base32Address:
+    """
+    returns ``Base32Address(address, network_id, verbose)``, the result is cached
+    """
+    return _to_base32(_as_key(address), network_id, verbose, ignore_invalid_type)
+
+def from_trust_to_base32(address: str) -> Base32Address:
+    """
+    returns ``Base32Address(address, _from_trust=True)``, the result is cached
+    so the decoded properties of the address are shared as well
+    """
+    return _from_trust(_as_key(address))
+
+def normalize_to(
+    address: str, network_id: Optional[int], verbose: bool = False
+) -> Union[Base32Address, ChecksumAddress]:
+    """
+    the cached version of ``cfx_address.utils.normalize_to``
+    """
+    return _normalize(_as_key(address), network_id, verbose)
+
+def to_hex_address(base32_address: str) -> str:
+    """
+    returns the hex address of a base32 address, the result is cached
+    """
+    return _to_hex_address(_as_key(base32_address))
+
+
+def address_cache_info() -> "CacheInfo":
+    """
+    returns the hits and misses of the address conversion caches
+
+    >>> info = address_cache_info()
+    >>> info.hits / (info.hits + info.misses)
+    0.98
+    """
+    # imported here because the middlewares import this module
+    from conflux_web3.middleware.cache import CacheInfo
+    infos = [cache.cache_info() for cache in _CACHES]
+    return CacheInfo(
+        sum(info.hits for info in infos),
+        sum(info.misses for info in infos),
+        sum(info.maxsize or 0 for info in infos),
+        sum(info.currsize for info in infos),
+    )
+
+def clear_address_cache() -> None:
+    for cache in _CACHES:
+        cache.cache_clear()
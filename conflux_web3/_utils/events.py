@@ -1,9 +1,21 @@
 from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
     Optional,
+    Sequence,
+    Tuple,
     cast,
     Union,
 )
+from collections import (
+    OrderedDict,
+)
 import itertools
+import re
+import threading
 
 from eth_abi.codec import (
     ABICodec,
@@ -11,9 +23,15 @@ from eth_abi.codec import (
 from eth_utils.abi import (
     event_abi_to_log_topic,
 )
+from eth_utils.address import (
+    to_normalized_address,
+)
 from eth_utils.conversions import (
     to_bytes,
 )
+from hexbytes import (
+    HexBytes,
+)
 from eth_utils.toolz import (
     curry, # type: ignore
 )
@@ -29,6 +47,7 @@ from web3._utils.abi import (
     normalize_event_input_types,
 )
 from web3.types import (
+    ABI,
     ABIEvent,
 )
 from web3.datastructures import (
@@ -43,99 +62,376 @@ from web3._utils.encoding import (
     hexstr_if_str,
 )
 
-from cfx_address.utils import (
-    normalize_to
+from conflux_web3._utils.addresses import (
+    normalize_to,
 )
 from conflux_web3.types import (
+    EventColumns,
     EventData,
     LogReceipt,
     TransactionLogReceipt
 )
+from conflux_web3.types.records import (
+    EventDataRecord,
+)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None # type: ignore
 
-@curry
-def cfx_get_event_data(
-    abi_codec: ABICodec, event_abi: ABIEvent, log_entry: Union[TransactionLogReceipt, LogReceipt], chain_id: Optional[int]= None
-) -> EventData:
+_WORD_TYPE_PATTERN = re.compile(r"^(uint|int|bytes|address|bool)(\d*)$")
+
+
+def _normalize_address(chain_id: Optional[int]) -> Callable[[str, Any], Tuple[str, Any]]:
+    def normalizer(type_str: str, hex_address: Any) -> Tuple[str, Any]:
+        if type_str == "address":
+            return type_str, normalize_to(hex_address, chain_id, True)
+        return type_str, hex_address
+    return normalizer
+
+
+class EventDecoder:
+    def __init__(self, event_abi: ABIEvent) -> None:
+        """
+        an event ABI compiled for decoding logs.
+        The topic, the decoding types and the argument names are computed once rather than for every log.
+
+        Parameters
+        ----------
+        event_abi : ABIEvent
+            the event ABI
+        """
+        self.event_abi = event_abi
+        self.event_name = event_abi.get("name", None)
+        self.anonymous = bool(event_abi.get("anonymous", None))
+        # type ignored b/c event_abi_to_log_topic(event_abi: Dict[str, Any])
+        self.topic: Optional[bytes] = None if self.anonymous else event_abi_to_log_topic(event_abi) # type: ignore
+
+        log_topics_abi = get_indexed_event_inputs(event_abi)
+        self.topic_types = get_event_abi_types_for_decoding(normalize_event_input_types(log_topics_abi))
+        self.topic_names = get_abi_input_names(ABIEvent({"inputs": log_topics_abi}))
+
+        log_data_abi = exclude_indexed_event_inputs(event_abi)
+        self.data_types = get_event_abi_types_for_decoding(normalize_event_input_types(log_data_abi))
+        self.data_names = get_abi_input_names(ABIEvent({"inputs": log_data_abi}))
+
+        # data words are decoded in bulk by decode_columns if every data argument is a static 32-byte type
+        self._static_data = all(_parse_word_type(type_str) is not None for type_str in self.data_types)
+        # map_abi_data is skipped if there is no address to normalize
+        self._topic_has_address = any("address" in type_str for type_str in self.topic_types)
+        self._data_has_address = any("address" in type_str for type_str in self.data_types)
+
+        # sanity check that there are not name intersections between the topic
+        # names and the data argument names.
+        # the error is raised when decoding to keep the behaviour of cfx_get_event_data
+        duplicate_names = set(self.topic_names).intersection(self.data_names)
+        self._abi_error: Optional[InvalidEventABI] = None
+        if duplicate_names:
+            self._abi_error = InvalidEventABI(
+                "The following argument names are duplicated "
+                f"between event inputs: '{', '.join(duplicate_names)}'"
+            )
+
+    def _get_log_topics(self, log_entry: Union[TransactionLogReceipt, LogReceipt]) -> Sequence[Any]:
+        """
+        returns the topics of the indexed arguments, raises if the log does not match the event
+        """
+        if self.anonymous:
+            log_topics = log_entry["topics"]
+        elif not log_entry["topics"]:
+            raise MismatchedABI("Expected non-anonymous event to have 1 or more topics")
+        elif self.topic != log_entry["topics"][0]:
+            raise MismatchedABI("The event signature did not match the provided ABI")
+        else:
+            log_topics = log_entry["topics"][1:]
+
+        if len(log_topics) != len(self.topic_types):
+            raise LogTopicError(
+                f"Expected {len(self.topic_types)} log topics.  Got {len(log_topics)}"
+            )
+
+        if self._abi_error is not None:
+            raise self._abi_error
+        return log_topics
+
+    def decode(
+        self,
+        abi_codec: ABICodec,
+        log_entry: Union[TransactionLogReceipt, LogReceipt],
+        chain_id: Optional[int]= None,
+        as_record: bool = False,
+    ) -> EventData:
+        """
+        decode the log entry of the event, see ``cfx_get_event_data``.
+        The event data is an ``EventDataRecord`` rather than an AttributeDict if ``as_record`` is True
+        """
+        log_topics = self._get_log_topics(log_entry)
+
+        log_data = hexstr_if_str(to_bytes, log_entry["data"])
+        decoded_log_data = abi_codec.decode(self.data_types, log_data)
+        if self._data_has_address:
+            decoded_log_data = map_abi_data(
+                [_normalize_address(chain_id)], self.data_types, decoded_log_data
+            )
+
+        decoded_topic_data = [
+            abi_codec.decode([topic_type], topic_data)[0]
+            for topic_type, topic_data in zip(self.topic_types, log_topics)
+        ]
+        if self._topic_has_address:
+            decoded_topic_data = map_abi_data(
+                [_normalize_address(chain_id)], self.topic_types, decoded_topic_data
+            )
+
+        event_args = dict(
+            itertools.chain(
+                zip(self.topic_names, decoded_topic_data),
+                zip(self.data_names, decoded_log_data),
+            )
+        )
+
+        event_data = {
+            "args": event_args,
+            "event": self.event_name,
+            "logIndex": log_entry.get("logIndex", None),
+            "transactionIndex": log_entry.get("transactionIndex", None),
+            "transactionLogIndex": log_entry.get("transactionLogIndex", None),
+            "transactionHash": log_entry.get("transactionHash", None),
+            "address": log_entry["address"],
+            "blockHash": log_entry.get("blockHash", None),
+            "epochNumber": log_entry.get("epochNumber", None),
+        }
+
+        if as_record:
+            event_data["args"] = AttributeDict.recursive(event_args)
+            return cast(EventData, EventDataRecord.from_dict(event_data))
+        return cast(EventData, AttributeDict.recursive(event_data))
+
+
+    def decode_columns(
+        self,
+        abi_codec: ABICodec,
+        log_entries: Iterable[Union[TransactionLogReceipt, LogReceipt]],
+        chain_id: Optional[int]= None,
+    ) -> Tuple[EventColumns, List[Tuple[Union[TransactionLogReceipt, LogReceipt], Exception]]]:
+        """
+        decode the log entries of the event into columns rather than a dict for each log.
+        If every data argument is a static 32-byte type, the data words are decoded in bulk,
+        vectorized by numpy if installed.
+
+        Returns
+        -------
+        Tuple[EventColumns, List[Tuple[LogReceipt, Exception]]]
+            the decoded columns and the logs not matching the event with the errors
+        """
+        rejected: List[Tuple[Union[TransactionLogReceipt, LogReceipt], Exception]] = []
+        accepted: List[Union[TransactionLogReceipt, LogReceipt]] = []
+        topic_rows: List[Sequence[Any]] = []
+        data_rows: List[bytes] = []
+        for log_entry in log_entries:
+            try:
+                log_topics = self._get_log_topics(log_entry)
+            except (MismatchedABI, LogTopicError, InvalidEventABI, TypeError) as e:
+                rejected.append((log_entry, e))
+                continue
+            accepted.append(log_entry)
+            topic_rows.append(log_topics)
+            data_rows.append(hexstr_if_str(to_bytes, log_entry["data"]))
+
+        address_cache: Dict[bytes, Any] = {}
+        args: Dict[str, Sequence[Any]] = {}
+        for index, (name, type_str) in enumerate(zip(self.topic_names, self.topic_types)):
+            args[name] = _decode_word_column(
+                abi_codec, type_str, [bytes(HexBytes(topics[index])) for topics in topic_rows], chain_id, address_cache
+            )
+
+        word_count = len(self.data_types)
+        if self._static_data and all(len(data) >= 32 * word_count for data in data_rows):
+            for index, (name, type_str) in enumerate(zip(self.data_names, self.data_types)):
+                args[name] = _decode_word_column(
+                    abi_codec, type_str, [data[32 * index:32 * index + 32] for data in data_rows], chain_id, address_cache
+                )
+        else:
+            decoded_rows = [abi_codec.decode(self.data_types, data) for data in data_rows]
+            for index, (name, type_str) in enumerate(zip(self.data_names, self.data_types)):
+                column = [row[index] for row in decoded_rows]
+                if "address" in type_str:
+                    normalizer = _normalize_address(chain_id)
+                    column = [map_abi_data([normalizer], [type_str], [value])[0] for value in column]
+                args[name] = column
+
+        columns: Dict[str, Any] = {
+            "event": self.event_name,
+            "args": args,
+            "address": [log_entry["address"] for log_entry in accepted],
+        }
+        for field in ("blockHash", "epochNumber", "transactionHash", "transactionIndex", "transactionLogIndex", "logIndex"):
+            columns[field] = [log_entry.get(field, None) for log_entry in accepted]
+        return cast(EventColumns, columns), rejected
+
+
+def _parse_word_type(type_str: str) -> Optional[Tuple[str, int]]:
     """
-    Given an event ABI and a log entry for that event, return the decoded
-    event data.
-    Modified from web3._utils.events.get_event_data
+    returns (kind, bit size of integers or byte size of bytes<M>) if the type is a static type encoded as a single 32-byte word
     """
-    if event_abi.get("anonymous", None):
-        log_topics = log_entry["topics"]
-    elif not log_entry["topics"]:
-        raise MismatchedABI("Expected non-anonymous event to have 1 or more topics")
-    # type ignored b/c event_abi_to_log_topic(event_abi: Dict[str, Any])
-    elif event_abi_to_log_topic(event_abi) != log_entry["topics"][0]:  # type: ignore
-        raise MismatchedABI("The event signature did not match the provided ABI")
-    else:
-        log_topics = log_entry["topics"][1:]
-
-    log_topics_abi = get_indexed_event_inputs(event_abi)
-    log_topic_normalized_inputs = normalize_event_input_types(log_topics_abi)
-    log_topic_types = get_event_abi_types_for_decoding(log_topic_normalized_inputs)
-    log_topic_names = get_abi_input_names(ABIEvent({"inputs": log_topics_abi}))
-
-    if len(log_topics) != len(log_topic_types):
-        raise LogTopicError(
-            f"Expected {len(log_topic_types)} log topics.  Got {len(log_topics)}"
-        )
+    match = _WORD_TYPE_PATTERN.match(type_str)
+    if match is None:
+        return None
+    kind, size = match.group(1), match.group(2)
+    if kind in ("address", "bool"):
+        return None if size else (kind, 0)
+    if kind == "bytes":
+        return (kind, int(size)) if size else None
+    return kind, int(size or 256)
 
-    log_data = hexstr_if_str(to_bytes, log_entry["data"])
-    log_data_abi = exclude_indexed_event_inputs(event_abi)
-    log_data_normalized_inputs = normalize_event_input_types(log_data_abi)
-    log_data_types = get_event_abi_types_for_decoding(log_data_normalized_inputs)
-    log_data_names = get_abi_input_names(ABIEvent({"inputs": log_data_abi}))
-
-    # sanity check that there are not name intersections between the topic
-    # names and the data argument names.
-    duplicate_names = set(log_topic_names).intersection(log_data_names)
-    if duplicate_names:
-        raise InvalidEventABI(
-            "The following argument names are duplicated "
-            f"between event inputs: '{', '.join(duplicate_names)}'"
+def _decode_word_column(
+    abi_codec: ABICodec, type_str: str, words: List[bytes], chain_id: Optional[int], address_cache: Dict[bytes, Any]
+) -> Sequence[Any]:
+    """
+    decode 32-byte words of the same static type.
+    Unlike the codec, the padding bytes are not validated
+    """
+    word_type = _parse_word_type(type_str)
+    if word_type is None:
+        column = [abi_codec.decode([type_str], word)[0] for word in words]
+        if "address" in type_str:
+            normalizer = _normalize_address(chain_id)
+            column = [map_abi_data([normalizer], [type_str], [value])[0] for value in column]
+        return column
+    kind, size = word_type
+    if np is not None and words and (kind == "bool" or (kind in ("uint", "int") and size <= 64)):
+        array = np.frombuffer(b"".join(words), dtype=np.uint8).reshape(len(words), 32)
+        if kind == "bool":
+            return array[:, 31] != 0
+        return np.ascontiguousarray(array[:, 24:]).view(">u8" if kind == "uint" else ">i8").reshape(len(words)).astype(
+            np.uint64 if kind == "uint" else np.int64
         )
+    if kind == "uint":
+        return [int.from_bytes(word, "big") for word in words]
+    if kind == "int":
+        return [int.from_bytes(word, "big", signed=True) for word in words]
+    if kind == "bool":
+        return [word[31] != 0 for word in words]
+    if kind == "address":
+        column = []
+        for word in words:
+            address = word[12:]
+            if address not in address_cache:
+                address_cache[address] = normalize_to(to_normalized_address(address), chain_id, True)
+            column.append(address_cache[address])
+        return column
+    # bytes<M>
+    return [word[:size] for word in words]
 
-    decoded_log_data = abi_codec.decode(log_data_types, log_data)
-    
-    return_normalizer = [
-        lambda type_str, hex_address: (type_str, normalize_to(hex_address, chain_id, True)) if type_str == "address" \
-                                                                                        else (type_str, hex_address)
-    ]
-    
-    normalized_log_data = map_abi_data(
-        return_normalizer, log_data_types, decoded_log_data
-    )
 
-    decoded_topic_data = [
-        abi_codec.decode([topic_type], topic_data)[0]
-        for topic_type, topic_data in zip(log_topic_types, log_topics)
-    ]
-    normalized_topic_data = map_abi_data(
-        return_normalizer, log_topic_types, decoded_topic_data
-    )
+class EventDecoderRegistry:
+    def __init__(self, contract_abi: ABI) -> None:
+        """
+        decoders of every event in a contract ABI, indexed by the event topic
 
-    event_args = dict(
-        itertools.chain(
-            zip(log_topic_names, normalized_topic_data),
-            zip(log_data_names, normalized_log_data),
-        )
+        Parameters
+        ----------
+        contract_abi : ABI
+            the contract ABI
+        """
+        self.contract_abi = contract_abi
+        # id of the event ABI -> decoder, the event ABIs are kept alive by self.contract_abi
+        self._decoders: Dict[int, EventDecoder] = {}
+        self.topic_index: Dict[bytes, EventDecoder] = {}
+        self.anonymous_decoders: List[EventDecoder] = []
+        for abi_element in contract_abi:
+            if abi_element.get("type") != "event":
+                continue
+            decoder = EventDecoder(cast(ABIEvent, abi_element))
+            self._decoders[id(abi_element)] = decoder
+            if decoder.topic is None:
+                self.anonymous_decoders.append(decoder)
+            else:
+                self.topic_index.setdefault(bytes(decoder.topic), decoder)
+
+    def get_decoder(self, event_abi: ABIEvent) -> EventDecoder:
+        """
+        returns the decoder of the event ABI, which is compiled if the ABI is not an element of the contract ABI
+        """
+        decoder = self._decoders.get(id(event_abi))
+        if decoder is not None and decoder.event_abi is event_abi:
+            return decoder
+        return get_event_decoder(event_abi)
+
+    def route(self, log_entry: Union[TransactionLogReceipt, LogReceipt]) -> Optional[EventDecoder]:
+        """
+        returns the decoder of the non-anonymous event matching the topic0 and the topic count of the log,
+        or None if no event matches
+        """
+        topics = log_entry["topics"]
+        if not topics:
+            return None
+        decoder = self.topic_index.get(bytes(HexBytes(topics[0])))
+        if decoder is None or len(topics) != len(decoder.topic_types) + 1:
+            return None
+        return decoder
+
+    def get_decoder_by_topic(self, topic: Union[bytes, str]) -> Optional[EventDecoder]:
+        """
+        returns the decoder of the non-anonymous event with the topic, or None if no event matches
+        """
+        return self.topic_index.get(bytes(HexBytes(topic)))
+
+
+class _IdentityCache:
+    """
+    LRU cache keyed by the identity of an ABI. The ABI is kept alive by the cached value,
+    so the id is not reused by another object while it is cached
+    """
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._values: "OrderedDict[int, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key_object: Any, source: Callable[[Any], Any], factory: Callable[[Any], Any]) -> Any:
+        key = id(key_object)
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None and source(value) is key_object:
+                self._values.move_to_end(key)
+                return value
+        value = factory(key_object)
+        with self._lock:
+            self._values[key] = value
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return value
+
+
+_event_decoders = _IdentityCache(1024)
+_event_decoder_registries = _IdentityCache(256)
+
+def get_event_decoder(event_abi: ABIEvent) -> EventDecoder:
+    """
+    returns the compiled decoder of the event ABI, which is cached for the ABI object
+    """
+    return _event_decoders.get_or_create(event_abi, lambda decoder: decoder.event_abi, EventDecoder)
+
+def get_event_decoder_registry(contract_abi: ABI) -> EventDecoderRegistry:
+    """
+    returns the decoders of the events in the contract ABI, which are cached for the ABI object
+    """
+    return _event_decoder_registries.get_or_create(
+        contract_abi, lambda registry: registry.contract_abi, EventDecoderRegistry
     )
 
-    event_data = {
-        "args": event_args,
-        "event": event_abi.get("name", None),
-        "logIndex": log_entry.get("logIndex", None),
-        "transactionIndex": log_entry.get("transactionIndex", None),
-        "transactionLogIndex": log_entry.get("transactionLogIndex", None),
-        "transactionHash": log_entry.get("transactionHash", None),
-        "address": log_entry["address"],
-        "blockHash": log_entry.get("blockHash", None),
-        "epochNumber": log_entry.get("epochNumber", None),
-    }
-
-    return cast(EventData, AttributeDict.recursive(event_data))
+
+@curry
+def cfx_get_event_data(
+    abi_codec: ABICodec, event_abi: ABIEvent, log_entry: Union[TransactionLogReceipt, LogReceipt], chain_id: Optional[int]= None
+) -> EventData:
+    """
+    Given an event ABI and a log entry for that event, return the decoded
+    event data.
+    Modified from web3._utils.events.get_event_data
+    """
+    return get_event_decoder(event_abi).decode(abi_codec, log_entry, chain_id)
 
     
 
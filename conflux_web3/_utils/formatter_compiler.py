@@ -0,0 +1,396 @@
+"""
+Compile result formatters into specialized functions.
+
+Result formatters are composed of toolz curried applicators such as
+``apply_formatters_to_dict`` and ``apply_formatter_if``, and the formatted result is then
+converted by ``AttributeDict.recursive``. Every field of every block, receipt or log costs
+several nested calls. ``compile_result_formatter`` generates the source of a function
+doing the same work in a single pass: the applicators known to the compiler are inlined,
+the leaf formatters (e.g. ``to_hash32``) are called as they are, and dicts are converted
+to ``AttributeDict`` as they are formatted. Formatters unknown to the compiler are called
+as they are, so the output is always the same as the composed formatters.
+
+Formatters compiled with ``light=True`` produce plain python values instead: dicts rather
+than ``AttributeDict``, ``bytes`` rather than ``HexBytes``, ``int`` rather than ``Drip`` and
+``str`` rather than ``Base32Address``. Formatted dicts can also be created as other types
+(e.g. ``__slots__`` records) by the factories passed as ``records``, whose simple fields
+can be stored as compact values converted when they are read (see ``compact_field_formatters``).
+"""
+import inspect
+import numbers
+from functools import (
+    lru_cache,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from eth_utils.curried import (
+    apply_formatter_if,
+    apply_formatter_to_array,
+    apply_formatters_to_dict,
+    apply_one_of_formatters,
+)
+from web3.datastructures import (
+    AttributeDict,
+)
+from cfx_utils.token_unit import (
+    AbstractTokenUnit,
+    to_int_if_drip_units,
+)
+from web3._utils.method_formatters import (
+    is_not_null,
+)
+
+T = TypeVar("T")
+
+# values kept as they are by AttributeDict.recursive
+_SCALAR_TYPES = (str, int, bytes, float, bool, type(None), numbers.Number)
+
+_APPLY_FORMATTER_IF = apply_formatter_if.func
+_APPLY_FORMATTER_TO_ARRAY = apply_formatter_to_array.func
+_APPLY_FORMATTERS_TO_DICT = apply_formatters_to_dict.func
+_APPLY_ONE_OF_FORMATTERS = apply_one_of_formatters.func
+
+
+def _to_attrdict(value: Any) -> Any:
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    return AttributeDict.recursive(value)
+
+def _finalize(value: Any) -> Any:
+    # the same as apply_formatter_if(not_attrdict, AttributeDict.recursive)
+    if isinstance(value, AttributeDict):
+        return value
+    return AttributeDict.recursive(value)
+
+def _new_attrdict(result: Dict[str, Any]) -> "AttributeDict[str, Any]":
+    # wraps the formatted dict without copying it again as AttributeDict.__init__ does
+    attrdict: "AttributeDict[str, Any]" = AttributeDict.__new__(AttributeDict)
+    attrdict.__dict__ = result
+    return attrdict
+
+
+def to_plain(value: Any) -> Any:
+    """
+    converts the formatted value to plain python values recursively:
+    mappings to dicts, ``HexBytes`` to bytes, ``Drip`` to int and ``Base32Address`` to str
+    """
+    cls = value.__class__
+    if cls is str or cls is int or cls is bool or cls is bytes or value is None:
+        return value
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, bytes):
+        return bytes(value)
+    if isinstance(value, AbstractTokenUnit):
+        return to_int_if_drip_units(value)
+    if isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, str):
+        return str(value)
+    return value
+
+def _if_not_null(formatter: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def format_if_not_null(value: Any) -> Any:
+        return None if value is None else formatter(value)
+    return format_if_not_null
+
+def _to_list(formatter: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def format_items(values: Any) -> Any:
+        return [formatter(value) for value in values]
+    return format_items
+
+def compact_field_formatter(
+    formatter: Any, compact: Mapping[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]
+) -> Optional[Tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+    """
+    returns the ``(compact, expand)`` functions of a field if its formatter is a leaf formatter in ``compact``,
+    optionally wrapped by ``apply_formatter_if(is_not_null, ...)`` or a list formatter, else None.
+    ``compact`` maps the leaf formatters to the functions formatting the JSON value to a compact value
+    and the functions converting the compact value to the formatted value
+    """
+    for leaf, functions in compact.items():
+        if formatter is leaf:
+            return functions
+    func, args = _curried_call(formatter)
+    if func is _APPLY_FORMATTER_IF and args[0] is is_not_null:
+        inner = compact_field_formatter(args[1], compact)
+        if inner is not None:
+            return _if_not_null(inner[0]), _if_not_null(inner[1])
+        return None
+    item_formatter = _unwrap_list_formatter(formatter)
+    if item_formatter is not None:
+        inner = compact_field_formatter(item_formatter, compact)
+        if inner is not None:
+            return _to_list(inner[0]), _to_list(inner[1])
+    return None
+
+def compact_field_formatters(
+    formatters: Mapping[str, Any], compact: Mapping[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]
+) -> Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+    """
+    returns the ``(compact, expand)`` functions of the fields of a dict formatter stored as compact values,
+    see ``compact_field_formatter``
+    """
+    fields = {}
+    for key, formatter in formatters.items():
+        functions = compact_field_formatter(formatter, compact)
+        if functions is not None:
+            fields[key] = functions
+    return fields
+
+def _curried_call(formatter: Any) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+    """
+    returns the function and bound arguments of a curry object which takes the value as the last argument,
+    or the formatter itself
+    """
+    func = getattr(formatter, "func", None)
+    args = getattr(formatter, "args", None)
+    if func is None or not isinstance(args, tuple) or getattr(formatter, "keywords", None):
+        return formatter, ()
+    if _required_positional_count(func) != len(args) + 1:
+        return formatter, ()
+    return func, args
+
+@lru_cache(maxsize=None)
+def _required_positional_count(func: Callable[..., Any]) -> int:
+    """
+    returns the count of the required arguments if they are the leading positional arguments, else -1
+    """
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return -1
+    positional = [
+        parameter for parameter in parameters
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+    ]
+    required = [
+        parameter for parameter in parameters
+        if parameter.default is parameter.empty and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+    ]
+    if required != positional[:len(required)]:
+        return -1
+    return len(required)
+
+def _unwrap_list_formatter(formatter: Any) -> Any:
+    """
+    returns the item formatter of ``apply_formatter_to_array(formatter)``
+    or web3's ``apply_list_to_array_formatter(formatter)``, else returns None
+    """
+    for candidate in (formatter, getattr(formatter, "__wrapped__", None)):
+        func, args = _curried_call(candidate)
+        if func is _APPLY_FORMATTER_TO_ARRAY:
+            return args[0]
+    return None
+
+
+class _Compiler:
+    def __init__(
+        self,
+        light: bool = False,
+        replacements: Optional[Dict[Any, Callable[[Any], Any]]] = None,
+        records: Sequence[Tuple[Mapping[str, Any], Callable[[Dict[str, Any]], Any]]] = (),
+        compact: Optional[Mapping[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]] = None,
+    ) -> None:
+        self.light = light
+        self.compact = compact or {}
+        self.namespace: Dict[str, Any] = {
+            "_to_attrdict": _to_attrdict,
+            "_finalize": _finalize,
+            "_new_attrdict": _new_attrdict,
+            "_SCALAR_TYPES": _SCALAR_TYPES,
+            "to_plain": to_plain,
+        }
+        # the functions converting values as AttributeDict.recursive does, or to plain values
+        self.convert = "to_plain" if light else "_to_attrdict"
+        self.finalize = "to_plain" if light else "_finalize"
+        # the replacements are kept to keep their ids valid
+        self._replacements = replacements or {}
+        self._replacement_ids = {id(formatter): replacement for formatter, replacement in self._replacements.items()}
+        # formatter dicts are not hashable, so record factories are looked up by the ids of the dicts
+        self._records = records
+        self._record_ids = {id(formatters): factory for formatters, factory in records}
+        self.sources: List[str] = []
+        self._names: Dict[int, str] = {}
+        # id of a dict or one-of formatter -> name of the generated function
+        self._functions: Dict[int, str] = {}
+        self._counter = 0
+
+    def _unique(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def bind(self, obj: Any) -> str:
+        """
+        returns the name of obj in the namespace of the generated code
+        """
+        name = self._names.get(id(obj))
+        if name is None:
+            name = self._unique("_c")
+            self._names[id(obj)] = name
+            self.namespace[name] = obj
+        return name
+
+    def expression(self, formatter: Any, var: str) -> Tuple[str, bool]:
+        """
+        returns the expression formatting var,
+        and whether the value of the expression is already converted as AttributeDict.recursive does
+        (or to plain values if light)
+        """
+        replacement = self._replacement_ids.get(id(formatter))
+        if replacement is not None:
+            return f"{self.bind(replacement)}({var})", True
+        func, args = _curried_call(formatter)
+        if func is _APPLY_FORMATTER_IF:
+            condition, inner = args
+            inner_expression, converted = self.expression(inner, var)
+            if condition is is_not_null:
+                return f"(None if {var} is None else {inner_expression})", converted
+            otherwise = f"{self.convert}({var})" if converted else var
+            return f"({inner_expression} if {self.bind(condition)}({var}) else {otherwise})", converted
+        if func is _APPLY_FORMATTERS_TO_DICT or func is _APPLY_ONE_OF_FORMATTERS:
+            name = self._functions.get(id(formatter))
+            if name is None:
+                self.bind(formatter)
+                if func is _APPLY_FORMATTERS_TO_DICT:
+                    name = self.dict_function(formatter, args[0])
+                else:
+                    name = self.one_of_function(formatter, args[0])
+                self._functions[id(formatter)] = name
+            return f"{name}({var})", True
+        item_formatter = _unwrap_list_formatter(formatter)
+        if item_formatter is not None:
+            item = self._unique("_x")
+            item_expression, converted = self.expression(item_formatter, item)
+            if not converted:
+                item_expression = f"{self.convert}({item_expression})"
+            return f"[{item_expression} for {item} in {var}]", True
+        bound_args = "".join(f"{self.bind(arg)}, " for arg in args)
+        return f"{self.bind(func)}({bound_args}{var})", False
+
+    def dict_function(self, original: Any, formatters: Dict[str, Any]) -> str:
+        name = self._unique("_format_dict")
+        # the original formatter is called for unexpected values to raise the same errors
+        fallback = f"{self.convert}({self.bind(original)}(value))"
+        lines = [
+            f"def {name}(value):",
+            "    if value.__class__ is not dict:",
+            f"        return {fallback}",
+            "    result = dict(value)",
+            "    try:",
+        ]
+        factory = self._record_ids.get(id(formatters))
+        compact_fields = (
+            compact_field_formatters(formatters, self.compact) if factory is not None and not self.light else {}
+        )
+        for key, formatter in formatters.items():
+            if key in compact_fields:
+                expression = f"{self.bind(compact_fields[key][0])}(item)"
+            else:
+                expression, converted = self.expression(formatter, "item")
+                if not converted:
+                    expression = f"{self.convert}({expression})"
+            lines += [
+                f"        if {key!r} in result:",
+                f"            item = result[{key!r}]",
+                f"            result[{key!r}] = {expression}",
+            ]
+        lines += [
+            "    except (ValueError, TypeError):",
+            f"        return {fallback}",
+        ]
+        if self.light:
+            # the values of the fields without formatters are plain JSON values
+            lines.append("    return result")
+        else:
+            lines += [
+                # the values of the fields without formatters are converted as AttributeDict.recursive does
+                "    for key, item in result.items():",
+                f"        if not isinstance(item, _SCALAR_TYPES) and key not in {self.bind(frozenset(formatters))}:",
+                "            result[key] = _to_attrdict(item)",
+                f"    return {'_new_attrdict' if factory is None else self.bind(factory)}(result)",
+            ]
+        self.sources.append("\n".join(lines))
+        return name
+
+    def one_of_function(self, original: Any, formatter_condition_pairs: Any) -> str:
+        name = self._unique("_format_one_of")
+        lines = [f"def {name}(value):"]
+        for condition, formatter in formatter_condition_pairs:
+            expression, converted = self.expression(formatter, "value")
+            if not converted:
+                expression = f"{self.convert}({expression})"
+            lines += [
+                f"    if {self.bind(condition)}(value):",
+                f"        return {expression}",
+            ]
+        # no condition is satisfied, the original formatter raises
+        lines.append(f"    return {self.convert}({self.bind(original)}(value))")
+        self.sources.append("\n".join(lines))
+        return name
+
+    def result_function(self, formatter: Any) -> str:
+        name = self._unique("_format_result")
+        expression, converted = self.expression(formatter, "value")
+        if not converted:
+            expression = f"{self.finalize}({expression})"
+        self.sources.append(f"def {name}(value):\n    return {expression}")
+        return name
+
+    def build(self, names: Dict[Any, str]) -> Dict[Any, Callable[[Any], Any]]:
+        source = "\n\n".join(self.sources)
+        exec(compile(source, "<compiled result formatters>", "exec"), self.namespace)
+        return {key: self.namespace[name] for key, name in names.items()}
+
+
+def compile_result_formatters(
+    formatters: Dict[T, Callable[..., Any]],
+    light: bool = False,
+    replacements: Optional[Dict[Any, Callable[[Any], Any]]] = None,
+    records: Sequence[Tuple[Mapping[str, Any], Callable[[Dict[str, Any]], Any]]] = (),
+    compact: Optional[Mapping[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]] = None,
+) -> Dict[T, Callable[[Any], Any]]:
+    """
+    compile the result formatters together so the formatters shared by them are generated once,
+    see ``compile_result_formatter``
+    """
+    compiler = _Compiler(light, replacements, records, compact)
+    names = {key: compiler.result_function(formatter) for key, formatter in formatters.items()}
+    return compiler.build(names)
+
+def compile_result_formatter(
+    formatter: Callable[..., Any],
+    light: bool = False,
+    replacements: Optional[Dict[Any, Callable[[Any], Any]]] = None,
+    records: Sequence[Tuple[Mapping[str, Any], Callable[[Dict[str, Any]], Any]]] = (),
+    compact: Optional[Mapping[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]]] = None,
+) -> Callable[[Any], Any]:
+    """
+    returns a function equal to ``compose(apply_formatter_if(not_attrdict, AttributeDict.recursive), formatter)``,
+    or ``compose(to_plain, formatter)`` if light.
+    The leaf formatters in ``replacements`` are replaced by the corresponding functions,
+    which is used to skip creating the wrapper objects converted by ``to_plain`` afterwards.
+    The dicts formatted by ``apply_formatters_to_dict(formatters)`` are created by ``factory(result)``
+    rather than as ``AttributeDict`` for each ``(formatters, factory)`` in ``records`` if not light,
+    and their fields formatted by the leaf formatters in ``compact`` are stored as compact values,
+    see ``compact_field_formatters``.
+
+    >>> format_receipt = compile_result_formatter(apply_formatters_to_dict(RECEIPT_FORMATTERS))
+    >>> format_receipt(raw_receipt)["gasUsed"]
+    21000
+    """
+    return compile_result_formatters({None: formatter}, light, replacements, records, compact)[None]
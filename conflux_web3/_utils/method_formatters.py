@@ -1,7 +1,11 @@
+from functools import (
+    lru_cache,
+)
 from typing import (
     Any,
     Callable,
     Dict,
+    Tuple,
     Union,
     Type,
     get_type_hints
@@ -50,6 +54,7 @@ from eth_utils.types import (
 from eth_utils.toolz import (
     complement, # type: ignore
     compose,  # type: ignore
+    identity,
     # curried,
     partial, # type: ignore
 )
@@ -65,6 +70,14 @@ from web3._utils.blocks import is_hex_encoded_block_hash as is_hash32_str
 from cfx_address import (
     Base32Address
 )
+from conflux_web3._utils.addresses import (
+    from_trust_to_base32,
+)
+from conflux_web3._utils.formatter_compiler import (
+    compact_field_formatters,
+    compile_result_formatter,
+    compile_result_formatters,
+)
 from conflux_web3._utils.rpc_abi import (
     RPC_ABIS,
     RPC
@@ -75,6 +88,14 @@ from conflux_web3.middleware.pending import (
 from conflux_web3.types import (
     Drip,
     CollateralInfo,
+    ResultMode,
+)
+from conflux_web3.types.records import (
+    BlockRecord,
+    LogRecord,
+    ReceiptRecord,
+    Record,
+    TransactionRecord,
 )
 
 STANDARD_NORMALIZERS = [
@@ -88,12 +109,26 @@ STANDARD_NORMALIZERS = [
 def to_hash32(val: Union[str, int, bytes], variable_length: bool=False):
     return to_hexbytes(32, val, variable_length)
 
-def from_trust_to_base32(val: str):
-    return Base32Address(val, _from_trust=True)
-
 def from_hex_to_drip(val: Any):
     return Drip(val, 16)
 
+# light versions of the formatters above, returning plain values rather than wrapper objects
+
+def to_hash32_bytes(val: Union[str, int, bytes]) -> bytes:
+    if val.__class__ is str and len(val) == 66 and val.startswith("0x"): # type: ignore
+        return bytes.fromhex(val[2:]) # type: ignore
+    return bytes(to_hash32(val))
+
+def to_bytes_if_hex(val: Union[str, int, bytes]) -> bytes:
+    if val.__class__ is str and val.startswith("0x") and len(val) % 2 == 0: # type: ignore
+        return bytes.fromhex(val[2:]) # type: ignore
+    return bytes(HexBytes(val))
+
+def from_hex_to_int(val: Any) -> int:
+    if val.__class__ is str:
+        return int(val, 16)
+    return from_hex_to_drip(val).value
+
 transaction_param_formatter = compose(
     remove_key_if('to', lambda txn: txn['to'] in {'', b'', None}),  # type: ignore
     remove_key_if('gasPrice', lambda txn: txn['gasPrice'] in {'', b'', None}),  # type: ignore
@@ -123,6 +158,8 @@ PYTHONIC_REQUEST_FORMATTERS: Dict[RPCEndpoint, Callable[..., Any]] = {
     RPC.cfx_getSkippedBlocksByEpoch: apply_formatter_at_index(to_hex_if_integer, 0),
     RPC.cfx_getBlockByHashWithPivotAssumption: apply_formatter_at_index(to_hex_if_integer, 2),
     RPC.cfx_getEpochReceipts: apply_formatter_at_index(to_hex_if_integer, 0),
+    RPC.cfx_getTransactionsByEpoch: apply_formatter_at_index(to_hex_if_integer, 0),
+    RPC.trace_epoch: apply_formatter_at_index(to_hex_if_integer, 0),
     
     RPC.cfx_getCode: apply_formatter_at_index(to_hex_if_integer, 1),
     RPC.cfx_getStorageAt: apply_formatter_at_index(to_hex_if_integer, 2),
@@ -316,6 +353,56 @@ BLOCK_FORMATTERS = {
 block_formatter = apply_formatters_to_dict(BLOCK_FORMATTERS)
 
 
+def to_base32_if_not_hex(val: str) -> Union[Base32Address, str]:
+    # addresses of eSpace trace actions are hex addresses
+    if val.startswith("0x"):
+        return val
+    return from_trust_to_base32(val)
+
+TRACE_ACTION_FORMATTERS = {
+    "from": apply_formatter_if(is_not_null, to_base32_if_not_hex),
+    "to": apply_formatter_if(is_not_null, to_base32_if_not_hex),
+    "addr": apply_formatter_if(is_not_null, to_base32_if_not_hex),
+    "value": to_integer_if_hex,
+    "gas": to_integer_if_hex,
+    "gasLeft": to_integer_if_hex,
+    "input": HexBytes,
+    "init": HexBytes,
+    "returnData": HexBytes,
+}
+trace_action_formatter = apply_formatters_to_dict(TRACE_ACTION_FORMATTERS)
+
+TRACE_FORMATTERS = {
+    "action": trace_action_formatter,
+    "epochHash": apply_formatter_if(is_not_null, to_hash32),
+    "epochNumber": apply_formatter_if(is_not_null, to_integer_if_hex),
+    "blockHash": apply_formatter_if(is_not_null, to_hash32),
+    "transactionHash": apply_formatter_if(is_not_null, to_hash32),
+    "transactionPosition": apply_formatter_if(is_not_null, to_integer_if_hex),
+}
+trace_formatter = apply_formatters_to_dict(TRACE_FORMATTERS)
+
+TRANSACTION_TRACE_FORMATTERS = {
+    "traces": apply_list_to_array_formatter(trace_formatter),
+    "transactionHash": to_hash32,
+    "transactionPosition": to_integer_if_hex,
+}
+
+BLOCK_TRACE_FORMATTERS = {
+    "transactionTraces": apply_list_to_array_formatter(
+        apply_formatters_to_dict(TRANSACTION_TRACE_FORMATTERS)
+    ),
+    "epochHash": to_hash32,
+    "epochNumber": to_integer_if_hex,
+    "blockHash": to_hash32,
+}
+
+EPOCH_TRACE_FORMATTERS = {
+    "cfxTraces": apply_list_to_array_formatter(trace_formatter),
+    # ethTraces are kept in the format of ethereum traces
+}
+
+
 def to_transaction_hash(val: Hash32) -> TransactionHash:
     if isinstance(val, TransactionHash):
         return val
@@ -528,6 +615,19 @@ PYTHONIC_RESULT_FORMATTERS: Dict[RPCEndpoint, Callable[..., Any]] = {
     # RPC.personal_sendTransaction: to_hash32,
     # RPC.personal_signTypedData: HexBytes,
     
+    RPC.cfx_getTransactionsByEpoch: apply_list_to_array_formatter(transaction_data_formatter),
+
+    # trace
+    RPC.trace_block: apply_formatter_if(
+        is_not_null,
+        apply_formatters_to_dict(BLOCK_TRACE_FORMATTERS),
+    ),
+    RPC.trace_transaction: apply_formatter_if(
+        is_not_null,
+        apply_list_to_array_formatter(trace_formatter),
+    ),
+    RPC.trace_epoch: apply_formatters_to_dict(EPOCH_TRACE_FORMATTERS),
+    
     # Transaction Pool
     RPC.txpool_nextNonce: to_integer_if_hex,
 }
@@ -553,10 +653,92 @@ def is_attrdict(val: Any) -> bool:
     return isinstance(val, AttributeDict)
 not_attrdict = complement(is_attrdict)
 
+# formatters generated once for each RPC, the same as
+# compose(apply_formatter_if(not_attrdict, AttributeDict.recursive), PYTHONIC_RESULT_FORMATTERS[method])
+COMPILED_RESULT_FORMATTERS: Dict[RPCEndpoint, Tuple[Callable[..., Any], Callable[..., Any]]] = {
+    method: (PYTHONIC_RESULT_FORMATTERS[method], compiled)
+    for method, compiled in compile_result_formatters(PYTHONIC_RESULT_FORMATTERS).items()
+}
+
+# leaf formatters replaced in the "light" result mode
+LIGHT_LEAF_FORMATTERS: Dict[Any, Callable[[Any], Any]] = {
+    HexBytes: to_bytes_if_hex,
+    to_hash32: to_hash32_bytes,
+    from_hex_to_drip: from_hex_to_int,
+    from_trust_to_base32: identity,
+    to_base32_if_not_hex: identity,
+}
+
+# leaf formatters of the record fields stored as compact values in the "records" result mode,
+# mapped to the functions formatting the JSON values compactly and the functions converting them when read.
+# Addresses are not included because the Base32Address objects are shared by the address cache
+COMPACT_LEAF_FORMATTERS: Dict[Any, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    HexBytes: (to_bytes_if_hex, HexBytes),
+    to_hash32: (to_hash32_bytes, HexBytes),
+    from_hex_to_drip: (from_hex_to_int, Drip),
+}
+
+RECORD_TYPES: Tuple[Tuple[Dict[str, Any], Type[Record]], ...] = (
+    (BLOCK_FORMATTERS, BlockRecord),
+    (TRANSACTION_DATA_FORMATTERS, TransactionRecord),
+    (RECEIPT_FORMATTERS, ReceiptRecord),
+    (LOG_ENTRY_FORMATTERS, LogRecord),
+)
+for _formatters, _record_type in RECORD_TYPES:
+    _record_type._expanders = {
+        key: expand for key, (_, expand) in compact_field_formatters(_formatters, COMPACT_LEAF_FORMATTERS).items()
+    }
+
+# dicts created as records in the "records" result mode
+RECORD_FACTORIES: Tuple[Tuple[Dict[str, Any], Callable[[Dict[str, Any]], Any]], ...] = tuple(
+    (formatters, record_type.from_dict) for formatters, record_type in RECORD_TYPES
+)
+
+RESULT_MODE_COMPILE_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "light": {"light": True, "replacements": LIGHT_LEAF_FORMATTERS},
+    "records": {"records": RECORD_FACTORIES, "compact": COMPACT_LEAF_FORMATTERS},
+}
+
+@lru_cache(maxsize=None)
+def _compiled_mode_result_formatters(
+    result_mode: ResultMode
+) -> Dict[RPCEndpoint, Tuple[Callable[..., Any], Callable[..., Any]]]:
+    # compiled on first use because the result modes other than "default" are optional
+    return {
+        method: (PYTHONIC_RESULT_FORMATTERS[method], compiled)
+        for method, compiled in compile_result_formatters(
+            PYTHONIC_RESULT_FORMATTERS, **RESULT_MODE_COMPILE_OPTIONS[result_mode]
+        ).items()
+    }
+
+def result_mode_formatter(method_name: RPCEndpoint, result_mode: ResultMode) -> Callable[..., Any]:
+    """
+    returns the result formatter of the "light" or "records" result mode for a method in PYTHONIC_RESULT_FORMATTERS.
+    "light" formats the result as the default mode but returns plain dicts, lists, ints, bytes and strs,
+    "records" returns blocks, transactions, receipts and logs as ``__slots__`` records
+    """
+    formatter = PYTHONIC_RESULT_FORMATTERS[method_name]
+    compiled = _compiled_mode_result_formatters(result_mode).get(method_name)
+    if compiled is not None and compiled[0] is formatter:
+        return compiled[1]
+    return compile_result_formatter(formatter, **RESULT_MODE_COMPILE_OPTIONS[result_mode])
+
 def cfx_result_formatters(
     method_name: Union[RPCEndpoint, Callable[..., RPCEndpoint]],
     module: "Module",
 ) -> Dict[str, Callable[..., Any]]:
+    result_mode: ResultMode = getattr(module, "result_mode", "default")
+    if result_mode == "raw":
+        return identity # type: ignore
+    if result_mode != "default" and method_name in PYTHONIC_RESULT_FORMATTERS:
+        return result_mode_formatter(method_name, result_mode) # type: ignore
+    if result_mode == "light":
+        # JSON-RPC results are plain values
+        return identity # type: ignore
+    compiled = COMPILED_RESULT_FORMATTERS.get(method_name) # type: ignore
+    # the compiled formatter is skipped if PYTHONIC_RESULT_FORMATTERS is modified
+    if compiled is not None and compiled[0] is PYTHONIC_RESULT_FORMATTERS.get(method_name): # type: ignore
+        return compiled[1] # type: ignore
     formatters = combine_formatters((PYTHONIC_RESULT_FORMATTERS,), method_name)
     # formatters_requiring_module = combine_formatters(
     #     (FILTER_RESULT_FORMATTERS,), method_name
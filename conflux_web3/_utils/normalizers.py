@@ -15,6 +15,9 @@ from eth_utils.toolz import (
 from cfx_address import (
     Base32Address
 )
+from conflux_web3._utils.addresses import (
+    to_base32_address,
+)
 from conflux_web3._utils.cns import (
     is_cns_name,
     resolve_if_cns_name,
@@ -50,5 +53,5 @@ def addresses_to_verbose_base32(
     network_id: int, type_str: TypeStr, data: Any
 ) -> Tuple[TypeStr, Base32Address]:
     if type_str == "address":
-        return type_str, Base32Address(data, network_id, verbose=True, _ignore_invalid_type=True)
+        return type_str, to_base32_address(data, network_id, verbose=True, ignore_invalid_type=True)
     return type_str, data
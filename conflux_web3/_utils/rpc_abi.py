@@ -113,6 +113,11 @@ RPC_ABIS = {
     RPC.cfx_getSkippedBlocksByEpoch: [EPOCH_NUMBER_PARAM],
     RPC.cfx_getBlockByHashWithPivotAssumption: ["bytes32", "bytes32", "uint"],
     RPC.cfx_getEpochReceipts: [EPOCH_NUMBER_PARAM, "bool"],
+    RPC.cfx_getTransactionsByEpoch: [EPOCH_NUMBER_PARAM],
+    
+    RPC.trace_block: ["bytes32"],
+    RPC.trace_transaction: ["bytes32"],
+    RPC.trace_epoch: [EPOCH_NUMBER_PARAM],
 
     RPC.cfx_getBalance: ["address", EPOCH_NUMBER_PARAM],
     RPC.cfx_getStakingBalance: ["address", EPOCH_NUMBER_PARAM],
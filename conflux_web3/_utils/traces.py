@@ -0,0 +1,325 @@
+import codecs
+import json
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    cast,
+)
+
+import requests
+from web3.datastructures import (
+    AttributeDict,
+)
+from web3.providers.rpc import (
+    HTTPProvider,
+)
+from web3._utils.method_formatters import (
+    to_hex_if_integer,
+)
+
+from cfx_utils.types import (
+    EpochNumberParam,
+)
+from conflux_web3._utils.rpc_abi import (
+    RPC,
+)
+from conflux_web3.providers import (
+    ConfluxHTTPProvider,
+)
+from conflux_web3.types import (
+    CallFrame,
+    TraceData,
+)
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",}] \t\n\r"
+_DECODER = json.JSONDecoder()
+
+FRAME_START_TYPES = ("call", "create")
+FRAME_RESULT_TYPES = ("call_result", "create_result")
+# fields shared by the traces of a transaction, copied to each frame
+FRAME_CONTEXT_FIELDS = (
+    "transactionHash", "transactionPosition", "epochNumber", "epochHash", "blockHash", "valid",
+)
+
+
+class _JSONStreamScanner:
+    """
+    scans a JSON document from text chunks, only the consumed part of the document is dropped from the buffer
+    """
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer = self._buffer[self._pos:] + chunk
+                self._pos = 0
+                return True
+        self._eof = True
+        return False
+
+    def peek(self) -> Optional[str]:
+        """
+        returns the next non-whitespace character without consuming it, None at the end of the document
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at {self._pos} of the JSON stream")
+        self._pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        decodes the next JSON value, more chunks are read until the value is complete
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # a number at the end of the buffer might be continued in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """
+        skips the next JSON value without decoding it
+        """
+        depth = 0
+        while True:
+            char = self.peek() if depth == 0 else self._next_char()
+            if char is None:
+                raise ValueError("Unexpected end of the JSON stream")
+            if char == '"':
+                self._skip_string()
+            elif char in "{[":
+                depth += 1
+                self._pos += 1
+            elif char in "}]":
+                depth -= 1
+                self._pos += 1
+            elif depth > 0:
+                self._pos += 1
+            else:
+                self._skip_scalar()
+            if depth == 0:
+                return
+
+    def _next_char(self) -> Optional[str]:
+        if self._pos < len(self._buffer) or self._fill():
+            return self._buffer[self._pos]
+        return None
+
+    def _skip_string(self) -> None:
+        # the opening quote is at self._pos
+        while True:
+            end = self._buffer.find('"', self._pos + 1)
+            while end != -1:
+                backslashes = 0
+                while self._buffer[end - 1 - backslashes] == "\\":
+                    backslashes += 1
+                if backslashes % 2 == 0:
+                    self._pos = end + 1
+                    return
+                end = self._buffer.find('"', end + 1)
+            if not self._fill():
+                raise ValueError("Unterminated string in the JSON stream")
+
+    def _skip_scalar(self) -> None:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] not in _DELIMITERS:
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def iter_array_items(self, path: Sequence[str]) -> Iterator[Any]:
+        """
+        decodes the items of the array at the path of object keys one by one, other values are skipped.
+        Nothing is yielded if the path does not exist
+        """
+        if not path:
+            self.expect("[")
+            while True:
+                char = self.peek()
+                if char == "]":
+                    self._pos += 1
+                    return
+                if char == ",":
+                    self._pos += 1
+                    continue
+                if char is None:
+                    raise ValueError("Unexpected end of the JSON stream")
+                yield self.decode_value()
+        if self.peek() != "{":
+            self.skip_value()
+            return
+        self._pos += 1
+        while True:
+            char = self.peek()
+            if char == "}":
+                self._pos += 1
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            if char is None:
+                raise ValueError("Unexpected end of the JSON stream")
+            key = self.decode_value()
+            self.expect(":")
+            if key == path[0]:
+                yield from self.iter_array_items(path[1:])
+            else:
+                self.skip_value()
+
+
+def iter_rpc_result_items(chunks: Iterable[str], path: Sequence[str]) -> Iterator[Any]:
+    """
+    decodes the items of an array in the result of a JSON-RPC response as the response text arrives,
+    without decoding the whole response.
+
+    >>> list(iter_rpc_result_items(['{"jsonrpc":"2.0","result":{"a":[1,', '{"b":2}]},"id":1}'], ["a"]))
+    [1, {'b': 2}]
+
+    Parameters
+    ----------
+    chunks : Iterable[str]
+        the text chunks of a JSON-RPC response
+    path : Sequence[str]
+        keys of the array in the result, an empty path if the result is the array
+
+    Raises
+    ------
+    ValueError
+        if the response is a JSON-RPC error
+    """
+    scanner = _JSONStreamScanner(chunks)
+    scanner.expect("{")
+    while True:
+        char = scanner.peek()
+        if char == "}" or char is None:
+            return
+        if char == ",":
+            scanner.expect(",")
+            continue
+        key = scanner.decode_value()
+        scanner.expect(":")
+        if key == "result":
+            if scanner.peek() == "n":
+                scanner.skip_value()
+            else:
+                yield from scanner.iter_array_items(path)
+        elif key == "error":
+            raise ValueError(scanner.decode_value())
+        else:
+            scanner.skip_value()
+
+
+def stream_epoch_traces(provider: HTTPProvider, epoch_number: EpochNumberParam, chunk_size: int = 65536) -> Iterator[TraceData]:
+    """
+    sends a ``trace_epoch`` request and decodes the core space traces one by one as the response arrives.
+    The request does not go through middlewares and the traces are not formatted
+
+    Parameters
+    ----------
+    provider : HTTPProvider
+        the provider to send the request
+    epoch_number : EpochNumberParam
+        the epoch to trace
+    chunk_size : int, optional
+        bytes read from the response at a time, by default 65536
+    """
+    request_data = json.dumps({
+        "jsonrpc": "2.0",
+        "method": RPC.trace_epoch,
+        "params": [to_hex_if_integer(epoch_number)],
+        "id": next(provider.request_counter),
+    })
+    if isinstance(provider, ConfluxHTTPProvider):
+        response = provider.post(request_data.encode(), stream=True)
+    else:
+        request_kwargs = dict(provider.get_request_kwargs())
+        request_kwargs.setdefault("timeout", 10)
+        response = requests.post(provider.endpoint_uri, data=request_data, stream=True, **request_kwargs)
+    with response:
+        response.raise_for_status()
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        chunks = (decoder.decode(chunk) for chunk in response.iter_content(chunk_size))
+        yield from iter_rpc_result_items(chunks, ["cfxTraces"])
+
+
+def iter_call_frames(traces: Iterable[TraceData]) -> Iterator[CallFrame]:
+    """
+    flattens the formatted traces of ``trace_epoch`` or ``trace_transaction`` into call frames.
+    A call or create action is merged with its result action,
+    frames of a transaction are yielded in the order they start once the traces of the transaction end,
+    so at most the frames of one transaction are buffered.
+
+    Parameters
+    ----------
+    traces : Iterable[TraceData]
+        formatted traces in the order returned by the node
+
+    Returns
+    -------
+    Iterator[CallFrame]
+        call, create and internal transfer frames
+    """
+    frames: List[Dict[str, Any]] = []
+    # frames waiting for their result actions
+    stack: List[Dict[str, Any]] = []
+    current_transaction = None
+    for trace in traces:
+        transaction_hash = trace.get("transactionHash")
+        if transaction_hash != current_transaction:
+            yield from _to_call_frames(frames)
+            frames = []
+            stack = []
+            current_transaction = transaction_hash
+        trace_type = trace["type"]
+        action = trace["action"]
+        if trace_type in FRAME_RESULT_TYPES:
+            if not stack:
+                raise ValueError(f"Unexpected {trace_type} trace without a call or create trace")
+            frame = stack.pop()
+            frame["outcome"] = action.get("outcome")
+            frame["gasLeft"] = action.get("gasLeft")
+            frame["returnData"] = action.get("returnData")
+            if "addr" in action:
+                frame["to"] = action["addr"]
+            continue
+        frame = {field: trace[field] for field in FRAME_CONTEXT_FIELDS if field in trace}  # type: ignore
+        frame["type"] = trace_type
+        frame["depth"] = len(stack)
+        frame.update(action)
+        frames.append(frame)
+        if trace_type in FRAME_START_TYPES:
+            stack.append(frame)
+    yield from _to_call_frames(frames)
+
+
+def _to_call_frames(frames: List[Dict[str, Any]]) -> Iterator[CallFrame]:
+    for frame in frames:
+        yield cast(CallFrame, AttributeDict(frame))
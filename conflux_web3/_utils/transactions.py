@@ -1,9 +1,19 @@
 
-from inspect import Parameter
+import asyncio
+import threading
+import time
+from inspect import (
+    Parameter,
+    iscoroutinefunction,
+)
 from typing import (
     TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
     List,
     Optional,
+    Tuple,
     cast,
 )
 from eth_utils.toolz import (
@@ -20,33 +30,158 @@ from conflux_web3.exceptions import (
 )
 from conflux_web3.types import (
     TxParam,
+    EstimateResult,
 )
 from conflux_web3._utils.cns import (
     resolve_if_cns_name,
 )
 
 if TYPE_CHECKING:
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
+
+
+class TransactionDefaultsSnapshot:
+    """
+    gas price and epoch height shared by the transactions filled within the staleness window,
+    so a burst of transactions does not query the same values again and again
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # key -> (value, time when the value is queried)
+        self._values: Dict[str, Tuple[int, float]] = {}
+
+    def get(self, key: str, staleness: float) -> Optional[int]:
+        with self._lock:
+            entry = self._values.get(key)
+        if entry is None or time.monotonic() - entry[1] > staleness:
+            return None
+        return entry[0]
+
+    def set(self, key: str, value: int) -> None:
+        with self._lock:
+            self._values[key] = (value, time.monotonic())
+
+
+def _get_shared_default(client: Any, key: str, query: Callable[[], int]) -> int:
+    staleness = client.transaction_defaults_staleness
+    value = client._transaction_defaults_snapshot.get(key, staleness) if staleness > 0 else None
+    if value is None:
+        value = query()
+        client._transaction_defaults_snapshot.set(key, value)
+    return value
+
+async def _async_get_shared_default(client: Any, key: str, query: Callable[[], Any]) -> int:
+    staleness = client.transaction_defaults_staleness
+    value = client._transaction_defaults_snapshot.get(key, staleness) if staleness > 0 else None
+    if value is None:
+        value = await query()
+        client._transaction_defaults_snapshot.set(key, value)
+    return value
+
+
+def _get_next_nonce(w3: "Web3", tx: TxParam) -> int:
+    # the nonce is reserved locally without RPC request if a nonce manager is set
+    nonce_manager = getattr(w3.cfx, "nonce_manager", None)
+    if nonce_manager is not None:
+        return nonce_manager.next_nonce(tx['from'])
+    return w3.cfx.get_next_nonce(tx['from'])
 
 
 TRANSACTION_DEFAULTS = {
     "value": 0,
     "data": b"",
-    "nonce": lambda w3, tx, estimate=None: w3.cfx.get_next_nonce(tx['from']),
+    "nonce": lambda w3, tx, estimate=None: _get_next_nonce(w3, tx),
     "gas": lambda w3, tx, estimate=None: estimate["gasLimit"],
     "storageLimit": lambda w3, tx, estimate=None: estimate["storageCollateralized"],
     # convert to int value
-    "gasPrice": lambda w3, tx, estimate=None: w3.cfx.gas_price.to(Drip).value,
+    "gasPrice": lambda w3, tx, estimate=None: _get_shared_default(
+        w3.cfx, "gasPrice", lambda: w3.cfx.gas_price.to(Drip).value
+    ),
     "chainId": lambda w3, tx, estimate=None: w3.cfx.chain_id,
-    "epochHeight": lambda w3, tx, estimate=None: w3.cfx.epoch_number,
+    "epochHeight": lambda w3, tx, estimate=None: _get_shared_default(
+        w3.cfx, "epochHeight", lambda: w3.cfx.epoch_number
+    ),
+}
+
+
+async def _async_get_next_nonce(async_w3: "AsyncWeb3", tx: TxParam, estimate: Optional[EstimateResult]=None) -> int:
+    return await async_w3.cfx.get_next_nonce(tx['from'])
+
+async def _async_get_gas_price(async_w3: "AsyncWeb3", tx: TxParam, estimate: Optional[EstimateResult]=None) -> int:
+    async def query() -> int:
+        return (await async_w3.cfx.gas_price).to(Drip).value
+    return await _async_get_shared_default(async_w3.cfx, "gasPrice", query)
+
+async def _async_get_chain_id(async_w3: "AsyncWeb3", tx: TxParam, estimate: Optional[EstimateResult]=None) -> int:
+    return await async_w3.cfx.chain_id
+
+async def _async_get_epoch_height(async_w3: "AsyncWeb3", tx: TxParam, estimate: Optional[EstimateResult]=None) -> int:
+    async def query() -> int:
+        return await async_w3.cfx.epoch_number
+    return await _async_get_shared_default(async_w3.cfx, "epochHeight", query)
+
+# values of ASYNC_TRANSACTION_DEFAULTS are either constants, coroutine functions
+# or plain callables which only read the estimate result
+ASYNC_TRANSACTION_DEFAULTS = {
+    "value": 0,
+    "data": b"",
+    "nonce": _async_get_next_nonce,
+    "gas": TRANSACTION_DEFAULTS["gas"],
+    "storageLimit": TRANSACTION_DEFAULTS["storageLimit"],
+    "gasPrice": _async_get_gas_price,
+    "chainId": _async_get_chain_id,
+    "epochHeight": _async_get_epoch_height,
 }
 
 
+def _prefetch_transaction_defaults(w3: "Web3", transaction: TxParam) -> Tuple[Dict[str, Any], Optional[EstimateResult]]:
+    """
+    query the missing fields which require RPC requests in a single batch request.
+    Values available locally, i.e. cached chain id, fresh gas price or epoch height and
+    nonce from the nonce manager, are not queried
+    """
+    cfx = w3.cfx
+    staleness = cfx.transaction_defaults_staleness
+    snapshot = cfx._transaction_defaults_snapshot
+    # requests in a batch don't go through the name service middleware
+    to_estimate = dict(transaction)
+    if to_estimate.get("to"):
+        to_estimate["to"] = resolve_if_cns_name(w3, to_estimate["to"]) # type: ignore
+
+    with cfx.batch() as batch:
+        items: Dict[str, Any] = {}
+        if "nonce" not in transaction and cfx.nonce_manager is None:
+            items["nonce"] = batch.get_next_nonce(transaction["from"])
+        if "gas" not in transaction or "storageLimit" not in transaction:
+            items["estimate"] = batch.estimate_gas_and_collateral(to_estimate)
+        if "gasPrice" not in transaction and (staleness <= 0 or snapshot.get("gasPrice", staleness) is None):
+            items["gasPrice"] = batch.gas_price
+        if "chainId" not in transaction and "chain_id" not in cfx.__dict__:
+            items["chainId"] = batch.get_status()
+        if "epochHeight" not in transaction and (staleness <= 0 or snapshot.get("epochHeight", staleness) is None):
+            items["epochHeight"] = batch.epoch_number
+
+    # raises the exception of the first failed request
+    prefetched = {key: item.result() for key, item in items.items()}
+    estimate = prefetched.pop("estimate", None)
+    if "gasPrice" in prefetched:
+        prefetched["gasPrice"] = prefetched["gasPrice"].to(Drip).value
+        snapshot.set("gasPrice", prefetched["gasPrice"])
+    if "epochHeight" in prefetched:
+        snapshot.set("epochHeight", prefetched["epochHeight"])
+    if "chainId" in prefetched:
+        prefetched["chainId"] = prefetched["chainId"]["chainId"]
+        # cache chain id as ``cfx.chain_id`` does
+        cfx.__dict__["chain_id"] = prefetched["chainId"]
+    return prefetched, estimate
+
+
 @curry
 def fill_transaction_defaults(w3: "Web3", transaction: TxParam) -> TxParam:
     """
     Fill the necessary fields to "send" a transaction
-    Before this function is invoked, ensure 'from' field is filled
+    Before this function is invoked, ensure 'from' field is filled.
+    Missing fields are queried in a single batch request if ``w3.cfx.batch_fill_transaction_defaults`` is True
     """
     if not w3:
         raise NoWeb3Exception("A web3 object is required to fill transaction defaults, but no web3 object is passed")
@@ -55,15 +190,64 @@ def fill_transaction_defaults(w3: "Web3", transaction: TxParam) -> TxParam:
     if "from" in transaction:
         transaction['from'] = resolve_if_cns_name(w3, transaction['from'])
     
-    for key, default_getter in TRANSACTION_DEFAULTS.items():
+    fills_nonce = "nonce" not in transaction
+    try:
+        prefetched: Dict[str, Any] = {}
         estimate = None
+        if w3.cfx.batch_fill_transaction_defaults:
+            prefetched, estimate = _prefetch_transaction_defaults(w3, transaction)
+        for key, default_getter in TRANSACTION_DEFAULTS.items():
+            if key not in transaction:
+                if key in prefetched:
+                    default_val = prefetched[key]
+                elif callable(default_getter):
+                    if estimate is None:
+                        if key == "gas" or key == "storageLimit":
+                            estimate = w3.cfx.estimate_gas_and_collateral(transaction)
+                    default_val = default_getter(w3, transaction, estimate)
+                else:
+                    default_val = default_getter
+
+                transaction.setdefault(key, default_val) # type: ignore
+    except Exception:
+        # give back the nonce reserved by the nonce manager
+        nonce_manager = getattr(w3.cfx, "nonce_manager", None)
+        if fills_nonce and nonce_manager is not None and "nonce" in transaction:
+            nonce_manager.release(transaction["from"], transaction["nonce"])
+        raise
+    return transaction
+
+
+async def async_fill_transaction_defaults(async_w3: "AsyncWeb3", transaction: TxParam) -> TxParam:
+    """
+    Async version of `fill_transaction_defaults`, 
+    fill the necessary fields to "send" a transaction using an AsyncWeb3 instance,
+    the missing fields are queried concurrently.
+    Before this function is invoked, ensure 'from' field is filled
+    """
+    if not async_w3:
+        raise NoWeb3Exception("A web3 object is required to fill transaction defaults, but no web3 object is passed")
+    if (not transaction.get("from")) and (transaction.get("nonce", None) is None):
+        raise ValueError("Transaction's 'from' field is required to fill nonce field")
+    if "from" in transaction:
+        transaction['from'] = resolve_if_cns_name(async_w3, transaction['from']) # type: ignore
+    
+    # independent lookups are sent concurrently
+    lookups: Dict[str, Any] = {}
+    if "gas" not in transaction or "storageLimit" not in transaction:
+        lookups["estimate"] = async_w3.cfx.estimate_gas_and_collateral(transaction)
+    for key, default_getter in ASYNC_TRANSACTION_DEFAULTS.items():
+        if key not in transaction and iscoroutinefunction(default_getter):
+            lookups[key] = default_getter(async_w3, transaction)
+    results = dict(zip(lookups.keys(), await asyncio.gather(*lookups.values())))
+    estimate = results.pop("estimate", None)
+
+    for key, default_getter in ASYNC_TRANSACTION_DEFAULTS.items():
         if key not in transaction:
-            if callable(default_getter):
-                if not estimate:
-                    if key == "gas" or key == "storageLimit":
-                        estimate = w3.cfx.estimate_gas_and_collateral(transaction)
-                default_val = default_getter(w3, transaction, estimate)
-                
+            if key in results:
+                default_val = results[key]
+            elif callable(default_getter):
+                default_val = default_getter(async_w3, transaction, estimate)
             else:
                 default_val = default_getter
 
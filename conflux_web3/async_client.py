@@ -0,0 +1,555 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+    overload,
+)
+from typing_extensions import (
+    Literal,
+    Unpack,
+)
+import warnings
+from hexbytes import HexBytes
+
+from cytoolz import ( keyfilter, merge ) # type:ignore
+from eth_typing.encoding import (
+    HexStr
+)
+from eth_utils.toolz import (
+    assoc  # type: ignore
+)
+
+from web3.eth import (
+    AsyncEth,
+)
+from web3.exceptions import (
+    TransactionNotFound,
+    TimeExhausted
+)
+from web3._utils.blocks import is_hex_encoded_block_hash as is_hash32_str
+from web3._utils.method_formatters import (
+    to_integer_if_hex,
+)
+
+from cfx_utils.token_unit import (
+    to_int_if_drip_units,
+    AbstractDerivedTokenUnit
+)
+from cfx_utils.types import (
+    _Hash32,
+    Hash32,
+    Drip,
+    EpochLiteral,
+    EpochNumberParam,
+    TxParam,
+    EpochNumber,
+    Storage,
+)
+from cfx_address import (
+    Base32Address,
+)
+from cfx_account import (
+    Account,
+)
+
+from conflux_web3._utils.rpc_abi import (
+    RPC
+)
+from conflux_web3._utils.disabled_eth_apis import (
+    disabled_method_list,
+)
+from conflux_web3.types import (
+    EstimateResult,
+    TxReceipt,
+    TxData,
+    NodeStatus,
+    FilterParams,
+    LogReceipt,
+    BlockData,
+    SponsorInfo,
+    AccountInfo,
+    DepositInfo,
+    TxReceiptWithSpace,
+    VoteInfo,
+    StorageRoot,
+    BlockRewardInfo,
+    PendingInfo,
+    PoSEconomicsInfo,
+    PoSEpochRewardInfo,
+    DAOVoteInfo,
+    SupplyInfo,
+    PendingTransactionsInfo,
+    TransactionPaymentInfo,
+    CollateralInfo,
+    TraceData,
+    BlockTraceData,
+    EpochTraceData,
+    BlockFilterId,
+    TxFilterId,
+    LogFilterId,
+    _FilterId,
+)
+from conflux_web3.client import (
+    BaseCfx,
+)
+from conflux_web3.contract.async_contract import (
+    AsyncConfluxContract,
+)
+from conflux_web3.contract.metadata import (
+    get_contract_metadata
+)
+from conflux_web3._utils.transactions import (
+    async_fill_transaction_defaults,
+    TransactionDefaultsSnapshot,
+)
+from conflux_web3.method import (
+    ConfluxMethod
+)
+from conflux_web3.middleware.pending import (
+    TransactionHash
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import AsyncWeb3
+
+
+class AsyncConfluxClient(BaseCfx, AsyncEth):
+    """Async RPC entry of ``AsyncWeb3``.
+    APIs are the same as ``ConfluxClient`` but should be awaited
+
+    >>> w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("https://test.confluxrpc.com"))
+    >>> await w3.cfx.epoch_number
+    """
+    is_async = True
+    w3: "AsyncWeb3" # type: ignore
+    account: Account
+    _default_contract_factory: Type[AsyncConfluxContract] = AsyncConfluxContract # type: ignore
+    # chain id is cached after the first time `await w3.cfx.chain_id` is executed
+    _cached_chain_id: Optional[int] = None
+
+    def __init__(self, w3: "AsyncWeb3") -> None:
+        super().__init__(w3) # type: ignore
+        self._transaction_defaults_snapshot = TransactionDefaultsSnapshot()
+        # account is not bound to AsyncWeb3 because signing in cfx_account is synchronous
+        self.account = Account()
+        self._disable_eth_methods(disabled_method_list)
+
+    def send_transaction_munger(self, transaction: TxParam) -> Tuple[TxParam]:
+        # transaction defaults are filled in `send_transaction` because filling requires awaiting
+        return (transaction,)
+
+    _send_transaction: ConfluxMethod[Callable[[TxParam], HexBytes]] = ConfluxMethod(
+        RPC.cfx_sendTransaction,
+        mungers=[send_transaction_munger]
+    )
+
+    def contract( # type: ignore
+        self,
+        address: Optional[Union[Base32Address, str]] = None,
+        *,
+        name: Optional[str] = None,
+        with_deployment_info: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> Union[Type[AsyncConfluxContract], AsyncConfluxContract]:
+        """
+        Produce a contract factory (address is not specified) or a contract(address is not specified).
+        The usage is the same as ``ConfluxClient.contract``,
+        but ``await w3.cfx.chain_id`` is required before using deployment info specified by ``name``
+        """
+        if name is not None:
+            metadata = get_contract_metadata(name, self._cached_chain_id, with_deployment_info) # type: ignore
+            kwargs = merge(metadata, kwargs)
+        if address is not None:
+            kwargs["address"] = address
+        return self._contract_from_kwargs(kwargs)
+
+    async def get_status(self) -> NodeStatus:
+        """
+        get the blockchain status from the provider
+
+        >>> await w3.cfx.get_status()
+        """
+        return await self._get_status() # type: ignore
+
+    @property
+    async def gas_price(self) -> Drip: # type: ignore
+        return await self._gas_price() # type: ignore
+
+    @property
+    async def accounts(self) -> Tuple[Base32Address]: # type: ignore
+        return await self._accounts() # type: ignore
+
+    @property
+    async def epoch_number(self) -> EpochNumber:
+        return await self._epoch_number(None) # type: ignore
+
+    async def epoch_number_by_tag(self, epoch_tag: EpochLiteral) -> EpochNumber:
+        return await self._epoch_number(epoch_tag) # type: ignore
+
+    @property
+    async def chain_id(self) -> int: # type: ignore
+        """
+        Get the chain id of the current network.
+        The result is cached after the first query
+        """
+        if self._cached_chain_id is None:
+            # the result is the hex string if result_mode is "raw"
+            self._cached_chain_id = to_integer_if_hex((await self._get_status())["chainId"]) # type: ignore
+        return cast(int, self._cached_chain_id)
+
+    @property
+    async def client_version(self) -> str:
+        return await self._clientVersion() # type: ignore
+
+    async def get_balance(self, # type: ignore
+                    address: Union[Base32Address, str],
+                    block_identifier: Optional[EpochNumberParam] = None) -> Drip:
+        return await self._get_balance(address, block_identifier) # type: ignore
+
+    async def get_staking_balance(self,
+                    address: Union[Base32Address, str],
+                    block_identifier: Optional[EpochNumberParam] = None) -> Drip:
+        return await self._get_staking_balance(address, block_identifier) # type: ignore
+
+    async def call(self, # type: ignore
+             transaction: TxParam,
+             block_identifier: Optional[EpochNumberParam]=None,
+             **kwargs: Dict[str, Any]) -> Any:
+        return await self._call(transaction, block_identifier) # type: ignore
+
+    async def get_next_nonce(self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None) -> int:
+        return await self._get_next_nonce(address, block_identifier) # type: ignore
+
+    async def get_transaction_count(self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None) -> int: # type: ignore
+        return await self.get_next_nonce(address, block_identifier)
+
+    async def estimate_gas_and_collateral(self, transaction: TxParam, block_identifier: Optional[EpochNumberParam]=None) -> EstimateResult:
+        return await self._estimate_gas_and_collateral(transaction, block_identifier) # type: ignore
+
+    async def estimate_gas(self, transaction: TxParam, block_identifier: Optional[EpochNumberParam] = None) -> EstimateResult: # type: ignore
+        return await self.estimate_gas_and_collateral(transaction, block_identifier)
+
+    async def send_raw_transaction(self, raw_transaction: Union[HexStr, bytes]) -> TransactionHash: # type: ignore
+        return cast(TransactionHash, await self._send_raw_transaction(raw_transaction)) # type: ignore
+
+    async def send_transaction(self, transaction: TxParam) -> TransactionHash: # type: ignore
+        """
+        Fill the transaction defaults and send the transaction.
+        The transaction will be signed by the wallet middleware if the wallet has the account of ``from`` field
+        """
+        if 'from' not in transaction and self.default_account:
+            transaction = assoc(transaction, 'from', self.default_account)
+        if 'value' in transaction:
+            transaction['value'] = to_int_if_drip_units(transaction['value'])
+        if 'gasPrice' in transaction:
+            transaction['gasPrice'] = to_int_if_drip_units(transaction['gasPrice'])
+        transaction = await async_fill_transaction_defaults(self.w3, transaction)
+        return cast(TransactionHash, await self._send_transaction(transaction)) # type: ignore
+
+    async def get_transaction_receipt(self, transaction_hash: _Hash32) -> TxReceipt: # type: ignore
+        return await self._get_transaction_receipt(transaction_hash) # type: ignore
+
+    async def wait_till_transaction_mined(
+        self, transaction_hash: _Hash32, timeout: float = 60, poll_latency: float = 0.5
+    ) -> TxData:
+        async def _wait_till_mined() -> TxData:
+            while True:
+                try:
+                    tx_data = await self.get_transaction_by_hash(transaction_hash)
+                except TransactionNotFound:
+                    tx_data = None
+                if tx_data is not None and tx_data["blockHash"]:
+                    return tx_data
+                await asyncio.sleep(poll_latency)
+
+        try:
+            return await asyncio.wait_for(_wait_till_mined(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(
+                f"Transaction {HexBytes(transaction_hash) !r} is not in the chain "
+                f"after {timeout} seconds"
+            )
+
+    async def wait_for_transaction_receipt( # type: ignore
+        self, transaction_hash: _Hash32, timeout: float = 300, poll_latency: float = 0.5
+    ) -> TxReceipt:
+        async def _wait_for_receipt() -> TxReceipt:
+            while True:
+                try:
+                    tx_receipt = await self.get_transaction_receipt(transaction_hash)
+                except TransactionNotFound:
+                    tx_receipt = None
+                if tx_receipt is not None:
+                    return tx_receipt
+                await asyncio.sleep(poll_latency)
+
+        try:
+            receipt = await asyncio.wait_for(_wait_for_receipt(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise TimeExhausted(
+                f"Transaction {HexBytes(transaction_hash) !r} is not executed"
+                f"after {timeout} seconds"
+            )
+        if receipt["outcomeStatus"] != 0:
+            raise RuntimeError(f'transaction "${transaction_hash}" execution failed, outcomeStatus ${receipt["outcomeStatus"]}')
+        return receipt
+
+    async def wait_till_transaction_executed(
+        self, transaction_hash: _Hash32, timeout: float = 300, poll_latency: float = 0.5
+    ) -> TxReceipt:
+        return await self.wait_for_transaction_receipt(transaction_hash, timeout, poll_latency)
+
+    async def _wait_till_epoch_reached(
+        self, transaction_hash: _Hash32, epoch_tag: EpochLiteral, timeout: float, poll_latency: float
+    ) -> TxReceipt:
+        # the execution is awaited first, so the whole timeout remains for it
+        tx_receipt = await self.wait_till_transaction_executed(transaction_hash, timeout, poll_latency)
+        tx_epoch = tx_receipt["epochNumber"]
+        while True:
+            if tx_epoch <= await self.epoch_number_by_tag(epoch_tag):
+                return tx_receipt
+            await asyncio.sleep(poll_latency)
+
+    async def wait_till_transaction_confirmed(
+        self, transaction_hash: _Hash32, timeout: float = 600, poll_latency: float = 0.5
+    ) -> TxReceipt:
+        try:
+            return await asyncio.wait_for(
+                self._wait_till_epoch_reached(transaction_hash, "latest_confirmed", timeout, poll_latency), timeout=timeout
+            )
+        except (asyncio.TimeoutError, TimeExhausted):
+            raise TimeExhausted(
+                f"Transaction {HexBytes(transaction_hash) !r} is not confirmed "
+                f"after {timeout} seconds"
+            )
+
+    async def wait_till_transaction_finalized(
+        self, transaction_hash: _Hash32, timeout: float = 1200, poll_latency: float = 0.5
+    ) -> TxReceipt:
+        warnings.warn("4 ~ 6 minutes are required to finalize a transaction", UserWarning)
+        try:
+            return await asyncio.wait_for(
+                self._wait_till_epoch_reached(transaction_hash, "latest_finalized", timeout, poll_latency), timeout=timeout
+            )
+        except (asyncio.TimeoutError, TimeExhausted):
+            raise TimeExhausted(
+                f"Transaction {HexBytes(transaction_hash) !r} is not finalized "
+                f"after {timeout} seconds"
+            )
+
+    async def get_transaction_by_hash(self, transaction_hash: _Hash32) -> TxData: # type: ignore
+        return await self._get_transaction_by_hash(transaction_hash) # type: ignore
+
+    async def get_transaction(self, transaction_hash: _Hash32) -> TxData: # type: ignore
+        return await self.get_transaction_by_hash(transaction_hash)
+
+    async def get_block_by_hash(
+        self, block_hash: _Hash32, full_transactions: bool=False
+    ) -> Union[BlockData, None]:
+        return await self._get_block_by_hash(block_hash, full_transactions) # type: ignore
+
+    async def get_block_by_epoch_number(
+        self, epoch_number_param: EpochNumberParam, full_transactions: bool=False
+    ) -> BlockData:
+        return await self._get_block_by_epoch_number(epoch_number_param, full_transactions) # type: ignore
+
+    async def get_block_by_block_number(
+        self, block_number: int, full_transactions: bool=False
+    ) -> BlockData:
+        return await self._get_block_by_block_number(block_number, full_transactions) # type: ignore
+
+    async def get_best_block_hash(self) -> HexBytes:
+        return await self._get_best_block_hash() # type: ignore
+
+    async def get_blocks_by_epoch(self, epoch_number_param: EpochNumberParam) -> Sequence[HexBytes]:
+        return await self._get_blocks_by_epoch(epoch_number_param) # type: ignore
+
+    async def get_skipped_blocks_by_epoch(self, epoch_number_param: EpochNumberParam) -> Sequence[HexBytes]:
+        return await self._get_skipped_blocks_by_epoch(epoch_number_param) # type: ignore
+
+    async def get_block_by_hash_with_pivot_assumptions(self, block_hash: _Hash32, assumed_pivot_hash: _Hash32, epoch_number: int) -> BlockData:
+        return await self._get_block_by_hash_with_pivot_assumptions(block_hash, assumed_pivot_hash, epoch_number) # type: ignore
+
+    @overload
+    async def get_epoch_receipts(self, epoch_number: EpochNumberParam, include_espace_receipts: Literal[True]) -> Sequence[Sequence[TxReceiptWithSpace]]: ...
+
+    @overload
+    async def get_epoch_receipts(self, epoch_number: EpochNumberParam, include_espace_receipts: Optional[Literal[False]]) -> Sequence[Sequence[TxReceipt]]: ...
+
+    async def get_epoch_receipts(self, epoch_number: EpochNumberParam, include_espace_receipts: Optional[bool]=False) -> Sequence[Sequence[Union[TxReceipt, TxReceiptWithSpace]]]:
+        return await self._get_epoch_receipts(epoch_number, include_espace_receipts) # type: ignore
+
+    async def get_confirmation_risk_by_hash(self, block_hash: _Hash32) -> float:
+        return await self._get_confirmation_risk_by_hash(block_hash) # type: ignore
+
+    async def get_block(self, block_identifier: Union[_Hash32, EpochNumberParam], full_transactions: bool = False) -> BlockData: # type: ignore
+        if block_identifier == "latest":
+            block_identifier = "latest_state"
+        elif isinstance(block_identifier, bytes) or is_hash32_str(block_identifier):
+            return await self.get_block_by_hash(block_identifier, full_transactions) # type: ignore
+        return await self.get_block_by_epoch_number(block_identifier, full_transactions) # type: ignore
+
+    async def get_code( # type: ignore
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> HexBytes:
+        return await self._get_code(address, block_identifier) # type: ignore
+
+    async def get_storage_at( # type: ignore
+        self, address: Union[Base32Address, str], storage_position: int, block_identifier: Optional[EpochNumberParam] = None
+    ) -> Union[HexBytes, None]:
+        return await self._get_storage_at(address, storage_position, block_identifier) # type: ignore
+
+    async def get_storage_root(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> Union[StorageRoot, None]:
+        return await self._get_storage_root(address, block_identifier) # type: ignore
+
+    async def get_collateral_for_storage(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> Storage:
+        return await self._get_collateral_for_storage(address, block_identifier) # type: ignore
+
+    async def get_sponsor_info(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> SponsorInfo:
+        return await self._get_sponsor_info(address, block_identifier) # type: ignore
+
+    async def get_account(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> AccountInfo:
+        return await self._get_account(address, block_identifier) # type: ignore
+
+    async def get_deposit_list(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> Sequence[DepositInfo]:
+        return await self._get_deposit_list(address, block_identifier) # type: ignore
+
+    async def get_vote_list(
+        self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None
+    ) -> Sequence[VoteInfo]:
+        return await self._get_vote_list(address, block_identifier) # type: ignore
+
+    async def get_interest_rate(
+        self, block_identifier: Optional[EpochNumberParam] = None
+    ) -> int:
+        return await self._get_interest_rate(block_identifier) # type: ignore
+
+    async def get_accumulate_interest_rate(
+        self, block_identifier: Optional[EpochNumberParam] = None
+    ) -> int:
+        return await self._get_accumulate_interest_rate(block_identifier) # type: ignore
+
+    async def get_block_reward_info(
+        self, block_identifier: Union[EpochNumber, int, Literal["latest_checkpoint"] ]
+    ) -> Sequence[BlockRewardInfo]:
+        return await self._get_block_reward_info(block_identifier) # type: ignore
+
+    async def get_pos_economics(
+        self, block_identifier: Optional[EpochNumberParam] = None
+    ) -> PoSEconomicsInfo:
+        return await self._get_pos_economics(block_identifier) # type: ignore
+
+    async def get_pos_reward_by_epoch(
+        self, epoch_number: Union[EpochNumber, int]
+    ) -> Union[PoSEpochRewardInfo, None]:
+        return await self._get_pos_reward_by_epoch(epoch_number) # type: ignore
+
+    async def get_params_from_vote(
+        self, block_identifier: Optional[EpochNumberParam] = None
+    ) -> DAOVoteInfo:
+        return await self._get_params_from_vote(block_identifier) # type: ignore
+
+    async def get_supply_info(self) -> SupplyInfo:
+        return await self._get_supply_info() # type: ignore
+
+    async def get_account_pending_info(
+        self, address: Union[Base32Address, str]
+    ) -> PendingInfo:
+        return await self._get_account_pending_info(address) # type: ignore
+
+    async def get_account_pending_transactions(
+        self, address: Union[Base32Address, str], start_nonce: Optional[int]=None, limit: Optional[int]=None
+    ) -> PendingTransactionsInfo:
+        return await self._get_account_pending_transactions(address, start_nonce, limit) # type: ignore
+
+    async def check_balance_against_transaction(
+        self,
+        account_address: Union[Base32Address, str],
+        contract_address: Union[Base32Address, str],
+        gas_limit: int,
+        gas_price: Union[Drip, AbstractDerivedTokenUnit[Drip], int],
+        storage_limit: Union[Storage, int],
+        block_identifier: Optional[EpochNumberParam] = None
+    ) -> TransactionPaymentInfo:
+        gas_price = to_int_if_drip_units(gas_price)
+        return await self._check_balance_against_transaction( # type: ignore
+            account_address, contract_address, gas_limit, gas_price, storage_limit, block_identifier
+        )
+
+    @overload
+    async def get_logs(self, filter_params: FilterParams) -> List[LogReceipt]:...
+
+    @overload
+    async def get_logs(self, filter_params: None=None, **kwargs: Any) -> List[LogReceipt]:...
+
+    async def get_logs(self, filter_params: Optional[FilterParams]=None, **kwargs: Any) -> List[LogReceipt]: # type: ignore
+        if filter_params is None:
+            filter_params = cast(FilterParams, keyfilter(lambda key: key in FilterParams.__annotations__.keys(), kwargs)) # type: ignore
+        elif len(kwargs.keys()) != 0:
+            raise ValueError("Redundant Param: FilterParams as get_logs first parameter is already provided")
+        return await self._get_logs(filter_params) # type: ignore
+
+    async def get_collateral_info(self, block_identifier: Optional[EpochNumberParam] = None) -> CollateralInfo:
+        return await self._get_collateral_info(block_identifier) # type: ignore
+
+    @overload
+    async def new_filter(self, filter_params: FilterParams) -> LogFilterId:...
+
+    @overload
+    async def new_filter(self, filter_params: None=None, **kwargs: Unpack[FilterParams]) -> LogFilterId:...
+
+    async def new_filter(self, filter_params: Optional[FilterParams]=None, **kwargs: Unpack[FilterParams]) -> LogFilterId: # type: ignore
+        if filter_params is None:
+            filter_params = cast(FilterParams, keyfilter(lambda key: key in FilterParams.__annotations__.keys(), kwargs)) # type: ignore
+        elif len(kwargs.keys()) != 0:
+            raise ValueError("Redundant Param: FilterParams as get_logs first parameter is already provided")
+        return await self._new_filter(filter_params) # type: ignore
+
+    async def new_block_filter(self) -> BlockFilterId:
+        return await self._new_block_filter() # type: ignore
+
+    async def new_pending_transaction_filter(self) -> TxFilterId:
+        return await self._new_pending_transaction_filter() # type: ignore
+
+    async def get_filter_changes(self, filter_id: _FilterId) -> Union[Sequence[Hash32], Sequence[LogReceipt]]: # type: ignore
+        return await self._get_filter_changes(filter_id) # type: ignore
+
+    async def get_filter_logs(self, log_filter_id: Union[LogFilterId, str]) -> Sequence[LogReceipt]: # type: ignore
+        return await self._get_filter_logs(log_filter_id) # type: ignore
+
+    async def uninstall_filter(self, filter_id: _FilterId) -> bool: # type: ignore
+        return await self._uninstall_filter(filter_id) # type: ignore
+
+    async def get_admin(self, address: Union[Base32Address, str], block_identifier: Optional[EpochNumberParam] = None) -> Union[None, Base32Address]:
+        return await self._get_admin(address, block_identifier) # type: ignore
+
+    async def get_transactions_by_epoch(self, epoch_number: EpochNumberParam) -> Sequence[TxData]:
+        return await self._get_transactions_by_epoch(epoch_number) # type: ignore
+
+    async def trace_block(self, block_hash: _Hash32) -> Union[BlockTraceData, None]:
+        return await self._trace_block(block_hash) # type: ignore
+
+    async def trace_transaction(self, transaction_hash: _Hash32) -> Union[Sequence[TraceData], None]:
+        return await self._trace_transaction(transaction_hash) # type: ignore
+
+    async def trace_epoch(self, epoch_number: EpochNumberParam) -> EpochTraceData:
+        return await self._trace_epoch(epoch_number) # type: ignore
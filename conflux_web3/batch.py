@@ -0,0 +1,288 @@
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+from types import (
+    TracebackType,
+)
+
+from eth_utils import (
+    to_bytes,
+)
+from web3._utils.encoding import (
+    FriendlyJsonSerde,
+)
+from web3._utils.request import (
+    make_post_request,
+)
+from web3.manager import (
+    RequestManager,
+)
+from web3.method import (
+    Method,
+)
+from web3.module import (
+    apply_result_formatters,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+from web3.providers.rpc import (
+    HTTPProvider,
+)
+from web3.types import (
+    RPCEndpoint,
+    RPCResponse,
+)
+
+from conflux_web3._utils.decorators import (
+    cached_property
+)
+from conflux_web3._utils.rpc_abi import (
+    RPC
+)
+
+if TYPE_CHECKING:
+    from conflux_web3.client import ConfluxClient
+
+T = TypeVar("T")
+
+_NOT_EXECUTED = object()
+
+
+class BatchItem(Generic[T]):
+    """
+    The placeholder of a request queued in a ``BatchRequest``.
+    The result is available after the batch is executed.
+    """
+    def __init__(
+        self,
+        method: RPCEndpoint,
+        params: Any,
+        response_formatters: Tuple[Callable[..., Any], Callable[..., Any], Callable[..., Any]],
+    ) -> None:
+        self.method = method
+        self.params = params
+        self._response_formatters = response_formatters
+        self._result: Any = _NOT_EXECUTED
+        self._exception: Optional[Exception] = None
+
+    def done(self) -> bool:
+        return self._result is not _NOT_EXECUTED or self._exception is not None
+
+    def result(self) -> T:
+        """
+        returns the formatted result of the request,
+        or raises the exception if the request failed
+        """
+        if not self.done():
+            raise RuntimeError(f"The batch containing {self.method} is not executed")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self) -> Optional[Exception]:
+        """
+        returns the exception if the request failed, else returns None
+        """
+        if not self.done():
+            raise RuntimeError(f"The batch containing {self.method} is not executed")
+        return self._exception
+
+    def _set_response(self, response: RPCResponse) -> None:
+        result_formatters, error_formatters, null_result_formatters = self._response_formatters
+        try:
+            result = RequestManager.formatted_response(
+                response, self.params, error_formatters, null_result_formatters
+            )
+            self._result = apply_result_formatters(result_formatters, result)
+        except Exception as e:
+            self._exception = e
+
+    def _set_exception(self, exception: Exception) -> None:
+        self._exception = exception
+
+    def __repr__(self) -> str:
+        if not self.done():
+            status = "pending"
+        elif self._exception is not None:
+            status = f"error={self._exception!r}"
+        else:
+            status = f"result={self._result!r}"
+        return f"BatchItem({self.method}, {status})"
+
+
+class BatchRequest:
+    """
+    Queue RPC calls and send them as a single JSON-RPC batch request.
+    Any ``w3.cfx`` RPC method backed by a single RPC request can be queued,
+    the queued call returns a ``BatchItem`` whose result is available after the batch is executed.
+
+    >>> with w3.cfx.batch() as batch:
+    ...     balance = batch.get_balance(address)
+    ...     nonce = batch.get_next_nonce(address)
+    ...     epoch_number = batch.epoch_number
+    >>> balance.result()
+    1000000000000000000 Drip
+
+    Note that requests in a batch do not go through the middlewares,
+    so transactions should be signed and sent via ``send_raw_transaction``
+    and name service addresses are not resolved.
+    """
+    def __init__(self, client: "ConfluxClient") -> None:
+        self._client = client
+        self._items: List[BatchItem[Any]] = []
+        self._executed = False
+        # a copy of the client whose RPC calls are queued rather than sent
+        # copy.copy is not used because the client's __getattr__ treats any missing attribute as an RPC method
+        self._recorder = object.__new__(type(client))
+        self._recorder.__dict__.update(client.__dict__)
+        self._recorder.retrieve_caller_fn = self._retrieve_caller_fn # type: ignore
+
+    @property
+    def items(self) -> Sequence[BatchItem[Any]]:
+        return tuple(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _retrieve_caller_fn(self, method: Method[Callable[..., Any]]) -> Callable[..., BatchItem[Any]]:
+        def caller(*args: Any, **kwargs: Any) -> BatchItem[Any]:
+            if self._executed:
+                raise RuntimeError("Batch is already executed")
+            if method.json_rpc_method == RPC.cfx_sendTransaction:
+                raise ValueError("cfx_sendTransaction is not supported in batch request, "
+                                 "sign the transaction and use send_raw_transaction instead")
+            (method_str, params), response_formatters = method.process_params(
+                self._recorder, *args, **kwargs
+            )
+            item: BatchItem[Any] = BatchItem(method_str, params, response_formatters) # type: ignore
+            self._items.append(item)
+            return item
+        return caller
+
+    def _queue(self, name: str, queue_fn: Callable[[], Any]) -> BatchItem[Any]:
+        queued_count = len(self._items)
+        try:
+            item = queue_fn()
+        except Exception as e:
+            if len(self._items) == queued_count:
+                raise
+            # the API tried to process the queued result
+            del self._items[queued_count:]
+            raise ValueError(f"{name} can not be batched: only APIs sending a single RPC request are supported") from e
+        if len(self._items) != queued_count + 1 or item is not self._items[-1]:
+            del self._items[queued_count:]
+            raise ValueError(f"{name} can not be batched: only APIs sending a single RPC request are supported")
+        return item
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        static_attr = inspect.getattr_static(self._recorder, name, None)
+        if isinstance(static_attr, (property, cached_property)):
+            return self._queue(name, lambda: getattr(self._recorder, name))
+        fn = getattr(self._recorder, name)
+        if not callable(fn):
+            raise ValueError(f"{name} can not be batched: only APIs sending a single RPC request are supported")
+        return lambda *args, **kwargs: self._queue(name, lambda: fn(*args, **kwargs))
+
+    def execute(self) -> Sequence[BatchItem[Any]]:
+        """
+        send the queued requests as a single batch request and set the results of the ``BatchItem``s.
+        A failed request only sets the exception of the corresponding item.
+        """
+        if self._executed:
+            raise RuntimeError("Batch is already executed")
+        self._executed = True
+        if not self._items:
+            return ()
+        try:
+            responses = make_batch_request(
+                self._client.w3.provider,
+                [(item.method, item.params) for item in self._items]
+            )
+        except Exception as e:
+            for item in self._items:
+                item._set_exception(e)
+            raise
+        for item, response in zip(self._items, responses):
+            item._set_response(response)
+        return self.items
+
+    def __enter__(self) -> "BatchRequest":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.execute()
+
+
+def make_batch_request(
+    provider: BaseProvider, requests: Sequence[Tuple[RPCEndpoint, Any]]
+) -> List[RPCResponse]:
+    """
+    send requests as a JSON-RPC batch, returns the responses in the same order of the requests.
+    Providers can support batch requests by implementing ``make_batch_request``,
+    HTTPProvider is supported by default,
+    other providers fall back to sending the requests one by one.
+    """
+    if hasattr(provider, "make_batch_request"):
+        return provider.make_batch_request(requests) # type: ignore
+    if isinstance(provider, HTTPProvider):
+        return _make_http_batch_request(provider, requests)
+    return [provider.make_request(method, params) for method, params in requests]
+
+
+def _make_http_batch_request(
+    provider: HTTPProvider, requests: Sequence[Tuple[RPCEndpoint, Any]]
+) -> List[RPCResponse]:
+    rpc_dicts = [
+        {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(provider.request_counter),
+        } for method, params in requests
+    ]
+    request_data = to_bytes(text=FriendlyJsonSerde().json_encode(rpc_dicts))
+    raw_response = make_post_request(
+        provider.endpoint_uri, request_data, **provider.get_request_kwargs()
+    )
+    decoded: Union[List[RPCResponse], RPCResponse] = provider.decode_rpc_response(raw_response) # type: ignore
+    return match_batch_responses([rpc_dict["id"] for rpc_dict in rpc_dicts], decoded)
+
+
+def match_batch_responses(
+    request_ids: Sequence[Any], decoded: Union[List[RPCResponse], RPCResponse]
+) -> List[RPCResponse]:
+    """
+    order batch responses by request ids.
+    If the node rejects the whole batch, the error is used as the response of every request
+    """
+    if not isinstance(decoded, list):
+        return [decoded for _ in request_ids]
+    responses_by_id: Dict[Any, RPCResponse] = {
+        response.get("id"): response for response in decoded
+    }
+    return [
+        responses_by_id.get(
+            request_id,
+            {"error": {"code": -32603, "message": f"No response for batch request id {request_id}"}} # type: ignore
+        ) for request_id in request_ids
+    ]
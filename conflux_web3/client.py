@@ -9,6 +9,8 @@ from typing import (
     Type,
     Union,
     Dict,
+    Iterator,
+    TypeVar,
     cast,
     overload
 )
@@ -26,6 +28,13 @@ from eth_typing.encoding import (
 from eth_utils.toolz import (
     assoc  # type: ignore
 )
+from web3.module import (
+    retrieve_async_method_call_fn,
+    retrieve_blocking_method_call_fn,
+)
+from web3._utils.method_formatters import (
+    to_integer_if_hex,
+)
 
 from web3.eth import (
     BaseEth, 
@@ -39,6 +48,9 @@ from web3._utils.empty import (
 from web3._utils.threads import (
     Timeout,
 )
+from web3.providers.rpc import (
+    HTTPProvider,
+)
 from web3.types import (
     RPCEndpoint,
 )
@@ -91,6 +103,7 @@ from conflux_web3.types import (
     FilterParams,
     LogReceipt,
     BlockData,
+    EpochData,
     SponsorInfo,
     AccountInfo,
     DepositInfo,
@@ -106,19 +119,26 @@ from conflux_web3.types import (
     PendingTransactionsInfo,
     TransactionPaymentInfo,
     CollateralInfo,
+    TraceData,
+    BlockTraceData,
+    EpochTraceData,
+    CallFrame,
     BlockFilterId,
     TxFilterId,
     LogFilterId,
+    ResultMode,
     _FilterId,
 )
 from conflux_web3.contract import (
-    ConfluxContract
+    ConfluxContract,
+    ContractFactoryCache,
 )
 from conflux_web3.contract.metadata import (
     get_contract_metadata
 )
 from conflux_web3._utils.transactions import (
-    fill_transaction_defaults
+    fill_transaction_defaults,
+    TransactionDefaultsSnapshot,
 )
 from conflux_web3._utils.normalizers import (
     rpc_snake_to_camel
@@ -126,6 +146,28 @@ from conflux_web3._utils.normalizers import (
 from conflux_web3.method import (
     ConfluxMethod
 )
+from conflux_web3.batch import (
+    BatchRequest
+)
+from conflux_web3.multicall import (
+    Multicall
+)
+from conflux_web3.nonce_manager import (
+    NonceManager
+)
+from conflux_web3.log_iterator import (
+    LogIterator
+)
+from conflux_web3.log_index import (
+    LogIndex
+)
+from conflux_web3.epoch_iterator import (
+    EpochIterator
+)
+from conflux_web3.receipt_watcher import (
+    ReceiptStrategy,
+    ReceiptWatcher,
+)
 from conflux_web3.middleware.pending import (
     TransactionHash
 )
@@ -135,15 +177,162 @@ from conflux_web3._utils.decorators import (
 from conflux_web3._utils.cns import (
     resolve_if_cns_name,
 )
+from conflux_web3._utils.method_formatters import (
+    trace_formatter,
+)
+from conflux_web3._utils.traces import (
+    iter_call_frames,
+    stream_epoch_traces,
+)
 
 if TYPE_CHECKING:
     from conflux_web3 import Web3
 
+TClient = TypeVar("TClient", bound="BaseCfx")
+RESULT_MODES = ("default", "records", "light", "raw")
+
 class BaseCfx(BaseEth):
     _default_block: EpochNumberParam = "latest_state"
     _default_account: Union[AddressParam, Empty] = empty
     w3: "Web3"
     
+    _allow_arbitary_rpc: bool = False
+    # seconds the gas price and epoch height queried to fill transaction defaults are reused by later transactions,
+    # 0 means the latest values are always queried
+    transaction_defaults_staleness: float = 0
+    _transaction_defaults_snapshot: TransactionDefaultsSnapshot
+    # how RPC results are formatted, see `with_result_mode`
+    result_mode: ResultMode = "default"
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if not self._allow_arbitary_rpc:
+            raise Exception(f"RPC method cfx_{rpc_snake_to_camel(name)} is not defined, you can set `web3.cfx._allow_arbitary_rpc=True` to enable any RPC call.")
+        method: ConfluxMethod[Callable[..., Any]] = ConfluxMethod(RPCEndpoint(f"cfx_{rpc_snake_to_camel(name)}"))
+        return method.__get__(self, self.__class__)
+
+    @cached_property
+    def _contract_factories(self) -> ContractFactoryCache:
+        return ContractFactoryCache()
+
+    def _contract_from_kwargs(self, kwargs: Dict[str, Any]) -> Any:
+        """
+        works as ``Eth.contract``, but the contract factory created with the same arguments is reused
+        """
+        address = kwargs.pop("address", None)
+        factory_class = kwargs.pop("ContractFactoryClass", self._default_contract_factory) # type: ignore
+        contract_factory = self._contract_factories.get_factory(self.w3, factory_class, kwargs)
+        if address:
+            return contract_factory(address)
+        return contract_factory
+
+    def with_result_mode(self: TClient, result_mode: ResultMode) -> TClient:
+        """
+        Returns a copy of the client whose RPC methods return results in the specified mode.
+        The copy shares the provider, middlewares, accounts and settings of the client.
+
+        >>> w3.cfx.with_result_mode("light").get_balance(address)
+        1000000000000000000
+        >>> w3.cfx.with_result_mode("raw").get_balance(address)
+        '0xde0b6b3a7640000'
+
+        Parameters
+        ----------
+        result_mode : ResultMode
+            | "default": AttributeDicts with wrapper types such as Drip, HexBytes and Base32Address
+            | "records": the same as the default mode, but blocks, transactions, receipts and logs are
+            immutable ``__slots__`` records (see ``conflux_web3.types.records``) supporting the same read access,
+            which take a fraction of the memory of AttributeDicts
+            | "light": formatted as the default mode, but plain dicts, lists, ints, bytes and strs are returned,
+            which costs far less memory and CPU for each record
+            | "raw": the JSON-RPC results as they are, e.g. to be serialized again
+
+        Returns
+        -------
+        TClient
+            a client of the same class.
+            It is recommended to only read data by the copy,
+            because APIs such as ``wait_till_transaction_executed`` expect results in the default mode
+        """
+        if result_mode not in RESULT_MODES:
+            raise ValueError(f"result_mode is expected to be one of {RESULT_MODES}, but {result_mode!r} is received")
+        # copy.copy is not used because the client's __getattr__ treats any missing attribute as an RPC method
+        client = object.__new__(type(self))
+        client.__dict__.update(self.__dict__)
+        client.result_mode = result_mode
+        # the bound caller function passes the module to the result formatters, so it is bound to the copy
+        if self.is_async:
+            client.retrieve_caller_fn = retrieve_async_method_call_fn(self.w3, client) # type: ignore
+        else:
+            client.retrieve_caller_fn = retrieve_blocking_method_call_fn(self.w3, client) # type: ignore
+        return client
+
+    def _disable_eth_methods(self, disabled_method_list: Sequence[str]):
+        for api in disabled_method_list:
+            always_returns_zero: Callable[..., Literal[0]] = lambda *args, **kwargs: 0
+            self.__setattr__(
+                api,
+                use_instead(origin=api)(
+                    always_returns_zero
+                ),
+            )
+            
+    @property
+    @use_instead
+    def syncing(self):
+        """
+        Unsupported API
+        """
+        pass
+    
+    @property
+    @use_instead
+    def coinbase(self):
+        """
+        # WARNING: Unsupported API
+        """
+        pass
+
+    
+    @property
+    @use_instead
+    def mining(self):
+        """
+        # WARNING: Unsupported API
+        """
+        pass
+    
+    @property
+    @use_instead
+    def hashrate(self):
+        """
+        # WARNING: Unsupported API
+        """
+        pass
+    
+    @property
+    @use_instead(origin="web3.eth.block_number", substitute="web3.cfx.epoch_number")
+    def block_number(self):
+        """
+        # WARNING: Unsupported API, use `web3.cfx.epoch_number` instead
+        """
+        pass
+    
+    @property
+    @use_instead
+    def max_priority_fee(self):
+        """
+        # WARNING: Unsupported API
+        """
+        pass
+    
+    @property
+    @use_instead
+    def get_work(self):
+        """
+        # WARNING: Unsupported API
+        """
+        pass
+    
     @property
     def default_block(self) -> EpochNumberParam:
         return self._default_block
@@ -410,6 +599,14 @@ class BaseCfx(BaseEth):
 
     _get_collateral_info: ConfluxMethod[Callable[[Optional[EpochNumberParam]], CollateralInfo]] = ConfluxMethod(RPC.cfx_getCollateralInfo)
 
+    _get_transactions_by_epoch: ConfluxMethod[Callable[[EpochNumberParam], Sequence[TxData]]] = ConfluxMethod(RPC.cfx_getTransactionsByEpoch)
+
+    _trace_block: ConfluxMethod[Callable[[_Hash32], Union[BlockTraceData, None]]] = ConfluxMethod(RPC.trace_block)
+
+    _trace_transaction: ConfluxMethod[Callable[[_Hash32], Union[Sequence[TraceData], None]]] = ConfluxMethod(RPC.trace_transaction)
+
+    _trace_epoch: ConfluxMethod[Callable[[EpochNumberParam], EpochTraceData]] = ConfluxMethod(RPC.trace_epoch)
+
     @overload  
     def contract(
         self, address: Union[Base32Address, str], *, name: Optional[str]=None, with_deployment_info: Optional[bool]=None, **kwargs: Any
@@ -450,6 +647,7 @@ class BaseCfx(BaseEth):
     ) -> Union[Type[ConfluxContract], ConfluxContract]:
         """
         Produce a contract factory (address is not specified) or a contract(address is not specified).
+        Contract factories created with the same arguments are cached and shared, so they should not be modified.
         Address is specified by:
 
             1. explicitly using address param
@@ -495,99 +693,97 @@ class BaseCfx(BaseEth):
             kwargs = merge(metadata, kwargs)
         if address is not None:
             kwargs["address"] = address
-        return super().contract(**kwargs)  # type: ignore
+        return self._contract_from_kwargs(kwargs)
 
 class ConfluxClient(BaseCfx, Eth):
     """RPC entry defined provides friendlier APIs for users
     """
     account: Account
     _default_contract_factory: Type[ConfluxContract] = ConfluxContract
-    _allow_arbitary_rpc: bool = False
+    # transaction nonce is reserved by the nonce manager rather than queried from the node if set
+    nonce_manager: Optional[NonceManager] = None
+    # missing transaction fields are queried in a single batch request rather than one by one if True
+    batch_fill_transaction_defaults: bool = False
+    # get_logs reads the synced epochs from the local log index if set
+    log_index: Optional[LogIndex] = None
 
     def __init__(self, w3: "Web3") -> None:
         super().__init__(w3)
+        self._transaction_defaults_snapshot = TransactionDefaultsSnapshot()
         self.account = Account()
         self.account.set_w3(w3)
         self._disable_eth_methods(disabled_method_list)
 
-    def __getattr__(self, name: str) -> Callable[..., Any]:
-        if not self._allow_arbitary_rpc:
-            raise Exception(f"RPC method cfx_{rpc_snake_to_camel(name)} is not defined, you can set `web3.cfx._allow_arbitary_rpc=True` to enable any RPC call.")
-        method: ConfluxMethod[Callable[..., Any]] = ConfluxMethod(RPCEndpoint(f"cfx_{rpc_snake_to_camel(name)}"))
-        return method.__get__(self, self.__class__)
-
     # lazy initialize self.address
     @cached_property
     def address(self) -> Type[Base32Address]:
         return get_base32_address_factory(self.chain_id)
         
-    def _disable_eth_methods(self, disabled_method_list: Sequence[str]):
-        for api in disabled_method_list:
-            always_returns_zero: Callable[..., Literal[0]] = lambda *args, **kwargs: 0
-            self.__setattr__(
-                api,
-                use_instead(origin=api)(
-                    always_returns_zero
-                ),
-            )
-            
-    @property
-    @use_instead
-    def syncing(self):
-        """
-        Unsupported API
-        """
-        pass
-    
-    @property
-    @use_instead
-    def coinbase(self):
-        """
-        # WARNING: Unsupported API
+    def batch(self, result_mode: Optional[ResultMode] = None) -> BatchRequest:
         """
-        pass
+        Create a batch to send multiple RPC requests in a single JSON-RPC batch request.
+        The result of each request is available after the batch is executed.
+        A failed request won't affect other requests in the batch.
+
+        >>> with w3.cfx.batch() as batch:
+        ...     balance = batch.get_balance(address)
+        ...     nonce = batch.get_next_nonce(address)
+        ...     epoch_number = batch.epoch_number
+        >>> balance.result()
+        1000000000000000000 Drip
+        >>> nonce.exception() is None
+        True
 
-    
-    @property
-    @use_instead
-    def mining(self):
-        """
-        # WARNING: Unsupported API
-        """
-        pass
-    
-    @property
-    @use_instead
-    def hashrate(self):
-        """
-        # WARNING: Unsupported API
-        """
-        pass
-    
-    @property
-    @use_instead(origin="web3.eth.block_number", substitute="web3.cfx.epoch_number")
-    def block_number(self):
-        """
-        # WARNING: Unsupported API, use `web3.cfx.epoch_number` instead
-        """
-        pass
-    
-    @property
-    @use_instead
-    def max_priority_fee(self):
-        """
-        # WARNING: Unsupported API
+        Parameters
+        ----------
+        result_mode : Optional[ResultMode], optional
+            the result mode of the queued requests, by default None which means the result mode of the client,
+            see ``with_result_mode``
+
+        Returns
+        -------
+        BatchRequest
+            a batch whose queued calls return ``BatchItem`` placeholders, 
+            queued requests are sent when exiting the ``with`` block or calling ``batch.execute()``
         """
-        pass
-    
-    @property
-    @use_instead
-    def get_work(self):
+        if result_mode is not None:
+            return BatchRequest(self.with_result_mode(result_mode))
+        return BatchRequest(self)
+
+    def multicall(
+        self,
+        block_identifier: Optional[EpochNumberParam] = None,
+        aggregator: Optional[AddressParam] = None,
+        max_calls_per_request: int = 500,
+    ) -> Multicall:
         """
-        # WARNING: Unsupported API
+        Create a multicall to execute many read-only contract function calls in few requests.
+        Calls are packed into calls to the aggregator contract,
+        or sent in JSON-RPC batch requests if the aggregator is not deployed.
+        A failed call won't affect other calls.
+
+        >>> with w3.cfx.multicall() as multicall:
+        ...     balances = [multicall.add(token.functions.balanceOf(holder)) for holder in holders]
+        >>> balances[0].result()
+        100
+
+        Parameters
+        ----------
+        block_identifier : Optional[EpochNumberParam], optional
+            the epoch to execute the calls, by default None
+        aggregator : Optional[AddressParam], optional
+            the address of the aggregator contract, by default None which means the embedded deployment
+        max_calls_per_request : int, optional
+            max count of calls in an aggregator call or a batch request, by default 500
+
+        Returns
+        -------
+        Multicall
+            a multicall whose ``add`` returns ``MulticallItem`` placeholders,
+            queued calls are executed when exiting the ``with`` block or calling ``multicall.execute()``
         """
-        pass
-    
+        return Multicall(self.w3, block_identifier, aggregator, max_calls_per_request)
+
     def get_status(self) -> NodeStatus:
         """
         get the blockchain status from the provider
@@ -687,7 +883,8 @@ class ConfluxClient(BaseCfx, Eth):
         int
             chain id of the blockchain, 1 for conflux testnet and 1029 for conflux mainnet
         """
-        return self._get_status()["chainId"]
+        # the result is the hex string if result_mode is "raw"
+        return to_integer_if_hex(self._get_status()["chainId"])
 
     @property
     def client_version(self):
@@ -962,11 +1159,21 @@ class ConfluxClient(BaseCfx, Eth):
             )
     
     def wait_for_transaction_receipt(
-        self, transaction_hash: _Hash32, timeout: float = 300, poll_latency: float = 0.5
+        self,
+        transaction_hash: _Hash32,
+        timeout: float = 300,
+        poll_latency: float = 0.5,
+        strategy: ReceiptStrategy = "receipt",
+        epoch_hint: Optional[Union[int, _Hash32]] = None,
     ) -> TxReceipt:
         """
         Alias for `wait_till_transaction_executed`
         """
+        if strategy == "epoch":
+            watcher = ReceiptWatcher(self.w3, poll_latency, strategy="epoch")
+            future = watcher.watch(transaction_hash, "executed", timeout, epoch_hint=epoch_hint)
+            watcher.run_until_complete()
+            return cast(TxReceipt, future.result())
         try:
             receipt = cast(TxReceipt, super().wait_for_transaction_receipt(transaction_hash, timeout, poll_latency)) # type: ignore
         except TimeExhausted:
@@ -979,7 +1186,12 @@ class ConfluxClient(BaseCfx, Eth):
         return receipt
     
     def wait_till_transaction_executed(
-        self, transaction_hash: _Hash32, timeout: float = 300, poll_latency: float = 0.5
+        self,
+        transaction_hash: _Hash32,
+        timeout: float = 300,
+        poll_latency: float = 0.5,
+        strategy: ReceiptStrategy = "receipt",
+        epoch_hint: Optional[Union[int, _Hash32]] = None,
     ) -> TxReceipt:
         """
         Returns transaction receipt after it is executed.
@@ -1013,6 +1225,13 @@ class ConfluxClient(BaseCfx, Eth):
             maximum wait time before timeout in seconds, by default 300
         poll_latency : float, optional
             time interval to query transaction status in seconds, by default 0.5
+        strategy : ReceiptStrategy, optional
+            "receipt" to query the receipt by hash in each poll,
+            or "epoch" to query the receipts of each newly executed epoch with ``get_epoch_receipts``, by default "receipt".
+            See ``ReceiptWatcher`` to wait for many transactions in the "epoch" strategy
+        epoch_hint : Optional[Union[int, _Hash32]], optional
+            used in "epoch" strategy, the epoch number before which the transaction is not executed,
+            or the hash of the block containing the transaction, by default None
 
         Returns
         -------
@@ -1026,7 +1245,7 @@ class ConfluxClient(BaseCfx, Eth):
         RuntimeError
             if transaction is not executed successfully
         """  
-        return self.wait_for_transaction_receipt(transaction_hash, timeout, poll_latency)
+        return self.wait_for_transaction_receipt(transaction_hash, timeout, poll_latency, strategy, epoch_hint)
         
     
     def wait_till_transaction_confirmed(
@@ -1413,6 +1632,49 @@ class ConfluxClient(BaseCfx, Eth):
         """
         return self._get_epoch_receipts(epoch_number, include_espace_receipts)
     
+    def iter_epochs(
+        self,
+        start_epoch: EpochNumberParam,
+        end_epoch: EpochNumberParam,
+        full_transactions: bool = False,
+        include_receipts: bool = False,
+        concurrency: int = 4,
+        result_mode: Optional[ResultMode] = None,
+    ) -> Iterator[EpochData]:
+        """
+        Iterates the blocks and receipts of each epoch in the range.
+        Epochs are prefetched by a bounded window of concurrent requests and yielded in epoch order.
+
+        >>> for epoch in w3.cfx.iter_epochs(97134060, 97135060, full_transactions=True, include_receipts=True):
+        ...     print(epoch["pivotBlock"]["hash"], len(epoch["blocks"]))
+
+        Parameters
+        ----------
+        start_epoch : EpochNumberParam
+            the first epoch
+        end_epoch : EpochNumberParam
+            the last epoch (inclusive), should be earlier than latest_state if receipts are included
+        full_transactions : bool, optional
+            if true, blocks contain the full transaction objects rather than the hashes, by default False
+        include_receipts : bool, optional
+            if true, the receipts of each block are included, by default False
+        concurrency : int, optional
+            max count of epochs fetched at the same time, by default 4
+        result_mode : Optional[ResultMode], optional
+            the result mode of the blocks and receipts, by default None which means the result mode of the client,
+            see ``with_result_mode``
+
+        Returns
+        -------
+        Iterator[EpochData]
+            the pivot block, all blocks and the receipts (if included) of each epoch
+        """
+        return iter(EpochIterator(
+            self.w3, start_epoch, end_epoch,
+            full_transactions=full_transactions, include_receipts=include_receipts, concurrency=concurrency,
+            result_mode=self.result_mode if result_mode is None else result_mode,
+        ))
+
     def get_confirmation_risk_by_hash(self, block_hash: _Hash32) -> float:
         """
         Returns the confirmation risk of a given block, identified by its hash
@@ -1612,11 +1874,55 @@ class ConfluxClient(BaseCfx, Eth):
         """        
         if filter_params is None:
             filter_params = cast(FilterParams, keyfilter(lambda key: key in FilterParams.__annotations__.keys(), kwargs)) # type: ignore
-            return self._get_logs(filter_params)
-        else:
-            if len(kwargs.keys()) != 0:
-                raise ValueError("Redundant Param: FilterParams as get_logs first parameter is already provided")
-            return self._get_logs(filter_params)
+        elif len(kwargs.keys()) != 0:
+            raise ValueError("Redundant Param: FilterParams as get_logs first parameter is already provided")
+        # logs in the index are stored in the default result mode
+        if self.log_index is not None and self.result_mode == "default":
+            return self.log_index.get_logs(filter_params)
+        return self._get_logs(filter_params)
+
+    def iter_logs(
+        self,
+        filter_params: Optional[FilterParams]=None,
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        result_mode: Optional[ResultMode] = None,
+        **kwargs: Any
+    ) -> Iterator[LogReceipt]:
+        """
+        Iterates logs matching the filter over a large epoch range.
+        The range is split into chunks which are queried in parallel,
+        chunks are shrunk if the node rejects the epoch span or the log count, and grown if logs are sparse.
+        Logs are yielded in epoch order with bounded memory.
+
+        >>> for log in w3.cfx.iter_logs({"fromEpoch": 97134060, "toEpoch": 99134060}, chunk_size=1000, concurrency=8):
+        ...     print(log["epochNumber"])
+
+        Parameters
+        ----------
+        filter_params : Optional[FilterParams], optional
+            the same as ``get_logs``, fromEpoch and toEpoch tags are resolved once before iterating
+        chunk_size : int, optional
+            epoch count of the first chunk, by default 1000
+        concurrency : int, optional
+            max count of chunks queried at the same time, by default 4
+        result_mode : Optional[ResultMode], optional
+            the result mode of the logs, by default None which means the result mode of the client,
+            see ``with_result_mode``
+
+        Returns
+        -------
+        Iterator[LogReceipt]
+            an iterator of LogReceipt in epoch order
+        """
+        if filter_params is None:
+            filter_params = cast(FilterParams, keyfilter(lambda key: key in FilterParams.__annotations__.keys(), kwargs)) # type: ignore
+        elif len(kwargs.keys()) != 0:
+            raise ValueError("Redundant Param: FilterParams as iter_logs first parameter is already provided")
+        return iter(LogIterator(
+            self.w3, filter_params, chunk_size=chunk_size, concurrency=concurrency,
+            result_mode=self.result_mode if result_mode is None else result_mode,
+        ))
 
     def get_collateral_info(self, block_identifier: Optional[EpochNumberParam] = None) -> CollateralInfo:
         return self._get_collateral_info(block_identifier)
@@ -1664,3 +1970,97 @@ class ConfluxClient(BaseCfx, Eth):
     
     def get_admin(self, address: AddressParam, block_identifier: Optional[EpochNumberParam] = None) -> Union[None, Base32Address]:
         return self._get_admin(address, block_identifier)
+
+    def get_transactions_by_epoch(self, epoch_number: EpochNumberParam) -> Sequence[TxData]:
+        """
+        Returns the transactions of all blocks in the epoch. Only available in local RPC
+
+        Parameters
+        ----------
+        epoch_number : EpochNumberParam
+            the epoch to query
+
+        Returns
+        -------
+        Sequence[TxData]
+            transactions of the epoch in execution order
+        """
+        return self._get_transactions_by_epoch(epoch_number)
+
+    def trace_block(self, block_hash: _Hash32) -> Union[BlockTraceData, None]:
+        """
+        Returns the traces of the transactions in a block. The node should enable trace
+
+        Parameters
+        ----------
+        block_hash : _Hash32
+            block hash
+
+        Returns
+        -------
+        Union[BlockTraceData, None]
+            traces of each transaction in the block, None if the block is not executed
+        """
+        return self._trace_block(block_hash)
+
+    def trace_transaction(self, transaction_hash: _Hash32) -> Union[Sequence[TraceData], None]:
+        """
+        Returns the traces of a transaction. The node should enable trace
+
+        Parameters
+        ----------
+        transaction_hash : _Hash32
+            transaction hash
+
+        Returns
+        -------
+        Union[Sequence[TraceData], None]
+            traces of the transaction in execution order, None if the transaction is not executed
+        """
+        return self._trace_transaction(transaction_hash)
+
+    def trace_epoch(self, epoch_number: EpochNumberParam) -> EpochTraceData:
+        """
+        Returns the traces of all transactions in an epoch. The node should enable trace.
+        Use ``iter_call_frames`` to process large epochs without holding the whole result
+
+        Parameters
+        ----------
+        epoch_number : EpochNumberParam
+            the epoch to trace
+
+        Returns
+        -------
+        EpochTraceData
+            core space traces, eSpace traces and the mirror addresses of eSpace addresses
+        """
+        return self._trace_epoch(epoch_number)
+
+    def iter_call_frames(self, epoch_number: EpochNumberParam, chunk_size: int = 65536) -> Iterator[CallFrame]:
+        """
+        Iterates the flattened calls, creates and internal transfers of the core space transactions in an epoch.
+        If the provider is an ``HTTPProvider``, the ``trace_epoch`` response is decoded as it arrives
+        and the request does not go through middlewares,
+        so memory is bounded by the traces of a single transaction rather than the whole epoch.
+        Other providers fall back to ``trace_epoch``.
+
+        >>> for frame in w3.cfx.iter_call_frames(97134060):
+        ...     if frame["type"] == "internal_transfer_action":
+        ...         print(frame["from"], frame["to"], frame["value"])
+
+        Parameters
+        ----------
+        epoch_number : EpochNumberParam
+            the epoch to trace
+        chunk_size : int, optional
+            bytes read from the HTTP response at a time, by default 65536
+
+        Returns
+        -------
+        Iterator[CallFrame]
+            frames of each transaction in the order they start
+        """
+        if isinstance(self.w3.provider, HTTPProvider):
+            traces = map(trace_formatter, stream_epoch_traces(self.w3.provider, epoch_number, chunk_size))
+            return iter_call_frames(traces)
+        return iter_call_frames(self.trace_epoch(epoch_number)["cfxTraces"])
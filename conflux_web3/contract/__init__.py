@@ -1,13 +1,25 @@
+import json
+import threading
+from collections import (
+    OrderedDict,
+)
 from typing import (
     TYPE_CHECKING,
     Any,
+    Dict,
+    Hashable,
     Optional,
+    Type,
     cast,
     List,
     Callable,
     Union,
 )
 
+from eth_utils.crypto import (
+    keccak,
+)
+
 from web3.contract import (
     Contract,
 )
@@ -53,9 +65,13 @@ from conflux_web3.types import (
 from conflux_web3._utils.cns import (
     resolve_if_cns_name
 )
+from conflux_web3._utils.events import (
+    _IdentityCache,
+)
 from conflux_web3.contract.function import (
     ConfluxContractFunction,
     ConfluxContractFunctions,
+    ContractFunctionClasses,
 )
 from conflux_web3.contract.caller import (
     ConfluxContractCaller
@@ -95,6 +111,8 @@ class ConfluxContract(Contract):
     functions: ConfluxContractFunctions
     caller: "ConfluxContractCaller"
     events: "ConfluxContractEvents"
+    # function classes shared by the functions and callers of the contract class and its instances
+    _function_classes: Optional[ContractFunctionClasses] = None
     
     def __init__(self, address: AddressParam) -> None:
         """Create a new smart contract proxy object.
@@ -120,8 +138,12 @@ class ConfluxContract(Contract):
         if not self.address:
             raise TypeError("The address argument is required to instantiate a contract.")
 
-        self.functions = ConfluxContractFunctions(self.abi, self.w3, self.address, decode_tuples=self.decode_tuples)
-        self.caller = ConfluxContractCaller(self.abi, self.w3, self.address, decode_tuples=self.decode_tuples)
+        self.functions = ConfluxContractFunctions(
+            self.abi, self.w3, self.address, decode_tuples=self.decode_tuples, function_classes=self._function_classes
+        )
+        self.caller = ConfluxContractCaller(
+            self.abi, self.w3, self.address, decode_tuples=self.decode_tuples, function_classes=self._function_classes
+        )
         self.events = ConfluxContractEvents(self.abi, self.w3, self.address)
         self.fallback = Contract.get_fallback_function(self.abi, self.w3, ConfluxContractFunction, self.address) # type: ignore
         self.receive = Contract.get_receive_function(self.abi, self.w3, ConfluxContractFunction, self.address) # type: ignore
@@ -146,8 +168,14 @@ class ConfluxContract(Contract):
                 normalizers=normalizers,
             ),
         )
-        contract.functions = ConfluxContractFunctions(contract.abi, contract.w3, decode_tuples=contract.decode_tuples)
-        contract.caller = ConfluxContractCaller(contract.abi, contract.w3, contract.address, decode_tuples=contract.decode_tuples)
+        contract._function_classes = ContractFunctionClasses(contract.abi, contract.w3, contract.decode_tuples)
+        contract.functions = ConfluxContractFunctions(
+            contract.abi, contract.w3, decode_tuples=contract.decode_tuples, function_classes=contract._function_classes
+        )
+        contract.caller = ConfluxContractCaller(
+            contract.abi, contract.w3, contract.address,
+            decode_tuples=contract.decode_tuples, function_classes=contract._function_classes
+        )
         contract.events = ConfluxContractEvents(contract.abi, contract.w3)
         contract.fallback = Contract.get_fallback_function(
             contract.abi,
@@ -188,3 +216,55 @@ class ConfluxContract(Contract):
         return find_functions_by_identifier(  # type: ignore
             contract_abi, w3, address, callable_check, ConfluxContractFunction # type: ignore
         )
+
+
+_abi_hashes = _IdentityCache(1024)
+
+def get_abi_hash(abi: Union[ABI, str]) -> bytes:
+    """
+    returns the keccak hash of the ABI json, which is cached for the ABI object
+    """
+    if isinstance(abi, str):
+        return keccak(text=abi)
+    return _abi_hashes.get_or_create(
+        abi, lambda value: value[0], lambda abi: (abi, keccak(text=json.dumps(abi, sort_keys=True)))
+    )[1]
+
+
+class ContractFactoryCache:
+    """
+    Size-bounded LRU cache of the contract factory classes created by a web3 instance.
+    Factories are keyed by the factory class, the ABI hash and the other factory arguments,
+    so the cached factory is shared by the callers and should not be modified.
+    """
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._factories: "OrderedDict[Hashable, Type[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_factory(self, w3: "Web3", factory_class: Type[Any], kwargs: Dict[str, Any]) -> Type[Any]:
+        try:
+            key = (
+                factory_class,
+                get_abi_hash(kwargs["abi"]) if kwargs.get("abi") is not None else None,
+                tuple(sorted((k, v) for k, v in kwargs.items() if k != "abi")),
+            )
+            hash(key)
+        except TypeError:
+            # unhashable factory arguments
+            return factory_class.factory(w3, **kwargs)
+        with self._lock:
+            factory = self._factories.get(key)
+            if factory is not None:
+                self._factories.move_to_end(key)
+                return factory
+        factory = factory_class.factory(w3, **kwargs)
+        with self._lock:
+            self._factories[key] = factory
+            if len(self._factories) > self.maxsize:
+                self._factories.popitem(last=False)
+        return factory
+
+    def clear(self) -> None:
+        with self._lock:
+            self._factories.clear()
@@ -0,0 +1,450 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    cast,
+)
+from hexbytes import HexBytes
+
+from eth_utils.toolz import (
+    partial,
+)
+from web3.contract.async_contract import (
+    AsyncContract,
+    AsyncContractConstructor,
+    AsyncContractFunction,
+)
+from web3.contract.base_contract import (
+    BaseContractCaller,
+    BaseContractEvents,
+    BaseContractFunctions,
+)
+from web3.contract.utils import (
+    async_call_contract_function,
+    find_functions_by_identifier,
+)
+from web3._utils.abi import (
+    filter_by_type,
+)
+from web3._utils.datatypes import (
+    PropertyCheckingFactory,
+)
+from web3._utils.normalizers import (
+    normalize_abi,
+    normalize_bytecode,
+)
+from web3.types import (
+    ABI,
+    CallOverride,
+)
+
+from cfx_address import (
+    Base32Address,
+)
+from cfx_address.utils import (
+    is_valid_base32,
+    validate_address_agaist_network_id,
+)
+from cfx_utils.decorators import (
+    combomethod,
+)
+from cfx_utils.exceptions import (
+    Base32AddressNotMatch,
+)
+from cfx_utils.token_unit import (
+    to_int_if_drip_units,
+)
+from cfx_utils.types import (
+    ChecksumAddress,
+)
+from conflux_web3.types import (
+    AddressParam,
+    EpochNumberParam,
+    EstimateResult,
+    EventData,
+    TxParam,
+)
+from conflux_web3._utils.cns import (
+    resolve_if_cns_name,
+)
+from conflux_web3._utils.contracts import (
+    prepare_transaction,
+)
+from conflux_web3._utils.normalizers import (
+    addresses_to_verbose_base32,
+)
+from conflux_web3._utils.transactions import (
+    async_fill_transaction_defaults,
+)
+from conflux_web3.contract.event import (
+    ConfluxContractEvent,
+)
+from conflux_web3.contract.function import (
+    ContractFunctionClasses,
+    get_lazy_function,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import AsyncWeb3
+    from conflux_web3.types.transaction_hash import TransactionHash
+
+
+class AsyncConfluxContractFunction(AsyncContractFunction):
+    w3: "AsyncWeb3"
+    address: Base32Address
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "AsyncConfluxContractFunction":
+        return super().__call__(*args, **kwargs) # type: ignore
+
+    async def call(self,
+            transaction: Optional[TxParam] = None,
+            block_identifier: Optional[EpochNumberParam] = "latest_state",
+            state_override: Optional[CallOverride] = None,
+            ccip_read_enabled: Optional[bool] = None) -> Any:
+        call_transaction = self._get_call_txparams(transaction) # type: ignore
+
+        return await async_call_contract_function(
+            self.w3, # type: ignore
+            self.address, # type: ignore
+            [
+                addresses_to_verbose_base32(await self.w3.cfx.chain_id), # type: ignore
+            ],
+            self.function_identifier,
+            call_transaction,
+            block_identifier, # type: ignore
+            self.contract_abi,
+            self.abi,
+            state_override,
+            ccip_read_enabled,
+            self.decode_tuples,
+            *self.args,
+            **self.kwargs,
+        )
+
+    async def transact(self, transaction: Optional[TxParam] = None) -> "TransactionHash":
+        if transaction and "value" in transaction:
+            transaction["value"] = to_int_if_drip_units(transaction["value"])
+        return await super().transact(transaction) # type: ignore
+
+    async def build_transaction(self, transaction: Optional[TxParam] = None) -> TxParam:
+        built_transaction = self._build_transaction(transaction)  # type: ignore
+        prepared_transaction: TxParam = prepare_transaction(
+            self.address, # type: ignore
+            self.w3,
+            fn_identifier=self.function_identifier,
+            contract_abi=self.contract_abi,
+            fn_abi=self.abi,
+            transaction=built_transaction,
+            fn_args=self.args,
+            fn_kwargs=self.kwargs,
+        )
+        return await async_fill_transaction_defaults(self.w3, prepared_transaction)
+
+    @classmethod
+    def factory(cls, class_name: str, **kwargs: Any) -> "AsyncConfluxContractFunction":
+        return cast(AsyncConfluxContractFunction, cls.factory_class(class_name, **kwargs)(kwargs.get("abi")))
+
+    @classmethod
+    def factory_class(cls, class_name: str, **kwargs: Any) -> Type["AsyncConfluxContractFunction"]:
+        return cast(Type[AsyncConfluxContractFunction], PropertyCheckingFactory(class_name, (cls,), kwargs))
+
+
+class AsyncConfluxContractFunctions(BaseContractFunctions):
+    def __init__(
+        self,
+        abi: ABI,
+        w3: "AsyncWeb3",
+        address: Optional[AddressParam] = None,
+        decode_tuples: Optional[bool] = False,
+        function_classes: Optional[ContractFunctionClasses] = None,
+    ) -> None:
+        # function objects are created on first access rather than for every function in the abi
+        self.abi = abi
+        self.w3 = w3
+        self.address = address
+        self._function_classes = function_classes or ContractFunctionClasses(
+            abi, w3, decode_tuples, AsyncConfluxContractFunction # type: ignore
+        )
+        if self.abi:
+            self._functions = self._function_classes.function_abis
+
+    def _create_function(self, function_name: str) -> "AsyncConfluxContractFunction":
+        function = self._function_classes.get_function(function_name, self.address)
+        setattr(self, function_name, function)
+        return function
+
+    def __getattr__(self, function_name: str) -> "AsyncConfluxContractFunction":
+        return get_lazy_function(self, function_name)
+
+
+class AsyncConfluxContractCaller(BaseContractCaller):
+    def __init__(
+        self,
+        abi: ABI,
+        w3: "AsyncWeb3",
+        address: AddressParam,
+        transaction: Optional[TxParam] = None,
+        block_identifier: EpochNumberParam = "latest_state",
+        ccip_read_enabled: Optional[bool] = None,
+        decode_tuples: Optional[bool] = False,
+        function_classes: Optional[ContractFunctionClasses] = None,
+    ) -> None:
+        super().__init__(
+            abi,
+            w3,
+            address, # type: ignore
+            decode_tuples=decode_tuples
+        )
+        # caller methods are created on first access,
+        # so binding the caller to another block identifier or transaction is cheap
+        self._function_classes = function_classes or ContractFunctionClasses(
+            abi, w3, decode_tuples, AsyncConfluxContractFunction # type: ignore
+        )
+        self._transaction = {} if transaction is None else transaction
+        self._block_identifier = block_identifier
+        self._ccip_read_enabled = ccip_read_enabled
+        if self.abi:
+            self._functions = self._function_classes.function_abis
+
+    def _create_function(self, function_name: str) -> Callable[..., Any]:
+        # the block identifier is not parsed because a block hash can not be resolved without an await
+        caller_method = partial(
+            self.call_function,
+            self._function_classes.get_function(function_name, self.address),
+            transaction=self._transaction,
+            block_identifier=self._block_identifier,
+            ccip_read_enabled=self._ccip_read_enabled,
+        )
+        setattr(self, function_name, caller_method)
+        return caller_method
+
+    def __getattr__(self, function_name: str) -> Any:
+        return get_lazy_function(self, function_name)
+
+    def __call__(
+        self,
+        transaction: Optional[TxParam] = None,
+        block_identifier: EpochNumberParam = "latest_state",
+        ccip_read_enabled: Optional[bool] = None,
+    ) -> "AsyncConfluxContractCaller":
+        return type(self)(
+            self.abi,
+            self.w3, # type: ignore
+            self.address,
+            transaction=transaction,
+            block_identifier=block_identifier,
+            ccip_read_enabled=ccip_read_enabled,
+            decode_tuples=self.decode_tuples,
+            function_classes=self._function_classes,
+        )
+
+
+class AsyncConfluxContractEvent(ConfluxContractEvent):
+    w3: "AsyncWeb3" # type: ignore
+
+    @combomethod
+    def _get_chain_id(self) -> Optional[int]:
+        """
+        chain id can not be awaited here, so the cached chain id or the network id of the contract address is used
+        """
+        chain_id = self.w3.cfx._cached_chain_id
+        if chain_id is None and self.address:
+            chain_id = Base32Address(self.address).network_id
+        return chain_id
+
+    @combomethod
+    async def get_logs( # type: ignore
+        self,
+        argument_filters: Optional[Dict[str, Any]] = None,
+        fromEpoch: Optional[EpochNumberParam] = None,
+        toEpoch: Optional[EpochNumberParam] = None,
+        blockHashes: Optional[Sequence[HexBytes]] = None,
+        address: Optional[Union[Base32Address, Sequence[Base32Address]]]=None
+    ) -> Sequence[EventData]:
+        topics = self.get_filter_topics(argument_filters)
+        filter_params = {
+            "blockHashes": blockHashes,
+            "fromEpoch": fromEpoch,
+            "toEpoch": toEpoch,
+            "topics": topics,
+            "address": address
+        }
+        logs = await self.w3.cfx.get_logs(filter_params)
+        return tuple(
+            self.process_log(log) for log in logs
+        )
+
+
+class AsyncConfluxContractEvents(BaseContractEvents):
+    def __init__(
+        self, abi: ABI, w3: "AsyncWeb3", address: Optional[AddressParam] = None
+    ) -> None:
+        self._w3 = w3
+        self._address = address
+        # event classes are created on first access, see ConfluxContractEvents
+        if abi:
+            self.abi = abi
+            self._events = filter_by_type("event", abi)
+            self._event_names = frozenset(event["name"] for event in self._events)
+
+    def __getitem__(self, event_name: str) -> Type["AsyncConfluxContractEvent"]:
+        return cast(Type[AsyncConfluxContractEvent], super().__getitem__(event_name))
+
+    def __getattr__(self, event_name: str) -> Type["AsyncConfluxContractEvent"]:
+        if event_name in self.__dict__.get("_event_names", ()):
+            event = AsyncConfluxContractEvent.factory(
+                event_name, w3=self._w3, contract_abi=self.abi, address=self._address, event_name=event_name
+            )
+            setattr(self, event_name, event)
+            return cast(Type[AsyncConfluxContractEvent], event)
+        return cast(Type[AsyncConfluxContractEvent], super().__getattr__(event_name))
+
+
+class AsyncConfluxContractConstructor(AsyncContractConstructor):
+    w3: "AsyncWeb3"
+
+    @combomethod
+    async def transact(self, transaction: Optional[TxParam] = None) -> "TransactionHash":
+        return await super().transact(transaction) # type: ignore
+
+    @combomethod
+    async def build_transaction(self, transaction: Optional[TxParam] = None) -> TxParam:
+        built_transaction = self._build_transaction(transaction)
+        return await async_fill_transaction_defaults(self.w3, built_transaction)
+
+    @combomethod
+    async def estimate_gas(
+        self,
+        transaction: Optional[TxParam] = None,
+        block_identifier: Optional[EpochNumberParam] = None,
+    ) -> EstimateResult:
+        return await self.estimate_gas_and_collateral(transaction, block_identifier)
+
+    @combomethod
+    async def estimate_gas_and_collateral(
+        self,
+        transaction: Optional[TxParam] = None,
+        block_identifier: Optional[EpochNumberParam] = None,
+    ) -> EstimateResult:
+        return await super().estimate_gas(transaction, block_identifier) # type: ignore
+
+
+class AsyncConfluxContract(AsyncContract):
+    address: Base32Address
+    w3: "AsyncWeb3"
+    functions: AsyncConfluxContractFunctions
+    caller: "AsyncConfluxContractCaller"
+    events: "AsyncConfluxContractEvents"
+    # function classes shared by the functions and callers of the contract class and its instances
+    _function_classes: Optional[ContractFunctionClasses] = None
+
+    def __init__(self, address: AddressParam) -> None:
+        """Create a new smart contract proxy object.
+
+        :param address: Base32 Contract address.
+            Hex address is only accepted after chain id is cached by ``await w3.cfx.chain_id``
+        """
+        if self.w3 is None:
+            raise AttributeError(
+                'The `Contract` class has not been initialized.  Please use the '
+                '`web3.contract` interface to create your contract class.'
+            )
+
+        if address:
+            address = resolve_if_cns_name(self.w3, address) # type: ignore
+            chain_id = self.w3.cfx._cached_chain_id
+            if chain_id is None:
+                if not is_valid_base32(address):
+                    raise ValueError("Chain id is required to instantiate a contract with a hex address. "
+                                     "Use a base32 address or cache chain id by `await w3.cfx.chain_id` first")
+                chain_id = Base32Address(address).network_id
+            validate_address_agaist_network_id(address, chain_id, True)
+            address = Base32Address(address, chain_id)
+            if address.address_type != "contract" and address.address_type != "builtin":
+                raise Base32AddressNotMatch(f"expected an address of contract type or builtin type"
+                                            f"receives {address} of {address.address_type}")
+            self.address = Base32Address(address, chain_id, verbose=True)
+
+        if not self.address:
+            raise TypeError("The address argument is required to instantiate a contract.")
+
+        self.functions = AsyncConfluxContractFunctions(
+            self.abi, self.w3, self.address, decode_tuples=self.decode_tuples, function_classes=self._function_classes
+        )
+        self.caller = AsyncConfluxContractCaller(
+            self.abi, self.w3, self.address, decode_tuples=self.decode_tuples, function_classes=self._function_classes
+        )
+        self.events = AsyncConfluxContractEvents(self.abi, self.w3, self.address)
+        self.fallback = AsyncContract.get_fallback_function(self.abi, self.w3, AsyncConfluxContractFunction, self.address) # type: ignore
+        self.receive = AsyncContract.get_receive_function(self.abi, self.w3, AsyncConfluxContractFunction, self.address) # type: ignore
+
+    @classmethod
+    def factory(cls, w3: "AsyncWeb3", class_name: Optional[str] = None, **kwargs: Any) -> "AsyncContract": # type: ignore
+        kwargs["w3"] = w3
+
+        normalizers = {
+            "abi": normalize_abi,
+            "bytecode": normalize_bytecode,
+            "bytecode_runtime": normalize_bytecode,
+        }
+
+        contract = cast(
+            AsyncConfluxContract,
+            PropertyCheckingFactory(
+                class_name or cls.__name__,
+                (cls,),
+                kwargs,
+                normalizers=normalizers,
+            ),
+        )
+        contract._function_classes = ContractFunctionClasses(
+            contract.abi, contract.w3, contract.decode_tuples, AsyncConfluxContractFunction # type: ignore
+        )
+        contract.functions = AsyncConfluxContractFunctions(
+            contract.abi, contract.w3, decode_tuples=contract.decode_tuples, function_classes=contract._function_classes
+        )
+        contract.caller = AsyncConfluxContractCaller(
+            contract.abi, contract.w3, contract.address,
+            decode_tuples=contract.decode_tuples, function_classes=contract._function_classes
+        )
+        contract.events = AsyncConfluxContractEvents(contract.abi, contract.w3)
+        contract.fallback = AsyncContract.get_fallback_function(
+            contract.abi,
+            contract.w3,
+            AsyncConfluxContractFunction, # type: ignore
+        )
+        contract.receive = AsyncContract.get_receive_function(
+            contract.abi,
+            contract.w3,
+            AsyncConfluxContractFunction, # type: ignore
+        )
+
+        return contract
+
+    @classmethod
+    def constructor(cls, *args: Any, **kwargs: Any) -> "AsyncConfluxContractConstructor": # type: ignore
+        if cls.bytecode is None:
+            raise ValueError(
+                "Cannot call constructor on a contract that does not have "
+                "'bytecode' associated with it"
+            )
+
+        return AsyncConfluxContractConstructor(cls.w3, cls.abi, cls.bytecode, *args, **kwargs)
+
+    @combomethod
+    def find_functions_by_identifier(
+        cls,
+        contract_abi: ABI,
+        w3: "AsyncWeb3",
+        address: Union[ChecksumAddress, Base32Address],
+        callable_check: Callable[..., Any],
+    ) -> List["AsyncConfluxContractFunction"]:
+        return find_functions_by_identifier(  # type: ignore
+            contract_abi, w3, address, callable_check, AsyncConfluxContractFunction # type: ignore
+        )
@@ -1,5 +1,7 @@
 from typing import (
     TYPE_CHECKING,
+    Any,
+    Callable,
     Optional,
 )
 
@@ -18,10 +20,6 @@ from web3.types import (
     ABI,
 )
 
-from web3._utils.abi import (
-    filter_by_type,
-)
-
 from conflux_web3.types import (
     TxParam,
     AddressParam,
@@ -29,12 +27,15 @@ from conflux_web3.types import (
 )
 
 from .function import (
-    ConfluxContractFunction
+    ContractFunctionClasses,
+    get_lazy_function,
 )
 
 if TYPE_CHECKING:
     from conflux_web3 import Web3
-    
+
+_NOT_PARSED = object()
+
 
 class ConfluxContractCaller(BaseContractCaller):
     def __init__(
@@ -46,6 +47,7 @@ class ConfluxContractCaller(BaseContractCaller):
         block_identifier: EpochNumberParam = "latest_state",
         ccip_read_enabled: Optional[bool] = None,
         decode_tuples: Optional[bool] = False,
+        function_classes: Optional[ContractFunctionClasses] = None,
     ) -> None:
         super().__init__(
             abi,
@@ -53,34 +55,31 @@ class ConfluxContractCaller(BaseContractCaller):
             address, # type: ignore
             decode_tuples=decode_tuples
         )
-
+        # caller methods are created on first access,
+        # so binding the caller to another block identifier or transaction is cheap
+        self._function_classes = function_classes or ContractFunctionClasses(abi, w3, decode_tuples)
+        self._transaction = {} if transaction is None else transaction
+        self._block_identifier = block_identifier
+        self._parsed_block_identifier: Any = _NOT_PARSED
+        self._ccip_read_enabled = ccip_read_enabled
         if self.abi:
-            if transaction is None:
-                transaction = {}
-
-            self._functions = filter_by_type("function", self.abi)
-            for func in self._functions:
-                fn: ConfluxContractFunction = ConfluxContractFunction.factory(
-                    func["name"],
-                    w3=self.w3,
-                    contract_abi=self.abi,
-                    address=self.address,
-                    function_identifier=func["name"],
-                    decode_tuples=decode_tuples,
-                )
+            self._functions = self._function_classes.function_abis
 
-                block_id = parse_block_identifier(self.w3, block_identifier)
-                caller_method = partial(
-                    self.call_function,
-                    fn,
-                    transaction=transaction,
-                    block_identifier=block_id,
-                    ccip_read_enabled=ccip_read_enabled,
-                    # decode_tuples=decode_tuples,
-                )
+    def _create_function(self, function_name: str) -> Callable[..., Any]:
+        if self._parsed_block_identifier is _NOT_PARSED:
+            self._parsed_block_identifier = parse_block_identifier(self.w3, self._block_identifier)
+        caller_method = partial(
+            self.call_function,
+            self._function_classes.get_function(function_name, self.address),
+            transaction=self._transaction,
+            block_identifier=self._parsed_block_identifier,
+            ccip_read_enabled=self._ccip_read_enabled,
+        )
+        setattr(self, function_name, caller_method)
+        return caller_method
 
-                setattr(self, func["name"], caller_method)
-        
+    def __getattr__(self, function_name: str) -> Any:
+        return get_lazy_function(self, function_name)
 
     def __call__(
         self,
@@ -88,8 +87,6 @@ class ConfluxContractCaller(BaseContractCaller):
         block_identifier: EpochNumberParam = "latest_state",
         ccip_read_enabled: Optional[bool] = None,
     ) -> "ConfluxContractCaller":
-        if transaction is None:
-            transaction = {}
         return type(self)(
             self.abi,
             self.w3, # type: ignore
@@ -98,4 +95,5 @@ class ConfluxContractCaller(BaseContractCaller):
             block_identifier=block_identifier,
             ccip_read_enabled=ccip_read_enabled,
             decode_tuples=self.decode_tuples,
+            function_classes=self._function_classes,
         )
@@ -4,11 +4,18 @@ from typing import (
     Any,
     Dict,
     Iterable,
+    Iterator,
+    List,
     Optional,
     Sequence,
+    Tuple,
     Type,
     Union,
     cast,
+    overload,
+)
+from typing_extensions import (
+    Literal,
 )
 from hexbytes import HexBytes
 
@@ -32,6 +39,9 @@ from web3.logs import (
     STRICT,
     WARN,
 )
+from web3._utils.abi import (
+    filter_by_type,
+)
 from web3._utils.events import (
     EventLogErrorFlags,
 )
@@ -53,12 +63,18 @@ from cfx_utils.decorators import (
 from conflux_web3.types import (
     AddressParam,
     TxReceipt,
+    EventColumns,
     EventData,
     LogReceipt,
     EpochNumberParam,
 )
+from conflux_web3._utils.addresses import (
+    normalize_to,
+)
 from conflux_web3._utils.events import (
-    cfx_get_event_data,
+    EventDecoder,
+    get_event_decoder,
+    get_event_decoder_registry,
 )
 from conflux_web3._utils.decorators import (
     use_instead
@@ -67,6 +83,37 @@ from conflux_web3._utils.decorators import (
 if TYPE_CHECKING:
     from conflux_web3 import Web3
 
+def _get_receipt_logs(txn_receipt: TxReceipt) -> List[LogReceipt]:
+    """
+    the logs of the receipt with the transaction fields filled
+    """
+    logs: List[LogReceipt] = []
+    for transaction_log_index, transaction_log in enumerate(txn_receipt["logs"]):
+        log = cast(LogReceipt, dict(transaction_log))
+        log["transactionHash"] = txn_receipt["transactionHash"]
+        log["blockHash"] = txn_receipt["blockHash"]
+        log["epochNumber"] = txn_receipt["epochNumber"]
+        log["transactionIndex"] = txn_receipt["index"]
+        log["transactionLogIndex"] = transaction_log_index
+        logs.append(log)
+    return logs
+
+def _handle_decode_errors(failures: Sequence[Tuple[LogReceipt, Exception]], errors: EventLogErrorFlags) -> None:
+    """
+    discard, raise or warn the errors of the logs failed to decode according to the error flag
+    """
+    if errors == DISCARD:
+        return
+    for log, e in failures:
+        if errors == STRICT:
+            raise e
+        warnings.warn(
+            f"The log with transaction hash: {log.get('transactionHash')!r} "
+            f"encountered the following "
+            f"error during processing: {type(e).__name__}({e}). It has "
+            "been discarded."
+        )
+
 class ConfluxContractEvent(BaseContractEvent):
     
     w3: "Web3"
@@ -95,18 +142,11 @@ class ConfluxContractEvent(BaseContractEvent):
             raise AttributeError(
                 f"Error flag must be one of: {EventLogErrorFlags.flag_options()}"
             )
-        for transaction_log_index in range(len(txn_receipt["logs"])):
-        # for log in txn_receipt["logs"]:
-            log = txn_receipt["logs"][transaction_log_index]
+        decoder = self._get_event_decoder()
+        chain_id = self._get_chain_id()
+        for log in _get_receipt_logs(txn_receipt):
             try:
-                log = cast(LogReceipt, dict(log))
-                log["transactionHash"] = txn_receipt["transactionHash"]
-                log["blockHash"] = txn_receipt["blockHash"]
-                log["epochNumber"] = txn_receipt["epochNumber"]
-                log["transactionIndex"] = txn_receipt["index"]
-                log["transactionLogIndex"] = transaction_log_index
-                abi = self.abi or self._get_event_abi()
-                rich_log = cfx_get_event_data(self.w3.codec, abi, log, self.w3.cfx.chain_id)
+                rich_log = decoder.decode(self.w3.codec, log, chain_id)
             except (MismatchedABI, LogTopicError, InvalidEventABI, TypeError) as e:
                 if errors == DISCARD:
                     continue
@@ -129,12 +169,95 @@ class ConfluxContractEvent(BaseContractEvent):
 
     @combomethod
     def process_log(self, log: LogReceipt) -> EventData:
+        return self._get_event_decoder().decode(self.w3.codec, log, self._get_chain_id())
+
+    @overload
+    def decode_logs(
+        self, logs: Iterable[LogReceipt], output: Literal["rows", "records"] = "rows", errors: EventLogErrorFlags = WARN
+    ) -> Sequence[EventData]: ...
+
+    @overload
+    def decode_logs(
+        self, logs: Iterable[LogReceipt], output: Literal["columns"], errors: EventLogErrorFlags = WARN
+    ) -> EventColumns: ...
+
+    @combomethod
+    def decode_logs(
+        self,
+        logs: Iterable[LogReceipt],
+        output: Literal["rows", "records", "columns"] = "rows",
+        errors: EventLogErrorFlags = WARN,
+    ) -> Union[Sequence[EventData], EventColumns]:
+        """
+        Decode many logs of the event at once.
+        Logs of other events are handled according to ``errors``.
+
+        >>> columns = contract.events.Transfer.decode_logs(logs, output="columns")
+        >>> columns["args"]["value"][0], columns["epochNumber"][0]
+        (100, 97134060)
+
+        Parameters
+        ----------
+        logs : Iterable[LogReceipt]
+            logs returned by ``w3.cfx.get_logs`` or ``w3.cfx.iter_logs``
+        output : Literal["rows", "records", "columns"], optional
+            "rows" returns an EventData for each log,
+            "records" returns an ``EventDataRecord`` for each log, which supports the same read access with less memory,
+            "columns" returns a list (or a numpy array for at most 64-bit integer or bool arguments) for each field,
+            which is faster and uses less memory. By default "rows"
+        errors : EventLogErrorFlags, optional
+            how to handle logs not matching the event, by default WARN. IGNORE is not supported in "columns" output
+
+        Returns
+        -------
+        Union[Sequence[EventData], EventColumns]
+            the decoded events
+        """
+        if output not in ("rows", "records", "columns"):
+            raise ValueError(f"output is expected to be 'rows', 'records' or 'columns', but {output} is received")
+        if output == "columns" and errors == IGNORE:
+            raise ValueError("IGNORE error flag is not supported in 'columns' output")
+        decoder = self._get_event_decoder()
+        chain_id = self._get_chain_id()
+        if output != "columns":
+            as_record = output == "records"
+            events: List[EventData] = []
+            for log in logs:
+                try:
+                    events.append(decoder.decode(self.w3.codec, log, chain_id, as_record))
+                except (MismatchedABI, LogTopicError, InvalidEventABI, TypeError) as e:
+                    if errors == IGNORE:
+                        new_log = MutableAttributeDict(log)  # type: ignore
+                        new_log["errors"] = e
+                        events.append(AttributeDict(new_log))  # type: ignore
+                    else:
+                        _handle_decode_errors([(log, e)], errors)
+            return tuple(events)
+
+        columns, rejected = decoder.decode_columns(self.w3.codec, logs, chain_id)
+        _handle_decode_errors(rejected, errors)
+        return columns
+
+    @combomethod
+    def _get_event_decoder(self) -> EventDecoder:
+        """
+        the compiled decoder of the event, shared by the events of the same contract ABI
+        """
         abi = self.abi or self._get_event_abi()
-        return cfx_get_event_data(self.w3.codec, abi, log, self.w3.cfx.chain_id)
+        if self.contract_abi:
+            return get_event_decoder_registry(self.contract_abi).get_decoder(abi)
+        return get_event_decoder(abi)
+
+    @combomethod
+    def _get_chain_id(self) -> Optional[int]:
+        """
+        the chain id used to encode the addresses in decoded event args
+        """
+        return self.w3.cfx.chain_id
 
     @combomethod
     def processLog(self, log: LogReceipt) -> EventData:
-        return self.process_log(self.w3.codec, self.abi, log)
+        return self.process_log(log)
 
     @combomethod
     @use_instead
@@ -218,6 +341,52 @@ class ConfluxContractEvent(BaseContractEvent):
             self.process_log(log) for log in logs
         )
         
+    @combomethod
+    def iter_logs(
+        self,
+        argument_filters: Optional[Dict[str, Any]] = None,
+        fromEpoch: Optional[EpochNumberParam] = None,
+        toEpoch: Optional[EpochNumberParam] = None,
+        address: Optional[Union[Base32Address, Sequence[Base32Address]]]=None,
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+    ) -> Iterator[EventData]:
+        """
+        Iterates the decoded events over a large epoch range, see ``w3.cfx.iter_logs``
+
+        >>> for event in contract.events.Transfer.iter_logs(fromEpoch=97134060, toEpoch=99134060, concurrency=8):
+        ...     print(event["args"])
+
+        Parameters
+        ----------
+        argument_filters : Optional[Dict[str, Any]], optional
+            filters of the indexed event arguments, by default None
+        fromEpoch : Optional[EpochNumberParam], optional
+            the first epoch to query, by default None which means "latest_checkpoint"
+        toEpoch : Optional[EpochNumberParam], optional
+            the last epoch to query, by default None which means "latest_state"
+        address : Optional[Union[Base32Address, Sequence[Base32Address]]], optional
+            the contract address(es) emitting the event, by default None
+        chunk_size : int, optional
+            epoch count of the first chunk, by default 1000
+        concurrency : int, optional
+            max count of chunks queried at the same time, by default 4
+
+        Returns
+        -------
+        Iterator[EventData]
+            an iterator of decoded events in epoch order
+        """
+        topics = self.get_filter_topics(argument_filters)
+        filter_params = {
+            "fromEpoch": fromEpoch,
+            "toEpoch": toEpoch,
+            "topics": topics,
+            "address": address
+        }
+        for log in self.w3.cfx.iter_logs(filter_params, chunk_size=chunk_size, concurrency=concurrency): # type: ignore
+            yield self.process_log(log)
+
     @combomethod
     def getLogs(self, *args, **kwargs):
         return self.get_logs(*args, **kwargs)
@@ -226,10 +395,89 @@ class ConfluxContractEvents(BaseContractEvents):
     def __init__(
         self, abi: ABI, w3: "Web3", address: Optional[AddressParam] = None
     ) -> None:
-        super().__init__(abi, w3, ConfluxContractEvent, address) # type: ignore
+        self._contract_abi = abi or []
+        self._w3 = w3
+        self._address = address
+        # event classes are created on first access rather than for every event of the abi,
+        # so instantiating a contract is cheap
+        if abi:
+            self.abi = abi
+            self._events = filter_by_type("event", abi)
+            self._event_names = frozenset(event["name"] for event in self._events)
+
+    def process_receipt_all(
+        self, txn_receipt: TxReceipt, errors: EventLogErrorFlags = WARN
+    ) -> Dict[str, Tuple[EventData, ...]]:
+        """
+        Decode the logs of all events of the contract in the receipt, see ``process_logs_all``
+
+        >>> events = contract.events.process_receipt_all(receipt)
+        >>> events["Transfer"][0]["args"]["value"]
+        100
+        """
+        return self.process_logs_all(_get_receipt_logs(txn_receipt), errors)
+
+    def process_logs_all(
+        self, logs: Iterable[LogReceipt], errors: EventLogErrorFlags = WARN
+    ) -> Dict[str, Tuple[EventData, ...]]:
+        """
+        Decode the logs of all events of the contract in a single pass.
+        Each log is routed to the decoder of its event by topic0,
+        logs of other contracts (if the contract address is set), of unknown events or of anonymous events are skipped.
+
+        Parameters
+        ----------
+        logs : Iterable[LogReceipt]
+            logs returned by ``w3.cfx.get_logs`` or ``w3.cfx.iter_logs``
+        errors : EventLogErrorFlags, optional
+            how to handle the logs routed to an event but failed to decode, by default WARN
+
+        Returns
+        -------
+        Dict[str, Tuple[EventData, ...]]
+            event name -> decoded events in log order, every event of the contract ABI is a key
+        """
+        registry = get_event_decoder_registry(self._contract_abi)
+        chain_id = self._w3.cfx.chain_id
+        codec = self._w3.codec
+        # anonymous events are keys as well, although their logs can't be routed
+        grouped: Dict[str, List[EventData]] = {
+            event_name: [] for event_name in self.__dict__.get("_event_names", ())
+        }
+        contract_address = None if self._address is None else normalize_to(self._address, None)
+        # log address -> whether the log is emitted by the contract
+        address_matches: Dict[str, bool] = {}
+        failures: List[Tuple[LogReceipt, Exception]] = []
+        for log in logs:
+            if contract_address is not None:
+                log_address = log["address"]
+                if log_address not in address_matches:
+                    address_matches[log_address] = normalize_to(log_address, None) == contract_address
+                if not address_matches[log_address]:
+                    continue
+            decoder = registry.route(log)
+            if decoder is None:
+                continue
+            try:
+                grouped[decoder.event_name].append(decoder.decode(codec, log, chain_id))
+            except (MismatchedABI, LogTopicError, InvalidEventABI, TypeError) as e:
+                if errors == IGNORE:
+                    new_log = MutableAttributeDict(log)  # type: ignore
+                    new_log["errors"] = e
+                    grouped[decoder.event_name].append(AttributeDict(new_log))  # type: ignore
+                else:
+                    failures.append((log, e))
+        _handle_decode_errors(failures, errors)
+        return {event_name: tuple(events) for event_name, events in grouped.items()}
         
     def __getitem__(self, event_name: str) -> Type["ConfluxContractEvent"]:
         return cast(Type[ConfluxContractEvent], super().__getitem__(event_name))
     
     def __getattr__(self, event_name: str) -> Type["ConfluxContractEvent"]:
+        if event_name in self.__dict__.get("_event_names", ()):
+            event = ConfluxContractEvent.factory(
+                event_name, w3=self._w3, contract_abi=self.abi, address=self._address, event_name=event_name
+            )
+            setattr(self, event_name, event)
+            return cast(Type[ConfluxContractEvent], event)
         return cast(Type[ConfluxContractEvent], super().__getattr__(event_name))
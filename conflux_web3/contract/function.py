@@ -2,7 +2,11 @@ from typing import (
     TYPE_CHECKING,
     cast,
     Any,
+    Dict,
+    FrozenSet,
     Optional,
+    Sequence,
+    Type,
 )
 
 from web3._utils.datatypes import (
@@ -17,6 +21,14 @@ from web3.contract.contract import (
 from web3.contract.contract import (
     call_contract_function
 )
+from web3.exceptions import (
+    ABIFunctionNotFound,
+    NoABIFound,
+    NoABIFunctionsFound,
+)
+from web3._utils.abi import (
+    filter_by_type,
+)
 
 from web3.types import (
     ABI,
@@ -134,7 +146,76 @@ class ConfluxContractFunction(ContractFunction):
 
     @classmethod
     def factory(cls, class_name: str, **kwargs: Any) -> "ConfluxContractFunction":
-        return cast(ConfluxContractFunction, PropertyCheckingFactory(class_name, (cls,), kwargs)(kwargs.get("abi")))
+        return cast(ConfluxContractFunction, cls.factory_class(class_name, **kwargs)(kwargs.get("abi")))
+
+    @classmethod
+    def factory_class(cls, class_name: str, **kwargs: Any) -> Type["ConfluxContractFunction"]:
+        return cast(Type[ConfluxContractFunction], PropertyCheckingFactory(class_name, (cls,), kwargs))
+
+
+class ContractFunctionClasses:
+    """
+    function classes of a contract abi, created on first use and shared by
+    the functions and callers of a contract class and its instances
+    """
+    def __init__(
+        self,
+        abi: ABI,
+        w3: "Web3",
+        decode_tuples: Optional[bool] = False,
+        function_class: Type[Any] = ConfluxContractFunction,
+    ) -> None:
+        self.abi = abi
+        self.w3 = w3
+        self.decode_tuples = decode_tuples
+        self.function_class = function_class
+        self.function_abis: Sequence[ABIFunction] = filter_by_type("function", abi) if abi else [] # type: ignore
+        self.function_names: FrozenSet[str] = frozenset(func["name"] for func in self.function_abis)
+        self._classes: Dict[str, Type[Any]] = {}
+
+    def get_function(self, function_name: str, address: Optional[AddressParam] = None) -> Any:
+        """
+        returns a new function object bound to the address
+        """
+        function_class = self._classes.get(function_name)
+        if function_class is None:
+            function_class = self.function_class.factory_class(
+                function_name,
+                w3=self.w3,
+                contract_abi=self.abi,
+                function_identifier=function_name,
+                decode_tuples=self.decode_tuples,
+            )
+            self._classes[function_name] = function_class
+        function = function_class(None)
+        if address is not None:
+            function.address = address
+        return function
+
+
+def get_lazy_function(container: Any, function_name: str) -> Any:
+    """
+    create the function object of ``ConfluxContractFunctions`` or ``ConfluxContractCaller`` on first access,
+    raises the errors of web3 if the function is not in the abi
+    """
+    # __dict__ is used because __getattr__ might be called before __init__, e.g. by copy
+    attributes = container.__dict__
+    function_classes: Optional[ContractFunctionClasses] = attributes.get("_function_classes")
+    if function_classes is not None and function_name in function_classes.function_names:
+        return container._create_function(function_name)
+    if function_name.startswith("_") or function_classes is None:
+        raise AttributeError(function_name)
+    if attributes.get("abi") is None:
+        raise NoABIFound("There is no ABI found for this contract.")
+    if not function_classes.function_abis:
+        raise NoABIFunctionsFound(
+            "The abi for this contract contains no function definitions. ",
+            "Are you sure you provided the correct contract abi?",
+        )
+    raise ABIFunctionNotFound(
+        f"The function '{function_name}' was not found in this contract's abi.",
+        " Are you sure you provided the correct contract abi?",
+    )
 
 
 class ConfluxContractFunctions(BaseContractFunctions):
@@ -144,14 +225,20 @@ class ConfluxContractFunctions(BaseContractFunctions):
         w3: "Web3",
         address: Optional[AddressParam] = None,
         decode_tuples: Optional[bool] = False,
+        function_classes: Optional[ContractFunctionClasses] = None,
     ) -> None:
-        super().__init__(
-            abi,
-            w3,
-            ConfluxContractFunction,
-            address, # type: ignore
-            decode_tuples
-        )
-    
+        # function objects are created on first access rather than for every function in the abi
+        self.abi = abi
+        self.w3 = w3
+        self.address = address
+        self._function_classes = function_classes or ContractFunctionClasses(abi, w3, decode_tuples)
+        if self.abi:
+            self._functions = self._function_classes.function_abis
+
+    def _create_function(self, function_name: str) -> "ConfluxContractFunction":
+        function = self._function_classes.get_function(function_name, self.address)
+        setattr(self, function_name, function)
+        return function
+
     def __getattr__(self, function_name: str) -> "ConfluxContractFunction":
-        return super().__getattr__(function_name) # type: ignore
+        return get_lazy_function(self, function_name)
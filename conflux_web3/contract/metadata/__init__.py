@@ -1,9 +1,13 @@
 import json
 import os
+from functools import (
+    lru_cache
+)
 from pathlib import (
     Path
 )
 from typing import (
+    Any,
     Dict,
     Optional
 )
@@ -35,6 +39,8 @@ DEPLOYMENT_INFO = {
     "ParamsControl": "0x0888000000000000000000000000000000000007",
     "Create2Factory": "0x8A3A92281Df6497105513B18543fd3B60c778E40",
     "ERC1820": "0x88887eD889e776bCBe2f0f9932EcFaBcDfCd1820",
+    # deployed by Create2Factory with salt 0, see conflux_web3.multicall
+    "Multicall": "0x863B3f369E09F0EC9a88bA4D14A5879EF7e1E5A4",
     "Faucet": "cfxtest:acejjfa80vj06j2jgtz9pngkv423fhkuxj786kjr61",
     "cUSDT": {
         1: "cfxtest:acepe88unk7fvs18436178up33hb4zkuf62a9dk1gv",
@@ -58,6 +64,19 @@ METADATA_INFO = {
 def list_embedded_contract_names():
     pass
 
+@lru_cache(maxsize=64)
+def _load_metadata(file_name: str) -> Optional[Dict[str, Any]]:
+    """
+    returns the abi and bytecode in the metadata file, or None if the file does not exist.
+    The parsed metadata is cached and shared by the callers, so it should not be modified
+    """
+    metadata_path = METADATA_DIR / f"{file_name}.json"
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path) as f:
+        metadata = json.load(f)
+    return keyfilter(lambda x: x in ["abi", "bytecode"], metadata)
+
 # TODO: normalize metadata["bin"] to metadata["bytecode"]
 # TODO: return type as TypedDict
 def get_contract_metadata(
@@ -94,12 +113,11 @@ def get_contract_metadata(
         _description_
     """
     try:
-        metadata_path = METADATA_DIR / f"{METADATA_INFO.get(contract_name, contract_name)}.json"
-        if not os.path.exists(metadata_path):
+        cached_metadata = _load_metadata(METADATA_INFO.get(contract_name, contract_name))
+        if cached_metadata is None:
             raise ContractMetadataNotFound(f"Metadata for {contract_name} not found")
-        with open(metadata_path) as f:
-            metadata = json.load(f)
-        metadata = keyfilter(lambda x: x in ["abi", "bytecode"], metadata)
+        # the abi object is shared, so the contract factory and event decoder caches keyed by it are hit
+        metadata = dict(cached_metadata)
     except ContractMetadataNotFound as e:
         abi = getattr(abis, contract_name, None)
         if abi:
@@ -0,0 +1,163 @@
+from collections import (
+    deque,
+)
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from typing import (
+    TYPE_CHECKING,
+    Deque,
+    Iterator,
+    Optional,
+    Sequence,
+    cast,
+)
+
+from hexbytes import (
+    HexBytes,
+)
+from web3.datastructures import (
+    AttributeDict,
+)
+from web3._utils.method_formatters import (
+    to_integer_if_hex,
+)
+
+from cfx_utils.types import (
+    EpochNumberParam,
+)
+from conflux_web3.types import (
+    EpochData,
+    ResultMode,
+    TxReceipt,
+)
+from conflux_web3.log_iterator import (
+    resolve_epoch_number,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+
+class EpochIterator:
+    def __init__(
+        self,
+        w3: "Web3",
+        start_epoch: EpochNumberParam,
+        end_epoch: EpochNumberParam,
+        full_transactions: bool = False,
+        include_receipts: bool = False,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        result_mode: ResultMode = "default",
+    ) -> None:
+        """
+        iterate the blocks and receipts of each epoch in a range.
+        Epochs are fetched by a read-ahead window of concurrent requests and yielded in epoch order.
+        At most ``concurrency`` epochs are fetched or buffered at the same time,
+        so memory is flat however large the range is.
+
+        Each epoch costs two batch requests:
+        the block hashes and the receipts of the epoch, and then the blocks by hash.
+        An epoch is fetched again if its receipts do not belong to its blocks,
+        which happens if the pivot chain changes between the two requests.
+
+        >>> for epoch in EpochIterator(w3, 97134060, 97135060, full_transactions=True, include_receipts=True):
+        ...     process(epoch["pivotBlock"], epoch["blocks"], epoch["receipts"])
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to query blocks and receipts
+        start_epoch : EpochNumberParam
+            the first epoch, epoch tags are resolved before iterating
+        end_epoch : EpochNumberParam
+            the last epoch (inclusive), epoch tags are resolved before iterating
+        full_transactions : bool, optional
+            if true, blocks contain the full transaction objects rather than the hashes, by default False
+        include_receipts : bool, optional
+            if true, the receipts of each block are queried by ``cfx_getEpochReceipts``, by default False
+        concurrency : int, optional
+            max count of epochs fetched at the same time, by default 4
+        max_retries : int, optional
+            max count an epoch is fetched again if the pivot chain changes, by default 3
+        result_mode : ResultMode, optional
+            the result mode of the blocks and receipts, by default "default",
+            the epoch data is a plain dict if the mode is "light" or "raw"
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency is expected to be positive, but {concurrency} is received")
+        self.w3 = w3
+        self.start_epoch = start_epoch
+        self.end_epoch = end_epoch
+        self.full_transactions = full_transactions
+        self.include_receipts = include_receipts
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.result_mode = result_mode
+        self._client = w3.cfx if w3.cfx.result_mode == result_mode else w3.cfx.with_result_mode(result_mode)
+
+    def __iter__(self) -> Iterator[EpochData]:
+        start_epoch = resolve_epoch_number(self.w3, self.start_epoch, "earliest")
+        end_epoch = resolve_epoch_number(self.w3, self.end_epoch, "latest_state")
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        # epochs in order, the head is the next to yield
+        pending: "Deque[Future[EpochData]]" = deque()
+        next_epoch = start_epoch
+        try:
+            while pending or next_epoch <= end_epoch:
+                while len(pending) < self.concurrency and next_epoch <= end_epoch:
+                    pending.append(executor.submit(self._fetch_epoch, next_epoch))
+                    next_epoch += 1
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _fetch_epoch(self, epoch_number: int) -> EpochData:
+        for _ in range(self.max_retries + 1):
+            epoch_data = self._try_fetch_epoch(epoch_number)
+            if epoch_data is not None:
+                return epoch_data
+        raise RuntimeError(f"The pivot chain kept changing while fetching epoch {epoch_number}")
+
+    def _try_fetch_epoch(self, epoch_number: int) -> Optional[EpochData]:
+        with self._client.batch() as batch:
+            hashes_item = batch.get_blocks_by_epoch(epoch_number)
+            receipts_item = batch.get_epoch_receipts(epoch_number) if self.include_receipts else None
+        block_hashes: Sequence[HexBytes] = hashes_item.result()
+        if not block_hashes:
+            return None
+        with self._client.batch() as batch:
+            block_items = [
+                batch.get_block_by_hash(block_hash, self.full_transactions) for block_hash in block_hashes
+            ]
+        blocks = [item.result() for item in block_items]
+
+        receipts: Optional[Sequence[Sequence[TxReceipt]]] = None
+        if receipts_item is not None:
+            receipts = receipts_item.result()
+            if not self._receipts_match(block_hashes, receipts):
+                return None
+        # epoch numbers are hex strings if the result mode is "raw"
+        if any(block is None or to_integer_if_hex(block["epochNumber"]) != epoch_number for block in blocks):
+            return None
+        epoch_data = {
+            "epochNumber": epoch_number,
+            "pivotBlock": blocks[-1],
+            "blocks": blocks,
+            "receipts": receipts,
+        }
+        if self.result_mode in ("default", "records"):
+            return cast(EpochData, AttributeDict(epoch_data))
+        return cast(EpochData, epoch_data)
+
+    def _receipts_match(self, block_hashes: Sequence[HexBytes], receipts: Sequence[Sequence[TxReceipt]]) -> bool:
+        if len(receipts) != len(block_hashes):
+            return False
+        return all(
+            len(block_receipts) == 0 or block_receipts[0]["blockHash"] == block_hash
+            for block_hash, block_receipts in zip(block_hashes, receipts)
+        )
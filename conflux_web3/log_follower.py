@@ -0,0 +1,186 @@
+import time
+from collections import (
+    OrderedDict,
+)
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+from typing_extensions import (
+    Literal,
+)
+
+from hexbytes import (
+    HexBytes,
+)
+from web3.datastructures import (
+    AttributeDict,
+)
+
+from conflux_web3.types import (
+    FilterParams,
+    LogReceipt,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+ConfirmationLevel = Literal["latest_state", "latest_confirmed", "latest_finalized"]
+CONFIRMATION_LEVELS = ("latest_state", "latest_confirmed", "latest_finalized")
+
+
+class ReorgTooDeep(Exception):
+    pass
+
+
+class LogFollower:
+    def __init__(
+        self,
+        w3: "Web3",
+        filter_params: FilterParams,
+        epoch_tag: ConfirmationLevel = "latest_state",
+        from_epoch: Optional[int] = None,
+        poll_latency: float = 1,
+        max_epochs_per_poll: int = 100,
+        max_reorg_depth: int = 200,
+    ) -> None:
+        """
+        follow the logs matching the filter near the chain head and handle pivot chain reorgs.
+        The pivot block hash of each processed epoch is recorded,
+        a reorg is detected if the pivot block of a processed epoch changes.
+        Logs of the reverted epochs are emitted again with ``removed`` set to True, newest first,
+        and then the logs of the new pivot chain are emitted.
+
+        Every emitted log has a ``removed`` field.
+
+        >>> follower = LogFollower(w3, {"address": contract.address}, epoch_tag="latest_confirmed")
+        >>> for log in follower:
+        ...     if log["removed"]:
+        ...         revert(log)
+        ...     else:
+        ...         apply(log)
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to query logs and blocks
+        filter_params : FilterParams
+            the filter without epoch or block ranges
+        epoch_tag : ConfirmationLevel, optional
+            logs are followed up to this epoch, "latest_state", "latest_confirmed" or "latest_finalized",
+            by default "latest_state"
+        from_epoch : Optional[int], optional
+            the first epoch to follow, by default None which means the epoch of epoch_tag at the first poll
+        poll_latency : float, optional
+            seconds to sleep when no new epoch is available, by default 1
+        max_epochs_per_poll : int, optional
+            max count of epochs fetched in a poll, by default 100
+        max_reorg_depth : int, optional
+            count of latest processed epochs whose pivot block hashes and logs are kept for reorg handling,
+            by default 200. ``ReorgTooDeep`` is raised if all of them are reverted
+        """
+        if epoch_tag not in CONFIRMATION_LEVELS:
+            raise ValueError(f"epoch_tag is expected to be one of {CONFIRMATION_LEVELS}, but {epoch_tag} is received")
+        if any(filter_params.get(key) is not None for key in ("fromEpoch", "toEpoch", "blockHashes", "fromBlock", "toBlock")):
+            raise ValueError("filter_params of LogFollower is not expected to contain epoch, block or block hash ranges")
+        self.w3 = w3
+        self.filter_params = filter_params
+        self.epoch_tag = epoch_tag
+        self.poll_latency = poll_latency
+        self.max_epochs_per_poll = max_epochs_per_poll
+        self.max_reorg_depth = max_reorg_depth
+        self._next_epoch = from_epoch
+        # processed epoch -> (pivot block hash, logs emitted for the epoch), at most max_reorg_depth epochs
+        self._epochs: "OrderedDict[int, Tuple[HexBytes, List[LogReceipt]]]" = OrderedDict()
+
+    @property
+    def processed_epoch(self) -> Optional[int]:
+        """
+        the last processed epoch, None if no epoch is processed
+        """
+        return None if self._next_epoch is None else self._next_epoch - 1
+
+    def __iter__(self) -> Iterator[LogReceipt]:
+        while True:
+            logs, caught_up = self._poll()
+            yield from logs
+            if caught_up:
+                time.sleep(self.poll_latency)
+
+    def poll(self) -> List[LogReceipt]:
+        """
+        handle reorgs and fetch the logs of at most max_epochs_per_poll new epochs
+        """
+        return self._poll()[0]
+
+    def _poll(self) -> Tuple[List[LogReceipt], bool]:
+        head = int(self.w3.cfx.epoch_number_by_tag(self.epoch_tag))
+        if self._next_epoch is None:
+            self._next_epoch = head
+        emitted = self._handle_reorg(head)
+        if self._next_epoch > head:
+            return emitted, True
+        to_epoch = min(head, self._next_epoch + self.max_epochs_per_poll - 1)
+        epochs = range(self._next_epoch, to_epoch + 1)
+        filter_params = cast(FilterParams, {**self.filter_params, "fromEpoch": epochs[0], "toEpoch": to_epoch})
+        with self.w3.cfx.batch() as batch:
+            pivots = [batch.get_block_by_epoch_number(epoch) for epoch in epochs]
+            logs_item = batch._get_logs(filter_params)
+            # the pivot chain changed while fetching if the last pivot block is changed
+            last_pivot = batch.get_block_by_epoch_number(to_epoch)
+        if last_pivot.result()["hash"] != pivots[-1].result()["hash"]:
+            return emitted, False
+
+        logs_by_epoch: Dict[int, List[LogReceipt]] = {}
+        for log in logs_item.result():
+            logs_by_epoch.setdefault(log["epochNumber"], []).append(
+                cast(LogReceipt, AttributeDict({**log, "removed": False}))
+            )
+        for epoch, pivot in zip(epochs, pivots):
+            epoch_logs = logs_by_epoch.get(epoch, [])
+            self._epochs[epoch] = (HexBytes(pivot.result()["hash"]), epoch_logs)
+            emitted.extend(epoch_logs)
+        while len(self._epochs) > self.max_reorg_depth:
+            self._epochs.popitem(last=False)
+        self._next_epoch = to_epoch + 1
+        return emitted, to_epoch == head
+
+    def _handle_reorg(self, head: int) -> List[LogReceipt]:
+        """
+        returns the removed logs of the reverted epochs and rewinds to the fork point
+        """
+        # epochs above the head can't be checked until the head reaches them again
+        checked_epochs = [epoch for epoch in self._epochs if epoch <= head]
+        if not checked_epochs:
+            return []
+        latest_epoch = checked_epochs[-1]
+        if self._get_pivot_hashes([latest_epoch])[latest_epoch] == self._epochs[latest_epoch][0]:
+            return []
+        # pivot chain changed, find the latest epoch whose pivot block is not changed
+        pivot_hashes = self._get_pivot_hashes(checked_epochs)
+        fork_epoch = next(
+            (epoch for epoch in reversed(checked_epochs) if pivot_hashes[epoch] == self._epochs[epoch][0]), None
+        )
+        if fork_epoch is None:
+            raise ReorgTooDeep(
+                f"All of the latest {len(self._epochs)} processed epochs are reverted, "
+                "increase max_reorg_depth or follow a higher confirmation level"
+            )
+        removed: List[LogReceipt] = []
+        for epoch in reversed([epoch for epoch in self._epochs if epoch > fork_epoch]):
+            _, epoch_logs = self._epochs.pop(epoch)
+            removed.extend(
+                cast(LogReceipt, AttributeDict({**log, "removed": True})) for log in reversed(epoch_logs)
+            )
+        self._next_epoch = fork_epoch + 1
+        return removed
+
+    def _get_pivot_hashes(self, epochs: List[int]) -> Dict[int, HexBytes]:
+        with self.w3.cfx.batch() as batch:
+            items = [batch.get_block_by_epoch_number(epoch) for epoch in epochs]
+        return {epoch: HexBytes(item.result()["hash"]) for epoch, item in zip(epochs, items)}
@@ -0,0 +1,314 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+from cfx_address import (
+    Base32Address,
+)
+from eth_utils import (
+    to_hex,
+)
+
+from conflux_web3._utils.addresses import (
+    normalize_to,
+)
+from conflux_web3.types import (
+    FilterParams,
+    LogReceipt,
+)
+from conflux_web3._utils.method_formatters import (
+    log_entry_formatter,
+)
+from conflux_web3.log_iterator import (
+    LogIterator,
+    resolve_epoch_number,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS logs (
+        chain_id INTEGER NOT NULL,
+        epoch_number INTEGER NOT NULL,
+        address TEXT NOT NULL,
+        topic0 TEXT,
+        topic1 TEXT,
+        topic2 TEXT,
+        topic3 TEXT,
+        transaction_hash TEXT NOT NULL,
+        transaction_log_index INTEGER NOT NULL,
+        log TEXT NOT NULL,
+        UNIQUE (chain_id, transaction_hash, transaction_log_index)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS logs_address_epoch ON logs (chain_id, address, epoch_number)",
+    "CREATE INDEX IF NOT EXISTS logs_topic0_epoch ON logs (chain_id, topic0, epoch_number)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_state (
+        chain_id INTEGER NOT NULL,
+        scope TEXT NOT NULL,
+        start_epoch INTEGER NOT NULL,
+        synced_epoch INTEGER NOT NULL,
+        PRIMARY KEY (chain_id, scope, start_epoch)
+    )
+    """,
+)
+# scope of an index tracking the logs of all addresses
+ALL_ADDRESSES = "*"
+
+
+def _to_address_key(address: Union[Base32Address, str]) -> str:
+    return normalize_to(address, None).lower()
+
+def _to_topic_key(topic: Union[bytes, str]) -> str:
+    return to_hex(topic).lower() if isinstance(topic, bytes) else topic.lower()
+
+
+class LogIndex:
+    def __init__(
+        self,
+        w3: "Web3",
+        path: str,
+        addresses: Optional[Sequence[Union[Base32Address, str]]] = None,
+        start_epoch: int = 0,
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        timeout: float = 30,
+    ) -> None:
+        """
+        a sqlite index of the finalized logs emitted by the addresses,
+        which answers ``cfx_getLogs`` filters locally.
+
+        ``sync`` downloads the logs from the last synced epoch up to the latest_finalized epoch by ``cfx_getLogs``.
+        ``get_logs`` reads the synced epochs from the database and queries the other epochs from the node,
+        filters the index can't answer (other addresses, block hashes or block numbers) are sent to the node.
+        The database can be shared by multiple processes and different networks.
+
+        >>> log_index = LogIndex(w3, "logs.sqlite", addresses=[contract.address], start_epoch=97000000)
+        >>> log_index.sync()
+        >>> w3.cfx.log_index = log_index # w3.cfx.get_logs reads the index
+        >>> logs = w3.cfx.get_logs(fromEpoch=97134060, toEpoch="latest_state", address=contract.address)
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to query logs
+        path : str
+            path of the sqlite database file
+        addresses : Optional[Sequence[Union[Base32Address, str]]], optional
+            the addresses whose logs are indexed, by default None which means the logs of all addresses
+        start_epoch : int, optional
+            the first epoch to index, by default 0
+        chunk_size : int, optional
+            epoch count of the first chunk queried when syncing, see ``LogIterator``, by default 1000
+        concurrency : int, optional
+            max count of chunks queried at the same time when syncing, by default 4
+        timeout : float, optional
+            seconds to wait for the database lock held by another process, by default 30
+        """
+        self.w3 = w3
+        self.path = path
+        self.addresses = None if addresses is None else sorted(set(_to_address_key(address) for address in addresses))
+        self.start_epoch = start_epoch
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._scope = ALL_ADDRESSES if self.addresses is None else json.dumps(self.addresses)
+        # sqlite connections can't be shared across threads or processes
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        # WAL allows readers and a writer from different processes at the same time
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _init_db(self) -> None:
+        connection = self._get_connection()
+        for statement in _SCHEMA:
+            connection.execute(statement)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    def close(self) -> None:
+        if getattr(self._local, "pid", None) == os.getpid():
+            self._local.connection.close()
+            del self._local.connection
+            del self._local.pid
+
+    @property
+    def synced_epoch(self) -> int:
+        """
+        the last epoch whose logs are indexed, start_epoch - 1 if nothing is synced
+        """
+        row = self._get_connection().execute(
+            "SELECT synced_epoch FROM sync_state WHERE chain_id = ? AND scope = ? AND start_epoch = ?",
+            (self.w3.cfx.chain_id, self._scope, self.start_epoch),
+        ).fetchone()
+        return self.start_epoch - 1 if row is None else row[0]
+
+    def sync(self, to_epoch: Optional[int] = None, flush_size: int = 10000) -> int:
+        """
+        index the logs from the last synced epoch up to to_epoch.
+        Logs are committed in batches, so an interrupted sync continues from the last committed epoch.
+
+        Parameters
+        ----------
+        to_epoch : Optional[int], optional
+            the last epoch to index, by default None which means the latest_finalized epoch.
+            It is capped by the latest_finalized epoch
+        flush_size : int, optional
+            count of logs committed in a database transaction, by default 10000
+
+        Returns
+        -------
+        int
+            the synced epoch
+        """
+        finalized_epoch = int(self.w3.cfx.epoch_number_by_tag("latest_finalized"))
+        to_epoch = finalized_epoch if to_epoch is None else min(to_epoch, finalized_epoch)
+        from_epoch = self.synced_epoch + 1
+        if from_epoch > to_epoch:
+            return from_epoch - 1
+        chain_id = self.w3.cfx.chain_id
+        filter_params: Dict[str, Any] = {"fromEpoch": from_epoch, "toEpoch": to_epoch}
+        if self.addresses is not None:
+            filter_params["address"] = [normalize_to(address, chain_id) for address in self.addresses]
+        # raw JSON-RPC logs are persisted without result formatters
+        iterator = LogIterator(
+            self.w3, cast(FilterParams, filter_params),
+            chunk_size=self.chunk_size, concurrency=self.concurrency, result_mode="raw",
+        )
+        buffer: List[Dict[str, Any]] = []
+        for log in iterator:
+            epoch_number = int(log["epochNumber"], 16) # type: ignore
+            # all logs of an epoch are committed together, so the synced epoch is consistent
+            if len(buffer) >= flush_size and epoch_number > int(buffer[-1]["epochNumber"], 16):
+                self._insert(chain_id, buffer, int(buffer[-1]["epochNumber"], 16))
+                buffer = []
+            buffer.append(cast(Dict[str, Any], log))
+        self._insert(chain_id, buffer, to_epoch)
+        return to_epoch
+
+    def _insert(self, chain_id: int, logs: List[Dict[str, Any]], synced_epoch: int) -> None:
+        rows = []
+        for log in logs:
+            topics = [_to_topic_key(topic) for topic in log["topics"]]
+            topics += [None] * (4 - len(topics))
+            rows.append((
+                chain_id,
+                int(log["epochNumber"], 16),
+                _to_address_key(log["address"]),
+                *topics[:4],
+                log["transactionHash"].lower(),
+                int(log["transactionLogIndex"], 16),
+                json.dumps(log),
+            ))
+        connection = self._get_connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(
+                "INSERT OR IGNORE INTO logs (chain_id, epoch_number, address, topic0, topic1, topic2, topic3, "
+                "transaction_hash, transaction_log_index, log) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.execute(
+                "INSERT INTO sync_state (chain_id, scope, start_epoch, synced_epoch) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (chain_id, scope, start_epoch) DO UPDATE SET synced_epoch = MAX(synced_epoch, excluded.synced_epoch)",
+                (chain_id, self._scope, self.start_epoch, synced_epoch),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _get_filter_addresses(self, filter_params: FilterParams) -> Optional[List[str]]:
+        address = filter_params.get("address")
+        if address is None or (isinstance(address, (list, tuple)) and len(address) == 0):
+            return None
+        if isinstance(address, (list, tuple)):
+            return [_to_address_key(item) for item in address]
+        return [_to_address_key(address)]
+
+    def covers(self, filter_params: FilterParams) -> bool:
+        """
+        returns if the filter could be answered by the index
+        """
+        if any(filter_params.get(key) is not None for key in ("blockHashes", "fromBlock", "toBlock")):
+            return False
+        # only 4 topics are indexed, the node reports its own error for more topic positions
+        if len(filter_params.get("topics") or []) > 4:
+            return False
+        if self.addresses is None:
+            return True
+        addresses = self._get_filter_addresses(filter_params)
+        return addresses is not None and set(addresses).issubset(self.addresses)
+
+    def get_logs(self, filter_params: FilterParams) -> List[LogReceipt]:
+        """
+        returns logs matching the filter, the same as ``w3.cfx.get_logs``.
+        The synced epochs are read from the index and other epochs are queried from the node
+        """
+        if not self.covers(filter_params):
+            return self.w3.cfx._get_logs(filter_params)
+        from_epoch = resolve_epoch_number(self.w3, filter_params.get("fromEpoch"), "latest_checkpoint")
+        to_epoch = resolve_epoch_number(self.w3, filter_params.get("toEpoch"), "latest_state")
+        synced_epoch = self.synced_epoch
+        logs: List[LogReceipt] = []
+        # (from epoch, to epoch, whether the range is read from the index)
+        ranges = (
+            (from_epoch, min(to_epoch, self.start_epoch - 1), False),
+            (max(from_epoch, self.start_epoch), min(to_epoch, synced_epoch), True),
+            (max(from_epoch, self.start_epoch, synced_epoch + 1), to_epoch, False),
+        )
+        for start, end, is_local in ranges:
+            if start > end:
+                continue
+            if is_local:
+                logs.extend(self._query(filter_params, start, end))
+            else:
+                node_filter = cast(FilterParams, {**filter_params, "fromEpoch": start, "toEpoch": end})
+                logs.extend(self.w3.cfx._get_logs(node_filter))
+        return logs
+
+    def _query(self, filter_params: FilterParams, from_epoch: int, to_epoch: int) -> List[LogReceipt]:
+        conditions = ["chain_id = ?", "epoch_number BETWEEN ? AND ?"]
+        args: List[Any] = [self.w3.cfx.chain_id, from_epoch, to_epoch]
+        addresses = self._get_filter_addresses(filter_params)
+        if addresses is not None:
+            conditions.append(f"address IN ({', '.join('?' * len(addresses))})")
+            args.extend(addresses)
+        for position, topic in enumerate(filter_params.get("topics") or []):
+            if topic is None or (isinstance(topic, (list, tuple)) and len(topic) == 0):
+                continue
+            topics = topic if isinstance(topic, (list, tuple)) else [topic]
+            conditions.append(f"topic{position} IN ({', '.join('?' * len(topics))})")
+            args.extend(_to_topic_key(item) for item in topics) # type: ignore
+        rows = self._get_connection().execute(
+            f"SELECT log FROM logs WHERE {' AND '.join(conditions)} ORDER BY epoch_number, rowid", args
+        )
+        return [log_entry_formatter(json.loads(row[0])) for row in rows]
+
+    def count(self) -> int:
+        return self._get_connection().execute("SELECT COUNT(*) FROM logs").fetchone()[0]
+
@@ -0,0 +1,206 @@
+from collections import (
+    deque,
+)
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from eth_utils import (
+    is_integer,
+)
+
+from conflux_web3.types import (
+    FilterParams,
+    LogReceipt,
+    ResultMode,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+# substrings of the node error messages showing the epoch span of cfx_getLogs exceeds the node limit
+EPOCH_SPAN_ERROR_PATTERNS = (
+    "larger than max_gap",
+    "epoch span",
+    "epoch range",
+    "gap between",
+)
+# substrings of the node error messages showing cfx_getLogs matches more logs than the node limit
+TOO_MANY_LOGS_ERROR_PATTERNS = (
+    "too many logs",
+    "query returned more than",
+)
+
+# (from epoch, to epoch, future of the logs in the range)
+_Chunk = Tuple[int, int, "Future[List[LogReceipt]]"]
+
+
+def _get_error_message(error: Any) -> str:
+    if isinstance(error, ValueError) and len(error.args) == 1 and isinstance(error.args[0], dict):
+        error = error.args[0]
+    if isinstance(error, dict):
+        return f"{error.get('message', '')} {error.get('data', '')}".lower()
+    return str(error).lower()
+
+def is_epoch_span_error(error: Any) -> bool:
+    """
+    returns if the error shows the epoch span of the filter exceeds the node limit
+    """
+    message = _get_error_message(error)
+    return any(pattern in message for pattern in EPOCH_SPAN_ERROR_PATTERNS)
+
+def is_too_many_logs_error(error: Any) -> bool:
+    """
+    returns if the error shows the filter matches more logs than the node limit
+    """
+    message = _get_error_message(error)
+    return any(pattern in message for pattern in TOO_MANY_LOGS_ERROR_PATTERNS)
+
+def resolve_epoch_number(w3: "Web3", epoch: Any, default: str) -> int:
+    """
+    returns the epoch number of an epoch number param of a filter, epoch tags are queried from the node
+    """
+    if epoch is None:
+        epoch = default
+    if is_integer(epoch):
+        return int(epoch)
+    if isinstance(epoch, bytes):
+        return int.from_bytes(epoch, "big")
+    if isinstance(epoch, str) and epoch.startswith("0x"):
+        return int(epoch, 16)
+    return int(w3.cfx.epoch_number_by_tag(epoch))
+
+
+class LogIterator:
+    def __init__(
+        self,
+        w3: "Web3",
+        filter_params: FilterParams,
+        chunk_size: int = 1000,
+        concurrency: int = 4,
+        max_chunk_size: Optional[int] = None,
+        sparse_threshold: int = 1000,
+        result_mode: ResultMode = "default",
+    ) -> None:
+        """
+        iterate the logs matching the filter over a large epoch range.
+        The range is split into chunks queried by ``cfx_getLogs`` in parallel,
+        and the logs are yielded in epoch order.
+
+        Chunk size adapts to the node limits and the log density:
+
+        - a chunk rejected for its epoch span or for matching too many logs is split in halves and retried,
+          and later chunks are smaller
+        - the chunk size is doubled after a chunk returns fewer logs than ``sparse_threshold``
+
+        At most ``concurrency`` chunks are queried or buffered at the same time, so memory is bounded.
+
+        >>> for log in LogIterator(w3, {"fromEpoch": 97134060, "toEpoch": 99134060, "address": address}):
+        ...     process(log)
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to query logs
+        filter_params : FilterParams
+            the filter, fromEpoch defaults to "latest_checkpoint" and toEpoch defaults to "latest_state".
+            Epoch tags are resolved to epoch numbers once before iterating.
+            Filters using blockHashes or block numbers are queried with a single ``cfx_getLogs``
+        chunk_size : int, optional
+            epoch count of the first chunk, by default 1000
+        concurrency : int, optional
+            max count of chunks queried at the same time, by default 4
+        max_chunk_size : Optional[int], optional
+            max epoch count of a chunk, by default None which means only limited by the node
+        sparse_threshold : int, optional
+            the chunk size grows after a chunk returns fewer logs than this, by default 1000
+        result_mode : ResultMode, optional
+            the result mode of the logs, by default "default"
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size is expected to be positive, but {chunk_size} is received")
+        if concurrency < 1:
+            raise ValueError(f"concurrency is expected to be positive, but {concurrency} is received")
+        self.w3 = w3
+        self.filter_params = filter_params
+        self.chunk_size = chunk_size if max_chunk_size is None else min(chunk_size, max_chunk_size)
+        self.concurrency = concurrency
+        self.max_chunk_size = max_chunk_size
+        self.sparse_threshold = sparse_threshold
+        self._client = w3.cfx if w3.cfx.result_mode == result_mode else w3.cfx.with_result_mode(result_mode)
+
+    def __iter__(self) -> Iterator[LogReceipt]:
+        filter_params = self.filter_params
+        if (
+            filter_params.get("blockHashes") is not None
+            or filter_params.get("fromBlock") is not None
+            or filter_params.get("toBlock") is not None
+        ):
+            yield from self._client.get_logs(filter_params)
+            return
+        from_epoch = self._resolve_epoch(filter_params.get("fromEpoch"), "latest_checkpoint")
+        to_epoch = self._resolve_epoch(filter_params.get("toEpoch"), "latest_state")
+        if from_epoch > to_epoch:
+            return
+        yield from self._iter_range(from_epoch, to_epoch)
+
+    def _resolve_epoch(self, epoch: Any, default: str) -> int:
+        return resolve_epoch_number(self.w3, epoch, default)
+
+    def _query(self, from_epoch: int, to_epoch: int) -> List[LogReceipt]:
+        filter_params = dict(self.filter_params)
+        filter_params["fromEpoch"] = from_epoch
+        filter_params["toEpoch"] = to_epoch
+        return self._client.get_logs(filter_params) # type: ignore
+
+    def _shrink(self, span: int, is_span_limit: bool) -> None:
+        self.chunk_size = max(1, min(self.chunk_size, span // 2))
+        if is_span_limit:
+            # the node rejects spans this large regardless of the log density
+            self.max_chunk_size = max(1, span - 1) if self.max_chunk_size is None else min(self.max_chunk_size, span - 1)
+
+    def _grow(self) -> None:
+        self.chunk_size *= 2
+        if self.max_chunk_size is not None:
+            self.chunk_size = min(self.chunk_size, self.max_chunk_size)
+
+    def _iter_range(self, from_epoch: int, to_epoch: int) -> Iterator[LogReceipt]:
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        # chunks in epoch order, the head is the next to yield
+        pending: Deque[_Chunk] = deque()
+        next_epoch = from_epoch
+        try:
+            while pending or next_epoch <= to_epoch:
+                while len(pending) < self.concurrency and next_epoch <= to_epoch:
+                    chunk_end = min(next_epoch + self.chunk_size - 1, to_epoch)
+                    pending.append((next_epoch, chunk_end, executor.submit(self._query, next_epoch, chunk_end)))
+                    next_epoch = chunk_end + 1
+                start, end, future = pending.popleft()
+                exception = future.exception()
+                if exception is not None:
+                    is_span_limit = is_epoch_span_error(exception)
+                    if start == end or not (is_span_limit or is_too_many_logs_error(exception)):
+                        raise exception
+                    self._shrink(end - start + 1, is_span_limit)
+                    middle = (start + end) // 2
+                    pending.appendleft((middle + 1, end, executor.submit(self._query, middle + 1, end)))
+                    pending.appendleft((start, middle, executor.submit(self._query, start, middle)))
+                    continue
+                logs = future.result()
+                if len(logs) < self.sparse_threshold and end - start + 1 >= self.chunk_size:
+                    self._grow()
+                yield from logs
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -13,11 +13,15 @@ from eth_abi.codec import (
     ABICodec
 )
 from web3 import (
-    Web3 as OriWeb3
+    Web3 as OriWeb3,
+    AsyncWeb3 as OriAsyncWeb3,
 )
 from web3.providers.base import (
     BaseProvider,
 )
+from web3.providers.async_base import (
+    AsyncBaseProvider,
+)
 from web3.types import (
     RPCEndpoint
 )
@@ -39,18 +43,26 @@ from conflux_web3.types import (
     MiddlewareOnion
 )
 from conflux_web3.middleware import (
-    conflux_default_middlewares
+    conflux_default_middlewares,
+    async_conflux_default_middlewares,
 )
 
 from conflux_web3.client import (
     ConfluxClient
 )
+from conflux_web3.async_client import (
+    AsyncConfluxClient
+)
 from conflux_web3.txpool import (
-    Txpool
+    Txpool,
+    AsyncTxpool,
 )
 from conflux_web3.exceptions import (
     DeploymentInfoNotFound
 )
+from conflux_web3.providers import (
+    ConfluxHTTPProvider
+)
 from conflux_web3._utils.abi import (
     build_cfx_default_registry
 )
@@ -58,10 +70,12 @@ from cns import (
     CNS
 )
 if TYPE_CHECKING:
-    from conflux_web3.middleware.wallet import Wallet
+    from conflux_web3.middleware.wallet import Wallet, AsyncWallet
 
 # The module name __name__ should be Web3 
 class Web3(OriWeb3):
+    HTTPProvider = ConfluxHTTPProvider
+
     cfx: ConfluxClient
     txpool: Txpool
     
@@ -204,3 +218,100 @@ class Web3(OriWeb3):
         assert "error" not in response # type: ignore
 
         return True
+
+
+class AsyncWeb3(OriAsyncWeb3):
+    cfx: AsyncConfluxClient
+    txpool: AsyncTxpool
+
+    def __init__(
+        self,
+        provider: AsyncBaseProvider,
+        middlewares: Optional[Sequence[Any]] = None,
+        modules: Optional[Dict[str, Union[Type[Module], Sequence[Any]]]] = None,
+        **kwargs,
+    ):
+        """
+        initialize an ``AsyncWeb3`` instance to interact with the blockchain asynchronously.
+        Name service is not supported by ``AsyncWeb3`` currently.
+
+        >>> w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider("https://test.confluxrpc.com"))
+        >>> await w3.cfx.epoch_number
+
+        Parameters
+        ----------
+        provider : AsyncBaseProvider
+            ``provider`` decides on how to connect to the blockchain, 
+        middlewares : Optional[Sequence[Any]], optional
+            middlewares to use, recommended not to specify
+        modules : Optional[Dict[str, Union[Type[Module], Sequence[Any]]]], optional
+            modules to use, recommended not to specify
+        """
+        if middlewares is None:
+            middlewares = async_conflux_default_middlewares(self)
+        self.manager = self.RequestManager(self, provider, middlewares)
+        self.codec = ABICodec(build_cfx_default_registry())
+
+        if modules is None:
+            modules = {
+                "cfx": AsyncConfluxClient,
+                "txpool": AsyncTxpool,
+            }
+
+        if "cfx" not in modules:
+            raise ValueError("cfx module is missing in modules: cfx module is required to initialze a web3 instance")
+
+        self.attach_modules(modules)  # type: ignore
+
+        self.__setattr__("eth", self.cfx)
+        self.cns = cast(CNS, empty)
+
+    @property
+    def account(self) -> Account:
+        return self.cfx.account
+
+    @property
+    def api(self) -> str:
+        from conflux_web3 import __version__
+        return __version__
+
+    @property
+    def ens(self) -> CNS:
+        return self.cns
+
+    @ens.setter
+    def ens(self, new_cns: CNS) -> None:
+        self.cns = new_cns
+
+    @property
+    def cns(self) -> CNS:
+        return self._ens # type: ignore
+
+    @cns.setter
+    def cns(self, new_cns: CNS) -> None:
+        if new_cns is not empty:
+            raise ValueError("Name service is not supported by AsyncWeb3")
+        self._ens = new_cns
+
+    @property
+    def middleware_onion(self) -> MiddlewareOnion:
+        return cast(MiddlewareOnion, self.manager.middleware_onion)
+
+    @property
+    async def client_version(self) -> str:
+        return await self.cfx.client_version
+
+    @property
+    def wallet(self) -> "AsyncWallet":
+        return self.middleware_onion.get("wallet", None) # type: ignore
+
+    async def is_connected(self) -> bool: # type: ignore
+        try:
+            response = await self.provider.make_request(RPCEndpoint("cfx_clientVersion"), [])
+        except OSError:
+            return False
+
+        assert response["jsonrpc"] == "2.0" # type: ignore
+        assert "error" not in response # type: ignore
+
+        return True
@@ -4,37 +4,61 @@ from typing import (
     Tuple,
 )
 from conflux_web3.middleware.pending import (
-    PendingTransactionMiddleware
+    PendingTransactionMiddleware,
+    async_pending_transaction_middleware,
 )
 from conflux_web3.middleware.wallet import (
     Wallet,
+    AsyncWallet,
     construct_sign_and_send_raw_middleware
 )
 from conflux_web3.middleware.cache import (
-    simple_cache_middleware
+    simple_cache_middleware,
+    EpochCacheMiddleware,
+    construct_epoch_cache_middleware,
+)
+from conflux_web3.middleware.persistent_cache import (
+    PersistentCacheMiddleware,
+    construct_persistent_cache_middleware,
 )
 from conflux_web3.middleware.names import (
     name_to_address_middleware
 )
 from conflux_web3.types import (
-    Middleware
+    Middleware,
+    AsyncMiddleware,
 )
 
 if TYPE_CHECKING:
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
 
 def conflux_default_middlewares(w3: "Web3") -> Sequence[Tuple[Middleware, str]]:
     return [
         (name_to_address_middleware(w3), "name_to_address"),
         (PendingTransactionMiddleware, "PendingTransactionMiddleware"),
         (Wallet(), "wallet"),
-        (simple_cache_middleware, "CacheMiddleware"),
+        (EpochCacheMiddleware(), "CacheMiddleware"),
+    ]
+
+def async_conflux_default_middlewares(async_w3: "AsyncWeb3") -> Sequence[Tuple[AsyncMiddleware, str]]:
+    # name service is not supported by AsyncWeb3 currently,
+    # so name_to_address middleware is not included
+    return [
+        (async_pending_transaction_middleware, "PendingTransactionMiddleware"),
+        (AsyncWallet(), "wallet"),
     ]
 
 
 __all__ = [
     "PendingTransactionMiddleware",
+    "async_pending_transaction_middleware",
     "Wallet",
+    "AsyncWallet",
     "construct_sign_and_send_raw_middleware",
-    "conflux_default_middlewares"
+    "EpochCacheMiddleware",
+    "construct_epoch_cache_middleware",
+    "PersistentCacheMiddleware",
+    "construct_persistent_cache_middleware",
+    "conflux_default_middlewares",
+    "async_conflux_default_middlewares",
 ]
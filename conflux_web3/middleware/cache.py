@@ -1,12 +1,34 @@
+import threading
+import time
+from collections import (
+    OrderedDict,
+)
 from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
     Set,
+    Tuple,
     cast,
 )
 
 from web3.middleware.cache import (
     construct_simple_cache_middleware
 )
+from web3._utils.caching import (
+    generate_cache_key,
+)
 from conflux_web3.types import RPCEndpoint
+from conflux_web3._utils.rpc_abi import (
+    RPC
+)
+
+if TYPE_CHECKING:
+    from web3.types import RPCResponse
+    from conflux_web3 import Web3
 
 CONFLUX_SIMPLE_CACHE_RPC_WHITELIST = cast(
     Set[RPCEndpoint],
@@ -19,3 +41,327 @@ CONFLUX_SIMPLE_CACHE_RPC_WHITELIST = cast(
 simple_cache_middleware = construct_simple_cache_middleware(
     rpc_whitelist=CONFLUX_SIMPLE_CACHE_RPC_WHITELIST,
 )
+
+# the index of the epoch number parameter of the RPCs whose result is decided by the epoch
+EPOCH_PARAM_INDEX: Dict[RPCEndpoint, int] = {
+    RPC.cfx_getBlockByEpochNumber: 0,
+    RPC.cfx_getBlocksByEpoch: 0,
+    RPC.cfx_getSkippedBlocksByEpoch: 0,
+    RPC.cfx_getEpochReceipts: 0,
+    RPC.cfx_getBlockRewardInfo: 0,
+    RPC.cfx_getInterestRate: 0,
+    RPC.cfx_getAccumulateInterestRate: 0,
+    RPC.cfx_getParamsFromVote: 0,
+    RPC.cfx_getCollateralInfo: 0,
+    RPC.cfx_call: 1,
+    RPC.cfx_estimateGasAndCollateral: 1,
+    RPC.cfx_getBalance: 1,
+    RPC.cfx_getStakingBalance: 1,
+    RPC.cfx_getNextNonce: 1,
+    RPC.cfx_getCode: 1,
+    RPC.cfx_getStorageRoot: 1,
+    RPC.cfx_getCollateralForStorage: 1,
+    RPC.cfx_getSponsorInfo: 1,
+    RPC.cfx_getAccount: 1,
+    RPC.cfx_getDepositList: 1,
+    RPC.cfx_getVoteList: 1,
+    RPC.cfx_getAdmin: 1,
+    RPC.cfx_getStorageAt: 2,
+}
+
+# RPCs queried by hash, the result is immutable if the epoch of the result is finalized
+RESULT_EPOCH_RPCS: Set[RPCEndpoint] = {
+    RPC.cfx_getBlockByHash,
+    RPC.cfx_getBlockByHashWithPivotAssumption,
+    RPC.cfx_getTransactionReceipt,
+}
+
+# RPCs cached with a short ttl if the result is decided by the latest epoch
+DEFAULT_VOLATILE_RPC_WHITELIST: Set[RPCEndpoint] = {
+    RPC.cfx_gasPrice,
+}
+
+# opt-in whitelist also caching the chain head for a short ttl,
+# which should not be used if the chain head is polled, e.g. by LogFollower or ReceiptWatcher
+LATEST_EPOCH_RPC_WHITELIST: Set[RPCEndpoint] = {
+    RPC.cfx_gasPrice,
+    RPC.cfx_getStatus,
+    RPC.cfx_epochNumber,
+    RPC.cfx_getBestBlockHash,
+    RPC.cfx_getBlockByEpochNumber,
+}
+
+# RPCs whose results update the observed latest and finalized epochs, even if they are not cached
+EPOCH_OBSERVING_RPCS: Set[RPCEndpoint] = {
+    RPC.cfx_getStatus,
+    RPC.cfx_epochNumber,
+}
+
+# the volatile cache is cleared once a transaction is sent
+STATE_CHANGING_RPCS: Set[RPCEndpoint] = {
+    RPC.cfx_sendTransaction,
+    RPC.cfx_sendRawTransaction,
+}
+
+LATEST_EPOCH_TAGS = {None, "latest_state", "latest_mined"}
+
+def _copy_json(value: Any) -> Any:
+    """
+    copies the dicts and lists of a decoded JSON value,
+    so that callers mutating a returned result won't change the cached response
+    """
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+def _parse_epoch_number(value: Any) -> Optional[int]:
+    """
+    returns the epoch number if value is a fixed epoch, else None
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if value == "earliest":
+        return 0
+    # block hash is 66 characters long, which is not an epoch number
+    if isinstance(value, str) and value.startswith("0x") and len(value) < 66:
+        try:
+            return int(value, 16)
+        except ValueError:
+            return None
+    return None
+
+def get_request_epoch(method: RPCEndpoint, params: Any) -> Optional[int]:
+    """
+    returns the fixed epoch number the request is queried against,
+    or None if the request is not queried against a fixed epoch
+    """
+    if method not in EPOCH_PARAM_INDEX:
+        return None
+    index = EPOCH_PARAM_INDEX[method]
+    if params is None or len(params) <= index:
+        return None
+    return _parse_epoch_number(params[index])
+
+def get_result_epoch(method: RPCEndpoint, result: Any) -> Optional[int]:
+    """
+    returns the epoch number of the block or receipt queried by hash
+    """
+    if method not in RESULT_EPOCH_RPCS or not isinstance(result, dict):
+        return None
+    return _parse_epoch_number(result.get("epochNumber"))
+
+def get_immutable_epoch(method: RPCEndpoint, params: Any, result: Any) -> Optional[int]:
+    """
+    returns the epoch number deciding the result,
+    the result is immutable once this epoch is finalized.
+    Returns None if the result is not decided by a fixed epoch
+    """
+    epoch = get_request_epoch(method, params)
+    if epoch is None:
+        epoch = get_result_epoch(method, result)
+    return epoch
+
+def is_latest_epoch_request(method: RPCEndpoint, params: Any) -> bool:
+    if method not in EPOCH_PARAM_INDEX and method != RPC.cfx_epochNumber:
+        return method not in RESULT_EPOCH_RPCS
+    index = EPOCH_PARAM_INDEX.get(method, 0)
+    epoch_param = params[index] if params is not None and len(params) > index else None
+    return epoch_param in LATEST_EPOCH_TAGS
+
+
+class EpochTracker:
+    def __init__(self, refresh_interval: float = 1) -> None:
+        """
+        tracks the latest and finalized epoch observed from responses.
+
+        Parameters
+        ----------
+        refresh_interval : float, optional
+            min seconds between two latest_finalized epoch queries, by default 1
+        """
+        self.refresh_interval = refresh_interval
+        self.latest_epoch = -1
+        self.finalized_epoch = -1
+        self._finalized_epoch_checked_at = -float("inf")
+        self._lock = threading.Lock()
+
+    def observe(self, method: RPCEndpoint, params: Any, result: Any) -> None:
+        if method == RPC.cfx_getStatus and isinstance(result, dict):
+            latest_epoch = _parse_epoch_number(result.get("epochNumber"))
+            finalized_epoch = _parse_epoch_number(result.get("latestFinalized"))
+        elif method == RPC.cfx_epochNumber:
+            tag = params[0] if params else None
+            epoch = _parse_epoch_number(result)
+            latest_epoch = epoch if tag in LATEST_EPOCH_TAGS else None
+            finalized_epoch = epoch if tag == "latest_finalized" else None
+        else:
+            return
+        with self._lock:
+            if latest_epoch is not None and latest_epoch > self.latest_epoch:
+                self.latest_epoch = latest_epoch
+            if finalized_epoch is not None and finalized_epoch > self.finalized_epoch:
+                self.finalized_epoch = finalized_epoch
+
+    def is_finalized(self, epoch: int, make_request: Callable[..., "RPCResponse"]) -> bool:
+        """
+        returns if the epoch is finalized, 
+        the latest_finalized epoch is queried via make_request if the epoch is newer than the known finalized epoch
+        """
+        if epoch <= self.finalized_epoch:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            if now - self._finalized_epoch_checked_at < self.refresh_interval:
+                return False
+            self._finalized_epoch_checked_at = now
+        params = ["latest_finalized"]
+        response = make_request(RPC.cfx_epochNumber, params)
+        if "result" in response:
+            self.observe(RPC.cfx_epochNumber, params, response["result"])
+        return epoch <= self.finalized_epoch
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class EpochCacheMiddleware:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 1,
+        volatile_rpc_whitelist: Optional[Set[RPCEndpoint]] = None,
+    ) -> None:
+        """
+        a response cache middleware aware of conflux epoch semantics.
+        Note: this CLASS is not a web3.middleware, an INSTANCE is the actual middleware.
+
+        - results queried against a fixed epoch at or below latest_finalized epoch,
+          and blocks or receipts by hash in finalized epochs, are cached without expiry
+        - results queried against latest_state or latest_mined epoch are cached until the ttl expires
+          or a newer epoch is observed
+        - the cache is bounded in size and least recently used entries are evicted first
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            the max count of cached responses, by default 1024
+        ttl : float, optional
+            seconds a latest epoch result lives, by default 1
+        volatile_rpc_whitelist : Optional[Set[RPCEndpoint]], optional
+            RPCs to cache if queried against latest epoch, by default only cfx_gasPrice.
+            ``LATEST_EPOCH_RPC_WHITELIST`` also caches cfx_getStatus, cfx_epochNumber, cfx_getBestBlockHash
+            and cfx_getBlockByEpochNumber, so that the chain head is queried at most once per ttl
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.volatile_rpc_whitelist = (
+            DEFAULT_VOLATILE_RPC_WHITELIST if volatile_rpc_whitelist is None else set(volatile_rpc_whitelist)
+        )
+        self.hits = 0
+        self.misses = 0
+        # key -> (response, expire time or None if never expires, epoch number when cached)
+        self._cache: "OrderedDict[str, Tuple[RPCResponse, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._epochs = EpochTracker(ttl)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._cache))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _clear_volatile(self) -> None:
+        with self._lock:
+            for key in [key for key, (_, expire_at, _) in self._cache.items() if expire_at is not None]:
+                del self._cache[key]
+
+    def _get(self, key: str) -> Optional["RPCResponse"]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                response, expire_at, epoch = entry
+                if expire_at is None or (expire_at > time.monotonic() and epoch >= self._epochs.latest_epoch):
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._cache[key]
+            self.misses += 1
+            return None
+
+    def _set(self, key: str, response: "RPCResponse", ttl: Optional[float]) -> None:
+        expire_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._cache[key] = (response, expire_at, self._epochs.latest_epoch)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def _get_ttl(
+        self, method: RPCEndpoint, params: Any, result: Any, make_request: Callable[..., "RPCResponse"]
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        returns if the response should be cached and the ttl of the response
+        """
+        epoch = get_immutable_epoch(method, params, result)
+        if epoch is not None and self._epochs.is_finalized(epoch, make_request):
+            return True, None
+        if method in self.volatile_rpc_whitelist and is_latest_epoch_request(method, params):
+            return True, self.ttl
+        return False, None
+
+    def __call__(self, make_request: Callable[..., "RPCResponse"], w3: "Web3") -> Callable[..., "RPCResponse"]:
+        def middleware(method: RPCEndpoint, params: Any) -> "RPCResponse":
+            if method in STATE_CHANGING_RPCS:
+                self._clear_volatile()
+                return make_request(method, params)
+
+            cacheable = (
+                method in EPOCH_PARAM_INDEX
+                or method in RESULT_EPOCH_RPCS
+                or method in self.volatile_rpc_whitelist
+            )
+            if not cacheable:
+                response = make_request(method, params)
+                if method in EPOCH_OBSERVING_RPCS and "result" in response:
+                    self._epochs.observe(method, params, response["result"])
+                return response
+
+            try:
+                key = generate_cache_key((method, params))
+            except TypeError:
+                return make_request(method, params)
+
+            cached_response = self._get(key)
+            if cached_response is not None:
+                return _copy_json(cached_response)
+
+            response = make_request(method, params)
+            if "error" in response or response.get("result") is None:
+                return response
+            self._epochs.observe(method, params, response["result"])
+            should_cache, ttl = self._get_ttl(method, params, response["result"], make_request)
+            if should_cache:
+                self._set(key, _copy_json(response), ttl)
+            return response
+        return middleware
+
+
+def construct_epoch_cache_middleware(
+    maxsize: int = 1024,
+    ttl: float = 1,
+    volatile_rpc_whitelist: Optional[Set[RPCEndpoint]] = None,
+) -> EpochCacheMiddleware:
+    """
+    construct a cache middleware aware of epoch semantics, see ``EpochCacheMiddleware``
+    """
+    return EpochCacheMiddleware(maxsize, ttl, volatile_rpc_whitelist)
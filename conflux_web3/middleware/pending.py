@@ -7,7 +7,7 @@ from conflux_web3.types.transaction_hash import (
 )
 
 if TYPE_CHECKING:
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
 
     
 class PendingTransactionMiddleware:
@@ -25,3 +25,20 @@ class PendingTransactionMiddleware:
                 response["result"] = transaction_hash
         return response
 
+
+
+async def async_pending_transaction_middleware(make_request, async_w3: "AsyncWeb3"):
+    """
+    Async version of `PendingTransactionMiddleware`, 
+    wraps the result of cfx_sendTransaction and cfx_sendRawTransaction as `TransactionHash`
+    """
+    async def middleware(method, params):
+        response = await make_request(method, params)
+        if method == RPC.cfx_sendTransaction or method == RPC.cfx_sendRawTransaction:
+            if "result" in response:
+                transaction_hash = TransactionHash(response["result"])
+                transaction_hash.set_w3(async_w3)
+                
+                response["result"] = transaction_hash
+        return response
+    return middleware
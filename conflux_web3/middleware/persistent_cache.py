@@ -0,0 +1,197 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Optional,
+)
+
+from web3._utils.caching import (
+    generate_cache_key,
+)
+
+from conflux_web3.types import RPCEndpoint
+from conflux_web3._utils.rpc_abi import (
+    RPC
+)
+from conflux_web3.middleware.cache import (
+    EPOCH_PARAM_INDEX,
+    RESULT_EPOCH_RPCS,
+    CacheInfo,
+    EpochTracker,
+    get_immutable_epoch,
+    get_result_epoch,
+)
+
+if TYPE_CHECKING:
+    from web3.types import RPCResponse
+    from conflux_web3 import Web3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rpc_results (
+    chain_id INTEGER NOT NULL,
+    cache_key TEXT NOT NULL,
+    method TEXT NOT NULL,
+    epoch INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (chain_id, cache_key)
+)
+"""
+
+# RPCs whose result is decided by the epoch of the block in its blockHash field
+BLOCK_HASH_RESULT_RPCS = {
+    RPC.cfx_getTransactionByHash,
+}
+
+
+class PersistentCacheMiddleware:
+    def __init__(self, path: str, refresh_interval: float = 1, timeout: float = 30) -> None:
+        """
+        a middleware persisting immutable RPC results in a sqlite database,
+        so that finalized chain data is not downloaded again after restarting.
+        Note: this CLASS is not a web3.middleware, an INSTANCE is the actual middleware.
+
+        A result is persisted if it is queried against an epoch at or below the latest_finalized epoch,
+        or it is a block, receipt or transaction queried by hash whose epoch is finalized.
+        The epoch of a transaction is the epoch of the block packing it, which is queried via cfx_getBlockByHash.
+        Raw JSON-RPC results are stored so result formatters still apply.
+        The database can be shared by multiple processes and different networks.
+
+        >>> w3.middleware_onion.add(PersistentCacheMiddleware("chain_data.sqlite"), "persistent_cache")
+
+        Parameters
+        ----------
+        path : str
+            path of the sqlite database file
+        refresh_interval : float, optional
+            min seconds between two latest_finalized epoch queries, by default 1
+        timeout : float, optional
+            seconds to wait for the database lock held by another process, by default 30
+        """
+        self.path = path
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._epochs = EpochTracker(refresh_interval)
+        self._chain_id: Optional[int] = None
+        # sqlite connections can't be shared across threads or processes
+        self._local = threading.local()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        # WAL allows readers and a writer from different processes at the same time
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _init_db(self) -> None:
+        connection = self._get_connection()
+        connection.execute(_SCHEMA)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    def get(self, chain_id: int, cache_key: str) -> Optional[Any]:
+        row = self._get_connection().execute(
+            "SELECT result FROM rpc_results WHERE chain_id = ? AND cache_key = ?", (chain_id, cache_key)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, chain_id: int, cache_key: str, method: RPCEndpoint, epoch: int, result: Any) -> None:
+        # the result is immutable, so the record is never replaced
+        self._get_connection().execute(
+            "INSERT OR IGNORE INTO rpc_results (chain_id, cache_key, method, epoch, result) VALUES (?, ?, ?, ?, ?)",
+            (chain_id, cache_key, method, epoch, json.dumps(result)),
+        )
+
+    def count(self) -> int:
+        return self._get_connection().execute("SELECT COUNT(*) FROM rpc_results").fetchone()[0]
+
+    def close(self) -> None:
+        if getattr(self._local, "pid", None) == os.getpid():
+            self._local.connection.close()
+            del self._local.connection
+            del self._local.pid
+
+    def _get_chain_id(self, make_request: Callable[..., "RPCResponse"]) -> Optional[int]:
+        if self._chain_id is None:
+            response = make_request(RPC.cfx_getStatus, [])
+            if "result" in response:
+                self._epochs.observe(RPC.cfx_getStatus, [], response["result"])
+                self._chain_id = int(response["result"]["chainId"], 16)
+        return self._chain_id
+
+    def _get_key(self, method: RPCEndpoint, params: Any) -> Optional[str]:
+        try:
+            return generate_cache_key((method, params))
+        except TypeError:
+            return None
+
+    def __call__(self, make_request: Callable[..., "RPCResponse"], w3: "Web3") -> Callable[..., "RPCResponse"]:
+        def get_block_epoch(result: Any) -> Optional[int]:
+            block_hash = result.get("blockHash") if isinstance(result, dict) else None
+            if block_hash is None:
+                # the transaction is pending
+                return None
+            # queried through this middleware so that the block is persisted as well
+            response = middleware(RPC.cfx_getBlockByHash, [block_hash, False])
+            return get_result_epoch(RPC.cfx_getBlockByHash, response.get("result"))
+
+        def middleware(method: RPCEndpoint, params: Any) -> "RPCResponse":
+            if (
+                method not in EPOCH_PARAM_INDEX
+                and method not in RESULT_EPOCH_RPCS
+                and method not in BLOCK_HASH_RESULT_RPCS
+            ):
+                return make_request(method, params)
+            cache_key = self._get_key(method, params)
+            chain_id = self._get_chain_id(make_request)
+            if cache_key is None or chain_id is None:
+                return make_request(method, params)
+
+            result = self.get(chain_id, cache_key)
+            if result is not None:
+                self.hits += 1
+                return {"jsonrpc": "2.0", "id": -1, "result": result} # type: ignore
+            self.misses += 1
+
+            response = make_request(method, params)
+            if "error" in response or response.get("result") is None:
+                return response
+            epoch = get_immutable_epoch(method, params, response["result"])
+            if epoch is None and method in BLOCK_HASH_RESULT_RPCS:
+                epoch = get_block_epoch(response["result"])
+            if epoch is not None and self._epochs.is_finalized(epoch, make_request):
+                try:
+                    self.set(chain_id, cache_key, method, epoch, response["result"])
+                except (TypeError, ValueError):
+                    # the result is not raw JSON, probably processed by another middleware
+                    pass
+            return response
+        return middleware
+
+    def cache_info(self) -> CacheInfo:
+        """
+        returns hits and misses of this middleware instance and the count of persisted results.
+        maxsize is -1 because the database is not bounded
+        """
+        return CacheInfo(self.hits, self.misses, -1, self.count())
+
+
+def construct_persistent_cache_middleware(
+    path: str, refresh_interval: float = 1, timeout: float = 30
+) -> PersistentCacheMiddleware:
+    """
+    construct a middleware persisting finalized RPC results in a sqlite database, see ``PersistentCacheMiddleware``
+    """
+    return PersistentCacheMiddleware(path, refresh_interval, timeout)
@@ -37,7 +37,7 @@ from conflux_web3._utils.rpc_abi import (
 )
 
 if TYPE_CHECKING:
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
 
 _PrivateKey = Union[LocalAccount, PrivateKey, str, bytes]
 
@@ -128,24 +128,57 @@ class Wallet:
         # any account added to wallet is a brand new object
         return Account.from_key(private_key, self._chain_id)
     
+    def _get_signing_account(self, w3: Union["Web3", "AsyncWeb3"], method: str, params: Sequence[Any]) -> Optional[LocalAccount]:
+        """
+        returns the account to sign the transaction if the request should be signed by the wallet,
+        else returns None
+        """
+        if method != RPC.cfx_sendTransaction:
+            return None
+        
+        transaction: TxDict = params[0]
+        if "from" not in transaction:
+            return None
+        transaction["from"] = resolve_if_cns_name(w3, transaction["from"]) # type: ignore
+        if transaction["from"] not in self:
+            return None
+        return self[transaction["from"]]
+
+    def _report_send_result(self, w3: "Web3", transaction: TxDict, response: Optional[Dict[str, Any]]) -> None:
+        """
+        reports the send result to the nonce manager of w3.cfx if it is set.
+        ``response`` is None if the request failed without a JSON-RPC response
+        """
+        nonce_manager = getattr(w3.cfx, "nonce_manager", None)
+        if nonce_manager is None or "from" not in transaction or "nonce" not in transaction:
+            return
+        nonce = transaction["nonce"]
+        if isinstance(nonce, str):
+            nonce = int(nonce, 16)
+        if response is not None and "error" not in response:
+            nonce_manager.accept(transaction["from"], nonce)
+            return
+        nonce_manager.handle_send_error(
+            transaction["from"], nonce, response["error"] if response is not None else None
+        )
+
     def __call__(self, make_request: Callable[..., Dict[str, Any]], w3: "Web3"):
         def inner(method: str, params: Sequence[Any]):
             if method != RPC.cfx_sendTransaction:
                 return make_request(method, params)
             
-            transaction: TxDict = params[0]
-            if "from" not in transaction:
-                return make_request(method, params)
-            else:
-                transaction["from"] = resolve_if_cns_name(w3, transaction["from"])
-                if transaction["from"] not in self:
-                    return make_request(method, params)
-            
-            account = self[transaction["from"]]
-            raw_tx = account.sign_transaction(transaction).rawTransaction
-            # because param formatting has been done before middleware process
-            # we do the param formatting manually
-            response = make_request(RPC.cfx_sendRawTransaction, [raw_tx.hex()])
+            response = None
+            try:
+                account = self._get_signing_account(w3, method, params)
+                if account is None:
+                    response = make_request(method, params)
+                else:
+                    raw_tx = account.sign_transaction(params[0]).rawTransaction
+                    # because param formatting has been done before middleware process
+                    # we do the param formatting manually
+                    response = make_request(RPC.cfx_sendRawTransaction, [raw_tx.hex()])
+            finally:
+                self._report_send_result(w3, params[0], response)
             return response
         return inner
 
@@ -180,6 +213,23 @@ class Wallet:
             return self._accounts_map.pop(address)
 
 
+class AsyncWallet(Wallet):
+    """
+    Wallet middleware used by AsyncWeb3. 
+    The account management APIs are the same as `Wallet`
+    """
+    async def __call__(self, make_request: Callable[..., Any], async_w3: "AsyncWeb3"): # type: ignore
+        async def inner(method: str, params: Sequence[Any]):
+            account = self._get_signing_account(async_w3, method, params)
+            if account is None:
+                return await make_request(method, params)
+            
+            raw_tx = account.sign_transaction(params[0]).rawTransaction
+            response = await make_request(RPC.cfx_sendRawTransaction, [raw_tx.hex()])
+            return response
+        return inner
+
+
 def construct_sign_and_send_raw_middleware(
     account_or_accounts: Union[Sequence[_PrivateKey], _PrivateKey], 
     forced_chain_id: Optional[int]=None
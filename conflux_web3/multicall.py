@@ -0,0 +1,386 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+from types import (
+    TracebackType,
+)
+
+from eth_abi.exceptions import (
+    DecodingError,
+)
+from hexbytes import (
+    HexBytes,
+)
+from web3._utils.abi import (
+    get_abi_output_types,
+    map_abi_data,
+    named_tree,
+    recursive_dict_to_namedtuple,
+)
+from web3._utils.normalizers import (
+    BASE_RETURN_NORMALIZERS,
+)
+from web3.exceptions import (
+    BadFunctionCallOutput,
+    ContractLogicError,
+)
+
+from cfx_address import (
+    Base32Address,
+)
+from conflux_web3.types import (
+    AddressParam,
+    EpochNumberParam,
+    TxParam,
+)
+from conflux_web3._utils.contracts import (
+    prepare_transaction,
+)
+from conflux_web3._utils.normalizers import (
+    addresses_to_verbose_base32,
+)
+from conflux_web3.contract.metadata import (
+    DEPLOYMENT_INFO,
+    get_contract_metadata,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+    from conflux_web3.contract.function import ConfluxContractFunction
+    from conflux_web3.types.transaction_hash import TransactionHash
+
+_NOT_EXECUTED = object()
+
+# The aggregator contract (Multicall.json) reads records of
+# 20 bytes target address | 4 bytes call data length | call data
+# from its call data, static calls each target in order, and returns records of
+# 32 bytes (success << 128 | return data length) | return data
+CALL_HEADER_SIZE = 24
+RESULT_HEADER_SIZE = 32
+AGGREGATOR_SALT = 0
+REVERT_REASON_SELECTOR = HexBytes("0x08c379a0")
+# block identifiers of the latest state, at which the known deployments apply
+LATEST_STATE_IDENTIFIERS = (None, "latest_state")
+# the embedded deployment address is the same on every network
+AGGREGATOR_ADDRESS = cast(str, DEPLOYMENT_INFO["Multicall"])
+
+# (chain id, aggregator address) known to be deployed, the aggregator can't be destroyed
+_deployed_aggregators: Set[Tuple[int, str]] = set()
+
+
+class MulticallItem:
+    """
+    The placeholder of a contract function call queued in a ``Multicall``.
+    The result is available after the multicall is executed.
+    """
+    def __init__(self, function: "ConfluxContractFunction", target: bytes, data: bytes) -> None:
+        self.function = function
+        self.target = target
+        self.data = data
+        self._result: Any = _NOT_EXECUTED
+        self._exception: Optional[Exception] = None
+
+    def done(self) -> bool:
+        return self._result is not _NOT_EXECUTED or self._exception is not None
+
+    def result(self) -> Any:
+        """
+        returns the decoded output of the function call,
+        or raises the exception if the call failed
+        """
+        if not self.done():
+            raise RuntimeError(f"The multicall containing {self.function.fn_name} is not executed")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self) -> Optional[Exception]:
+        """
+        returns the exception if the call failed, else returns None
+        """
+        if not self.done():
+            raise RuntimeError(f"The multicall containing {self.function.fn_name} is not executed")
+        return self._exception
+
+    def _set_return_data(self, w3: "Web3", return_data: bytes) -> None:
+        try:
+            self._result = decode_function_output(w3, self.function, return_data)
+        except Exception as e:
+            self._exception = e
+
+    def _set_exception(self, exception: Exception) -> None:
+        self._exception = exception
+
+    def __repr__(self) -> str:
+        if not self.done():
+            status = "pending"
+        elif self._exception is not None:
+            status = f"error={self._exception!r}"
+        else:
+            status = f"result={self._result!r}"
+        return f"MulticallItem({self.function.fn_name}, {status})"
+
+
+class Multicall:
+    """
+    Queue read-only contract function calls and execute them in as few requests as possible.
+    Calls are packed into ``cfx_call``s to the aggregator contract,
+    if the aggregator is not deployed, calls are sent as ``cfx_call``s in JSON-RPC batch requests.
+    A failed call only sets the exception of the corresponding item.
+
+    >>> with w3.cfx.multicall() as multicall:
+    ...     balances = [multicall.add(token.functions.balanceOf(holder)) for holder in holders]
+    >>> balances[0].result()
+    100
+    """
+    def __init__(
+        self,
+        w3: "Web3",
+        block_identifier: Optional[EpochNumberParam] = None,
+        aggregator: Optional[AddressParam] = None,
+        max_calls_per_request: int = 500,
+        max_call_data_size: int = 65536,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to send requests
+        block_identifier : Optional[EpochNumberParam], optional
+            the epoch to execute the calls, by default None which means latest_state
+        aggregator : Optional[AddressParam], optional
+            the address of the aggregator contract, by default None which means the embedded deployment
+        max_calls_per_request : int, optional
+            max count of calls packed into an aggregator call or sent in a batch request, by default 500
+        max_call_data_size : int, optional
+            max size of the call data of an aggregator call, by default 65536.
+            An aggregator call failing for gas or response size limits is split in halves and sent again
+        """
+        if max_calls_per_request < 1:
+            raise ValueError(f"max_calls_per_request is expected to be positive, but {max_calls_per_request} is received")
+        self.w3 = w3
+        self.block_identifier: Optional[EpochNumberParam] = block_identifier
+        self.aggregator = Base32Address(aggregator or AGGREGATOR_ADDRESS, w3.cfx.chain_id)
+        self.max_calls_per_request = max_calls_per_request
+        self.max_call_data_size = max_call_data_size
+        self._items: List[MulticallItem] = []
+        self._executed = False
+
+    @property
+    def items(self) -> Sequence[MulticallItem]:
+        return tuple(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, function: "ConfluxContractFunction") -> MulticallItem:
+        """
+        queue a contract function call, e.g. ``multicall.add(token.functions.balanceOf(holder))``
+
+        Returns
+        -------
+        MulticallItem
+            the placeholder of the call result
+        """
+        if self._executed:
+            raise RuntimeError("Multicall is already executed")
+        if not function.address:
+            raise ValueError(f"Contract address of {function.fn_name} is not specified")
+        prepared_transaction: TxParam = prepare_transaction(
+            function.address, # type: ignore
+            self.w3,
+            fn_identifier=function.function_identifier,
+            contract_abi=function.contract_abi,
+            fn_abi=function.abi,
+            transaction={},
+            fn_args=function.args,
+            fn_kwargs=function.kwargs,
+        )
+        item = MulticallItem(
+            function,
+            HexBytes(Base32Address(function.address).hex_address),
+            HexBytes(prepared_transaction.get("data", b"")),
+        )
+        self._items.append(item)
+        return item
+
+    def execute(self) -> Sequence[MulticallItem]:
+        """
+        execute the queued calls and set the results of the ``MulticallItem``s
+        """
+        if self._executed:
+            raise RuntimeError("Multicall is already executed")
+        self._executed = True
+        if not self._items:
+            return ()
+        if self._is_aggregator_deployed():
+            self._execute_by_aggregator()
+        else:
+            self._execute_by_batch()
+        return self.items
+
+    def deploy_aggregator(self, transaction: Optional[TxParam] = None) -> "TransactionHash":
+        """
+        deploy the aggregator contract by ``Create2Factory``.
+        The embedded deployment address is the same on every network,
+        the transaction is sent from the default account if "from" is not specified
+        """
+        bytecode = get_contract_metadata("Multicall", with_deployment_info=False)["bytecode"]
+        create2_factory = self.w3.cfx.contract(name="Create2Factory", with_deployment_info=True)
+        return create2_factory.functions.deploy(bytecode, AGGREGATOR_SALT).transact(transaction)
+
+    def _is_aggregator_deployed(self) -> bool:
+        """
+        returns if the aggregator is deployed at ``block_identifier``.
+        The known deployments only apply to the latest state, the aggregator might be deployed after an earlier epoch
+        """
+        key = (self.w3.cfx.chain_id, self.aggregator.hex_address)
+        if self.block_identifier in LATEST_STATE_IDENTIFIERS and key in _deployed_aggregators:
+            return True
+        if self.w3.cfx.get_code(self.aggregator, self.block_identifier):
+            _deployed_aggregators.add(key)
+            return True
+        return False
+
+    def _chunks(self, items: Sequence[MulticallItem]) -> Iterator[List[MulticallItem]]:
+        chunk: List[MulticallItem] = []
+        chunk_size = 0
+        for item in items:
+            item_size = CALL_HEADER_SIZE + len(item.data)
+            if chunk and (len(chunk) >= self.max_calls_per_request or chunk_size + item_size > self.max_call_data_size):
+                yield chunk
+                chunk, chunk_size = [], 0
+            chunk.append(item)
+            chunk_size += item_size
+        if chunk:
+            yield chunk
+
+    def _execute_by_aggregator(self) -> None:
+        pending = list(self._chunks(self._items))
+        # calls of chunks receiving an empty output, which means the aggregator has no code at block_identifier
+        undeployed: List[MulticallItem] = []
+        while pending:
+            with self.w3.cfx.batch() as batch:
+                calls = [
+                    batch.call({"to": self.aggregator, "data": pack_calls(chunk)}, self.block_identifier)
+                    for chunk in pending
+                ]
+            failed: List[List[MulticallItem]] = []
+            for chunk, call in zip(pending, calls):
+                exception = call.exception()
+                if exception is None:
+                    if not call.result():
+                        undeployed.extend(chunk)
+                        continue
+                    try:
+                        results = unpack_results(call.result(), len(chunk))
+                    except ValueError as e:
+                        exception = e
+                    else:
+                        for item, (success, return_data) in zip(chunk, results):
+                            if success:
+                                item._set_return_data(self.w3, return_data)
+                            else:
+                                item._set_exception(to_revert_error(self.w3, return_data))
+                        continue
+                if len(chunk) == 1:
+                    chunk[0]._set_exception(exception)
+                else:
+                    # the chunk might exceed the gas or response size limits
+                    middle = len(chunk) // 2
+                    failed.extend((chunk[:middle], chunk[middle:]))
+            pending = failed
+        if undeployed:
+            undeployed.sort(key=self._items.index)
+            self._execute_by_batch(undeployed)
+
+    def _execute_by_batch(self, items: Optional[Sequence[MulticallItem]] = None) -> None:
+        items = self._items if items is None else items
+        for start in range(0, len(items), self.max_calls_per_request):
+            chunk = items[start:start + self.max_calls_per_request]
+            with self.w3.cfx.batch() as batch:
+                calls = [
+                    batch.call({"to": item.function.address, "data": item.data}, self.block_identifier)
+                    for item in chunk
+                ]
+            for item, call in zip(chunk, calls):
+                exception = call.exception()
+                if exception is None:
+                    item._set_return_data(self.w3, call.result())
+                else:
+                    item._set_exception(exception)
+
+    def __enter__(self) -> "Multicall":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.execute()
+
+
+def pack_calls(items: Sequence[MulticallItem]) -> HexBytes:
+    return HexBytes(b"".join(
+        item.target + len(item.data).to_bytes(4, "big") + item.data for item in items
+    ))
+
+
+def unpack_results(output: bytes, count: int) -> List[Tuple[bool, bytes]]:
+    results: List[Tuple[bool, bytes]] = []
+    position = 0
+    while position < len(output):
+        header = int.from_bytes(output[position:position + RESULT_HEADER_SIZE], "big")
+        size = header & ((1 << 128) - 1)
+        start = position + RESULT_HEADER_SIZE
+        results.append((bool(header >> 128), output[start:start + size]))
+        position = start + size
+    if len(results) != count or position != len(output):
+        raise ValueError(f"Unexpected aggregator output for {count} calls: {HexBytes(output).hex()}")
+    return results
+
+
+def decode_function_output(w3: "Web3", function: "ConfluxContractFunction", return_data: bytes) -> Any:
+    """
+    decode the return data of a contract function call as ``ConfluxContractFunction.call`` does
+    """
+    output_types = get_abi_output_types(function.abi)
+    try:
+        output_data = w3.codec.decode(output_types, return_data)
+    except DecodingError as e:
+        raise BadFunctionCallOutput(
+            f"Could not decode contract function call to {function.fn_name} with return data: "
+            f"{HexBytes(return_data).hex()}, output_types: {output_types}"
+        ) from e
+    normalizers = [
+        *BASE_RETURN_NORMALIZERS,
+        addresses_to_verbose_base32(w3.cfx.chain_id), # type: ignore
+    ]
+    normalized_data = map_abi_data(normalizers, output_types, output_data)
+    if function.decode_tuples:
+        normalized_data = recursive_dict_to_namedtuple(named_tree(function.abi.get("outputs", []), normalized_data))
+    if len(normalized_data) == 1:
+        return normalized_data[0]
+    return normalized_data
+
+
+def to_revert_error(w3: "Web3", return_data: bytes) -> ContractLogicError:
+    data = HexBytes(return_data)
+    if data[:4] == REVERT_REASON_SELECTOR:
+        try:
+            reason = w3.codec.decode(["string"], data[4:])[0]
+            return ContractLogicError(f"execution reverted: {reason}", data=data.hex())
+        except DecodingError:
+            pass
+    return ContractLogicError("execution reverted", data=data.hex())
@@ -0,0 +1,192 @@
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from cfx_address import (
+    Base32Address,
+)
+from cfx_address.utils import (
+    normalize_to,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+# substrings of the node error messages showing the local nonce is out of sync with the node
+STALE_NONCE_ERROR_PATTERNS = (
+    "too stale nonce",
+    "nonce too low",
+    "same nonce already inserted",
+    "tx already exist",
+)
+NONCE_TOO_HIGH_ERROR_PATTERNS = (
+    "too distant future",
+    "nonce too high",
+)
+
+
+class _AddressNonceState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # None means the nonce is not synced with the node
+        self.next_nonce: Optional[int] = None
+        # nonces handed out but not used, e.g. the transaction is rejected or dropped
+        self.gaps: Set[int] = set()
+        # nonces handed out whose transactions are not accepted by the node yet
+        self.reserved: Set[int] = set()
+
+
+class NonceManager:
+    def __init__(self, w3: "Web3", use_txpool: bool = True) -> None:
+        """
+        a thread-safe local nonce counter for senders sending transactions at a high rate.
+        The nonce of an address is synced from the node only once,
+        and then increases locally without any RPC request.
+        The nonce manager is only used by the sync ``Web3``, ``AsyncWeb3`` always queries the nonce from the node.
+
+        >>> w3.cfx.nonce_manager = NonceManager(w3)
+        >>> # nonce is filled by nonce manager from now on
+        >>> w3.cfx.send_transaction({"from": address, "to": address, "value": 1})
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance used to sync nonce
+        use_txpool : bool, optional
+            whether to sync nonce via txpool_nextNonce, which counts pending transactions in the txpool, by default True.
+            cfx_getNextNonce will be used if txpool_nextNonce is not available
+        """
+        self.w3 = w3
+        self.use_txpool = use_txpool
+        self._states: Dict[str, _AddressNonceState] = {}
+        self._lock = threading.Lock()
+
+    def _get_state(self, address: Union[Base32Address, str]) -> _AddressNonceState:
+        key = normalize_to(address, None)
+        with self._lock:
+            if key not in self._states:
+                self._states[key] = _AddressNonceState()
+            return self._states[key]
+
+    def _fetch_nonce(self, address: Union[Base32Address, str]) -> int:
+        if self.use_txpool:
+            try:
+                return self.w3.txpool.next_nonce(address)
+            except Exception:
+                pass
+        return self.w3.cfx.get_next_nonce(address)
+
+    def next_nonce(self, address: Union[Base32Address, str]) -> int:
+        """
+        returns the nonce to use for the next transaction of the address.
+        Nonce gaps are filled first
+
+        Parameters
+        ----------
+        address : Union[Base32Address, str]
+            the sender address
+
+        Returns
+        -------
+        int
+            the nonce reserved for the transaction
+        """
+        state = self._get_state(address)
+        with state.lock:
+            if state.next_nonce is None:
+                state.next_nonce = self._fetch_nonce(address)
+            if state.gaps:
+                nonce = min(state.gaps)
+                state.gaps.remove(nonce)
+            else:
+                nonce = state.next_nonce
+                state.next_nonce += 1
+            state.reserved.add(nonce)
+            return nonce
+
+    def release(self, address: Union[Base32Address, str], nonce: int) -> None:
+        """
+        give back a nonce whose transaction is not accepted or is dropped,
+        the nonce will be handed out again by ``next_nonce``.
+        Nonces not handed out by ``next_nonce`` or already accepted are ignored, e.g. nonces set by users
+        """
+        state = self._get_state(address)
+        with state.lock:
+            if nonce not in state.reserved:
+                return
+            state.reserved.remove(nonce)
+            assert state.next_nonce is not None
+            state.gaps.add(nonce)
+            # gaps at the end of the counter are not gaps
+            while (state.next_nonce - 1) in state.gaps:
+                state.next_nonce -= 1
+                state.gaps.remove(state.next_nonce)
+
+    def accept(self, address: Union[Base32Address, str], nonce: int) -> None:
+        """
+        mark the nonce as used by a transaction accepted by the node, so it won't be released
+        """
+        state = self._get_state(address)
+        with state.lock:
+            state.reserved.discard(nonce)
+
+    def resync(self, address: Union[Base32Address, str]) -> None:
+        """
+        drop the local nonce of the address, nonce will be synced from the node when it is required next time
+        """
+        state = self._get_state(address)
+        with state.lock:
+            state.next_nonce = None
+            state.gaps.clear()
+            state.reserved.clear()
+
+    def gaps(self, address: Union[Base32Address, str]) -> List[int]:
+        """
+        returns the nonces handed out but not used, in ascending order
+        """
+        state = self._get_state(address)
+        with state.lock:
+            return sorted(state.gaps)
+
+    def handle_send_error(self, address: Union[Base32Address, str], nonce: int, error: Any) -> None:
+        """
+        resync the nonce if the error shows the local nonce is stale or too high,
+        or there is no JSON-RPC error because the request failed, in which case the node may have accepted the transaction.
+        Else release the nonce as a gap
+
+        Parameters
+        ----------
+        address : Union[Base32Address, str]
+            the sender address
+        nonce : int
+            the nonce of the rejected transaction
+        error : Any
+            the error field of the JSON-RPC response, the exception formatted from it,
+            or None if the request failed without a JSON-RPC response
+        """
+        if error is None or is_nonce_error(error):
+            self.resync(address)
+        else:
+            self.release(address, nonce)
+
+
+def _get_error_message(error: Any) -> str:
+    if isinstance(error, dict):
+        return f"{error.get('message', '')} {error.get('data', '')}".lower()
+    return str(error).lower()
+
+def is_nonce_error(error: Any) -> bool:
+    """
+    returns if the error shows the transaction nonce is stale or too high
+    """
+    message = _get_error_message(error)
+    return any(
+        pattern in message for pattern in STALE_NONCE_ERROR_PATTERNS + NONCE_TOO_HIGH_ERROR_PATTERNS
+    )
@@ -0,0 +1,371 @@
+import functools
+import itertools
+import os
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from hexbytes import (
+    HexBytes,
+)
+from web3.exceptions import (
+    TimeExhausted,
+)
+
+from cfx_account import (
+    Account,
+)
+from cfx_address.utils import (
+    normalize_to,
+)
+from cfx_utils.token_unit import (
+    Drip,
+    to_int_if_drip_units,
+)
+
+from conflux_web3.batch import (
+    BatchRequest,
+)
+from conflux_web3.nonce_manager import (
+    NonceManager,
+)
+from conflux_web3.types import (
+    TxParam,
+)
+from conflux_web3.types.transaction_hash import (
+    TransactionHash,
+)
+from conflux_web3._utils.cns import (
+    resolve_if_cns_name,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+T = TypeVar("T")
+
+
+class PipelineResult(NamedTuple):
+    """
+    the submission result of a transaction in the pipeline,
+    exactly one of ``transaction_hash`` and ``exception`` is None
+    """
+    index: int
+    transaction: TxParam
+    transaction_hash: Optional[TransactionHash]
+    exception: Optional[Exception]
+
+
+def _sign_transactions(private_key: bytes, transactions: Sequence[Dict[str, Any]]) -> List[HexBytes]:
+    # defined at module level so that it can be executed in a process pool
+    account = Account.from_key(private_key)
+    return [account.sign_transaction(transaction).rawTransaction for transaction in transactions] # type: ignore
+
+
+def _make_result(
+    index: int, transaction: Dict[str, Any], transaction_hash: Optional[TransactionHash], exception: Optional[Exception]
+) -> PipelineResult:
+    return PipelineResult(index, cast(TxParam, transaction), transaction_hash, exception)
+
+
+def _chunks(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TransactionPipeline:
+    def __init__(
+        self,
+        w3: "Web3",
+        batch_size: int = 100,
+        max_in_flight: int = 1000,
+        processes: Optional[int] = None,
+        poll_latency: float = 1,
+        timeout: float = 300,
+    ) -> None:
+        """
+        submit a large amount of transactions signed by the accounts in ``w3.wallet``.
+        Transactions are processed in chunks of ``batch_size``:
+
+        - missing fields are filled with a single batch request for the whole chunk
+        - nonces are assigned locally by the nonce manager
+        - transactions are signed in a process pool
+        - raw transactions are sent in a single batch request
+
+        >>> pipeline = TransactionPipeline(w3)
+        >>> for result in pipeline.submit({"from": sender, "to": receiver, "value": 1} for receiver in receivers):
+        ...     if result.exception is not None:
+        ...         print(result.index, result.exception)
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to send transactions, senders should be accounts in ``w3.wallet``
+        batch_size : int, optional
+            count of transactions sent in a batch request, by default 100
+        max_in_flight : int, optional
+            max count of transactions of a sender which are sent but not executed, by default 1000.
+            The pipeline waits for the sender's transactions to be executed once the limit is reached,
+            so that the transaction pool won't be overflowed
+        processes : Optional[int], optional
+            count of processes to sign transactions, by default None, which means the count of CPUs.
+            The transactions of each sender in a chunk are split evenly across the processes.
+            0 means transactions are signed in the current process
+        poll_latency : float, optional
+            seconds between two queries of the executed nonce if a sender reaches ``max_in_flight``, by default 1
+        timeout : float, optional
+            seconds to wait for a sender to have an available in-flight slot, by default 300
+        """
+        self.w3 = w3
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.processes = processes
+        self._sign_workers = processes if processes is not None else (os.cpu_count() or 1)
+        self.poll_latency = poll_latency
+        self.timeout = timeout
+        # the nonce manager of w3.cfx is shared if it is set, so nonces won't conflict with w3.cfx.send_transaction
+        self.nonce_manager: NonceManager = w3.cfx.nonce_manager or NonceManager(w3)
+        # the next nonce to be executed of each sender, which is updated only when the in-flight limit is reached
+        self._executed_nonces: Dict[str, int] = {}
+
+    def submit(self, transactions: Iterable[TxParam]) -> Iterator[PipelineResult]:
+        """
+        submit the transactions and yield the submission results in order.
+        A failed transaction won't stop the pipeline, the exception is set in its ``PipelineResult``
+
+        Parameters
+        ----------
+        transactions : Iterable[TxParam]
+            the transactions to submit, which are consumed lazily
+
+        Returns
+        -------
+        Iterator[PipelineResult]
+            results in the same order of the transactions
+        """
+        executor = ProcessPoolExecutor(self.processes) if self.processes != 0 else None
+        try:
+            for chunk in _chunks(enumerate(transactions), self.batch_size):
+                yield from self._submit_chunk(chunk, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _submit_chunk(
+        self, chunk: List[Tuple[int, TxParam]], executor: Optional[Executor]
+    ) -> Iterator[PipelineResult]:
+        results: Dict[int, PipelineResult] = {}
+        prepared: List[Tuple[int, Dict[str, Any]]] = []
+        for index, transaction in chunk:
+            try:
+                prepared.append((index, self._prepare_transaction(transaction)))
+            except Exception as e:
+                results[index] = PipelineResult(index, transaction, None, e)
+
+        filled = self._fill_defaults(prepared, results)
+        self._assign_nonces_and_send(filled, results, executor)
+        for index, _ in chunk:
+            yield results[index]
+
+    def _prepare_transaction(self, tx_param: TxParam) -> Dict[str, Any]:
+        # fields are filled in a copy, which is cast back to TxParam in the results
+        transaction: Dict[str, Any] = dict(tx_param)
+        if "from" not in transaction and self.w3.cfx.default_account:
+            transaction["from"] = self.w3.cfx.default_account
+        if not transaction.get("from"):
+            raise ValueError("Transaction's 'from' field is required")
+        transaction["from"] = resolve_if_cns_name(self.w3, transaction["from"])
+        wallet = self.w3.wallet
+        if wallet is None or transaction["from"] not in wallet: # type: ignore
+            raise ValueError(f"{transaction['from']} is not an account in w3.wallet")
+        if transaction.get("to"):
+            transaction["to"] = resolve_if_cns_name(self.w3, transaction["to"])
+        if "value" in transaction:
+            transaction["value"] = to_int_if_drip_units(transaction["value"])
+        if "gasPrice" in transaction:
+            transaction["gasPrice"] = to_int_if_drip_units(transaction["gasPrice"])
+        return transaction
+
+    def _fill_defaults(
+        self, prepared: List[Tuple[int, Dict[str, Any]]], results: Dict[int, PipelineResult]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        fill fields except nonce, the lookups of the whole chunk are sent in a single batch request
+        """
+        cfx = self.w3.cfx
+        batch = cfx.batch()
+        estimates = {
+            index: batch.estimate_gas_and_collateral(cast(TxParam, transaction))
+            for index, transaction in prepared
+            if "gas" not in transaction or "storageLimit" not in transaction
+        }
+        gas_price = batch.gas_price if any("gasPrice" not in tx for _, tx in prepared) else None
+        epoch_number = batch.epoch_number if any("epochHeight" not in tx for _, tx in prepared) else None
+        self._execute(batch)
+
+        filled: List[Tuple[int, Dict[str, Any]]] = []
+        for index, transaction in prepared:
+            try:
+                if index in estimates:
+                    estimate = estimates[index].result()
+                    transaction.setdefault("gas", estimate["gasLimit"])
+                    transaction.setdefault("storageLimit", estimate["storageCollateralized"])
+                if gas_price is not None:
+                    transaction.setdefault("gasPrice", gas_price.result().to(Drip).value)
+                if epoch_number is not None:
+                    transaction.setdefault("epochHeight", epoch_number.result())
+                transaction.setdefault("chainId", cfx.chain_id)
+                transaction.setdefault("value", 0)
+                transaction.setdefault("data", b"")
+                filled.append((index, transaction))
+            except Exception as e:
+                results[index] = _make_result(index, transaction, None, e)
+        return filled
+
+    def _execute(self, batch: BatchRequest) -> bool:
+        """
+        returns False if the batch request failed without JSON-RPC responses
+        """
+        try:
+            batch.execute()
+        except Exception:
+            # the exception is set to every item in the batch and handled per transaction
+            return False
+        return True
+
+    def _get_executed_nonce(self, address: str, refresh: bool = False) -> int:
+        key = normalize_to(address, None)
+        if refresh or key not in self._executed_nonces:
+            self._executed_nonces[key] = self.w3.cfx.get_next_nonce(address)
+        return self._executed_nonces[key]
+
+    def _has_in_flight_slot(self, address: str, nonce: int) -> bool:
+        """
+        returns if the nonce is within the in-flight limit according to the last known executed nonce
+        """
+        return nonce - self._get_executed_nonce(address) < self.max_in_flight
+
+    def _wait_for_in_flight_slot(self, address: str, nonce: int) -> None:
+        if self._has_in_flight_slot(address, nonce):
+            return
+        start = time.time()
+        while nonce - self._get_executed_nonce(address, refresh=True) >= self.max_in_flight:
+            if time.time() - start > self.timeout:
+                raise TimeExhausted(
+                    f"Transactions of {address} are not executed after {self.timeout} seconds, "
+                    f"{self.max_in_flight} transactions are in flight"
+                )
+            time.sleep(self.poll_latency)
+
+    def _assign_nonces_and_send(
+        self,
+        filled: List[Tuple[int, Dict[str, Any]]],
+        results: Dict[int, PipelineResult],
+        executor: Optional[Executor],
+    ) -> None:
+        """
+        assign nonces and send the transactions in a batch.
+        If a sender reaches the in-flight limit, the transactions assigned so far are sent before waiting,
+        because the slot can't be freed until the transactions with smaller nonces are sent
+        """
+        assigned: List[Tuple[int, Dict[str, Any]]] = []
+        for index, transaction in filled:
+            try:
+                if "nonce" not in transaction:
+                    transaction["nonce"] = self.nonce_manager.next_nonce(transaction["from"])
+                    if assigned and not self._has_in_flight_slot(transaction["from"], transaction["nonce"]):
+                        self._send(self._sign(assigned, results, executor), results)
+                        assigned = []
+                    try:
+                        self._wait_for_in_flight_slot(transaction["from"], transaction["nonce"])
+                    except Exception:
+                        self.nonce_manager.release(transaction["from"], transaction["nonce"])
+                        raise
+                assigned.append((index, transaction))
+            except Exception as e:
+                results[index] = _make_result(index, transaction, None, e)
+        self._send(self._sign(assigned, results, executor), results)
+
+    def _sign(
+        self,
+        assigned: List[Tuple[int, Dict[str, Any]]],
+        results: Dict[int, PipelineResult],
+        executor: Optional[Executor],
+    ) -> List[Tuple[int, Dict[str, Any], HexBytes]]:
+        groups: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, transaction in assigned:
+            groups.setdefault(transaction["from"], []).append((index, transaction))
+
+        jobs: List[Tuple[List[Tuple[int, Dict[str, Any]]], List[Callable[[], List[HexBytes]]]]] = []
+        for sender, items in groups.items():
+            private_key = self.w3.wallet[sender].key # type: ignore
+            if executor is None:
+                sub_chunks = [items]
+            else:
+                # nonces are already assigned, so the transactions of a single sender are split across the workers
+                sub_chunks = list(_chunks(items, -(-len(items) // self._sign_workers)))
+            getters: List[Callable[[], List[HexBytes]]] = []
+            for sub_chunk in sub_chunks:
+                transactions = [transaction for _, transaction in sub_chunk]
+                if executor is None:
+                    getters.append(functools.partial(_sign_transactions, private_key, transactions))
+                else:
+                    getters.append(executor.submit(_sign_transactions, private_key, transactions).result)
+            jobs.append((items, getters))
+
+        signed: List[Tuple[int, Dict[str, Any], HexBytes]] = []
+        for items, getters in jobs:
+            try:
+                # a failed sub-chunk fails all transactions of the sender, so no nonce gap is left
+                raw_transactions = [raw_transaction for get in getters for raw_transaction in get()]
+            except Exception as e:
+                for index, transaction in items:
+                    self.nonce_manager.release(transaction["from"], transaction["nonce"])
+                    results[index] = _make_result(index, transaction, None, e)
+                continue
+            for (index, transaction), raw_transaction in zip(items, raw_transactions):
+                signed.append((index, transaction, raw_transaction))
+        signed.sort(key=lambda item: item[0])
+        return signed
+
+    def _send(self, signed: List[Tuple[int, Dict[str, Any], HexBytes]], results: Dict[int, PipelineResult]) -> None:
+        if not signed:
+            return
+        batch = self.w3.cfx.batch()
+        items = [batch.send_raw_transaction(raw_transaction) for _, _, raw_transaction in signed]
+        responded = self._execute(batch)
+        for (index, transaction, _), item in zip(signed, items):
+            exception = item.exception()
+            if exception is None:
+                self.nonce_manager.accept(transaction["from"], transaction["nonce"])
+                transaction_hash: TransactionHash = item.result()
+                # requests in a batch don't go through the pending transaction middleware
+                transaction_hash.set_w3(self.w3)
+                results[index] = _make_result(index, transaction, transaction_hash, None)
+            else:
+                # without a response, the node may have accepted the transaction, so the nonce is resynced
+                self.nonce_manager.handle_send_error(
+                    transaction["from"], transaction["nonce"], exception if responded else None
+                )
+                results[index] = _make_result(index, transaction, None, exception)
@@ -0,0 +1,232 @@
+"""
+An HTTP provider tuned for large JSON-RPC responses.
+
+``ConfluxHTTPProvider`` is the ``HTTPProvider`` of ``conflux_web3.Web3``. Compared with the
+``HTTPProvider`` of web3.py, it
+
+* decodes response bodies from bytes with a pluggable JSON backend,
+  orjson by default if it is installed (``pip install conflux-web3[orjson]``),
+* keeps a ``requests.Session`` for each thread whose connection pool is configurable,
+* allows disabling keep-alive and response compression.
+"""
+import json
+import logging
+import os
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import requests
+from requests.adapters import (
+    HTTPAdapter,
+)
+from eth_typing import (
+    URI,
+)
+from eth_utils import (
+    to_bytes,
+    to_dict,
+)
+from web3._utils.encoding import (
+    FriendlyJsonSerde,
+)
+from web3._utils.request import (
+    DEFAULT_TIMEOUT,
+)
+from web3.providers.rpc import (
+    HTTPProvider,
+)
+from web3.types import (
+    RPCEndpoint,
+    RPCResponse,
+)
+
+from conflux_web3.batch import (
+    match_batch_responses,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONLoads = Callable[[bytes], Any]
+JSONBackend = Union[str, JSONLoads]
+
+
+def get_json_loads(json_backend: Optional[JSONBackend] = None) -> JSONLoads:
+    """
+    returns the function decoding JSON response bodies
+
+    Parameters
+    ----------
+    json_backend : Optional[Union[str, Callable[[bytes], Any]]], optional
+        "orjson", "json" or a function decoding bytes,
+        by default orjson if it is installed else json
+
+    Returns
+    -------
+    Callable[[bytes], Any]
+        the decoding function
+    """
+    if callable(json_backend):
+        return json_backend
+    if json_backend is None:
+        json_backend = "json" if orjson is None else "orjson"
+    if json_backend == "orjson":
+        if orjson is None:
+            raise ImportError("orjson is required for the orjson backend: pip install conflux-web3[orjson]")
+        return orjson.loads
+    if json_backend == "json":
+        # json.loads accepts bytes, which saves decoding the body into a str first
+        return json.loads
+    raise ValueError(f"Unknown JSON backend: {json_backend!r}, expected 'orjson', 'json' or a function")
+
+
+class ConfluxHTTPProvider(HTTPProvider):
+    logger = logging.getLogger("conflux_web3.providers.ConfluxHTTPProvider")
+
+    def __init__(
+        self,
+        endpoint_uri: Optional[Union[URI, str]] = None,
+        request_kwargs: Optional[Any] = None,
+        session: Optional[requests.Session] = None,
+        json_backend: Optional[JSONBackend] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        compression: bool = True,
+    ) -> None:
+        """
+        an HTTP provider decoding responses with a fast JSON backend
+
+        >>> w3 = Web3(Web3.HTTPProvider("https://test.confluxrpc.com", pool_maxsize=32))
+        >>> w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:12537", json_backend="json", compression=False))
+
+        Parameters
+        ----------
+        endpoint_uri : Optional[Union[URI, str]], optional
+            the RPC url, by default the ``WEB3_HTTP_PROVIDER_URI`` environment variable or localhost
+        request_kwargs : Optional[Any], optional
+            keyword arguments of ``requests.Session.post``, e.g. ``{"timeout": 30}``
+        session : Optional[requests.Session], optional
+            the session to send requests from the current thread, by default None.
+            ``requests.Session`` is not thread-safe, so each thread sends requests with its own session,
+            which is created by the provider with the pool options
+        json_backend : Optional[Union[str, Callable[[bytes], Any]]], optional
+            "orjson", "json" or a function decoding bytes, by default orjson if it is installed else json
+        pool_connections : int, optional
+            number of connection pools cached by the session of each thread, by default 10
+        pool_maxsize : int, optional
+            maximum number of connections kept alive per host by the session of each thread, by default 10
+        keep_alive : bool, optional
+            whether connections are reused, by default True
+        compression : bool, optional
+            whether compressed responses are accepted, by default True.
+            Disabling compression saves the decompression cost if the node is on a local network
+        """
+        super().__init__(endpoint_uri, request_kwargs)
+        self.json_loads = get_json_loads(json_backend)
+        self.keep_alive = keep_alive
+        self.compression = compression
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        # (pid, session) of each thread, the pid avoids sharing connections with a forked process
+        self._local = threading.local()
+        if session is not None:
+            self._local.session = (os.getpid(), session)
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        the session of the current thread
+        """
+        pid = os.getpid()
+        entry = getattr(self._local, "session", None)
+        if entry is None or entry[0] != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            entry = (pid, session)
+            self._local.session = entry
+        return entry[1]
+
+    def get_request_headers(self) -> Dict[str, str]:
+        headers = super().get_request_headers()
+        if not self.keep_alive:
+            headers["Connection"] = "close"
+        if not self.compression:
+            headers["Accept-Encoding"] = "identity"
+        return headers
+
+    @to_dict
+    def get_request_kwargs(self) -> Iterable[Tuple[str, Any]]:
+        if "timeout" not in self._request_kwargs:
+            yield "timeout", DEFAULT_TIMEOUT
+        yield from super().get_request_kwargs().items()
+
+    def post(self, request_data: bytes, **kwargs: Any) -> requests.Response:
+        """
+        posts the request data to the endpoint with the session of the current thread.
+        ``kwargs`` override the request kwargs of the provider, e.g. ``stream=True``
+        """
+        request_kwargs = self.get_request_kwargs()
+        request_kwargs.update(kwargs)
+        return self.session.post(self.endpoint_uri, data=request_data, **request_kwargs)
+
+    def make_post_request(self, request_data: bytes) -> bytes:
+        """
+        posts the request data and returns the response body
+        """
+        with self.post(request_data) as response:
+            response.raise_for_status()
+            return response.content
+
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return self.json_loads(raw_response)
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug(f"Making request HTTP. URI: {self.endpoint_uri}, Method: {method}")
+        request_data = self.encode_rpc_request(method, params)
+        response = self.decode_rpc_response(self.make_post_request(request_data))
+        # formatting a large response is skipped unless it is logged
+        if debug:
+            self.logger.debug(
+                f"Getting response HTTP. URI: {self.endpoint_uri}, "
+                f"Method: {method}, Response: {response}"
+            )
+        return response
+
+    def make_batch_request(self, requests: Sequence[Tuple[RPCEndpoint, Any]]) -> List[RPCResponse]:
+        """
+        sends the requests as a JSON-RPC batch, see ``conflux_web3.batch.make_batch_request``
+        """
+        rpc_dicts = [
+            {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params or [],
+                "id": next(self.request_counter),
+            } for method, params in requests
+        ]
+        request_data = to_bytes(text=FriendlyJsonSerde().json_encode(rpc_dicts))
+        decoded = self.decode_rpc_response(self.make_post_request(request_data))
+        return match_batch_responses([rpc_dict["id"] for rpc_dict in rpc_dicts], decoded)
+
+
+__all__ = [
+    "ConfluxHTTPProvider",
+    "get_json_loads",
+]
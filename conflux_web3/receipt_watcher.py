@@ -0,0 +1,459 @@
+import threading
+import time
+from concurrent.futures import (
+    Future,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from typing_extensions import (
+    Literal,
+)
+from types import (
+    TracebackType,
+)
+
+from eth_utils import (
+    to_hex,
+)
+from hexbytes import (
+    HexBytes,
+)
+from web3.exceptions import (
+    TimeExhausted,
+)
+
+from conflux_web3.batch import (
+    BatchItem,
+    BatchRequest,
+)
+from conflux_web3.types import (
+    TxData,
+    TxReceipt,
+)
+
+if TYPE_CHECKING:
+    from conflux_web3 import Web3
+
+TransactionStage = Literal["mined", "executed", "confirmed", "finalized"]
+TRANSACTION_STAGES = ("mined", "executed", "confirmed", "finalized")
+ReceiptStrategy = Literal["receipt", "epoch"]
+RECEIPT_STRATEGIES = ("receipt", "epoch")
+# (kind, key, function to queue the request in a batch)
+_Request = Tuple[str, str, Callable[[BatchRequest], BatchItem[Any]]]
+
+
+class _Watch:
+    def __init__(self, stage: TransactionStage, future: "Future[Union[TxData, TxReceipt]]", deadline: Optional[float]) -> None:
+        self.stage: TransactionStage = stage
+        self.future = future
+        self.deadline = deadline
+
+
+class ReceiptWatcher:
+    def __init__(
+        self, w3: "Web3", poll_latency: float = 0.5, batch_size: int = 500, strategy: ReceiptStrategy = "receipt"
+    ) -> None:
+        """
+        wait for many transactions with a single polling loop.
+        Each tick queries the latest_confirmed and latest_finalized epochs once,
+        and fetches the outstanding transactions or receipts in batch requests.
+
+        Receipts are found in one of the strategies:
+
+        - "receipt": receipts of the outstanding transactions are queried by hash in every tick
+        - "epoch": receipts of each newly executed epoch are queried once by ``cfx_getEpochReceipts``
+          and matched against all the outstanding transactions,
+          so the RPC cost grows with the count of epochs rather than the count of transactions.
+          An epoch hint provided to ``watch`` tells the epoch to start from
+
+        >>> watcher = ReceiptWatcher(w3)
+        >>> futures = [watcher.watch(tx_hash, "confirmed") for tx_hash in tx_hashes]
+        >>> watcher.run_until_complete(timeout=600)
+        >>> receipts = [future.result() for future in futures]
+
+        The watcher can also poll in a background thread:
+
+        >>> with ReceiptWatcher(w3) as watcher:
+        ...     receipt = watcher.watch(tx_hash, "executed").result(timeout=300)
+
+        Parameters
+        ----------
+        w3 : Web3
+            the web3 instance to query transactions and receipts
+        poll_latency : float, optional
+            seconds between two ticks, by default 0.5
+        batch_size : int, optional
+            max count of requests in a batch request, by default 500.
+            In "epoch" strategy, it is also the max count of epochs scanned in a tick
+        strategy : ReceiptStrategy, optional
+            "receipt" or "epoch", by default "receipt"
+        """
+        if strategy not in RECEIPT_STRATEGIES:
+            raise ValueError(f"strategy is expected to be one of {RECEIPT_STRATEGIES}, but {strategy} is received")
+        self.w3 = w3
+        self.poll_latency = poll_latency
+        self.batch_size = batch_size
+        self.strategy = strategy
+        # transaction hash in hex -> watches of the transaction
+        self._watches: Dict[str, List[_Watch]] = {}
+        # receipts fetched in previous ticks, which are fetched again before resolving confirmed or finalized watches
+        self._receipts: Dict[str, TxReceipt] = {}
+        self._confirmed_epoch = -1
+        self._finalized_epoch = -1
+        # used in "epoch" strategy, transaction hash -> the next epoch to scan for its receipt
+        self._cursors: Dict[str, int] = {}
+        # used in "epoch" strategy, transaction hash -> hash of the block containing the transaction
+        self._block_hints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def watch(
+        self,
+        transaction_hash: Union[str, bytes],
+        stage: TransactionStage = "executed",
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[["Future[Union[TxData, TxReceipt]]"], Any]] = None,
+        epoch_hint: Optional[Union[int, str, bytes]] = None,
+    ) -> "Future[Union[TxData, TxReceipt]]":
+        """
+        watch a transaction until it reaches the stage.
+
+        Parameters
+        ----------
+        transaction_hash : Union[str, bytes]
+            the hash of the transaction, could be byte or hex string
+        stage : TransactionStage, optional
+            "mined", "executed", "confirmed" or "finalized", by default "executed"
+        timeout : Optional[float], optional
+            seconds before the future fails with ``TimeExhausted``, by default None which means never
+        callback : Optional[Callable[[Future], Any]], optional
+            invoked with the future once it is resolved, by default None
+        epoch_hint : Optional[Union[int, str, bytes]], optional
+            used in "epoch" strategy, the epoch number before which the transaction is not executed,
+            or the hash of the block containing the transaction. By default None,
+            which means the receipt is queried by hash once and then epochs after latest_state are scanned
+
+        Returns
+        -------
+        Future[Union[TxData, TxReceipt]]
+            resolved with the transaction data if stage is "mined", else the transaction receipt.
+            Fails with ``RuntimeError`` if the transaction execution failed
+        """
+        if stage not in TRANSACTION_STAGES:
+            raise ValueError(f"stage is expected to be one of {TRANSACTION_STAGES}, but {stage} is received")
+        future: "Future[Union[TxData, TxReceipt]]" = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        key = to_hex(HexBytes(transaction_hash))
+        with self._lock:
+            if self.strategy == "epoch" and epoch_hint is not None and key not in self._cursors:
+                if isinstance(epoch_hint, int):
+                    self._cursors[key] = epoch_hint
+                else:
+                    self._block_hints[key] = to_hex(HexBytes(epoch_hint))
+            self._watches.setdefault(key, []).append(_Watch(stage, future, deadline))
+        return future
+
+    def watch_many(
+        self,
+        transaction_hashes: Iterable[Union[str, bytes]],
+        stage: TransactionStage = "executed",
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[["Future[Union[TxData, TxReceipt]]"], Any]] = None,
+        epoch_hint: Optional[Union[int, str, bytes]] = None,
+    ) -> List["Future[Union[TxData, TxReceipt]]"]:
+        """
+        watch multiple transactions, see ``watch``
+        """
+        return [
+            self.watch(transaction_hash, stage, timeout, callback, epoch_hint)
+            for transaction_hash in transaction_hashes
+        ]
+
+    @property
+    def outstanding(self) -> int:
+        """
+        count of the watches not resolved
+        """
+        with self._lock:
+            return sum(len(watches) for watches in self._watches.values())
+
+    def poll(self) -> int:
+        """
+        run a single tick and returns the count of outstanding watches
+        """
+        now = time.monotonic()
+        resolutions: List[Tuple[Future, Any, Optional[Exception]]] = []
+        with self._lock:
+            for transaction_hash, watches in self._watches.items():
+                for watch in watches:
+                    if watch.deadline is not None and watch.deadline < now:
+                        resolutions.append((watch.future, None, TimeExhausted(
+                            f"Transaction {transaction_hash} is not {watch.stage} before timeout"
+                        )))
+                self._watches[transaction_hash] = [
+                    watch for watch in watches if watch.deadline is None or watch.deadline >= now
+                ]
+            watches_snapshot = {
+                transaction_hash: list(watches) for transaction_hash, watches in self._watches.items() if watches
+            }
+
+        fetched = self._execute(self._get_requests(watches_snapshot))
+        with self._lock:
+            self._confirmed_epoch = max(self._confirmed_epoch, fetched.get(("epoch", "latest_confirmed"), -1))
+            self._finalized_epoch = max(self._finalized_epoch, fetched.get(("epoch", "latest_finalized"), -1))
+        if self.strategy == "epoch":
+            fetched.update(self._scan_epochs(watches_snapshot, fetched))
+        # known receipts whose epoch is reached in this tick are fetched again before resolving
+        recheck = [
+            transaction_hash for transaction_hash, watches in watches_snapshot.items()
+            if ("receipt", transaction_hash) not in fetched
+            and self._receipt_epoch_reached(transaction_hash, {watch.stage for watch in watches})
+        ]
+        fetched.update(self._execute([self._receipt_request(transaction_hash) for transaction_hash in recheck]))
+        transactions = {key: value for (kind, key), value in fetched.items() if kind == "transaction"}
+        receipts = {key: value for (kind, key), value in fetched.items() if kind == "receipt"}
+
+        with self._lock:
+            self._receipts.update(receipts)
+            for transaction_hash, watches in watches_snapshot.items():
+                for watch in watches:
+                    resolution = self._try_resolve(watch, transactions.get(transaction_hash), receipts.get(transaction_hash))
+                    if resolution is not None:
+                        resolutions.append((watch.future, *resolution))
+                        self._watches[transaction_hash].remove(watch)
+            for transaction_hash in [h for h, watches in self._watches.items() if not watches]:
+                del self._watches[transaction_hash]
+                self._receipts.pop(transaction_hash, None)
+                self._cursors.pop(transaction_hash, None)
+                self._block_hints.pop(transaction_hash, None)
+            outstanding = sum(len(watches) for watches in self._watches.values())
+
+        # futures are resolved out of the lock because callbacks might watch other transactions
+        for future, result, exception in resolutions:
+            if future.done():
+                # cancelled by the user
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        return outstanding
+
+    def _receipt_request(self, transaction_hash: str) -> _Request:
+        return ("receipt", transaction_hash, lambda batch: batch.get_transaction_receipt(transaction_hash))
+
+    def _get_requests(self, watches: Dict[str, List[_Watch]]) -> List[_Request]:
+        """
+        returns the requests of epochs, transactions and receipts required to resolve the watches
+        """
+        stages: Set[TransactionStage] = {watch.stage for hash_watches in watches.values() for watch in hash_watches}
+        requests: List[_Request] = []
+        tags = [tag for tag, stage in (("latest_confirmed", "confirmed"), ("latest_finalized", "finalized")) if stage in stages]
+        if self.strategy == "epoch" and stages - {"mined"}:
+            # latest_state is queried before receipts, so a transaction not executed is executed after latest_state
+            tags.insert(0, "latest_state")
+        for tag in tags:
+            requests.append(("epoch", tag, lambda batch, tag=tag: batch.epoch_number_by_tag(tag)))
+        for transaction_hash, hash_watches in watches.items():
+            hash_stages: Set[TransactionStage] = {watch.stage for watch in hash_watches}
+            if "mined" in hash_stages:
+                requests.append((
+                    "transaction", transaction_hash,
+                    lambda batch, h=transaction_hash: batch.get_transaction_by_hash(h)
+                ))
+            if not self._receipt_required(transaction_hash, hash_stages):
+                continue
+            if self.strategy == "receipt":
+                requests.append(self._receipt_request(transaction_hash))
+                continue
+            with self._lock:
+                block_hash = self._block_hints.get(transaction_hash)
+                has_cursor = transaction_hash in self._cursors
+                has_receipt = transaction_hash in self._receipts
+            if block_hash is not None:
+                requests.append(("block", transaction_hash, lambda batch, b=block_hash: batch.get_block_by_hash(b)))
+            elif not has_cursor or has_receipt:
+                # the receipt is queried by hash before scanning epochs, or it is found and its status is required
+                requests.append(self._receipt_request(transaction_hash))
+        return requests
+
+    def _scan_epochs(self, watches: Dict[str, List[_Watch]], fetched: Dict[Tuple[str, str], Any]) -> Dict[Tuple[str, str], Any]:
+        """
+        used in "epoch" strategy, updates the scan cursors with the results of this tick
+        and fetches receipts of the epochs to scan
+        """
+        latest_state = fetched.get(("epoch", "latest_state"))
+        with self._lock:
+            for transaction_hash in watches:
+                block = fetched.get(("block", transaction_hash))
+                if block is not None and block["epochNumber"] is not None:
+                    del self._block_hints[transaction_hash]
+                    self._cursors[transaction_hash] = block["epochNumber"]
+                elif (
+                    latest_state is not None
+                    and transaction_hash not in self._cursors
+                    and transaction_hash not in self._block_hints
+                    and transaction_hash not in self._receipts
+                    and ("receipt", transaction_hash) not in fetched
+                ):
+                    self._cursors[transaction_hash] = latest_state + 1
+            pending = {
+                transaction_hash: self._cursors[transaction_hash] for transaction_hash in watches
+                if transaction_hash in self._cursors
+                and transaction_hash not in self._receipts
+                and ("receipt", transaction_hash) not in fetched
+            }
+        if latest_state is None or not pending:
+            return {}
+        start = min(pending.values())
+        end = min(latest_state, start + self.batch_size - 1)
+        epoch_receipts = self._execute([
+            ("epoch_receipts", str(epoch), lambda batch, epoch=epoch: batch.get_epoch_receipts(epoch))
+            for epoch in range(start, end + 1)
+        ])
+        # epochs are scanned contiguously, an epoch failed to fetch is scanned again in the next tick
+        scanned_end = start - 1
+        while ("epoch_receipts", str(scanned_end + 1)) in epoch_receipts and scanned_end < end:
+            scanned_end += 1
+
+        receipts: Dict[Tuple[str, str], Any] = {}
+        for epoch in range(start, scanned_end + 1):
+            for block_receipts in epoch_receipts[("epoch_receipts", str(epoch))]:
+                for receipt in block_receipts:
+                    transaction_hash = to_hex(receipt["transactionHash"])
+                    if transaction_hash in pending and pending[transaction_hash] <= epoch:
+                        receipts[("receipt", transaction_hash)] = receipt
+        with self._lock:
+            for transaction_hash, cursor in pending.items():
+                if cursor <= scanned_end:
+                    self._cursors[transaction_hash] = scanned_end + 1
+        return receipts
+
+    def _execute(self, requests: List[_Request]) -> Dict[Tuple[str, str], Any]:
+        """
+        send the requests in batches and returns the results by (kind, key).
+        Failed requests or null results are omitted and retried in later ticks
+        """
+        fetched: Dict[Tuple[str, str], Any] = {}
+        for start in range(0, len(requests), self.batch_size):
+            chunk = requests[start:start + self.batch_size]
+            batch = self.w3.cfx.batch()
+            items = [queue(batch) for _, _, queue in chunk]
+            try:
+                batch.execute()
+            except Exception:
+                continue
+            for (kind, key, _), item in zip(chunk, items):
+                if item.exception() is None and item.result() is not None:
+                    fetched[(kind, key)] = item.result()
+        return fetched
+
+    def _receipt_required(self, transaction_hash: str, stages: Set[TransactionStage]) -> bool:
+        """
+        returns if the receipt should be fetched at the start of a tick.
+        A known receipt of a confirmed or finalized watch is not fetched until the epoch is reached
+        """
+        stages = stages - {"mined"}
+        with self._lock:
+            return bool(stages) and ("executed" in stages or transaction_hash not in self._receipts)
+
+    def _receipt_epoch_reached(self, transaction_hash: str, stages: Set[TransactionStage]) -> bool:
+        """
+        returns if the epoch of the known receipt is reached by the confirmed or finalized epoch.
+        Such receipt is fetched again before resolving in case it is changed by a pivot chain switch
+        """
+        with self._lock:
+            receipt = self._receipts.get(transaction_hash)
+            if receipt is None or not stages & {"confirmed", "finalized"}:
+                return False
+            target_epoch = self._confirmed_epoch if "confirmed" in stages else self._finalized_epoch
+            return receipt["epochNumber"] <= target_epoch
+
+    def _try_resolve(
+        self, watch: _Watch, transaction: Optional[TxData], receipt: Optional[TxReceipt]
+    ) -> Optional[Tuple[Any, Optional[Exception]]]:
+        """
+        returns (result, exception) if the watch is resolved, else returns None
+        """
+        if watch.stage == "mined":
+            if transaction is not None and transaction.get("blockHash"):
+                return transaction, None
+            return None
+        if receipt is None:
+            return None
+        if watch.stage == "confirmed" and receipt["epochNumber"] > self._confirmed_epoch:
+            return None
+        if watch.stage == "finalized" and receipt["epochNumber"] > self._finalized_epoch:
+            return None
+        if receipt["outcomeStatus"] != 0:
+            return None, RuntimeError(
+                f'transaction "{to_hex(receipt["transactionHash"])}" execution failed, '
+                f'outcomeStatus {receipt["outcomeStatus"]}'
+            )
+        return receipt, None
+
+    def run_until_complete(self, timeout: Optional[float] = None) -> None:
+        """
+        poll until all watches are resolved in the current thread
+
+        Raises
+        ------
+        TimeExhausted
+            if there are still outstanding watches after timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() > 0:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeExhausted(f"{self.outstanding} watched transactions are not resolved after {timeout} seconds")
+            time.sleep(self.poll_latency)
+
+    def start(self) -> None:
+        """
+        poll in a background daemon thread until ``stop`` is called
+        """
+        if self._thread is not None:
+            raise RuntimeError("ReceiptWatcher is already started")
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="ReceiptWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # keep polling, failures are expected to be transient
+                pass
+            self._stopped.wait(self.poll_latency)
+
+    def __enter__(self) -> "ReceiptWatcher":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.stop()
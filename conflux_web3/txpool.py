@@ -1,4 +1,5 @@
 from typing import (
+    Awaitable,
     Callable,
     Union
 )
@@ -16,3 +17,13 @@ class Txpool(Module):
     
     def next_nonce(self, address: Union[Base32Address, str]) -> int:
         return self._next_nonce(address)
+
+class AsyncTxpool(Module):
+    is_async = True
+    
+    _next_nonce: ConfluxMethod[Callable[[Union[Base32Address, str]], Awaitable[int]]] = ConfluxMethod(
+        RPC.txpool_nextNonce
+    )
+    
+    async def next_nonce(self, address: Union[Base32Address, str]) -> int:
+        return await self._next_nonce(address)
@@ -1,6 +1,7 @@
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     List,
     NewType,
@@ -44,7 +45,7 @@ from cfx_utils.types import (
 )
 
 if TYPE_CHECKING:
-    from conflux_web3 import Web3
+    from conflux_web3 import Web3, AsyncWeb3
 
 class NodeStatus(TypedDict):
     """
@@ -197,6 +198,33 @@ class EventData(TransactionEventData, total=False):
     """
     logIndex: int
 
+class EventColumns(TypedDict):
+    """
+    Decoded logs of an event as columns, the i-th element of every column belongs to the i-th log.
+    Columns are lists, or numpy arrays for the arguments of at most 64-bit integer or bool types if numpy is installed
+
+    Parameters
+    ----------
+    | event: str
+    | args: Dict[str, Sequence[Any]]
+    | address: Sequence[Base32Address]
+    | blockHash: Sequence[Optional[Hash32]]
+    | epochNumber: Sequence[Optional[int]]
+    | transactionHash: Sequence[Optional[Hash32]]
+    | transactionIndex: Sequence[Optional[int]]
+    | transactionLogIndex: Sequence[Optional[int]]
+    | logIndex: Sequence[Optional[int]]
+    """
+    event: str
+    args: Dict[str, Sequence[Any]]
+    address: Sequence[Base32Address]
+    blockHash: Sequence[Optional[Hash32]]
+    epochNumber: Sequence[Optional[int]]
+    transactionHash: Sequence[Optional[Hash32]]
+    transactionIndex: Sequence[Optional[int]]
+    transactionLogIndex: Sequence[Optional[int]]
+    logIndex: Sequence[Optional[int]]
+
 
 # syntax b/c "from" keyword not allowed w/ class construction
 TxReceipt = TypedDict(
@@ -354,10 +382,164 @@ class BlockData(TypedDict):
     custom: Sequence[HexBytes]
     posReference: Hash32
     transactions: Sequence[Union[Hash32, TxData]]
+
+
+class EpochData(TypedDict):
+    """
+    Blocks and receipts of an epoch
+
+    Parameters
+    ----------
+    | epochNumber: int
+    | pivotBlock: BlockData
+    | blocks: Sequence[BlockData], blocks of the epoch in execution order, the last one is the pivot block
+    | receipts: Optional[Sequence[Sequence[TxReceipt]]], receipts of each block, None if not queried
+    """
+    epochNumber: int
+    pivotBlock: BlockData
+    blocks: Sequence[BlockData]
+    receipts: Optional[Sequence[Sequence[TxReceipt]]]
     
 
+class TraceData(TypedDict, total=False):
+    """
+    A trace of an action in a transaction.
+    ``epochHash``, ``epochNumber``, ``blockHash``, ``transactionHash`` and ``transactionPosition``
+    are not included in the traces of ``trace_block``
+
+    Parameters
+    ----------
+    | action: Dict[str, Any], the action fields, addresses of eSpace actions are hex strings
+    | type: Literal["call", "create", "call_result", "create_result", "internal_transfer_action"]
+    | valid: bool
+    | epochHash: Hash32
+    | epochNumber: int
+    | blockHash: Hash32
+    | transactionHash: Hash32
+    | transactionPosition: int
+    """
+    action: Dict[str, Any]
+    type: Literal["call", "create", "call_result", "create_result", "internal_transfer_action"]
+    valid: bool
+    epochHash: Hash32
+    epochNumber: int
+    blockHash: Hash32
+    transactionHash: Hash32
+    transactionPosition: int
+
+
+class TransactionTraceData(TypedDict):
+    """
+
+    Parameters
+    ----------
+    | traces: Sequence[TraceData]
+    | transactionHash: Hash32
+    | transactionPosition: int
+    """
+    traces: Sequence[TraceData]
+    transactionHash: Hash32
+    transactionPosition: int
+
+
+class BlockTraceData(TypedDict):
+    """
+
+    Parameters
+    ----------
+    | transactionTraces: Sequence[TransactionTraceData]
+    | epochHash: Hash32
+    | epochNumber: int
+    | blockHash: Hash32
+    """
+    transactionTraces: Sequence[TransactionTraceData]
+    epochHash: Hash32
+    epochNumber: int
+    blockHash: Hash32
+
+
+class EpochTraceData(TypedDict):
+    """
+
+    Parameters
+    ----------
+    | cfxTraces: Sequence[TraceData], traces of core space transactions
+    | ethTraces: Sequence[Dict[str, Any]], traces of eSpace transactions in the format of ethereum
+    | mirrorAddressMap: Dict[str, str]
+    """
+    cfxTraces: Sequence[TraceData]
+    ethTraces: Sequence[Dict[str, Any]]
+    mirrorAddressMap: Dict[str, str]
+
+
+# syntax b/c "from" keyword not allowed w/ class construction
+CallFrame = TypedDict(
+    "CallFrame",
+    {
+        "transactionHash": Hash32,
+        "transactionPosition": int,
+        "epochNumber": int,
+        "epochHash": Hash32,
+        "blockHash": Hash32,
+        "valid": bool,
+        "type": Literal["call", "create", "internal_transfer_action"],
+        "depth": int,
+        "space": str,
+        "from": Union[Base32Address, HexAddress],
+        "to": Union[Base32Address, HexAddress, None],
+        "value": int,
+        "gas": int,
+        "input": HexBytes,
+        "init": HexBytes,
+        "callType": str,
+        "createType": str,
+        "outcome": str,
+        "gasLeft": int,
+        "returnData": HexBytes,
+        "fromPocket": str,
+        "toPocket": str,
+        "fromSpace": str,
+        "toSpace": str,
+    },
+    total=False,
+)
+"""
+A flattened call, create or internal transfer of a transaction,
+the action fields and the fields of its result action are merged into a single dict.
+The created contract address of a create frame is set as "to"
+
+Parameters
+----------
+| "transactionHash": Hash32,
+| "transactionPosition": int,
+| "epochNumber": int,
+| "epochHash": Hash32,
+| "blockHash": Hash32,
+| "valid": bool,
+| "type": Literal["call", "create", "internal_transfer_action"],
+| "depth": int, 0 for the top level call of the transaction
+| "space": str,
+| "from": Union[Base32Address, HexAddress],
+| "to": Union[Base32Address, HexAddress, None],
+| "value": int,
+| "gas": int,
+| "input": HexBytes, input of call frames
+| "init": HexBytes, init code of create frames
+| "callType": str,
+| "createType": str,
+| "outcome": str,
+| "gasLeft": int,
+| "returnData": HexBytes,
+| "fromPocket": str,
+| "toPocket": str,
+| "fromSpace": str,
+| "toSpace": str,
+"""
+
+
 Middleware = Callable[[Callable[[RPCEndpoint, Any], RPCResponse], "Web3"], Any]
 MiddlewareOnion = NamedElementOnion[str, Middleware]
+AsyncMiddleware = Callable[[Callable[[RPCEndpoint, Any], Awaitable[RPCResponse]], "AsyncWeb3"], Any]
 
 class StorageRoot(TypedDict):
     """
@@ -584,6 +766,11 @@ class CollateralInfo(TypedDict):
     convertedStoragePoints: int
     usedStoragePoints: int
     
+# "default" returns AttributeDicts and wrapper types such as Drip, HexBytes and Base32Address,
+# "records" returns blocks, transactions, receipts and logs as __slots__ records (see conflux_web3.types.records),
+# "light" returns plain dicts, ints, bytes and strs, "raw" returns the JSON-RPC results as they are
+ResultMode = Literal["default", "records", "light", "raw"]
+
 LogFilterId = NewType("LogFilterId", HexStr)
 BlockFilterId = NewType("BlockFilterId", HexStr)
 TxFilterId = NewType("TxFilterId", HexStr)
@@ -609,11 +796,19 @@ __all__ = [
     "LogReceipt",
     "TransactionEventData",
     "EventData",
+    "EventColumns",
     "TxReceipt",
     "TxReceiptWithSpace"
     "TxData",
     "BlockData",
+    "EpochData",
+    "TraceData",
+    "TransactionTraceData",
+    "BlockTraceData",
+    "EpochTraceData",
+    "CallFrame",
     "MiddlewareOnion",
+    "AsyncMiddleware",
     "StorageRoot",
     "SponsorInfo",
     "AccountInfo",
@@ -629,6 +824,7 @@ __all__ = [
     "PendingTransactionsInfo",
     "TransactionPaymentInfo",
     "CollateralInfo",
+    "ResultMode",
     "LogFilterId",
     "BlockFilterId",
     "TxFilterId",
@@ -0,0 +1,206 @@
+"""
+Compact record types of blocks, transactions, receipts, logs and event data.
+
+A record stores the fields of a result in ``__slots__`` rather than in the ``__dict__`` of
+an ``AttributeDict``, which takes a fraction of the memory per object. Records are immutable
+and keep the read access of ``AttributeDict``: ``record["gasUsed"]``, ``record.gasUsed``,
+``record.get("gasUsed")``, ``record.keys()``, ``dict(record)`` and comparison with dicts.
+Fields returned by the node but not declared by the record type are kept in a dict.
+
+Records created by the "records" result mode store hashes and data as ``bytes`` and token
+amounts as ``int``. They are converted to ``HexBytes`` and ``Drip`` by the ``_expanders``
+of the record type each time they are read, so reading a field returns the same value
+as the default result mode.
+
+Records are returned by the RPCs if the result mode is "records", see ``w3.cfx.with_result_mode``.
+"""
+from collections.abc import (
+    Mapping,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from conflux_web3.types import (
+    BlockData,
+    EventData,
+    LogReceipt,
+    TxData,
+    TxReceiptWithSpace,
+)
+
+TRecord = TypeVar("TRecord", bound="Record")
+
+# prefix of the slots storing the fields, the field names are properties converting the stored values
+_SLOT_PREFIX = "_f_"
+
+
+def _slots(*names: str) -> Tuple[str, ...]:
+    return tuple(_SLOT_PREFIX + name for name in names)
+
+def _field_property(name: str, descriptor: Any) -> property:
+    get = descriptor.__get__
+
+    def getter(record: "Record") -> Any:
+        # an unset slot raises AttributeError, then __getattr__ looks up the extra fields
+        value = get(record, None)
+        expand = record._expanders.get(name)
+        return value if expand is None else expand(value)
+    return property(getter)
+
+
+class Record(Mapping): # type: ignore
+    """
+    The base class of the record types.
+    Subclasses declare the fields as ``__slots__ = _slots(*field_names)``
+    """
+    __slots__ = ("_extra",)
+    _extra: Optional[Dict[str, Any]]
+    # the descriptors of the slots storing the fields, set for each subclass
+    _fields: Dict[str, Any] = {}
+    # field name -> function converting the stored value when it is read,
+    # set by conflux_web3._utils.method_formatters for the fields stored compactly in the "records" result mode
+    _expanders: Dict[str, Callable[[Any], Any]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._fields = {}
+        for slot in cls.__slots__:
+            name = slot[len(_SLOT_PREFIX):]
+            descriptor = getattr(cls, slot)
+            cls._fields[name] = descriptor
+            setattr(cls, name, _field_property(name, descriptor))
+
+    @classmethod
+    def field_names(cls) -> Sequence[str]:
+        """
+        the fields declared by the record type
+        """
+        return tuple(cls._fields)
+
+    @classmethod
+    def from_dict(cls: Type[TRecord], values: Mapping) -> TRecord: # type: ignore
+        """
+        create a record from the fields of a dict, the values are stored as they are
+        """
+        record = object.__new__(cls)
+        fields = cls._fields
+        extra = None
+        for key, value in values.items():
+            descriptor = fields.get(key)
+            if descriptor is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                descriptor.__set__(record, value)
+        _set_extra(record, extra)
+        return record
+
+    def _get_stored(self, key: str) -> Any:
+        descriptor = self._fields.get(key)
+        if descriptor is not None:
+            try:
+                return descriptor.__get__(self, None)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._get_stored(key)
+        expand = self._expanders.get(key)
+        return value if expand is None else expand(value)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called if the attribute is not found, i.e. unset fields or extra fields
+        if name != "_extra" and self._extra is not None and name in self._extra:
+            value = self._extra[name]
+            expand = self._expanders.get(name)
+            return value if expand is None else expand(value)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self._get_stored(key) # type: ignore
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        for name, descriptor in self._fields.items():
+            try:
+                descriptor.__get__(self, None)
+            except AttributeError:
+                continue
+            yield name
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise TypeError("This data is immutable -- create a copy instead of modifying")
+
+    def __delattr__(self, name: str) -> None:
+        raise TypeError("This data is immutable -- create a copy instead of modifying")
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        # the stored values are pickled, rather than the converted ones
+        return type(self).from_dict, ({key: self._get_stored(key) for key in self},)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+_set_extra = Record._extra.__set__ # type: ignore
+
+
+class LogRecord(Record):
+    """
+    A log as a record, see ``LogReceipt``
+    """
+    __slots__ = _slots(*LogReceipt.__annotations__, "space")
+
+class ReceiptRecord(Record):
+    """
+    A transaction receipt as a record, see ``TxReceipt``
+    """
+    __slots__ = _slots(*TxReceiptWithSpace.__annotations__, "burntGasFee", "effectiveGasPrice", "type")
+
+class TransactionRecord(Record):
+    """
+    A transaction as a record, see ``TxData``
+    """
+    __slots__ = _slots(*TxData.__annotations__, "type", "accessList", "maxFeePerGas", "maxPriorityFeePerGas", "yParity")
+
+class BlockRecord(Record):
+    """
+    A block as a record, see ``BlockData``
+    """
+    __slots__ = _slots(*BlockData.__annotations__, "baseFeePerGas")
+
+class EventDataRecord(Record):
+    """
+    Decoded event data as a record, see ``EventData``
+    """
+    __slots__ = _slots(*EventData.__annotations__)
+
+
+__all__ = [
+    "Record",
+    "LogRecord",
+    "ReceiptRecord",
+    "TransactionRecord",
+    "BlockRecord",
+    "EventDataRecord",
+]
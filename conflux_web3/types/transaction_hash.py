@@ -16,6 +16,9 @@ if TYPE_CHECKING:
         TxReceipt,
         TxData,
     )
+    from conflux_web3.receipt_watcher import (
+        ReceiptStrategy,
+    )
 
 def requires_web3(func):
     def inner(self, *args, **kwargs):
@@ -48,8 +51,19 @@ class TransactionHash(HexBytes):
         return self._w3.cfx.wait_till_transaction_mined(self, timeout, poll_latency)
     
     @requires_web3
-    def executed(self, timeout: float = 300, poll_latency: float = 0.5) -> "TxReceipt":
-        return self._w3.cfx.wait_for_transaction_receipt(self, timeout, poll_latency) 
+    def executed(
+        self,
+        timeout: float = 300,
+        poll_latency: float = 0.5,
+        strategy: "ReceiptStrategy" = "receipt",
+        epoch_hint: Optional[Union[int, str, bytes]] = None,
+    ) -> "TxReceipt":
+        if strategy == "receipt" and epoch_hint is None:
+            # AsyncConfluxClient.wait_for_transaction_receipt only accepts the per-hash polling arguments
+            return self._w3.cfx.wait_for_transaction_receipt(self, timeout, poll_latency)
+        return self._w3.cfx.wait_for_transaction_receipt(
+            self, timeout, poll_latency, strategy=strategy, epoch_hint=epoch_hint
+        )
     
     @requires_web3
     def confirmed(self, timeout: float = 600, poll_latency: float = 0.5) -> "TxReceipt":
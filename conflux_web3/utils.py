@@ -2,7 +2,13 @@
 from conflux_web3._utils.transactions import (
     fill_transaction_defaults
 )
+from conflux_web3._utils.addresses import (
+    address_cache_info,
+    clear_address_cache,
+)
 
 __all__ = [
-    "fill_transaction_defaults"
+    "fill_transaction_defaults",
+    "address_cache_info",
+    "clear_address_cache",
 ]
@@ -68,6 +68,14 @@ extras_require = {
     "ipfs": [
         "ipfshttpclient==0.8.0a2",
     ],
+    # vectorized columnar event decoding
+    "numpy": [
+        "numpy",
+    ],
+    # fast JSON decoding of HTTP responses
+    "orjson": [
+        "orjson",
+    ],
 }
 
 extras_require['dev'] = (
@@ -0,0 +1,66 @@
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from web3.providers.base import (
+    BaseProvider,
+)
+
+
+class RPCError(Exception):
+    """
+    raised by a canned result to respond with a JSON-RPC error
+    """
+    def __init__(self, message: str, code: int = -32602, data: Optional[str] = None):
+        super().__init__(message)
+        self.error: Dict[str, Any] = {"code": code, "message": message}
+        if data is not None:
+            self.error["data"] = data
+
+
+class FakeProvider(BaseProvider):
+    """
+    responds to single and batch requests with canned results.
+    The method of every request is recorded in ``requests``, the methods of each batch in ``batches``.
+
+    A canned result is a value, a function of the params returning the value,
+    or an ``RPCError`` to respond with an error.
+    Providers simulating a chain override ``get_result``.
+    """
+    def __init__(self, results: Optional[Dict[str, Any]] = None):
+        self.results: Dict[str, Any] = dict(results or {})
+        self.requests: List[str] = []
+        self.batches: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def get_result(self, method: str, params: Any) -> Any:
+        if method not in self.results:
+            raise RPCError(f"Method not found: {method}", -32601)
+        result = self.results[method]
+        if isinstance(result, RPCError):
+            raise result
+        return result(params) if callable(result) else result
+
+    def respond(self, method: str, params: Any, id: int = 0) -> Dict[str, Any]:
+        try:
+            return {"jsonrpc": "2.0", "id": id, "result": self.get_result(method, params)}
+        except RPCError as e:
+            return {"jsonrpc": "2.0", "id": id, "error": e.error}
+
+    def make_request(self, method, params) -> Dict[str, Any]:
+        with self._lock:
+            self.requests.append(method)
+        return self.respond(method, params)
+
+    def make_batch_request(self, requests: Sequence[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        methods = [method for method, _ in requests]
+        with self._lock:
+            self.requests.extend(methods)
+            self.batches.append(methods)
+        return [self.respond(method, params, id) for id, (method, params) in enumerate(requests)]
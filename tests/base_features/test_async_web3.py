@@ -0,0 +1,199 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from hexbytes import HexBytes
+from eth_abi import encode
+from web3.providers.async_base import (
+    AsyncBaseProvider,
+)
+from web3.exceptions import (
+    TimeExhausted,
+)
+
+from cfx_account import Account
+from cfx_address import Base32Address
+from conflux_web3 import AsyncWeb3
+from conflux_web3.contract.metadata import (
+    get_contract_metadata,
+)
+from conflux_web3._utils.transactions import (
+    async_fill_transaction_defaults,
+)
+from conflux_web3.types.transaction_hash import (
+    TransactionHash,
+)
+
+CHAIN_ID = 1
+FAKE_TX_HASH = "0x" + "ab" * 32
+
+
+class FakeAsyncProvider(AsyncBaseProvider):
+    """
+    returns canned results and records the received requests
+    """
+    def __init__(self, results: Dict[str, Callable[[List[Any]], Any]]):
+        super().__init__()
+        self.results = results
+        self.requests: List[Tuple[str, List[Any]]] = []
+
+    async def make_request(self, method, params):
+        self.requests.append((method, params))
+        return {"jsonrpc": "2.0", "id": len(self.requests), "result": self.results[method](params)}
+
+
+def default_results():
+    return {
+        "cfx_getStatus": lambda params: {
+            "bestHash": "0x" + "00" * 32,
+            "chainId": hex(CHAIN_ID),
+            "ethereumSpaceChainId": "0x47",
+            "networkId": hex(CHAIN_ID),
+            "epochNumber": "0x64",
+            "blockNumber": "0x64",
+            "pendingTxNumber": "0x0",
+            "latestCheckpoint": "0x0",
+            "latestConfirmed": "0x60",
+            "latestState": "0x62",
+            "latestFinalized": "0x50",
+        },
+        "cfx_epochNumber": lambda params: "0x64",
+        "cfx_gasPrice": lambda params: hex(10**9),
+        "cfx_getNextNonce": lambda params: "0x3",
+        "cfx_estimateGasAndCollateral": lambda params: {
+            "gasLimit": hex(21000),
+            "gasUsed": hex(21000),
+            "storageCollateralized": "0x0",
+        },
+        "cfx_sendTransaction": lambda params: FAKE_TX_HASH,
+        "cfx_clientVersion": lambda params: "conflux-rust-fake",
+        "cfx_getTransactionReceipt": lambda params: None,
+    }
+
+
+@pytest.fixture
+def provider() -> FakeAsyncProvider:
+    return FakeAsyncProvider(default_results())
+
+
+@pytest.fixture
+def async_w3(provider: FakeAsyncProvider) -> AsyncWeb3:
+    return AsyncWeb3(provider)
+
+
+def test_async_rpc_results_are_formatted(async_w3: AsyncWeb3):
+    async def run():
+        assert await async_w3.is_connected()
+        assert await async_w3.cfx.epoch_number == 100
+        assert (await async_w3.cfx.gas_price).value == 10**9
+        assert (await async_w3.cfx.get_status())["latestState"] == 98
+        assert await async_w3.cfx.epoch_number_by_tag("latest_confirmed") == 100
+    asyncio.run(run())
+
+
+def test_async_chain_id_is_cached(async_w3: AsyncWeb3, provider: FakeAsyncProvider):
+    async def run():
+        assert await async_w3.cfx.chain_id == CHAIN_ID
+        assert await async_w3.cfx.chain_id == CHAIN_ID
+    asyncio.run(run())
+    assert [method for method, _ in provider.requests].count("cfx_getStatus") == 1
+
+
+def test_async_send_transaction(async_w3: AsyncWeb3, provider: FakeAsyncProvider):
+    address = Base32Address(Account.create().address, CHAIN_ID)
+
+    async def run():
+        return await async_w3.cfx.send_transaction({
+            "from": address,
+            "to": address,
+            "value": 100,
+        })
+    tx_hash = asyncio.run(run())
+
+    assert isinstance(tx_hash, TransactionHash)
+    assert tx_hash == HexBytes(FAKE_TX_HASH)
+    methods = [method for method, _ in provider.requests]
+    # estimate is only requested once when filling gas and storageLimit
+    assert methods.count("cfx_estimateGasAndCollateral") == 1
+    method, params = provider.requests[-1]
+    assert method == "cfx_sendTransaction"
+    assert params[0]["nonce"] == "0x3"
+    assert params[0]["gas"] == hex(21000)
+    assert params[0]["epochHeight"] == "0x64"
+
+
+def test_async_wait_for_receipt_timeout(async_w3: AsyncWeb3):
+    async def run():
+        await async_w3.cfx.wait_for_transaction_receipt(FAKE_TX_HASH, timeout=0.1, poll_latency=0.01)
+    with pytest.raises(TimeExhausted):
+        asyncio.run(run())
+
+
+def test_async_wait_till_transaction_confirmed_timeout(async_w3: AsyncWeb3, provider: FakeAsyncProvider):
+    async def run():
+        await async_w3.cfx.wait_till_transaction_confirmed(FAKE_TX_HASH, timeout=0.2, poll_latency=0.01)
+    start = time.monotonic()
+    with pytest.raises(TimeExhausted):
+        asyncio.run(run())
+    assert time.monotonic() - start < 1
+    # the receipt is polled with the poll latency of the caller
+    assert [method for method, _ in provider.requests].count("cfx_getTransactionReceipt") > 5
+
+
+def test_async_transaction_hash_executed(async_w3: AsyncWeb3, provider: FakeAsyncProvider):
+    provider.results["cfx_getTransactionReceipt"] = lambda params: {
+        "transactionHash": FAKE_TX_HASH,
+        "index": "0x0",
+        "blockHash": "0x" + "cd" * 32,
+        "epochNumber": "0x64",
+        "gasUsed": hex(21000),
+        "outcomeStatus": "0x0",
+    }
+    tx_hash = TransactionHash(FAKE_TX_HASH)
+    tx_hash.set_w3(async_w3) # type: ignore
+
+    async def run():
+        return await tx_hash.executed(timeout=1, poll_latency=0.01)
+    receipt = asyncio.run(run())
+
+    assert receipt["epochNumber"] == 100
+    assert receipt["transactionHash"] == HexBytes(FAKE_TX_HASH)
+
+
+def test_async_contract_call(provider: FakeAsyncProvider, async_w3: AsyncWeb3):
+    provider.results["cfx_call"] = lambda params: "0x" + encode(["uint256"], [42]).hex()
+    metadata = get_contract_metadata("ERC20")
+    contract_address = Base32Address("0x8" + "1" * 39, CHAIN_ID)
+    contract = async_w3.cfx.contract(address=contract_address, abi=metadata["abi"])
+
+    async def run():
+        return await contract.functions.initialSupply().call()
+    assert asyncio.run(run()) == 42
+    method, params = provider.requests[-1]
+    assert method == "cfx_call"
+    assert params[0]["to"] == contract_address
+
+
+def test_async_contract_requires_chain_id_for_hex_address(async_w3: AsyncWeb3):
+    metadata = get_contract_metadata("ERC20")
+    with pytest.raises(ValueError):
+        async_w3.cfx.contract(address="0x8" + "1" * 39, abi=metadata["abi"])
+
+
+def test_async_fill_transaction_defaults(async_w3: AsyncWeb3, provider: FakeAsyncProvider):
+    address = Base32Address(Account.create().address, CHAIN_ID)
+    async_w3.cfx.transaction_defaults_staleness = 10
+
+    async def fill_twice():
+        return [await async_fill_transaction_defaults(async_w3, {"from": address, "to": address}) for _ in range(2)]
+
+    filled = asyncio.run(fill_twice())
+    assert filled[0]["nonce"] == 3
+    assert filled[1]["gas"] == 21000
+    assert filled[1]["epochHeight"] == 100
+    methods = [method for method, _ in provider.requests]
+    assert methods.count("cfx_gasPrice") == 1
+    assert methods.count("cfx_epochNumber") == 1
+    assert methods.count("cfx_getStatus") == 1
+    assert methods.count("cfx_estimateGasAndCollateral") == 2
@@ -0,0 +1,106 @@
+import pytest
+
+from cfx_address import Base32Address
+from cfx_utils.token_unit import Drip
+from conflux_web3 import Web3
+from conflux_web3.batch import (
+    match_batch_responses,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+    RPCError,
+)
+
+ADDRESS = Base32Address("0x1" + "0" * 39, 1)
+
+
+@pytest.fixture
+def provider() -> FakeProvider:
+    return FakeProvider({
+        "cfx_getBalance": hex(10**18),
+        "cfx_getNextNonce": "0x5",
+        "cfx_epochNumber": "0x64",
+        "cfx_getStakingBalance": RPCError("invalid params"),
+        "cfx_getTransactionReceipt": None,
+    })
+
+
+@pytest.fixture
+def w3(provider: FakeProvider) -> Web3:
+    return Web3(provider, middlewares=[], ens=None)
+
+
+def test_batch_results_are_formatted(w3: Web3, provider: FakeProvider):
+    with w3.cfx.batch() as batch:
+        balance = batch.get_balance(ADDRESS)
+        nonce = batch.get_next_nonce(ADDRESS)
+        epoch_number = batch.epoch_number
+        assert not balance.done()
+    assert len(provider.batches) == 1
+    assert provider.batches[0] == ["cfx_getBalance", "cfx_getNextNonce", "cfx_epochNumber"]
+    assert balance.result() == Drip(10**18)
+    assert nonce.result() == 5
+    assert epoch_number.result() == 100
+
+
+def test_batch_result_mode(w3: Web3):
+    with w3.cfx.batch(result_mode="light") as batch:
+        light_balance = batch.get_balance(ADDRESS)
+    with w3.cfx.with_result_mode("raw").batch() as batch:
+        raw_balance = batch.get_balance(ADDRESS)
+    with w3.cfx.batch() as batch:
+        balance = batch.get_balance(ADDRESS)
+    assert type(light_balance.result()) is int and light_balance.result() == 10**18
+    assert raw_balance.result() == hex(10**18)
+    # the result mode of the client is not changed
+    assert balance.result() == Drip(10**18)
+    with pytest.raises(ValueError):
+        w3.cfx.batch(result_mode="plain") # type: ignore
+
+
+def test_batch_item_errors_are_isolated(w3: Web3):
+    with w3.cfx.batch() as batch:
+        staking_balance = batch.get_staking_balance(ADDRESS)
+        receipt = batch.get_transaction_receipt("0x" + "00" * 32)
+        nonce = batch.get_next_nonce(ADDRESS)
+    assert isinstance(staking_balance.exception(), ValueError)
+    with pytest.raises(ValueError):
+        staking_balance.result()
+    assert receipt.result() is None
+    assert nonce.result() == 5
+
+
+def test_batch_rejects_unbatchable_apis(w3: Web3, provider: FakeProvider):
+    batch = w3.cfx.batch()
+    with pytest.raises(ValueError):
+        batch.wait_till_transaction_confirmed("0x" + "00" * 32)
+    with pytest.raises(ValueError):
+        batch.send_transaction({"from": ADDRESS, "to": ADDRESS, "nonce": 1})
+    assert len(batch) == 0
+    with pytest.raises(RuntimeError):
+        batch.get_next_nonce(ADDRESS).result()
+    batch.execute()
+    assert len(provider.batches) == 1
+    with pytest.raises(RuntimeError):
+        batch.execute()
+
+
+def test_batch_is_not_sent_on_exception(w3: Web3, provider: FakeProvider):
+    with pytest.raises(KeyError):
+        with w3.cfx.batch() as batch:
+            batch.get_next_nonce(ADDRESS)
+            raise KeyError
+    assert provider.batches == []
+
+
+def test_match_batch_responses():
+    responses = match_batch_responses([1, 2, 3], [
+        {"jsonrpc": "2.0", "id": 3, "result": "0x3"},
+        {"jsonrpc": "2.0", "id": 1, "result": "0x1"},
+    ])
+    assert responses[0]["result"] == "0x1"
+    assert "error" in responses[1]
+    assert responses[2]["result"] == "0x3"
+
+    batch_error = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch too large"}}
+    assert match_batch_responses([1, 2], batch_error) == [batch_error, batch_error]
@@ -0,0 +1,165 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import requests
+
+from conflux_web3 import Web3
+from conflux_web3.providers import (
+    ConfluxHTTPProvider,
+    get_json_loads,
+)
+
+ADDRESS = "cfxtest:aak2rra2njvd77ezwjvx04kkds9fzagfe6ku8scz91"
+RESULTS: Dict[str, Any] = {
+    "cfx_epochNumber": "0x64",
+    "cfx_getBalance": "0xde0b6b3a7640000",
+    "cfx_getNextNonce": "0x2",
+    "trace_epoch": {
+        "cfxTraces": [
+            {
+                "type": "call",
+                "action": {
+                    "from": "CFXTEST:TYPE.USER:AAK2RRA2NJVD77EZWJVX04KKDS9FZAGFE6KU8SCZ91",
+                    "to": "CFXTEST:TYPE.USER:AAK2RRA2NJVD77EZWJVX04KKDS9FZAGFE6KU8SCZ91",
+                    "value": "0x1", "gas": "0x5208", "input": "0x", "callType": "call",
+                    "space": "native",
+                },
+                "valid": True, "epochHash": "0x" + "11" * 32, "epochNumber": "0x64",
+                "blockHash": "0x" + "22" * 32, "transactionPosition": "0x0",
+                "transactionHash": "0x" + "33" * 32,
+            },
+            {
+                "type": "call_result",
+                "action": {"outcome": "success", "gasLeft": "0x0", "returnData": "0x"},
+                "valid": True, "epochHash": "0x" + "11" * 32, "epochNumber": "0x64",
+                "blockHash": "0x" + "22" * 32, "transactionPosition": "0x0",
+                "transactionHash": "0x" + "33" * 32,
+            },
+        ],
+        "ethTraces": [],
+        "mirrorAddressMap": {},
+    },
+}
+
+
+class RPCHandler(BaseHTTPRequestHandler):
+    requests: List[Dict[str, Any]] = []
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append({"headers": dict(self.headers), "body": body})
+        if isinstance(body, list):
+            response: Any = [self.respond(item) for item in reversed(body)]
+        else:
+            response = self.respond(body)
+        data = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def respond(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request["method"] not in RESULTS:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": RESULTS[request["method"]]}
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+# cns=None skips querying the name service deployment
+@pytest.fixture
+def node_url() -> Iterator[str]:
+    RPCHandler.requests = []
+    server = HTTPServer(("127.0.0.1", 0), RPCHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_web3_http_provider():
+    assert Web3.HTTPProvider is ConfluxHTTPProvider
+
+
+def test_get_json_loads():
+    assert get_json_loads("json") is json.loads
+    assert get_json_loads(None)(b'{"result": "0x1"}') == {"result": "0x1"}
+    loads = lambda raw: {"raw": raw}
+    assert get_json_loads(loads) is loads
+    with pytest.raises(ValueError):
+        get_json_loads("simplejson")
+
+
+def test_orjson_backend():
+    orjson = pytest.importorskip("orjson")
+    assert get_json_loads("orjson") is orjson.loads
+    assert get_json_loads(None) is orjson.loads
+
+
+@pytest.mark.parametrize("json_backend", ["json", None])
+def test_make_request(node_url: str, json_backend: Any):
+    w3 = Web3(Web3.HTTPProvider(node_url, json_backend=json_backend), cns=None)
+    assert w3.cfx.epoch_number == 100
+    assert w3.cfx.get_balance(ADDRESS).value == 10**18
+
+
+def test_batch_request(node_url: str):
+    w3 = Web3(Web3.HTTPProvider(node_url), cns=None)
+    with w3.cfx.batch() as batch:
+        balance = batch.get_balance(ADDRESS)
+        nonce = batch.get_next_nonce(ADDRESS)
+    assert balance.result().value == 10**18
+    assert nonce.result() == 2
+    assert len(RPCHandler.requests) == 1
+
+
+def test_request_options(node_url: str):
+    w3 = Web3(Web3.HTTPProvider(node_url, keep_alive=False, compression=False, request_kwargs={"timeout": 3}), cns=None)
+    w3.cfx.epoch_number
+    headers = RPCHandler.requests[-1]["headers"]
+    assert headers["Connection"] == "close"
+    assert headers["Accept-Encoding"] == "identity"
+    assert w3.provider.get_request_kwargs()["timeout"] == 3
+
+    w3 = Web3(Web3.HTTPProvider(node_url), cns=None)
+    w3.cfx.epoch_number
+    headers = RPCHandler.requests[-1]["headers"]
+    assert headers["Connection"] == "keep-alive"
+    assert "gzip" in headers["Accept-Encoding"]
+
+
+def test_connection_pool():
+    provider = ConfluxHTTPProvider("http://127.0.0.1:12537", pool_connections=2, pool_maxsize=32)
+    adapter = provider.session.get_adapter("http://127.0.0.1:12537")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 32
+
+
+def test_session_per_thread(node_url: str):
+    session = requests.Session()
+    w3 = Web3(Web3.HTTPProvider(node_url, session=session), cns=None)
+    assert w3.provider.session is session
+
+    def request_in_thread(_: int) -> Any:
+        assert w3.cfx.epoch_number == 100
+        return w3.provider.session
+    with ThreadPoolExecutor(4) as executor:
+        sessions = list(executor.map(request_in_thread, range(8)))
+    assert session not in sessions
+    assert len({id(thread_session) for thread_session in sessions}) <= 4
+    assert all(thread_session.get_adapter(node_url)._pool_maxsize == 10 for thread_session in sessions)
+
+
+def test_iter_call_frames(node_url: str):
+    w3 = Web3(Web3.HTTPProvider(node_url), cns=None)
+    frames = list(w3.cfx.iter_call_frames(100))
+    assert len(frames) == 1
+    assert frames[0]["outcome"] == "success"
+    assert frames[0]["value"] == 1
@@ -0,0 +1,54 @@
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.contract.metadata import (
+    _load_metadata,
+    get_contract_metadata,
+)
+
+TOKEN = Base32Address("0x8" + "0" * 39, 1)
+
+
+def make_web3() -> Web3:
+    w3 = Web3(provider=BaseProvider(), middlewares=[], ens=None)
+    w3.cfx.chain_id = 1  # type: ignore
+    return w3
+
+
+def test_metadata_is_loaded_once():
+    get_contract_metadata("ERC20")
+    misses = _load_metadata.cache_info().misses
+    metadata = get_contract_metadata("ERC20")
+    assert _load_metadata.cache_info().misses == misses
+    # the returned dict could be modified without affecting the cached one
+    metadata["address"] = TOKEN
+    assert "address" not in get_contract_metadata("ERC20", with_deployment_info=False)
+    assert metadata["abi"] is get_contract_metadata("ERC20")["abi"]
+
+
+def test_contract_factory_is_reused():
+    w3 = make_web3()
+    factory = w3.cfx.contract(name="ERC20", with_deployment_info=False)
+    assert w3.cfx.contract(name="ERC20", with_deployment_info=False) is factory
+    # an equal abi of another object hits the cache by hash
+    abi = [dict(item) for item in factory.abi]
+    bytecode = get_contract_metadata("ERC20")["bytecode"]
+    assert w3.cfx.contract(abi=abi, bytecode=bytecode) is factory
+    assert w3.cfx.contract(abi=abi) is not factory
+    token = w3.cfx.contract(TOKEN, name="ERC20")
+    assert type(token) is factory
+    assert token.address == TOKEN
+    assert make_web3().cfx.contract(name="ERC20", with_deployment_info=False) is not factory
+
+
+def test_events_are_created_on_first_access():
+    w3 = make_web3()
+    token = w3.cfx.contract(TOKEN, name="ERC20")
+    assert "Transfer" not in token.events.__dict__
+    transfer = token.events.Transfer
+    assert token.events.Transfer is transfer
+    assert transfer.address == TOKEN
+    assert "Transfer" in [event.event_name for event in token.events]
@@ -0,0 +1,99 @@
+import pytest
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3.middleware import (
+    construct_result_generator_middleware,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+
+CONTRACT = Base32Address("0x8" + "0" * 39, 1)
+OTHER_CONTRACT = Base32Address("0x8" + "0" * 38 + "1", 1)
+HOLDER = "0x1" + "0" * 39
+TRANSFER_ABI = {
+    "type": "event",
+    "name": "Transfer",
+    "anonymous": False,
+    "inputs": [
+        {"name": "from", "type": "address", "indexed": True},
+        {"name": "to", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+APPROVAL_ABI = {
+    "type": "event",
+    "name": "Approval",
+    "anonymous": False,
+    "inputs": [
+        {"name": "owner", "type": "address", "indexed": True},
+        {"name": "spender", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+PAUSED_ABI = {"type": "event", "name": "Paused", "anonymous": False, "inputs": []}
+
+
+@pytest.fixture
+def w3() -> Web3:
+    w3 = Web3(provider=BaseProvider(), middlewares=[], ens=None)
+    w3.middleware_onion.add(construct_result_generator_middleware({
+        "cfx_getStatus": lambda method, params: {"chainId": "0x1", "networkId": "0x1"},
+    }))
+    return w3
+
+
+def make_log(event_abi, value: int, address=CONTRACT):
+    return {
+        "address": address,
+        "topics": [
+            HexBytes(event_abi_to_log_topic(event_abi)),
+            HexBytes(encode(["address"], [HOLDER])),
+            HexBytes(encode(["address"], [HOLDER])),
+        ],
+        "data": HexBytes(encode(["uint256"], [value])),
+    }
+
+
+def test_process_logs_all_routes_by_topic_and_address(w3: Web3):
+    contract = w3.cfx.contract(abi=[TRANSFER_ABI, APPROVAL_ABI, PAUSED_ABI], address=CONTRACT)
+    unknown_log = {**make_log(TRANSFER_ABI, 0), "topics": [HexBytes(b"\x01" * 32)]}
+    logs = [
+        make_log(TRANSFER_ABI, 1),
+        make_log(APPROVAL_ABI, 2),
+        make_log(TRANSFER_ABI, 3, OTHER_CONTRACT),
+        unknown_log,
+        make_log(TRANSFER_ABI, 4),
+    ]
+    events = contract.events.process_logs_all(logs)
+    assert set(events.keys()) == {"Transfer", "Approval", "Paused"}
+    assert [event["args"]["value"] for event in events["Transfer"]] == [1, 4]
+    assert [event["args"]["value"] for event in events["Approval"]] == [2]
+    assert events["Paused"] == ()
+
+
+def test_process_logs_all_keeps_anonymous_events(w3: Web3):
+    anonymous_abi = {**APPROVAL_ABI, "name": "AnonymousApproval", "anonymous": True}
+    contract = w3.cfx.contract(abi=[TRANSFER_ABI, anonymous_abi], address=CONTRACT)
+    events = contract.events.process_logs_all([make_log(TRANSFER_ABI, 1)])
+    assert set(events.keys()) == {"Transfer", "AnonymousApproval"}
+    assert events["AnonymousApproval"] == ()
+
+
+def test_process_receipt_all(w3: Web3):
+    contract = w3.cfx.contract(abi=[TRANSFER_ABI, APPROVAL_ABI])
+    receipt = {
+        "transactionHash": HexBytes(b"\x02" * 32),
+        "blockHash": HexBytes(b"\x03" * 32),
+        "epochNumber": 10,
+        "index": 0,
+        "logs": [make_log(APPROVAL_ABI, 5), make_log(TRANSFER_ABI, 6, OTHER_CONTRACT)],
+    }
+    events = contract.events.process_receipt_all(receipt)
+    assert events["Approval"][0]["args"]["value"] == 5
+    assert events["Approval"][0]["epochNumber"] == 10
+    assert events["Transfer"][0]["transactionLogIndex"] == 1
@@ -0,0 +1,59 @@
+import pytest
+from eth_abi import encode
+from web3.exceptions import (
+    ABIFunctionNotFound,
+)
+from web3.middleware import (
+    construct_result_generator_middleware,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+
+TOKEN = Base32Address("0x8" + "0" * 39, 1)
+OTHER_TOKEN = Base32Address("0x8" + "0" * 38 + "1", 1)
+HOLDER = Base32Address("0x1" + "0" * 39, 1)
+
+
+@pytest.fixture
+def w3() -> Web3:
+    calls = []
+    w3 = Web3(provider=BaseProvider(), middlewares=[], ens=None)
+    w3.middleware_onion.add(construct_result_generator_middleware({
+        "cfx_getStatus": lambda method, params: {"chainId": "0x1", "networkId": "0x1"},
+        "cfx_call": lambda method, params: calls.append(params) or "0x" + encode(["uint256"], [len(calls)]).hex(),
+    }))
+    w3.calls = calls # type: ignore
+    return w3
+
+
+def test_functions_are_created_on_first_access(w3: Web3):
+    factory = w3.cfx.contract(name="ERC20", with_deployment_info=False)
+    token = factory(TOKEN)
+    other_token = factory(OTHER_TOKEN)
+    assert "balanceOf" not in token.functions.__dict__
+    assert "balanceOf" not in token.caller.__dict__
+
+    balance_of = token.functions.balanceOf
+    assert token.functions.balanceOf is balance_of
+    assert balance_of.address == TOKEN
+    # function classes are shared by instances of the contract class
+    assert type(other_token.functions.balanceOf) is type(balance_of)
+    assert other_token.functions.balanceOf.address == OTHER_TOKEN
+    assert "balanceOf" in [name for name in token.functions]
+
+    with pytest.raises(ABIFunctionNotFound):
+        token.functions.notExist
+
+
+def test_rebinding_caller(w3: Web3):
+    token = w3.cfx.contract(name="ERC20", address=TOKEN)
+    caller = token.caller(block_identifier=100)
+    assert caller._function_classes is token.caller._function_classes
+    assert caller.balanceOf(HOLDER) == 1
+    assert w3.calls[-1][1] == hex(100) # type: ignore
+    assert token.caller.balanceOf(HOLDER) == 2
+    assert w3.calls[-1][1] == "latest_state" # type: ignore
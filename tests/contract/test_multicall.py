@@ -0,0 +1,130 @@
+import pytest
+from eth_abi import decode, encode
+from hexbytes import HexBytes
+from web3.exceptions import (
+    ContractLogicError,
+)
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.contract.metadata import (
+    DEPLOYMENT_INFO,
+)
+from conflux_web3.multicall import (
+    _deployed_aggregators,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+    RPCError,
+)
+
+TOKEN = Base32Address("0x8" + "0" * 39, 1)
+HOLDERS = [Base32Address("0x1" + f"{i:039x}", 1) for i in range(10)]
+BALANCE_OF_SELECTOR = HexBytes("0x70a08231")
+REVERT_DATA = HexBytes("0x08c379a0") + encode(["string"], ["no balance"])
+
+
+def balance_of(call_data: bytes):
+    """
+    the fake token returns the holder index as balance, holder 3 reverts
+    """
+    assert call_data[:4] == BALANCE_OF_SELECTOR
+    holder = decode(["address"], call_data[4:])[0]
+    index = int(holder, 16) - 0x1 * 16 ** 39
+    if index == 3:
+        return False, REVERT_DATA
+    return True, encode(["uint256"], [index])
+
+
+class FakeMulticallProvider(FakeProvider):
+    def __init__(self, deployed: bool, max_calls_per_aggregation: int = 100, deployed_epoch: int = 0):
+        super().__init__({"cfx_getStatus": {"chainId": "0x1", "networkId": "0x1"}})
+        self.deployed = deployed
+        self.deployed_epoch = deployed_epoch
+        self.max_calls_per_aggregation = max_calls_per_aggregation
+
+    def _is_deployed(self, epoch) -> bool:
+        # epoch tags are the latest state
+        if isinstance(epoch, str) and epoch.startswith("0x"):
+            return self.deployed and int(epoch, 16) >= self.deployed_epoch
+        return self.deployed
+
+    def get_result(self, method, params):
+        if method == "cfx_getCode":
+            return "0x6000" if self._is_deployed(params[1] if len(params) > 1 else None) else "0x"
+        if method != "cfx_call":
+            return super().get_result(method, params)
+        to = Base32Address(params[0]["to"])
+        data = HexBytes(params[0]["data"])
+        if to.hex_address.lower() == DEPLOYMENT_INFO["Multicall"].lower():
+            # calling an address without code returns empty output
+            return self._aggregate(data) if self._is_deployed(params[1] if len(params) > 1 else None) else "0x"
+        success, output = balance_of(data)
+        if not success:
+            raise RPCError("execution reverted", -32015, output.hex())
+        return HexBytes(output).hex()
+
+    def _aggregate(self, data: bytes) -> str:
+        output = b""
+        position = count = 0
+        while position < len(data):
+            size = int.from_bytes(data[position + 20:position + 24], "big")
+            success, return_data = balance_of(data[position + 24:position + 24 + size])
+            output += (int(success) << 128 | len(return_data)).to_bytes(32, "big") + return_data
+            position += 24 + size
+            count += 1
+        if count > self.max_calls_per_aggregation:
+            raise RPCError("out of gas", -32015)
+        return HexBytes(output).hex()
+
+
+@pytest.fixture(autouse=True)
+def clear_deployed_aggregators():
+    _deployed_aggregators.clear()
+
+
+def make_token(w3: Web3):
+    return w3.cfx.contract(name="ERC20", address=TOKEN)
+
+
+def test_multicall_by_aggregator():
+    provider = FakeMulticallProvider(deployed=True, max_calls_per_aggregation=4)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    token = make_token(w3)
+    with w3.cfx.multicall() as multicall:
+        items = [multicall.add(token.functions.balanceOf(holder)) for holder in HOLDERS]
+    assert [item.result() for item in items if item.exception() is None] == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    with pytest.raises(ContractLogicError, match="no balance"):
+        items[3].result()
+    # the chunk of 10 calls is split until each chunk is accepted
+    assert provider.requests.count("cfx_call") > 1
+
+
+def test_multicall_falls_back_to_batch():
+    provider = FakeMulticallProvider(deployed=False)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    token = make_token(w3)
+    with w3.cfx.multicall(max_calls_per_request=4) as multicall:
+        items = [multicall.add(token.functions.balanceOf(holder)) for holder in HOLDERS]
+    assert items[9].result() == 9
+    assert items[3].exception() is not None
+    assert provider.requests.count("cfx_call") == len(HOLDERS)
+
+
+@pytest.mark.parametrize("known_deployment", [False, True])
+def test_multicall_before_aggregator_deployment(known_deployment):
+    provider = FakeMulticallProvider(deployed=True, deployed_epoch=100)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    token = make_token(w3)
+    with w3.cfx.multicall() as multicall:
+        multicall.add(token.functions.balanceOf(HOLDERS[0]))
+    # the aggregator is deployed at the latest state, but not at epoch 50
+    multicall = w3.cfx.multicall(block_identifier=50)
+    items = [multicall.add(token.functions.balanceOf(holder)) for holder in HOLDERS]
+    if known_deployment:
+        # the aggregator call without code returns empty output, which falls back to batch
+        multicall._execute_by_aggregator()
+    else:
+        multicall.execute()
+    assert items[9].result() == 9
+    assert items[3].exception() is not None
@@ -12,6 +12,10 @@ from web3.utils.caching import (
 )
 
 from conflux_web3 import Web3
+from conflux_web3.middleware.cache import (
+    EpochCacheMiddleware,
+    LATEST_EPOCH_RPC_WHITELIST,
+)
 from web3._utils.caching import (
     generate_cache_key,
 )
@@ -155,3 +159,116 @@ def test_simple_cache_middleware_does_not_cache_endpoints_not_in_whitelist(w3):
     result_b = w3.manager.request_blocking("not_whitelisted", [])
 
     assert result_a != result_b
+
+
+@pytest.fixture
+def counted_w3(w3_base):
+    calls = []
+    results = {
+        "cfx_getBlocksByEpoch": lambda method, params: [f"block-{params[0]}"],
+        "cfx_getBalance": lambda method, params: hex(len(calls)),
+        "cfx_getTransactionReceipt": lambda method, params: {
+            "epochNumber": "0xa" if params[0] == "0x01" else "0x100",
+            "logs": [{"data": "0x"}],
+        },
+        "cfx_gasPrice": lambda method, params: hex(len(calls)),
+        "cfx_epochNumber": lambda method, params: "0x64" if params and params[0] == "latest_finalized" else hex(100 + len(calls)),
+    }
+    def record(method, params):
+        calls.append((method, params))
+        return results[method](method, params)
+    w3_base.middleware_onion.add(
+        construct_result_generator_middleware({method: record for method in results})
+    )
+    return w3_base, calls
+
+
+def test_epoch_cache_caches_finalized_epoch_without_expiry(counted_w3):
+    w3, calls = counted_w3
+    cache = EpochCacheMiddleware(ttl=0)
+    w3.middleware_onion.add(cache)
+
+    result = w3.manager.request_blocking("cfx_getBlocksByEpoch", ["0x10"])
+    assert w3.manager.request_blocking("cfx_getBlocksByEpoch", ["0x10"]) == result
+    # block epoch request, latest finalized request
+    assert len(calls) == 2
+    assert cache.cache_info().hits == 1
+
+    # epoch 0x200 is not finalized
+    w3.manager.request_blocking("cfx_getBlocksByEpoch", ["0x200"])
+    w3.manager.request_blocking("cfx_getBlocksByEpoch", ["0x200"])
+    assert [method for method, _ in calls].count("cfx_getBlocksByEpoch") == 3
+
+
+def test_epoch_cache_caches_finalized_receipts(counted_w3):
+    w3, calls = counted_w3
+    w3.middleware_onion.add(EpochCacheMiddleware())
+
+    w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x01"])
+    w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x01"])
+    w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x02"])
+    w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x02"])
+    assert [params for method, params in calls if method == "cfx_getTransactionReceipt"] == [["0x01"], ["0x02"], ["0x02"]]
+
+
+def test_epoch_cache_results_are_not_shared(counted_w3):
+    w3, calls = counted_w3
+    w3.middleware_onion.add(EpochCacheMiddleware())
+
+    # the result is not formatted, as in raw result mode
+    receipt = w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x01"])
+    receipt["epochNumber"] = "0x0"
+    receipt["logs"][0]["data"] = "0x00"
+    cached_receipt = w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x01"])
+    cached_receipt["logs"].clear()
+    assert w3.manager.request_blocking("cfx_getTransactionReceipt", ["0x01"]) == {
+        "epochNumber": "0xa",
+        "logs": [{"data": "0x"}],
+    }
+    assert [method for method, _ in calls].count("cfx_getTransactionReceipt") == 1
+
+
+def test_epoch_cache_latest_results_expire(counted_w3):
+    w3, calls = counted_w3
+    w3.middleware_onion.add(EpochCacheMiddleware(ttl=60))
+
+    gas_price = w3.manager.request_blocking("cfx_gasPrice", [])
+    assert w3.manager.request_blocking("cfx_gasPrice", []) == gas_price
+    # state query against latest epoch is not cached by default
+    assert w3.manager.request_blocking("cfx_getBalance", ["addr", "latest_state"]) != \
+        w3.manager.request_blocking("cfx_getBalance", ["addr", "latest_state"])
+    # a newer epoch is observed
+    w3.manager.request_blocking("cfx_epochNumber", ["latest_mined"])
+    assert w3.manager.request_blocking("cfx_gasPrice", []) != gas_price
+
+
+def test_epoch_cache_ttl_and_lru_bound(counted_w3):
+    w3, calls = counted_w3
+    cache = EpochCacheMiddleware(maxsize=2, ttl=0)
+    w3.middleware_onion.add(cache)
+
+    gas_price = w3.manager.request_blocking("cfx_gasPrice", [])
+    assert w3.manager.request_blocking("cfx_gasPrice", []) != gas_price
+
+    for epoch in ["0x1", "0x2", "0x3"]:
+        w3.manager.request_blocking("cfx_getBlocksByEpoch", [epoch])
+    assert cache.cache_info().currsize == 2
+    w3.manager.request_blocking("cfx_getBlocksByEpoch", ["0x1"])
+    assert [params for method, params in calls if method == "cfx_getBlocksByEpoch"].count(["0x1"]) == 2
+
+
+def test_epoch_cache_does_not_cache_chain_head_by_default(counted_w3):
+    w3, calls = counted_w3
+    w3.middleware_onion.add(EpochCacheMiddleware(ttl=60))
+
+    assert w3.manager.request_blocking("cfx_epochNumber", ["latest_mined"]) != \
+        w3.manager.request_blocking("cfx_epochNumber", ["latest_mined"])
+
+
+def test_epoch_cache_caches_chain_head_if_opted_in(counted_w3):
+    w3, calls = counted_w3
+    w3.middleware_onion.add(EpochCacheMiddleware(ttl=60, volatile_rpc_whitelist=LATEST_EPOCH_RPC_WHITELIST))
+
+    epoch_number = w3.manager.request_blocking("cfx_epochNumber", ["latest_mined"])
+    assert w3.manager.request_blocking("cfx_epochNumber", ["latest_mined"]) == epoch_number
+    assert [method for method, _ in calls].count("cfx_epochNumber") == 1
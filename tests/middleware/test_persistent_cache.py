@@ -0,0 +1,121 @@
+import multiprocessing
+
+import pytest
+
+from web3.middleware import (
+    construct_result_generator_middleware,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from conflux_web3 import Web3
+from conflux_web3.middleware.persistent_cache import (
+    PersistentCacheMiddleware,
+)
+
+
+def build_w3(path, calls, chain_id="0x1"):
+    w3 = Web3(provider=BaseProvider(), middlewares=[], ens=None)
+    results = {
+        "cfx_getStatus": lambda method, params: {"chainId": chain_id, "epochNumber": "0x200", "latestFinalized": "0x100"},
+        "cfx_getEpochReceipts": lambda method, params: [[{"epochNumber": params[0], "index": "0x0"}]],
+        "cfx_getBlockByHash": lambda method, params: {"hash": params[0], "epochNumber": "0x10" if params[0] == "0x01" else "0x150"},
+        "cfx_getBalance": lambda method, params: "0x1",
+        "cfx_epochNumber": lambda method, params: "0x100",
+        "cfx_getTransactionByHash": lambda method, params: {
+            "hash": params[0], "blockHash": {"0x11": "0x01", "0x12": "0x02"}.get(params[0]),
+        },
+    }
+    def record(method, params):
+        calls.append((method, params))
+        return results[method](method, params)
+    w3.middleware_onion.add(
+        construct_result_generator_middleware({method: record for method in results})
+    )
+    w3.middleware_onion.add(PersistentCacheMiddleware(path), "persistent_cache")
+    return w3
+
+
+def count_calls(calls, method):
+    return [m for m, _ in calls].count(method)
+
+
+def test_finalized_results_survive_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+    w3 = build_w3(path, calls)
+    receipts = w3.manager.request_blocking("cfx_getEpochReceipts", ["0x10"])
+    w3.manager.request_blocking("cfx_getEpochReceipts", ["0x10"])
+    assert count_calls(calls, "cfx_getEpochReceipts") == 1
+
+    # a new web3 instance with the same database
+    restarted_calls = []
+    restarted_w3 = build_w3(path, restarted_calls)
+    assert restarted_w3.manager.request_blocking("cfx_getEpochReceipts", ["0x10"]) == receipts
+    assert count_calls(restarted_calls, "cfx_getEpochReceipts") == 0
+    assert restarted_w3.middleware_onion.get("persistent_cache").cache_info().hits == 1
+
+
+def test_unfinalized_and_latest_results_are_not_persisted(tmp_path):
+    calls = []
+    w3 = build_w3(str(tmp_path / "cache.sqlite"), calls)
+    for _ in range(2):
+        w3.manager.request_blocking("cfx_getEpochReceipts", ["0x180"])
+        w3.manager.request_blocking("cfx_getBalance", ["addr", "latest_state"])
+        w3.manager.request_blocking("cfx_getBlockByHash", ["0x02", False])
+        w3.manager.request_blocking("cfx_getBlockByHash", ["0x01", False])
+    assert count_calls(calls, "cfx_getEpochReceipts") == 2
+    assert count_calls(calls, "cfx_getBalance") == 2
+    assert count_calls(calls, "cfx_getBlockByHash") == 3
+
+
+def test_transactions_in_finalized_blocks_are_persisted(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+    w3 = build_w3(path, calls)
+    for _ in range(2):
+        # packed in a finalized block, an unfinalized block and pending
+        for transaction_hash in ("0x11", "0x12", "0x13"):
+            w3.manager.request_blocking("cfx_getTransactionByHash", [transaction_hash])
+    assert count_calls(calls, "cfx_getTransactionByHash") == 5
+    # the finalized block is persisted with the transaction
+    assert calls.count(("cfx_getBlockByHash", ["0x01", False])) == 1
+    assert calls.count(("cfx_getBlockByHash", ["0x02", False])) == 2
+
+    restarted_calls = []
+    restarted_w3 = build_w3(path, restarted_calls)
+    assert restarted_w3.manager.request_blocking("cfx_getTransactionByHash", ["0x11"])["blockHash"] == "0x01"
+    assert restarted_calls == [("cfx_getStatus", [])]
+
+
+def test_results_are_separated_by_chain_id(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    w3 = build_w3(path, [])
+    w3.manager.request_blocking("cfx_getEpochReceipts", ["0x10"])
+    other_chain_calls = []
+    other_chain_w3 = build_w3(path, other_chain_calls, chain_id="0x405")
+    other_chain_w3.manager.request_blocking("cfx_getEpochReceipts", ["0x10"])
+    assert count_calls(other_chain_calls, "cfx_getEpochReceipts") == 1
+
+
+def _fill_cache(path, epochs):
+    w3 = build_w3(path, [])
+    for epoch in epochs:
+        w3.manager.request_blocking("cfx_getEpochReceipts", [epoch])
+
+
+def test_shared_by_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    PersistentCacheMiddleware(path)
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_fill_cache, args=(path, [hex(i) for i in range(start, start + 20)]))
+        for start in (0, 10, 20)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert PersistentCacheMiddleware(path).count() == 40
@@ -0,0 +1,75 @@
+from typing import List
+
+from conflux_web3 import Web3
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+
+def block_hash(epoch: int, index: int) -> str:
+    return "0x" + f"{epoch:032x}{index:032x}"
+
+
+class FakeEpochProvider(FakeProvider):
+    """
+    epoch n has n % 3 + 1 blocks, each block has a transaction and a receipt
+    """
+    def __init__(self, head: int):
+        super().__init__()
+        self.head = head
+
+    def _block_hashes(self, epoch: int) -> List[str]:
+        return [block_hash(epoch, index) for index in range(epoch % 3 + 1)]
+
+    def get_result(self, method, params):
+        if method == "cfx_epochNumber":
+            return hex(self.head)
+        if method == "cfx_getBlocksByEpoch":
+            return self._block_hashes(int(params[0], 16))
+        if method == "cfx_getBlockByHash":
+            epoch = int(params[0][2:34], 16)
+            transaction = {"hash": params[0]} if params[1] else params[0]
+            return {"hash": params[0], "epochNumber": hex(epoch), "transactions": [transaction]}
+        if method == "cfx_getEpochReceipts":
+            return [
+                [{"transactionHash": hash_, "blockHash": hash_, "epochNumber": params[0]}]
+                for hash_ in self._block_hashes(int(params[0], 16))
+            ]
+        return super().get_result(method, params)
+
+
+def test_iter_epochs_yields_bundles_in_order():
+    provider = FakeEpochProvider(head=20)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    epochs = list(w3.cfx.iter_epochs(5, 12, include_receipts=True, concurrency=3))
+    assert [epoch["epochNumber"] for epoch in epochs] == list(range(5, 13))
+    for epoch in epochs:
+        number = epoch["epochNumber"]
+        assert len(epoch["blocks"]) == number % 3 + 1
+        assert epoch["pivotBlock"] == epoch["blocks"][-1]
+        assert [receipts[0]["blockHash"] for receipts in epoch["receipts"]] == [block["hash"] for block in epoch["blocks"]]
+    assert "cfx_getEpochReceipts" in provider.requests
+
+
+def test_iter_epochs_is_lazy():
+    provider = FakeEpochProvider(head=10 ** 6)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    iterator = w3.cfx.iter_epochs(0, "latest_state", full_transactions=True, concurrency=2)
+    first = next(iterator)
+    assert first["epochNumber"] == 0
+    assert first["pivotBlock"]["transactions"][0]["hash"] == first["pivotBlock"]["hash"]
+    iterator.close()
+    # at most the read-ahead window is fetched
+    assert provider.requests.count("cfx_getBlocksByEpoch") <= 3
+    assert "cfx_getEpochReceipts" not in provider.requests
+
+
+def test_iter_epochs_result_mode():
+    provider = FakeEpochProvider(head=20)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    light_epoch, = w3.cfx.iter_epochs(5, 5, include_receipts=True, result_mode="light")
+    assert type(light_epoch) is dict and type(light_epoch["pivotBlock"]) is dict
+    assert light_epoch["pivotBlock"]["hash"] == bytes.fromhex(block_hash(5, 2)[2:])
+    raw_epoch, = w3.cfx.iter_epochs(5, 5, include_receipts=True, result_mode="raw")
+    assert raw_epoch["pivotBlock"]["epochNumber"] == "0x5"
+    assert raw_epoch["receipts"][0][0]["blockHash"] == block_hash(5, 0)
@@ -0,0 +1,109 @@
+from typing import List, Optional, Tuple
+
+import pytest
+
+from conflux_web3 import Web3
+from conflux_web3.log_iterator import (
+    LogIterator,
+    is_epoch_span_error,
+    is_too_many_logs_error,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+    RPCError,
+)
+
+
+class FakeLogsProvider(FakeProvider):
+    """
+    a chain with a log in each listed epoch, rejects queries exceeding the span or log limits
+    """
+    def __init__(self, log_epochs: List[int], max_span: Optional[int] = None, max_logs: Optional[int] = None):
+        super().__init__()
+        self.log_epochs = log_epochs
+        self.max_span = max_span
+        self.max_logs = max_logs
+        self.latest_state = max(log_epochs)
+        self.queries: List[Tuple[int, int]] = []
+
+    def get_result(self, method, params):
+        if method == "cfx_epochNumber":
+            return hex(self.latest_state)
+        assert method == "cfx_getLogs"
+        from_epoch, to_epoch = int(params[0]["fromEpoch"], 16), int(params[0]["toEpoch"], 16)
+        with self._lock:
+            self.queries.append((from_epoch, to_epoch))
+        if self.max_span is not None and to_epoch - from_epoch + 1 > self.max_span:
+            raise RPCError(
+                f"The gap between from_epoch {from_epoch} and to_epoch {to_epoch} is larger than max_gap {self.max_span}"
+            )
+        logs = [
+            {"epochNumber": hex(epoch), "topics": [], "data": "0x"}
+            for epoch in self.log_epochs if from_epoch <= epoch <= to_epoch
+        ]
+        if self.max_logs is not None and len(logs) > self.max_logs:
+            raise RPCError(f"This query results in too many logs, max limitation is {self.max_logs}")
+        return logs
+
+
+def epochs_of(logs) -> List[int]:
+    return [log["epochNumber"] for log in logs]
+
+
+def test_iter_logs_in_epoch_order():
+    provider = FakeLogsProvider(list(range(0, 100, 3)))
+    w3 = Web3(provider, middlewares=[], ens=None)
+    logs = w3.cfx.iter_logs({"fromEpoch": 0, "toEpoch": 99}, chunk_size=7, concurrency=4)
+    assert epochs_of(logs) == list(range(0, 100, 3))
+    assert min(start for start, _ in provider.queries) == 0
+    assert max(end for _, end in provider.queries) == 99
+
+
+def test_iter_logs_result_mode():
+    provider = FakeLogsProvider([1, 5, 9])
+    w3 = Web3(provider, middlewares=[], ens=None)
+    logs = list(w3.cfx.iter_logs({"fromEpoch": 0, "toEpoch": 9}, chunk_size=4, result_mode="raw"))
+    assert epochs_of(logs) == ["0x1", "0x5", "0x9"]
+    logs = list(w3.cfx.with_result_mode("light").iter_logs({"fromEpoch": 0, "toEpoch": 9}, chunk_size=4))
+    assert [type(log) for log in logs] == [dict] * 3
+    assert logs[0]["data"] == b""
+
+
+def test_iter_logs_resolves_epoch_tags():
+    provider = FakeLogsProvider([1, 5, 9])
+    w3 = Web3(provider, middlewares=[], ens=None)
+    assert epochs_of(w3.cfx.iter_logs(fromEpoch=0, toEpoch="latest_state", chunk_size=2)) == [1, 5, 9]
+
+
+def test_iter_logs_shrinks_on_span_error():
+    provider = FakeLogsProvider(list(range(50)), max_span=8)
+    iterator = LogIterator(Web3(provider, middlewares=[], ens=None), {"fromEpoch": 0, "toEpoch": 49}, chunk_size=32)
+    assert epochs_of(iterator) == list(range(50))
+    assert iterator.max_chunk_size is not None and iterator.max_chunk_size <= 8
+    assert iterator.chunk_size <= 8
+
+
+def test_iter_logs_shrinks_on_too_many_logs_and_grows_when_sparse():
+    # dense logs at the start, sparse logs afterwards
+    log_epochs = list(range(20)) + list(range(100, 1000, 100))
+    provider = FakeLogsProvider(log_epochs, max_logs=4)
+    iterator = LogIterator(
+        Web3(provider, middlewares=[], ens=None), {"fromEpoch": 0, "toEpoch": 999},
+        chunk_size=16, concurrency=1, sparse_threshold=2,
+    )
+    assert epochs_of(iterator) == log_epochs
+    assert iterator.chunk_size > 16
+
+
+def test_iter_logs_raises_other_errors():
+    provider = FakeLogsProvider(list(range(10)), max_logs=0)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    # a single epoch with too many logs can not be split
+    with pytest.raises(ValueError):
+        list(w3.cfx.iter_logs(fromEpoch=0, toEpoch=9))
+
+
+def test_error_patterns():
+    assert is_epoch_span_error({"code": -32602, "message": "The gap between from_epoch 1 and to_epoch 2000 is larger than max_gap 1000"})
+    assert is_too_many_logs_error(ValueError({"code": -32602, "message": "This query results in too many logs"}))
+    assert not is_too_many_logs_error(ValueError("insufficient balance"))
@@ -0,0 +1,98 @@
+from typing import Any, List
+
+import pytest
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.log_follower import (
+    LogFollower,
+    ReorgTooDeep,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+CONTRACT = Base32Address("0x8" + "0" * 39, 1)
+
+
+class FakeReorgProvider(FakeProvider):
+    """
+    a pivot chain whose epochs from ``fork_epoch`` are replaced when ``reorg`` is called
+    """
+    def __init__(self, head: int, log_epochs: List[int]):
+        super().__init__()
+        self.head = head
+        self.log_epochs = log_epochs
+        self.fork_epoch = 0
+        self.fork = 0
+
+    def reorg(self, fork_epoch: int, head: int, log_epochs: List[int]):
+        self.fork_epoch = fork_epoch
+        self.fork += 1
+        self.head = head
+        self.log_epochs = log_epochs
+
+    def _pivot_hash(self, epoch: int) -> str:
+        fork = self.fork if epoch >= self.fork_epoch else 0
+        return "0x" + f"{fork:032x}{epoch:032x}"
+
+    def get_result(self, method, params):
+        if method == "cfx_epochNumber":
+            return hex(self.head)
+        if method == "cfx_getBlockByEpochNumber":
+            epoch = int(params[0], 16)
+            assert epoch <= self.head
+            return {"hash": self._pivot_hash(epoch), "epochNumber": hex(epoch)}
+        if method == "cfx_getLogs":
+            from_epoch, to_epoch = int(params[0]["fromEpoch"], 16), int(params[0]["toEpoch"], 16)
+            return [
+                {"epochNumber": hex(epoch), "blockHash": self._pivot_hash(epoch), "topics": [], "data": "0x"}
+                for epoch in self.log_epochs if from_epoch <= epoch <= to_epoch
+            ]
+        return super().get_result(method, params)
+
+
+def summarize(logs) -> List[Any]:
+    return [(log["epochNumber"], log["removed"]) for log in logs]
+
+
+def test_follower_emits_removed_logs_on_reorg():
+    provider = FakeReorgProvider(head=5, log_epochs=[2, 4])
+    follower = LogFollower(Web3(provider, middlewares=[], ens=None), {"address": CONTRACT}, from_epoch=1)
+    assert summarize(follower.poll()) == [(2, False), (4, False)]
+    assert follower.processed_epoch == 5
+    assert follower.poll() == []
+
+    provider.reorg(fork_epoch=4, head=6, log_epochs=[2, 5])
+    assert summarize(follower.poll()) == [(4, True), (5, False)]
+    assert follower.processed_epoch == 6
+
+
+def test_follower_waits_for_head_after_reorg():
+    provider = FakeReorgProvider(head=5, log_epochs=[5])
+    follower = LogFollower(Web3(provider, middlewares=[], ens=None), {}, from_epoch=3)
+    assert summarize(follower.poll()) == [(5, False)]
+
+    # the head moves back, epochs above the head are checked once the head reaches them
+    provider.reorg(fork_epoch=5, head=4, log_epochs=[])
+    assert follower.poll() == []
+    provider.head = 5
+    assert summarize(follower.poll()) == [(5, True)]
+
+
+def test_follower_limits_epochs_per_poll():
+    provider = FakeReorgProvider(head=10, log_epochs=[1, 10])
+    follower = LogFollower(Web3(provider, middlewares=[], ens=None), {}, from_epoch=1, max_epochs_per_poll=4)
+    assert summarize(follower.poll()) == [(1, False)]
+    assert follower.processed_epoch == 4
+    assert follower.poll() == []
+    assert summarize(follower.poll()) == [(10, False)]
+
+
+def test_follower_raises_on_deep_reorg():
+    provider = FakeReorgProvider(head=5, log_epochs=[])
+    follower = LogFollower(Web3(provider, middlewares=[], ens=None), {}, from_epoch=1, max_reorg_depth=2)
+    follower.poll()
+    provider.reorg(fork_epoch=1, head=5, log_epochs=[])
+    with pytest.raises(ReorgTooDeep):
+        follower.poll()
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List
+
+import pytest
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.log_index import (
+    LogIndex,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+CONTRACT = Base32Address("0x8" + "0" * 39, 1)
+OTHER_CONTRACT = Base32Address("0x8" + "0" * 38 + "1", 1)
+TOPIC_A = "0x" + "aa" * 32
+TOPIC_B = "0x" + "bb" * 32
+
+
+def make_raw_log(epoch: int, address: Base32Address, topic: str) -> Dict[str, Any]:
+    return {
+        "address": str(address),
+        "topics": [topic],
+        "data": "0x",
+        "blockHash": "0x" + "cd" * 32,
+        "epochNumber": hex(epoch),
+        "transactionHash": "0x" + f"{epoch:064x}",
+        "transactionIndex": "0x0",
+        "logIndex": "0x0",
+        "transactionLogIndex": "0x0",
+    }
+
+
+class FakeLogsProvider(FakeProvider):
+    def __init__(self, logs: List[Dict[str, Any]], finalized_epoch: int, latest_epoch: int):
+        super().__init__({"cfx_getStatus": {"chainId": "0x1", "networkId": "0x1"}})
+        self.logs = logs
+        self.epochs = {"latest_finalized": finalized_epoch, "latest_state": latest_epoch}
+        self.queries: List[Dict[str, Any]] = []
+
+    def get_result(self, method, params):
+        if method == "cfx_epochNumber":
+            return hex(self.epochs[params[0]])
+        if method == "cfx_getLogs":
+            filter_params = params[0]
+            self.queries.append(filter_params)
+            from_epoch, to_epoch = int(filter_params["fromEpoch"], 16), int(filter_params["toEpoch"], 16)
+            addresses = filter_params.get("address")
+            if isinstance(addresses, str):
+                addresses = [addresses]
+            topics = filter_params.get("topics") or [None]
+            return [
+                log for log in self.logs
+                if from_epoch <= int(log["epochNumber"], 16) <= to_epoch
+                and (not addresses or log["address"] in [str(address) for address in addresses])
+                and (topics[0] is None or log["topics"][0] == topics[0])
+            ]
+        return super().get_result(method, params)
+
+
+@pytest.fixture
+def provider() -> FakeLogsProvider:
+    logs = [
+        make_raw_log(epoch, CONTRACT if epoch % 2 else OTHER_CONTRACT, TOPIC_A if epoch % 3 else TOPIC_B)
+        for epoch in range(1, 31)
+    ]
+    return FakeLogsProvider(logs, finalized_epoch=20, latest_epoch=30)
+
+
+def test_log_index_answers_synced_epochs_locally(provider: FakeLogsProvider, tmp_path):
+    w3 = Web3(provider, middlewares=[], ens=None)
+    log_index = LogIndex(w3, str(tmp_path / "logs.sqlite"), addresses=[CONTRACT], start_epoch=5, chunk_size=4)
+    assert log_index.sync() == 20
+    assert log_index.synced_epoch == 20
+    assert log_index.count() == 8
+
+    provider.queries.clear()
+    w3.cfx.log_index = log_index
+    logs = w3.cfx.get_logs(fromEpoch=5, toEpoch=20, address=CONTRACT)
+    assert provider.queries == []
+    assert [log["epochNumber"] for log in logs] == list(range(5, 21, 2))
+    assert logs == w3.cfx._get_logs({"fromEpoch": 5, "toEpoch": 20, "address": CONTRACT})
+
+    provider.queries.clear()
+    logs = w3.cfx.get_logs(fromEpoch=1, toEpoch="latest_state", address=CONTRACT, topics=[TOPIC_B])
+    assert [log["epochNumber"] for log in logs] == [3, 9, 15, 21, 27]
+    # epochs before start_epoch and after the synced epoch are queried from the node
+    assert [(query["fromEpoch"], query["toEpoch"]) for query in provider.queries] == [("0x1", "0x4"), ("0x15", "0x1e")]
+
+
+def test_log_index_forwards_uncovered_filters(provider: FakeLogsProvider, tmp_path):
+    w3 = Web3(provider, middlewares=[], ens=None)
+    log_index = LogIndex(w3, str(tmp_path / "logs.sqlite"), addresses=[CONTRACT])
+    log_index.sync()
+    provider.queries.clear()
+    logs = log_index.get_logs({"fromEpoch": 1, "toEpoch": 10, "address": OTHER_CONTRACT})
+    assert [log["epochNumber"] for log in logs] == [2, 4, 6, 8, 10]
+    assert len(provider.queries) == 1
+
+    provider.queries.clear()
+    topics = [TOPIC_A, None, None, None, None]
+    assert not log_index.covers({"fromEpoch": 1, "toEpoch": 10, "address": CONTRACT, "topics": topics})
+    log_index.get_logs({"fromEpoch": 1, "toEpoch": 10, "address": CONTRACT, "topics": topics})
+    assert len(provider.queries) == 1
+
+
+def test_log_index_sync_is_incremental(provider: FakeLogsProvider, tmp_path):
+    w3 = Web3(provider, middlewares=[], ens=None)
+    path = str(tmp_path / "logs.sqlite")
+    assert LogIndex(w3, path).sync(to_epoch=10) == 10
+    provider.epochs["latest_finalized"] = 25
+    provider.queries.clear()
+    log_index = LogIndex(w3, path)
+    assert log_index.synced_epoch == 10
+    assert log_index.sync() == 25
+    assert min(int(query["fromEpoch"], 16) for query in provider.queries) == 11
+    assert log_index.count() == 25
@@ -0,0 +1,107 @@
+import json
+from typing import Any, Dict
+
+from hexbytes import HexBytes
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3._utils.traces import (
+    iter_rpc_result_items,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+SENDER = str(Base32Address("0x1" + "0" * 39, 1))
+CONTRACT = str(Base32Address("0x8" + "0" * 39, 1))
+CREATED = str(Base32Address("0x8" + "0" * 38 + "1", 1))
+TX_HASHES = ["0x" + "01" * 32, "0x" + "02" * 32]
+
+
+def make_trace(type_: str, action: Dict[str, Any], tx_index: int) -> Dict[str, Any]:
+    return {
+        "action": action,
+        "type": type_,
+        "valid": True,
+        "epochHash": "0x" + "aa" * 32,
+        "epochNumber": "0x10",
+        "blockHash": "0x" + "bb" * 32,
+        "transactionHash": TX_HASHES[tx_index],
+        "transactionPosition": hex(tx_index),
+    }
+
+
+EPOCH_TRACES = {
+    "cfxTraces": [
+        make_trace("call", {
+            "space": "native", "from": SENDER, "to": CONTRACT, "value": "0x1",
+            "gas": "0x5208", "input": "0x12", "callType": "call",
+        }, 0),
+        make_trace("create", {
+            "space": "native", "from": CONTRACT, "value": "0x0", "gas": "0x100",
+            "init": "0x60", "createType": "create",
+        }, 0),
+        make_trace("internal_transfer_action", {
+            "from": CONTRACT, "fromPocket": "balance", "fromSpace": "native",
+            "to": CREATED, "toPocket": "balance", "toSpace": "native", "value": "0x2",
+        }, 0),
+        make_trace("create_result", {"outcome": "success", "addr": CREATED, "gasLeft": "0x10", "returnData": "0x"}, 0),
+        make_trace("call_result", {"outcome": "success", "gasLeft": "0x20", "returnData": "0x34"}, 0),
+        make_trace("call", {
+            "space": "native", "from": SENDER, "to": CONTRACT, "value": "0x0",
+            "gas": "0x5208", "input": "0x", "callType": "call",
+        }, 1),
+        make_trace("call_result", {"outcome": "reverted", "gasLeft": "0x0", "returnData": "0x"}, 1),
+    ],
+    "ethTraces": [],
+    "mirrorAddressMap": {},
+}
+
+
+class FakeTraceProvider(FakeProvider):
+    def get_result(self, method, params):
+        if method == "trace_epoch":
+            assert list(params) == ["0x10"]
+            return EPOCH_TRACES
+        if method == "trace_transaction":
+            return [trace for trace in EPOCH_TRACES["cfxTraces"] if trace["transactionHash"] == params[0]] or None
+        return super().get_result(method, params)
+
+
+def test_trace_formatters():
+    w3 = Web3(FakeTraceProvider(), middlewares=[], ens=None)
+    traces = w3.cfx.trace_transaction(TX_HASHES[0])
+    assert len(traces) == 5
+    assert traces[0]["action"]["from"] == Base32Address(SENDER)
+    assert traces[0]["action"]["value"] == 1
+    assert traces[0]["action"]["input"] == HexBytes("0x12")
+    assert traces[0]["epochNumber"] == 16
+    assert traces[0]["transactionHash"] == HexBytes(TX_HASHES[0])
+    assert w3.cfx.trace_transaction("0x" + "03" * 32) is None
+    assert len(w3.cfx.trace_epoch(16)["cfxTraces"]) == 7
+
+
+def test_iter_call_frames():
+    w3 = Web3(FakeTraceProvider(), middlewares=[], ens=None)
+    frames = list(w3.cfx.iter_call_frames(16))
+    assert [(frame["type"], frame["depth"]) for frame in frames] == [
+        ("call", 0), ("create", 1), ("internal_transfer_action", 2), ("call", 0),
+    ]
+    call, create, transfer, reverted_call = frames
+    assert call["outcome"] == "success"
+    assert call["gasLeft"] == 0x20
+    assert call["returnData"] == HexBytes("0x34")
+    assert create["to"] == Base32Address(CREATED)
+    assert create["init"] == HexBytes("0x60")
+    assert transfer["value"] == 2
+    assert transfer["transactionPosition"] == 0
+    assert reverted_call["outcome"] == "reverted"
+    assert reverted_call["transactionHash"] == HexBytes(TX_HASHES[1])
+
+
+def test_iter_rpc_result_items_across_chunks():
+    response = json.dumps({"jsonrpc": "2.0", "id": 1, "result": EPOCH_TRACES}, indent=2)
+    for chunk_size in (1, 7, len(response)):
+        chunks = [response[i:i + chunk_size] for i in range(0, len(response), chunk_size)]
+        assert list(iter_rpc_result_items(chunks, ["cfxTraces"])) == EPOCH_TRACES["cfxTraces"]
+    assert list(iter_rpc_result_items(['{"jsonrpc":"2.0","result":null,"id":1}'], ["cfxTraces"])) == []
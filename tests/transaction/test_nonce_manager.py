@@ -0,0 +1,181 @@
+import threading
+
+import pytest
+from web3.middleware import (
+    construct_result_generator_middleware,
+    construct_error_generator_middleware,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from cfx_account import Account
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.middleware import Wallet
+from conflux_web3.nonce_manager import (
+    NonceManager,
+    is_nonce_error,
+)
+from conflux_web3._utils.transactions import (
+    fill_transaction_defaults,
+)
+
+ADDRESS = Base32Address("0x1" + "0" * 39, 1)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def w3(calls) -> Web3:
+    w3 = Web3(provider=BaseProvider(), middlewares=[], ens=None)
+    def record(result):
+        def inner(method, params):
+            calls.append(method)
+            return result
+        return inner
+    w3.middleware_onion.add(construct_result_generator_middleware({
+        "txpool_nextNonce": record("0x5"),
+        "cfx_getNextNonce": record("0x3"),
+        "cfx_gasPrice": record("0x1"),
+        "cfx_epochNumber": record("0x64"),
+        "cfx_getStatus": record({"chainId": "0x1", "networkId": "0x1"}),
+        "cfx_estimateGasAndCollateral": record({"gasLimit": "0x5208", "gasUsed": "0x5208", "storageCollateralized": "0x0"}),
+    }))
+    return w3
+
+
+def test_nonce_is_synced_once(w3: Web3, calls):
+    nonce_manager = NonceManager(w3)
+    assert [nonce_manager.next_nonce(ADDRESS) for _ in range(3)] == [5, 6, 7]
+    assert calls.count("txpool_nextNonce") == 1
+
+    nonce_manager.resync(ADDRESS)
+    assert nonce_manager.next_nonce(ADDRESS.hex_address) == 5
+    assert calls.count("txpool_nextNonce") == 2
+
+
+def test_nonce_falls_back_to_cfx_get_next_nonce(w3: Web3):
+    assert NonceManager(w3, use_txpool=False).next_nonce(ADDRESS) == 3
+
+
+def test_nonce_gaps(w3: Web3):
+    nonce_manager = NonceManager(w3)
+    nonces = [nonce_manager.next_nonce(ADDRESS) for _ in range(4)]
+    assert nonces == [5, 6, 7, 8]
+    nonce_manager.release(ADDRESS, 6)
+    assert nonce_manager.gaps(ADDRESS) == [6]
+    assert nonce_manager.next_nonce(ADDRESS) == 6
+    # releasing the last nonces rewinds the counter
+    nonce_manager.release(ADDRESS, 7)
+    nonce_manager.release(ADDRESS, 8)
+    assert nonce_manager.gaps(ADDRESS) == []
+    assert nonce_manager.next_nonce(ADDRESS) == 7
+
+
+def test_only_reserved_nonces_are_released(w3: Web3):
+    nonce_manager = NonceManager(w3)
+    nonces = [nonce_manager.next_nonce(ADDRESS) for _ in range(3)]
+    assert nonces == [5, 6, 7]
+    nonce_manager.accept(ADDRESS, 5)
+    # 5 is accepted by the node and 3 is not handed out, e.g. set by the user
+    nonce_manager.release(ADDRESS, 5)
+    nonce_manager.release(ADDRESS, 3)
+    assert nonce_manager.gaps(ADDRESS) == []
+    nonce_manager.release(ADDRESS, 6)
+    nonce_manager.release(ADDRESS, 6)
+    assert nonce_manager.gaps(ADDRESS) == [6]
+
+
+def test_nonce_is_unique_across_threads(w3: Web3):
+    nonce_manager = NonceManager(w3)
+    nonces = []
+    def take():
+        for _ in range(100):
+            nonces.append(nonce_manager.next_nonce(ADDRESS))
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(nonces) == list(range(5, 805))
+
+
+def test_nonce_error_classification():
+    assert is_nonce_error({"code": -32602, "message": "Invalid parameters: tx", "data": "\"Transaction 0xab is discarded due to a too stale nonce\""})
+    assert is_nonce_error({"code": -32602, "message": "Invalid parameters: tx", "data": "\"Transaction 0xab is discarded due to in too distant future\""})
+    assert not is_nonce_error({"code": -32602, "message": "insufficient balance"})
+
+
+def test_fill_transaction_defaults_uses_nonce_manager(w3: Web3, calls):
+    w3.cfx.nonce_manager = NonceManager(w3)
+    filled = [fill_transaction_defaults(w3, {"from": ADDRESS, "to": ADDRESS}) for _ in range(2)]
+    assert [tx["nonce"] for tx in filled] == [5, 6]
+    assert calls.count("txpool_nextNonce") == 1
+    assert "cfx_getNextNonce" not in calls
+
+
+@pytest.mark.parametrize(
+    "error, expected_next_nonce",
+    [
+        ("Transaction 0xab is discarded due to a too stale nonce", 5),
+        ("insufficient balance", 6),
+    ]
+)
+def test_wallet_reports_rejected_transactions(w3: Web3, calls, error, expected_next_nonce):
+    nonce_manager = NonceManager(w3)
+    w3.cfx.nonce_manager = nonce_manager
+    w3.middleware_onion.add(construct_error_generator_middleware({
+        "cfx_sendTransaction": lambda *_: error,
+    }))
+    w3.middleware_onion.add(Wallet(), "wallet")
+    address = Base32Address(Account.create().address, 1)
+    nonce_manager.next_nonce(address)
+
+    with pytest.raises(ValueError):
+        w3.cfx.send_transaction({"from": address, "to": address})
+    # the rejected nonce 6 is released, or the nonce is resynced from the node
+    assert nonce_manager.next_nonce(address) == expected_next_nonce
+
+
+def test_wallet_ignores_user_nonces(w3: Web3):
+    nonce_manager = NonceManager(w3)
+    w3.cfx.nonce_manager = nonce_manager
+    w3.middleware_onion.add(construct_error_generator_middleware({
+        "cfx_sendTransaction": lambda *_: "insufficient balance",
+    }))
+    w3.middleware_onion.add(Wallet(), "wallet")
+    address = Base32Address(Account.create().address, 1)
+    assert [nonce_manager.next_nonce(address) for _ in range(2)] == [5, 6]
+
+    # nonce 4 is set by the user, it may be used on chain already
+    with pytest.raises(ValueError):
+        w3.cfx.send_transaction({"from": address, "to": address, "nonce": 4})
+    assert nonce_manager.gaps(address) == []
+    assert nonce_manager.next_nonce(address) == 7
+
+
+def test_wallet_resyncs_nonce_without_response(w3: Web3, calls):
+    nonce_manager = NonceManager(w3)
+    w3.cfx.nonce_manager = nonce_manager
+    def disconnect(make_request, w3):
+        def middleware(method, params):
+            if method == "cfx_sendRawTransaction":
+                raise ConnectionError("connection reset")
+            return make_request(method, params)
+        return middleware
+    w3.middleware_onion.add(disconnect)
+    wallet = Wallet(forced_chain_id=1)
+    wallet.add_account(Account.create())
+    w3.middleware_onion.add(wallet, "wallet")
+    address = list(wallet.accounts)[0]
+
+    with pytest.raises(ConnectionError):
+        w3.cfx.send_transaction({"from": address, "to": address})
+    # the node may have accepted the transaction, so the nonce is not handed out again without a resync
+    assert nonce_manager.gaps(address) == []
+    assert nonce_manager.next_nonce(address) == 5
+    assert calls.count("txpool_nextNonce") == 2
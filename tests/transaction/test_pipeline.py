@@ -0,0 +1,141 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import pytest
+from hexbytes import HexBytes
+
+from cfx_account import Account
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3.middleware import Wallet
+from conflux_web3 import pipeline as pipeline_module
+from conflux_web3.pipeline import (
+    TransactionPipeline,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+    RPCError,
+)
+
+RECEIVER = Base32Address("0x1" + "0" * 39, 1)
+
+
+def send_raw_transaction(params):
+    nonce = int(params[0], 16)
+    if nonce == 2:
+        raise RPCError("insufficient balance")
+    return "0x" + f"{nonce:064x}"
+
+
+@pytest.fixture
+def provider() -> FakeProvider:
+    return FakeProvider({
+        "txpool_nextNonce": "0x0",
+        "cfx_getNextNonce": "0x0",
+        "cfx_estimateGasAndCollateral": {"gasLimit": "0x5208", "gasUsed": "0x5208", "storageCollateralized": "0x0"},
+        "cfx_gasPrice": "0x3b9aca00",
+        "cfx_epochNumber": "0x64",
+        "cfx_getStatus": {"chainId": "0x1", "networkId": "0x1"},
+        "cfx_sendRawTransaction": send_raw_transaction,
+    })
+
+
+@pytest.fixture
+def sender() -> Base32Address:
+    return Base32Address(Account.create().address, 1)
+
+
+@pytest.fixture
+def w3(provider: FakeProvider, sender: Base32Address, monkeypatch) -> Web3:
+    w3 = Web3(provider, middlewares=[], ens=None)
+    wallet = Wallet(forced_chain_id=1)
+    wallet.add_account(Account.create())
+    w3.middleware_onion.add(wallet, "wallet")
+    # the raw transaction is replaced by the nonce so the provider can decide the response
+    monkeypatch.setattr(
+        pipeline_module,
+        "_sign_transactions",
+        lambda private_key, transactions: [HexBytes(transaction["nonce"].to_bytes(1, "big")) for transaction in transactions]
+    )
+    return w3
+
+
+@pytest.fixture
+def wallet_sender(w3: Web3) -> Base32Address:
+    return list(w3.wallet.accounts)[0]
+
+
+def test_pipeline_submits_in_batches(w3: Web3, provider: FakeProvider, wallet_sender, sender):
+    transactions = [{"from": wallet_sender, "to": RECEIVER, "value": i} for i in range(3)]
+    transactions.insert(1, {"from": sender, "to": RECEIVER})
+    results = list(TransactionPipeline(w3, batch_size=2, processes=0).submit(transactions))
+
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert isinstance(results[1].exception, ValueError)
+    assert [results[i].transaction["nonce"] for i in (0, 2, 3)] == [0, 1, 2]
+    assert results[0].transaction_hash == HexBytes(f"0x{0:064x}")
+    assert results[0].transaction_hash._w3 is w3
+    assert results[0].transaction["gasPrice"] == 10**9
+    assert results[0].transaction["chainId"] == 1
+    # nonce 2 is rejected
+    assert isinstance(results[3].exception, ValueError)
+    assert results[3].transaction_hash is None
+
+    assert provider.batches == [
+        ["cfx_estimateGasAndCollateral", "cfx_gasPrice", "cfx_epochNumber"],
+        ["cfx_sendRawTransaction"],
+        ["cfx_estimateGasAndCollateral", "cfx_estimateGasAndCollateral", "cfx_gasPrice", "cfx_epochNumber"],
+        ["cfx_sendRawTransaction", "cfx_sendRawTransaction"],
+    ]
+
+
+def test_pipeline_reuses_rejected_nonce(w3: Web3, wallet_sender):
+    pipeline = TransactionPipeline(w3, batch_size=3, processes=0)
+    results = list(pipeline.submit([{"from": wallet_sender, "to": RECEIVER} for _ in range(3)]))
+    assert results[2].exception is not None
+    assert pipeline.nonce_manager.next_nonce(wallet_sender) == 2
+
+
+def test_pipeline_limits_in_flight_transactions(w3: Web3, provider: FakeProvider, wallet_sender):
+    sent: List[int] = []
+    # the node executes the transactions it received, the next nonce only advances on sent transactions
+    provider.results["cfx_getNextNonce"] = lambda params: hex(len(sent))
+    provider.results["cfx_sendRawTransaction"] = lambda params: sent.append(int(params[0], 16)) or "0x" + "00" * 32
+    pipeline = TransactionPipeline(w3, max_in_flight=2, processes=0, poll_latency=0, timeout=1)
+    results = list(pipeline.submit([{"from": wallet_sender, "to": RECEIVER} for _ in range(5)]))
+    assert all(result.exception is None for result in results)
+    assert [result.transaction["nonce"] for result in results] == [0, 1, 2, 3, 4]
+    assert sent == [0, 1, 2, 3, 4]
+    # the assigned transactions are sent each time the limit is reached, then the executed nonce is queried
+    assert [len(batch) for batch in provider.batches if batch[0] == "cfx_sendRawTransaction"] == [2, 2, 1]
+    assert provider.requests.count("cfx_getNextNonce") == 3
+
+
+class CountingProcessPoolExecutor(ProcessPoolExecutor):
+    submits = 0
+
+    def submit(self, fn, *args, **kwargs):
+        type(self).submits += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_pipeline_signs_in_process_pool(provider: FakeProvider, monkeypatch):
+    sent: List[str] = []
+    provider.results["cfx_sendRawTransaction"] = lambda params: sent.append(params[0]) or "0x" + f"{len(sent):064x}"
+    monkeypatch.setattr(pipeline_module, "ProcessPoolExecutor", CountingProcessPoolExecutor)
+    w3 = Web3(provider, middlewares=[], ens=None)
+    account = Account.create()
+    wallet = Wallet(forced_chain_id=1)
+    wallet.add_account(account)
+    w3.middleware_onion.add(wallet, "wallet")
+    sender = Base32Address(account.address, 1)
+
+    transactions = [{"from": sender, "to": RECEIVER, "value": i} for i in range(6)]
+    results = list(TransactionPipeline(w3, batch_size=6, processes=2).submit(transactions))
+
+    assert all(result.exception is None for result in results)
+    # the transactions of a single sender are signed by both workers
+    assert CountingProcessPoolExecutor.submits == 2
+    assert sent == [
+        HexBytes(account.sign_transaction(result.transaction).rawTransaction).hex() for result in results
+    ]
@@ -0,0 +1,168 @@
+from typing import Any, Dict, List, Optional
+
+import pytest
+from concurrent.futures import wait
+from hexbytes import HexBytes
+from web3.exceptions import (
+    TimeExhausted,
+)
+
+from conflux_web3 import Web3
+from conflux_web3.receipt_watcher import (
+    ReceiptWatcher,
+)
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+HASHES = ["0x" + f"{i:064x}" for i in range(1, 4)]
+BLOCK_HASH = "0x" + "ab" * 32
+
+
+def make_receipt(transaction_hash: str, epoch: int, outcome_status: int = 0) -> Dict[str, Any]:
+    return {
+        "transactionHash": transaction_hash,
+        "blockHash": BLOCK_HASH,
+        "epochNumber": hex(epoch),
+        "outcomeStatus": hex(outcome_status),
+    }
+
+
+class FakeChainProvider(FakeProvider):
+    """
+    a chain whose receipts and epochs are set by tests, only accepts batch requests
+    """
+    def __init__(self):
+        super().__init__()
+        self.receipts: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.epochs = {"latest_state": 0, "latest_confirmed": 0, "latest_finalized": 0}
+        # epoch number -> receipts of the epoch
+        self.epoch_receipts: Dict[int, List[Dict[str, Any]]] = {}
+        self.block_epochs: Dict[str, int] = {}
+
+    def get_result(self, method, params):
+        if method == "cfx_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "cfx_getTransactionByHash":
+            return {"hash": params[0], "blockHash": BLOCK_HASH} if params[0] in self.receipts else None
+        if method == "cfx_epochNumber":
+            return hex(self.epochs[params[0]])
+        if method == "cfx_getEpochReceipts":
+            return [self.epoch_receipts.get(int(params[0], 16), [])]
+        if method == "cfx_getBlockByHash":
+            return {"hash": params[0], "epochNumber": hex(self.block_epochs[params[0]])}
+        return super().get_result(method, params)
+
+    def make_request(self, method, params):
+        raise AssertionError("requests are expected to be batched")
+
+
+@pytest.fixture
+def provider() -> FakeChainProvider:
+    return FakeChainProvider()
+
+
+@pytest.fixture
+def watcher(provider: FakeChainProvider) -> ReceiptWatcher:
+    return ReceiptWatcher(Web3(provider, middlewares=[], ens=None), poll_latency=0)
+
+
+def test_watcher_resolves_stages(watcher: ReceiptWatcher, provider: FakeChainProvider):
+    mined = watcher.watch(HASHES[0], "mined")
+    executed = watcher.watch(HASHES[0], "executed")
+    confirmed = watcher.watch_many(HASHES[:2], "confirmed")
+    finalized = watcher.watch(HASHES[1], "finalized")
+
+    assert watcher.poll() == 5
+    # a single batch request per tick
+    assert len(provider.batches) == 1
+    assert provider.batches[0].count("cfx_epochNumber") == 2
+
+    provider.receipts[HASHES[0]] = make_receipt(HASHES[0], 10)
+    provider.receipts[HASHES[1]] = make_receipt(HASHES[1], 20)
+    assert watcher.poll() == 3
+    assert mined.result()["blockHash"] == HexBytes(BLOCK_HASH)
+    assert executed.result()["epochNumber"] == 10
+
+    provider.epochs["latest_confirmed"] = 15
+    assert watcher.poll() == 2
+    assert confirmed[0].result()["epochNumber"] == 10
+    assert not confirmed[1].done()
+
+    provider.epochs["latest_confirmed"] = 20
+    provider.epochs["latest_finalized"] = 20
+    assert watcher.poll() == 0
+    assert confirmed[1].result()["epochNumber"] == 20
+    assert finalized.result()["epochNumber"] == 20
+
+
+def test_watcher_skips_far_receipts(watcher: ReceiptWatcher, provider: FakeChainProvider):
+    provider.receipts[HASHES[0]] = make_receipt(HASHES[0], 100)
+    watcher.watch(HASHES[0], "confirmed")
+    watcher.poll()
+    watcher.poll()
+    # the known receipt is not fetched again until the confirmed epoch is close to its epoch
+    assert provider.batches[-1] == ["cfx_epochNumber"]
+
+
+def test_watcher_failures(watcher: ReceiptWatcher, provider: FakeChainProvider):
+    provider.receipts[HASHES[0]] = make_receipt(HASHES[0], 1, outcome_status=1)
+    failed = watcher.watch(HASHES[0])
+    timed_out = watcher.watch(HASHES[1], timeout=0)
+    callback_results = []
+    watcher.watch(HASHES[1], timeout=0, callback=lambda future: callback_results.append(future.exception()))
+    watcher.run_until_complete(timeout=10)
+    assert isinstance(failed.exception(), RuntimeError)
+    assert isinstance(timed_out.exception(), TimeExhausted)
+    assert isinstance(callback_results[0], TimeExhausted)
+
+
+def test_watcher_background_thread(provider: FakeChainProvider, watcher: ReceiptWatcher):
+    provider.receipts[HASHES[0]] = make_receipt(HASHES[0], 1)
+    with watcher:
+        futures = watcher.watch_many(HASHES[:1])
+        done, _ = wait(futures, timeout=5)
+    assert len(done) == 1
+
+
+def test_epoch_strategy(provider: FakeChainProvider):
+    watcher = ReceiptWatcher(Web3(provider, middlewares=[], ens=None), poll_latency=0, strategy="epoch")
+    futures = watcher.watch_many(HASHES)
+    provider.epochs["latest_state"] = 10
+    # receipts are queried by hash once, and then epochs after latest_state are scanned
+    assert watcher.poll() == 3
+    assert provider.batches[-1] == ["cfx_epochNumber"] + ["cfx_getTransactionReceipt"] * 3
+
+    provider.epoch_receipts[11] = [make_receipt(HASHES[0], 11)]
+    provider.epoch_receipts[12] = [make_receipt(HASHES[1], 12), make_receipt("0x" + "ff" * 32, 12)]
+    provider.epochs["latest_state"] = 12
+    assert watcher.poll() == 1
+    assert provider.batches[-2:] == [["cfx_epochNumber"], ["cfx_getEpochReceipts"] * 2]
+    assert futures[0].result()["epochNumber"] == 11
+    assert futures[1].result()["epochNumber"] == 12
+
+    watcher.poll()
+    # scanned epochs are not queried again
+    assert provider.batches[-1] == ["cfx_epochNumber"]
+
+
+def test_epoch_strategy_hints(provider: FakeChainProvider):
+    watcher = ReceiptWatcher(Web3(provider, middlewares=[], ens=None), poll_latency=0, strategy="epoch")
+    provider.epochs["latest_state"] = 10
+    provider.epoch_receipts[5] = [make_receipt(HASHES[0], 5)]
+    provider.epoch_receipts[7] = [make_receipt(HASHES[1], 7)]
+    provider.block_epochs[BLOCK_HASH] = 7
+    by_epoch = watcher.watch(HASHES[0], epoch_hint=5)
+    by_block = watcher.watch(HASHES[1], epoch_hint=BLOCK_HASH)
+    watcher.run_until_complete(timeout=10)
+    assert by_epoch.result()["epochNumber"] == 5
+    assert by_block.result()["epochNumber"] == 7
+    assert not any("cfx_getTransactionReceipt" in batch for batch in provider.batches)
+
+
+def test_wait_till_transaction_executed_by_epoch(provider: FakeChainProvider):
+    w3 = Web3(provider, middlewares=[], ens=None)
+    provider.epochs["latest_state"] = 3
+    provider.epoch_receipts[3] = [make_receipt(HASHES[0], 3)]
+    receipt = w3.cfx.wait_till_transaction_executed(HASHES[0], timeout=10, strategy="epoch", epoch_hint=1)
+    assert receipt["epochNumber"] == 3
@@ -0,0 +1,43 @@
+from cfx_address import Base32Address
+from conflux_web3._utils.addresses import (
+    from_trust_to_base32,
+    normalize_to,
+    to_base32_address,
+    to_hex_address,
+)
+from conflux_web3._utils.method_formatters import (
+    log_entry_formatter,
+)
+from conflux_web3.utils import (
+    address_cache_info,
+    clear_address_cache,
+)
+
+HEX_ADDRESS = "0x1" + "0" * 38 + "1"
+BASE32_ADDRESS = Base32Address(HEX_ADDRESS, 1)
+
+
+def test_conversions_are_cached():
+    clear_address_cache()
+    address = to_base32_address(HEX_ADDRESS, 1, verbose=True)
+    assert address == BASE32_ADDRESS
+    assert address.startswith("CFXTEST:TYPE.USER:")
+    assert to_base32_address(HEX_ADDRESS, 1, verbose=True) is address
+    # Base32Address arguments share the cache entries of the equal strings
+    assert from_trust_to_base32(BASE32_ADDRESS) is from_trust_to_base32(str(BASE32_ADDRESS))
+    assert to_hex_address(BASE32_ADDRESS).lower() == HEX_ADDRESS
+    assert normalize_to(BASE32_ADDRESS, None).lower() == HEX_ADDRESS
+    assert normalize_to(HEX_ADDRESS, 1029) == Base32Address(HEX_ADDRESS, 1029)
+    info = address_cache_info()
+    assert info.hits == 2
+    assert info.misses == 5
+    assert info.currsize == 5
+
+
+def test_result_formatters_share_addresses():
+    log = {
+        "address": str(BASE32_ADDRESS),
+        "topics": [],
+        "data": "0x",
+    }
+    assert log_entry_formatter(log)["address"] is log_entry_formatter(dict(log))["address"]
@@ -0,0 +1,201 @@
+import copy
+import re
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from eth_utils.curried import apply_formatter_if
+from eth_utils.toolz import compose
+from web3.datastructures import AttributeDict
+
+from conflux_web3._utils import method_formatters
+from conflux_web3._utils.formatter_compiler import compile_result_formatter, to_plain
+from conflux_web3._utils.method_formatters import (
+    PYTHONIC_RESULT_FORMATTERS,
+    cfx_result_formatters,
+    result_mode_formatter,
+    not_attrdict,
+)
+from conflux_web3._utils.rpc_abi import RPC
+from conflux_web3.types import Drip
+
+ADDRESS = "cfx:aajg4wt2mbmbb44sp6szd783ry0jtad5bea80xdy7p"
+CONTRACT = "cfx:acc7uawf5ubtnmezvhu9dhc6sghea0403y2dgpyfjp"
+HASH = "0x" + "ab" * 32
+
+LOG = {
+    "address": CONTRACT,
+    "topics": [HASH, HASH],
+    "data": "0x" + "00" * 32,
+    "blockHash": HASH,
+    "epochNumber": "0x10",
+    "transactionHash": HASH,
+    "transactionIndex": "0x0",
+    "logIndex": "0x1",
+    "transactionLogIndex": "0x1",
+    "space": "native",
+}
+
+RECEIPT = {
+    "transactionHash": HASH,
+    "index": "0x0",
+    "blockHash": HASH,
+    "epochNumber": "0x10",
+    "from": ADDRESS,
+    "to": None,
+    "gasUsed": "0x5208",
+    "gasFee": "0x5208",
+    "contractCreated": CONTRACT,
+    "logs": [LOG, LOG],
+    "logsBloom": "0x" + "00" * 256,
+    "stateRoot": HASH,
+    "outcomeStatus": "0x0",
+    "txExecErrorMsg": None,
+    "gasCoveredBySponsor": False,
+    "storageCoveredBySponsor": False,
+    "storageCollateralized": "0x0",
+    "storageReleased": [{"address": ADDRESS, "collaterals": "0x40"}],
+}
+
+TRANSACTION = {
+    "hash": HASH,
+    "nonce": "0x1",
+    "blockHash": None,
+    "transactionIndex": None,
+    "from": ADDRESS,
+    "to": CONTRACT,
+    "value": "0x10",
+    "gasPrice": "0x1",
+    "gas": "0x5208",
+    "contractCreated": None,
+    "data": "0x",
+    "storageLimit": "0x0",
+    "epochHeight": "0x10",
+    "chainId": "0x1",
+    "status": None,
+    "v": "0x1",
+    "r": HASH,
+    "s": HASH,
+    "accessList": [{"address": CONTRACT, "storageKeys": [HASH]}],
+}
+
+BLOCK = {
+    "hash": HASH,
+    "parentHash": HASH,
+    "height": "0x10",
+    "miner": ADDRESS,
+    "deferredStateRoot": HASH,
+    "epochNumber": "0x10",
+    "blockNumber": None,
+    "gasLimit": "0x1c9c380",
+    "timestamp": "0x64",
+    "difficulty": "0x1",
+    "refereeHashes": [HASH],
+    "adaptive": False,
+    "nonce": "0x1",
+    "custom": ["0x01"],
+    "transactions": [TRANSACTION, TRANSACTION],
+}
+
+TRACE = {
+    "action": {"from": ADDRESS, "to": "0x" + "12" * 20, "value": "0x0", "gas": "0x10", "input": "0x", "callType": "call"},
+    "epochHash": HASH,
+    "epochNumber": "0x10",
+    "blockHash": HASH,
+    "transactionHash": HASH,
+    "transactionPosition": "0x0",
+    "type": "call",
+    "valid": True,
+}
+
+CASES = [
+    (RPC.cfx_getBlockByHash, BLOCK),
+    (RPC.cfx_getBlockByHash, {**BLOCK, "transactions": [HASH, HASH]}),
+    (RPC.cfx_getBlockByEpochNumber, None),
+    (RPC.cfx_getEpochReceipts, [[RECEIPT, RECEIPT], []]),
+    (RPC.cfx_getTransactionReceipt, RECEIPT),
+    (RPC.cfx_getTransactionReceipt, None),
+    (RPC.cfx_getTransactionByHash, TRANSACTION),
+    (RPC.cfx_getLogs, [LOG, LOG, LOG]),
+    (RPC.cfx_getStatus, {"chainId": "0x1", "networkId": "0x1", "epochNumber": "0x10", "bestHash": HASH}),
+    (RPC.cfx_getBalance, "0x10"),
+    (RPC.trace_transaction, [TRACE, TRACE]),
+    (RPC.trace_epoch, {"cfxTraces": [TRACE], "ethTraces": [{"action": {"from": "0x" + "12" * 20}}]}),
+]
+
+
+def composed(method: str):
+    return compose(apply_formatter_if(not_attrdict, AttributeDict.recursive), PYTHONIC_RESULT_FORMATTERS[method])
+
+
+def assert_identical(actual: Any, expected: Any):
+    assert type(actual) is type(expected)
+    if isinstance(expected, AttributeDict):
+        assert list(actual.keys()) == list(expected.keys())
+        for key in expected:
+            assert_identical(actual[key], expected[key])
+    elif isinstance(expected, (list, tuple)):
+        assert len(actual) == len(expected)
+        for actual_item, expected_item in zip(actual, expected):
+            assert_identical(actual_item, expected_item)
+    else:
+        assert actual == expected
+
+
+@pytest.mark.parametrize("method,raw", CASES)
+def test_compiled_formatter_is_identical(method: str, raw: Any):
+    expected = composed(method)(copy.deepcopy(raw))
+    actual = cfx_result_formatters(method, None)(copy.deepcopy(raw)) # type: ignore
+    assert_identical(actual, expected)
+
+
+def test_compiled_formatter_does_not_modify_input():
+    raw = copy.deepcopy(RECEIPT)
+    cfx_result_formatters(RPC.cfx_getTransactionReceipt, None)(raw) # type: ignore
+    assert raw == RECEIPT
+
+
+@pytest.mark.parametrize("method,raw", [
+    (RPC.cfx_getTransactionReceipt, {**RECEIPT, "gasUsed": "not hex"}),
+    (RPC.cfx_getBlockByHash, {**BLOCK, "transactions": [1]}),
+])
+def test_compiled_formatter_raises_the_same_error(method: str, raw: Any):
+    with pytest.raises(Exception) as expected:
+        composed(method)(copy.deepcopy(raw))
+    with pytest.raises(expected.type, match=re.escape(str(expected.value))):
+        cfx_result_formatters(method, None)(copy.deepcopy(raw)) # type: ignore
+
+
+def test_modified_formatter_is_not_compiled(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(method_formatters.PYTHONIC_RESULT_FORMATTERS, RPC.cfx_getBalance, lambda value: "patched")
+    assert cfx_result_formatters(RPC.cfx_getBalance, None)("0x10") == "patched" # type: ignore
+
+
+def test_compile_single_formatter():
+    format_receipt = compile_result_formatter(PYTHONIC_RESULT_FORMATTERS[RPC.cfx_getTransactionReceipt])
+    assert format_receipt(copy.deepcopy(RECEIPT)).gasUsed == 21000
+
+
+def assert_plain(value: Any):
+    assert type(value) in (dict, list, str, int, bool, bytes, float, type(None)), type(value)
+    if isinstance(value, dict):
+        for item in value.values():
+            assert_plain(item)
+    elif isinstance(value, list):
+        for item in value:
+            assert_plain(item)
+
+
+@pytest.mark.parametrize("method,raw", CASES)
+def test_light_formatter_is_plain_default_result(method: str, raw: Any):
+    expected = composed(method)(copy.deepcopy(raw))
+    actual = result_mode_formatter(method, "light")(copy.deepcopy(raw))
+    assert_plain(actual)
+    assert actual == to_plain(expected)
+
+
+@pytest.mark.parametrize("mode,expected", [("default", Drip(16)), ("light", 16), ("raw", "0x10")])
+def test_result_modes(mode: str, expected: Any):
+    module = SimpleNamespace(result_mode=mode)
+    result = cfx_result_formatters(RPC.cfx_getBalance, module)("0x10") # type: ignore
+    assert type(result) is type(expected) and result == expected
@@ -0,0 +1,135 @@
+import pytest
+from eth_abi import encode
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3.exceptions import (
+    MismatchedABI,
+)
+from web3.providers.base import (
+    BaseProvider,
+)
+
+from cfx_address import Base32Address
+from conflux_web3 import Web3
+from conflux_web3._utils.events import (
+    EventDecoder,
+    cfx_get_event_data,
+    get_event_decoder,
+    get_event_decoder_registry,
+)
+from conflux_web3.types.records import (
+    EventDataRecord,
+)
+
+SENDER = "0x1" + "0" * 39
+RECEIVER = "0x8" + "0" * 39
+TRANSFER_ABI = {
+    "type": "event",
+    "name": "Transfer",
+    "anonymous": False,
+    "inputs": [
+        {"name": "from", "type": "address", "indexed": True},
+        {"name": "to", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+APPROVAL_ABI = {
+    "type": "event",
+    "name": "Approval",
+    "anonymous": False,
+    "inputs": [
+        {"name": "owner", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+CONTRACT_ABI = [TRANSFER_ABI, APPROVAL_ABI, {"type": "function", "name": "foo", "inputs": [], "outputs": []}]
+
+
+@pytest.fixture
+def codec():
+    return Web3(BaseProvider(), middlewares=[], ens=None).codec
+
+
+def make_transfer_log():
+    return {
+        "address": Base32Address(SENDER, 1),
+        "topics": [
+            HexBytes(event_abi_to_log_topic(TRANSFER_ABI)),
+            HexBytes(encode(["address"], [SENDER])),
+            HexBytes(encode(["address"], [RECEIVER])),
+        ],
+        "data": HexBytes(encode(["uint256"], [100])),
+        "epochNumber": 1,
+    }
+
+
+def test_decoder_matches_cfx_get_event_data(codec):
+    log = make_transfer_log()
+    event = EventDecoder(TRANSFER_ABI).decode(codec, log, 1)
+    assert event == cfx_get_event_data(codec, TRANSFER_ABI, log, 1)
+    assert event["event"] == "Transfer"
+    assert event["args"]["from"] == Base32Address(SENDER, 1)
+    assert event["args"]["to"] == Base32Address(RECEIVER, 1)
+    assert event["args"]["value"] == 100
+
+    with pytest.raises(MismatchedABI):
+        EventDecoder(APPROVAL_ABI).decode(codec, log, 1)
+
+
+def test_decode_as_record(codec):
+    log = make_transfer_log()
+    record = EventDecoder(TRANSFER_ABI).decode(codec, log, 1, as_record=True)
+    assert isinstance(record, EventDataRecord)
+    assert record == EventDecoder(TRANSFER_ABI).decode(codec, log, 1)
+    assert record.args.value == 100
+
+
+def test_decoders_are_cached():
+    assert get_event_decoder(TRANSFER_ABI) is get_event_decoder(TRANSFER_ABI)
+    registry = get_event_decoder_registry(CONTRACT_ABI)
+    assert registry is get_event_decoder_registry(CONTRACT_ABI)
+    assert registry.get_decoder(APPROVAL_ABI).event_abi is APPROVAL_ABI
+    assert registry.get_decoder_by_topic(event_abi_to_log_topic(TRANSFER_ABI)).event_name == "Transfer"
+    assert registry.get_decoder_by_topic(HexBytes(b"\x00" * 32)) is None
+    assert len(registry.topic_index) == 2
+
+
+def test_decode_columns(codec):
+    logs = [make_transfer_log() for _ in range(3)]
+    logs[1]["epochNumber"] = 2
+    approval_log = {**make_transfer_log(), "topics": [HexBytes(event_abi_to_log_topic(APPROVAL_ABI))]}
+    columns, rejected = EventDecoder(TRANSFER_ABI).decode_columns(codec, logs + [approval_log], 1)
+    assert [log for log, _ in rejected] == [approval_log]
+    assert isinstance(rejected[0][1], MismatchedABI)
+    assert columns["event"] == "Transfer"
+    assert list(columns["epochNumber"]) == [1, 2, 1]
+    assert list(columns["args"]["value"]) == [100, 100, 100]
+    assert list(columns["args"]["to"]) == [Base32Address(RECEIVER, 1)] * 3
+    rows = [EventDecoder(TRANSFER_ABI).decode(codec, log, 1) for log in logs]
+    for index, row in enumerate(rows):
+        for name, value in row["args"].items():
+            assert columns["args"][name][index] == value
+
+
+def test_decode_columns_with_dynamic_data(codec):
+    event_abi = {
+        "type": "event",
+        "name": "Message",
+        "anonymous": False,
+        "inputs": [
+            {"name": "sender", "type": "address", "indexed": False},
+            {"name": "text", "type": "string", "indexed": False},
+            {"name": "small", "type": "uint8", "indexed": False},
+        ],
+    }
+    log = {
+        "address": Base32Address(SENDER, 1),
+        "topics": [HexBytes(event_abi_to_log_topic(event_abi))],
+        "data": HexBytes(encode(["address", "string", "uint8"], [SENDER, "hello", 7])),
+    }
+    columns, rejected = EventDecoder(event_abi).decode_columns(codec, [log, log], 1)
+    assert rejected == []
+    assert list(columns["args"]["text"]) == ["hello", "hello"]
+    assert list(columns["args"]["small"]) == [7, 7]
+    assert list(columns["args"]["sender"]) == [Base32Address(SENDER, 1)] * 2
+    assert list(columns["epochNumber"]) == [None, None]
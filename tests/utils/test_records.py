@@ -0,0 +1,120 @@
+import copy
+import pickle
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from cfx_utils.token_unit import Drip
+
+from conflux_web3._utils.method_formatters import cfx_result_formatters
+from conflux_web3._utils.rpc_abi import RPC
+from conflux_web3.types.records import (
+    BlockRecord,
+    LogRecord,
+    ReceiptRecord,
+    TransactionRecord,
+)
+
+from tests.utils.test_compiled_formatters import BLOCK, LOG, RECEIPT
+
+
+def format_result(method: str, raw, result_mode: str):
+    return cfx_result_formatters(method, SimpleNamespace(result_mode=result_mode))(copy.deepcopy(raw)) # type: ignore
+
+
+def test_record_read_access():
+    record = ReceiptRecord.from_dict({"from": "cfx:a", "gasUsed": 1, "unknownField": [1]})
+    assert record["from"] == "cfx:a" and record.gasUsed == 1
+    # fields not declared by the record type are kept
+    assert record["unknownField"] == record.unknownField == [1]
+    assert list(record) == ["from", "gasUsed", "unknownField"]
+    assert len(record) == 3
+    assert "to" not in record and "gasUsed" in record
+    assert record.get("to") is None
+    with pytest.raises(KeyError):
+        record["to"]
+    with pytest.raises(AttributeError):
+        record.to
+    assert record == {"from": "cfx:a", "gasUsed": 1, "unknownField": [1]}
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert copy.deepcopy(record) == record
+
+
+def test_record_is_immutable():
+    record = LogRecord.from_dict({"data": b""})
+    with pytest.raises(TypeError):
+        record.data = b"1"
+    with pytest.raises(TypeError):
+        del record.data
+    with pytest.raises(TypeError):
+        record["data"] = b"1" # type: ignore
+
+
+@pytest.mark.parametrize("method,raw,record_type", [
+    (RPC.cfx_getBlockByHash, BLOCK, BlockRecord),
+    (RPC.cfx_getTransactionReceipt, RECEIPT, ReceiptRecord),
+])
+def test_records_result_mode(method: str, raw, record_type):
+    record = format_result(method, raw, "records")
+    expected = format_result(method, raw, "default")
+    assert type(record) is record_type
+    assert record == expected
+    assert list(record.keys()) == [key for key in record_type.field_names() if key in expected]
+    for key in expected:
+        assert type(record[key]) in (type(expected[key]), list, LogRecord, TransactionRecord)
+
+
+def test_nested_records():
+    receipts = format_result(RPC.cfx_getEpochReceipts, [[RECEIPT], []], "records")
+    assert type(receipts[0][0]) is ReceiptRecord
+    assert type(receipts[0][0].logs[0]) is LogRecord
+    block = format_result(RPC.cfx_getBlockByHash, BLOCK, "records")
+    assert type(block.transactions[0]) is TransactionRecord
+    # unformatted nested values are converted as the default mode
+    assert type(block.transactions[0]["accessList"][0]) is AttributeDict
+    logs = format_result(RPC.cfx_getLogs, [LOG], "records")
+    assert type(logs[0]) is LogRecord
+
+
+def test_records_take_less_memory():
+    record = format_result(RPC.cfx_getTransactionReceipt, RECEIPT, "records")
+    attrdict = format_result(RPC.cfx_getTransactionReceipt, RECEIPT, "default")
+    assert sys.getsizeof(record) < (sys.getsizeof(attrdict) + sys.getsizeof(attrdict.__dict__)) / 2
+
+
+def test_records_store_compact_values():
+    receipt = format_result(RPC.cfx_getTransactionReceipt, RECEIPT, "records")
+    assert type(receipt._get_stored("transactionHash")) is bytes
+    assert type(receipt._get_stored("gasFee")) is int
+    assert type(receipt.logs[0]._get_stored("topics")[0]) is bytes
+    # the stored values are converted when they are read
+    assert type(receipt.transactionHash) is type(receipt["transactionHash"]) is HexBytes
+    assert type(receipt.gasFee) is type(receipt["gasFee"]) is Drip
+    assert type(receipt.logs[0].topics[0]) is HexBytes
+    assert pickle.loads(pickle.dumps(receipt)) == receipt
+
+
+def allocated_size(method: str, raw, result_mode: str) -> int:
+    raw = copy.deepcopy(raw)
+    formatter = cfx_result_formatters(method, SimpleNamespace(result_mode=result_mode)) # type: ignore
+    tracemalloc.start()
+    result = formatter(raw)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+@pytest.mark.parametrize("method,raw", [
+    (RPC.cfx_getLogs, [dict(LOG, logIndex=hex(i)) for i in range(200)]),
+    (RPC.cfx_getEpochReceipts, [[RECEIPT] * 100]),
+])
+def test_records_size_per_record(method: str, raw):
+    # warm up the compiled formatters and caches
+    allocated_size(method, raw, "records")
+    allocated_size(method, raw, "default")
+    assert allocated_size(method, raw, "records") < allocated_size(method, raw, "default") * 0.7
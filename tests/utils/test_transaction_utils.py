@@ -1,8 +1,15 @@
 from audioop import add
 import pytest
+
+from cfx_address import Base32Address
 from conflux_web3 import Web3
 from conflux_web3._utils.transactions import fill_transaction_defaults
 from tests._test_helpers.type_check import TypeValidator
+from tests._test_helpers.fake_provider import (
+    FakeProvider,
+)
+
+ADDRESS = Base32Address("0x1" + "0" * 39, 1)
 
 def test_fill_transaction_defaults(w3: Web3, address):
     """test inner util fill_transaction_defaults. 
@@ -15,3 +22,67 @@ def test_fill_transaction_defaults(w3: Web3, address):
     }
     filled_tx = fill_transaction_defaults(w3, unfilled_tx)
     TypeValidator.validate_typed_dict(filled_tx, "TxDict")
+
+
+@pytest.fixture
+def recording_provider() -> FakeProvider:
+    return FakeProvider({
+        "cfx_getNextNonce": "0x5",
+        "cfx_estimateGasAndCollateral": {"gasLimit": "0x5208", "gasUsed": "0x5208", "storageCollateralized": "0x0"},
+        "cfx_gasPrice": "0x3b9aca00",
+        "cfx_getStatus": {"chainId": "0x1", "networkId": "0x1", "epochNumber": "0x64"},
+        "cfx_epochNumber": "0x64",
+    })
+
+
+@pytest.fixture
+def offline_w3(recording_provider: FakeProvider) -> Web3:
+    return Web3(recording_provider, middlewares=[], ens=None)
+
+
+def test_fill_transaction_defaults_estimates_once(offline_w3: Web3, recording_provider: FakeProvider):
+    filled_tx = fill_transaction_defaults(offline_w3, {"from": ADDRESS, "to": ADDRESS})
+    assert filled_tx["gas"] == 21000
+    assert filled_tx["storageLimit"] == 0
+    assert recording_provider.requests.count("cfx_estimateGasAndCollateral") == 1
+
+
+def test_batch_fill_transaction_defaults(offline_w3: Web3, recording_provider: FakeProvider):
+    offline_w3.cfx.batch_fill_transaction_defaults = True
+    offline_w3.cfx.transaction_defaults_staleness = 10
+    filled_tx = fill_transaction_defaults(offline_w3, {"from": ADDRESS, "to": ADDRESS})
+    assert filled_tx == {
+        "from": ADDRESS,
+        "to": ADDRESS,
+        "value": 0,
+        "data": b"",
+        "nonce": 5,
+        "gas": 21000,
+        "storageLimit": 0,
+        "gasPrice": 10**9,
+        "chainId": 1,
+        "epochHeight": 100,
+    }
+    assert recording_provider.batches == [
+        ["cfx_getNextNonce", "cfx_estimateGasAndCollateral", "cfx_gasPrice", "cfx_getStatus", "cfx_epochNumber"]
+    ]
+    # no request is sent out of the batch
+    assert recording_provider.requests == recording_provider.batches[0]
+
+    # chain id is cached, gas price and epoch height are reused within the staleness window
+    filled_tx = fill_transaction_defaults(offline_w3, {"from": ADDRESS, "to": ADDRESS})
+    assert (filled_tx["gasPrice"], filled_tx["chainId"], filled_tx["epochHeight"]) == (10**9, 1, 100)
+    assert recording_provider.batches[1] == ["cfx_getNextNonce", "cfx_estimateGasAndCollateral"]
+
+
+def test_transaction_defaults_staleness(offline_w3: Web3, recording_provider: FakeProvider):
+    for _ in range(2):
+        fill_transaction_defaults(offline_w3, {"from": ADDRESS, "to": ADDRESS})
+    assert recording_provider.requests.count("cfx_gasPrice") == 2
+
+    # the values queried last time are reused
+    offline_w3.cfx.transaction_defaults_staleness = 10
+    for _ in range(2):
+        fill_transaction_defaults(offline_w3, {"from": ADDRESS, "to": ADDRESS})
+    assert recording_provider.requests.count("cfx_gasPrice") == 2
+    assert recording_provider.requests.count("cfx_epochNumber") == 2